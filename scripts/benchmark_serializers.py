@@ -0,0 +1,73 @@
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+# Make the src package importable when run from the scripts directory
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(SCRIPT_DIR, '..')))
+
+from src.backend.models import Startup, NewsArticle
+from src.backend.utils.serializers import serialize_many
+
+def legacy_to_dict(instance):
+    # Per-call reflection as done by the models before the serializer registry
+    result = {column.name: getattr(instance, column.name) for column in instance.__table__.columns}
+    for key, value in result.items():
+        if isinstance(value, (datetime, date)):
+            result[key] = value.isoformat()
+    return result
+
+def build_startups(num_rows):
+    # Build transient Startup objects, no database needed
+    base_date = datetime(2024, 1, 1)
+    return [
+        Startup(
+            id=i, name=f'Startup {i}', website=f'https://startup{i}.example.com', industry='Biotech',
+            sub_sector='Therapeutics', employee_count=50 + i % 400, local_employee_count=20 + i % 100,
+            headcount_growth_rate=0.12, total_funding=1.5e7 + i, last_funding_date=date(2023, 1 + i % 12, 1),
+            funding_stage='Series A', is_hiring=bool(i % 2), last_updated=base_date + timedelta(minutes=i)
+        )
+        for i in range(num_rows)
+    ]
+
+def build_articles(num_rows):
+    # Build transient NewsArticle objects, no database needed
+    base_date = datetime(2024, 1, 1)
+    return [
+        NewsArticle(
+            id=i, startup_id=i % 1000, title=f'Article {i}', url=f'https://news.example.com/{i}',
+            published_date=base_date + timedelta(hours=i), source='Boston Globe', summary='Summary',
+            created_at=base_date
+        )
+        for i in range(num_rows)
+    ]
+
+def rows_per_second(func, rows, repeat):
+    # Best of several runs, to reduce noise from other processes
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rows)
+        best = min(best, time.perf_counter() - start)
+    return len(rows) / best
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per-call to_dict reflection with compiled serializers')
+    parser.add_argument('--rows', type=int, default=20000, help='Number of rows per run')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs per measurement')
+    args = parser.parse_args()
+
+    for model, rows in ((Startup, build_startups(args.rows)), (NewsArticle, build_articles(args.rows))):
+        legacy = rows_per_second(lambda batch: [legacy_to_dict(row) for row in batch], rows, args.repeat)
+        compiled = rows_per_second(lambda batch: serialize_many(model, batch), rows, args.repeat)
+        projected = rows_per_second(lambda batch: serialize_many(model, batch, ('id', 'name' if model is Startup else 'title')), rows, args.repeat)
+
+        print(f"{model.__name__}:")
+        print(f"  legacy to_dict      {legacy:12,.0f} rows/sec")
+        print(f"  compiled serializer {compiled:12,.0f} rows/sec ({compiled / legacy:.1f}x)")
+        print(f"  projected (2 cols)  {projected:12,.0f} rows/sec ({projected / legacy:.1f}x)")
+
+if __name__ == '__main__':
+    main()
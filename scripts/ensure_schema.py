@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+import time
+
+# Make the src package importable when run from the scripts directory
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(SCRIPT_DIR, '..')))
+
+from sqlalchemy import create_engine
+import src.backend.models  # noqa: F401 - registers the tables and their indexes
+from src.backend.models.funding_rollup import ensure_bucket_index
+from src.backend.utils.conditional import ensure_version_columns
+from src.backend.utils.db import db
+from src.backend.utils.fuzzy import ensure_name_indexes
+from src.backend.utils.search import ensure_search_indexes
+
+def ensure_schema(engine):
+    """
+    Bring an existing database up to the current models, creating what create_all only sets up
+    along with new tables, and filling it in for the rows already there
+
+    Every step is idempotent, so the script can run on each deploy.
+
+    :param engine: SQLAlchemy Engine
+    :return: List of (step, result) pairs
+    """
+    steps = []
+    with engine.begin() as connection:
+        # Missing tables, with their indexes, triggers and constraints
+        db.metadata.create_all(connection)
+        steps.append(('tables', 'created if missing'))
+
+        # Version columns behind the ETag and Last-Modified validators, set for the rows already there
+        backfilled = ensure_version_columns(connection, db.metadata)
+        steps.append(('version columns', ', '.join(f'{table} {rows:,}' for table, rows in backfilled.items())))
+
+        # Full-text indexes of the job and news tables, filled from their current rows
+        steps.append(('search indexes', ', '.join(ensure_search_indexes(connection)) or 'unsupported database'))
+
+        # Trigram indexes of the startup and investor names, on Postgres
+        steps.append(('name indexes', ', '.join(ensure_name_indexes(connection)) or 'kept in process'))
+
+        # Unique index of the rollup buckets, NULL industries and round types included
+        steps.append(('rollup bucket index', 'created' if ensure_bucket_index(connection) else 'present'))
+    return steps
+
+def main():
+    parser = argparse.ArgumentParser(description='Create the indexes, triggers and columns an existing database lacks')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'), help='Target database (default: $DATABASE_URL)')
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error('--database-url or DATABASE_URL is required')
+
+    started = time.perf_counter()
+    print(f"Ensuring the schema of {args.database_url.rsplit('@', 1)[-1]}...")
+    for step, result in ensure_schema(create_engine(args.database_url)):
+        print(f"  {step:24} {result}")
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -1,136 +1,340 @@
-import sys
+import argparse
+import math
 import os
-import django
-from faker import Faker
 import random
-import datetime
+import sys
+import time
+from datetime import date, datetime, timedelta
 
-# Set up global variables
+# Make the src package importable when run from the scripts directory
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..', 'src', 'backend'))
-faker = Faker()
-
-def setup_django():
-    # Set up Django environment
-    sys.path.append(PROJECT_ROOT)
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'boston_startup_tracker.settings')
-    django.setup()
-
-def create_startups(num_startups):
-    # Create fake startup data
-    from startups.models import Startup
-    startups = []
-    for _ in range(num_startups):
-        startup = Startup(
-            name=faker.company(),
-            description=faker.catch_phrase(),
-            founded_date=faker.date_between(start_date='-10y', end_date='today'),
-            website=faker.url(),
-            logo_url=faker.image_url(),
-            industry=random.choice(['Tech', 'Biotech', 'Fintech', 'Edtech', 'Cleantech']),
-            employee_count=random.randint(1, 1000),
-            funding_stage=random.choice(['Seed', 'Series A', 'Series B', 'Series C', 'IPO'])
-        )
-        startup.save()
-        startups.append(startup)
-    return startups
-
-def create_investors(num_investors):
-    # Create fake investor data
-    from investors.models import Investor
-    investors = []
-    for _ in range(num_investors):
-        investor = Investor(
-            name=faker.company(),
-            type=random.choice(['VC', 'Angel', 'Corporate', 'Accelerator']),
-            website=faker.url(),
-            logo_url=faker.image_url(),
-            description=faker.paragraph(),
-            founded_date=faker.date_between(start_date='-30y', end_date='today'),
-            total_investments=random.randint(1000000, 1000000000)
+sys.path.insert(0, os.path.abspath(os.path.join(SCRIPT_DIR, '..')))
+
+from sqlalchemy import create_engine, func, select
+from src.backend.models import Executive, Founder, FundingRound, Investor, JobPosting, NewsArticle, Startup
+from src.backend.models.funding_rollup import rebuild_funding_rollups
+from src.backend.models.funding_round import funding_round_investors
+from src.backend.utils.db import db
+
+# Rows per unit of scale; --scale 10 loads roughly 5 million rows
+STARTUPS_PER_SCALE = 10000
+INVESTORS_PER_SCALE = 2000
+
+# Pareto shape of a startup's "heat", driving its funding, headcount and press coverage. 1.16 is
+# the 80/20 shape; funding concentrates further, as hot startups also raise more and later rounds
+HEAT_SHAPE = 1.16
+
+# Industries weighted towards the Boston ecosystem, with their sub-sectors
+INDUSTRIES = {
+    'Biotech': (24, ('Therapeutics', 'Gene Editing', 'Drug Discovery', 'Diagnostics')),
+    'Healthtech': (14, ('Digital Health', 'Medical Devices', 'Care Delivery')),
+    'Enterprise Software': (16, ('DevTools', 'Security', 'Data Infrastructure', 'HR Tech')),
+    'AI/ML': (12, ('Computer Vision', 'NLP', 'MLOps')),
+    'Robotics': (8, ('Warehouse Automation', 'Surgical Robotics', 'Drones')),
+    'Fintech': (9, ('Payments', 'Insurtech', 'Wealth Management')),
+    'Cleantech': (7, ('Energy Storage', 'Carbon Capture', 'Fusion')),
+    'Edtech': (5, ('K-12', 'Higher Ed', 'Corporate Learning')),
+    'Consumer': (5, ('E-commerce', 'Food & Beverage', 'Fitness')),
+}
+
+# Funding rounds in order, with the median amount in dollars and the months until the next one
+ROUND_TYPES = (
+    ('Pre-Seed', 500000, 10),
+    ('Seed', 2500000, 16),
+    ('Series A', 12000000, 20),
+    ('Series B', 30000000, 22),
+    ('Series C', 60000000, 24),
+    ('Series D', 100000000, 24),
+    ('Growth', 180000000, 30),
+)
+
+INVESTOR_TYPES = (('VC', 55), ('Angel', 20), ('Corporate', 15), ('Accelerator', 10))
+NAME_PREFIXES = ('Nova', 'Helix', 'Quanta', 'Bright', 'Harbor', 'Beacon', 'Cobalt', 'Vertex', 'Lumen', 'Kinetic',
+                 'Atlas', 'Summit', 'Charles', 'Back Bay', 'Fenway', 'Seaport', 'Aurora', 'Cirrus', 'Ember', 'Tidal')
+NAME_SUFFIXES = ('Bio', 'Labs', 'Health', 'AI', 'Robotics', 'Systems', 'Therapeutics', 'Energy', 'Works', 'Data',
+                 'Genomics', 'Analytics', 'Pay', 'Learning', 'Dynamics', 'Cloud', 'Sciences', 'Devices')
+INVESTOR_SUFFIXES = ('Ventures', 'Capital', 'Partners', 'Fund', 'Investments', 'Angels', 'Accelerator')
+FIRST_NAMES = ('Alex', 'Priya', 'Wei', 'Maria', 'James', 'Aisha', 'Daniel', 'Sofia', 'Kenji', 'Fatima', 'Liam',
+               'Elena', 'Omar', 'Grace', 'Mateo', 'Hannah', 'Ravi', 'Chloe', 'Noah', 'Yara')
+LAST_NAMES = ('Chen', 'Patel', 'Garcia', 'Smith', 'Kim', 'Nguyen', 'Johnson', 'Rossi', 'Okafor', 'Cohen',
+              'Murphy', 'Silva', 'Tanaka', 'Ali', 'Brown', 'Kowalski', 'Haddad', 'Larsen', 'Mehta', 'Walsh')
+FOUNDER_TITLES = ('CEO & Co-founder', 'CTO & Co-founder', 'Co-founder', 'Chief Scientist & Co-founder')
+EXECUTIVE_TITLES = ('COO', 'CFO', 'VP Engineering', 'VP Sales', 'Chief Medical Officer', 'VP Product',
+                    'Head of People', 'VP Marketing', 'General Counsel')
+DEPARTMENTS = {
+    'Engineering': ('Software Engineer', 'Senior Software Engineer', 'Staff Engineer', 'Data Engineer'),
+    'Research': ('Research Scientist', 'Senior Scientist', 'Research Associate'),
+    'Product': ('Product Manager', 'Product Designer'),
+    'Sales': ('Account Executive', 'Sales Development Representative'),
+    'Operations': ('Operations Manager', 'Office Manager', 'Recruiter'),
+}
+NEWS_SOURCES = (('Boston Globe', 'bostonglobe.com'), ('BostInno', 'bizjournals.com/boston/inno'),
+                ('Boston Business Journal', 'bizjournals.com/boston'), ('TechCrunch', 'techcrunch.com'),
+                ('STAT News', 'statnews.com'), ('Xconomy', 'xconomy.com'))
+NEWS_TEMPLATES = ('{name} raises {round}', '{name} expands its Boston team', '{name} launches new product',
+                  '{name} names new {title}', 'Inside {name}, one of Boston\'s fastest-growing startups',
+                  '{name} partners with a Fortune 500 company', '{name} opens new office in Kendall Square')
+
+def weighted(choices):
+    # Split (value, weight) pairs into values and cumulative weights for Random.choices
+    values, cumulative, total = [], [], 0
+    for value, weight in choices:
+        total += weight
+        values.append(value)
+        cumulative.append(total)
+    return values, cumulative
+
+class DataGenerator:
+    """
+    Deterministic generator of related rows for the tracker's tables
+
+    The same seed, scale and reference date always produce the same rows. IDs are assigned
+    here, so children are generated alongside their startup without reading anything back.
+    """
+
+    def __init__(self, seed, as_of, investor_count, first_ids):
+        self.rng = random.Random(seed)
+        self.as_of = as_of
+        self.next_ids = dict(first_ids)
+        self.industries = weighted((industry, weight) for industry, (weight, _) in INDUSTRIES.items())
+        self.investor_types = weighted(INVESTOR_TYPES)
+        # Investor popularity follows Zipf's law: a few firms join most rounds
+        first_investor = self.next_ids['investor']
+        self.investors = weighted(
+            (first_investor + rank, 1 / (rank + 1) ** 1.1) for rank in range(investor_count)
         )
-        investor.save()
-        investors.append(investor)
-    return investors
-
-def create_funding_rounds(startups, investors):
-    # Create fake funding round data
-    from funding.models import FundingRound
-    for startup in startups:
-        for _ in range(random.randint(0, 3)):
-            funding_round = FundingRound(
-                startup=startup,
-                round_type=random.choice(['Seed', 'Series A', 'Series B', 'Series C']),
-                amount=random.randint(100000, 100000000),
-                date=faker.date_between(start_date=startup.founded_date, end_date='today'),
-                lead_investor=random.choice(investors)
+
+    def _id(self, table):
+        value = self.next_ids[table]
+        self.next_ids[table] = value + 1
+        return value
+
+    def _person(self):
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def _day_between(self, start, end):
+        return start + timedelta(days=self.rng.randint(0, max((end - start).days, 0)))
+
+    def investor_rows(self, count):
+        rows = []
+        for _ in range(count):
+            investor_id = self._id('investor')
+            name = f"{self.rng.choice(NAME_PREFIXES)} {self.rng.choice(INVESTOR_SUFFIXES)} {investor_id}"
+            rows.append({
+                'id': investor_id, 'name': name,
+                'type': self.rng.choices(*self.investor_types)[0],
+                'website': f"https://investor{investor_id}.example.com",
+                'last_updated': datetime.combine(self.as_of, datetime.min.time()),
+            })
+        return rows
+
+    def startup_rows(self, count):
+        """
+        Generate a chunk of startups with their funding rounds, people, job postings and news
+
+        :param count: Number of startups
+        :return: Dictionary of table name to list of row dictionaries, in insert order
+        """
+        tables = {name: [] for name in ('startup', 'funding_round', 'funding_round_investors', 'founder',
+                                        'executive', 'job_posting', 'news_article')}
+        for _ in range(count):
+            self._add_startup(tables)
+        return tables
+
+    def _add_startup(self, tables):
+        rng = self.rng
+        startup_id = self._id('startup')
+        heat = rng.paretovariate(HEAT_SHAPE)
+        industry = rng.choices(*self.industries)[0]
+        founded = self._day_between(self.as_of - timedelta(days=15 * 365), self.as_of - timedelta(days=90))
+        name = f"{rng.choice(NAME_PREFIXES)} {rng.choice(NAME_SUFFIXES)}"
+
+        # Hotter startups raise more rounds, sooner and larger
+        rounds = self._add_funding_rounds(tables, startup_id, founded, heat)
+        total_funding = sum(row['amount'] for row in rounds)
+        employees = max(1, int(rng.lognormvariate(math.log(8 * heat ** 0.8), 0.6)))
+        is_hiring = rng.random() < min(0.25 + 0.1 * heat, 0.95)
+        tables['startup'].append({
+            'id': startup_id, 'name': name, 'website': f"https://startup{startup_id}.example.com",
+            'industry': industry, 'sub_sector': rng.choice(INDUSTRIES[industry][1]),
+            'employee_count': employees, 'local_employee_count': max(1, int(employees * rng.uniform(0.4, 0.9))),
+            'headcount_growth_rate': round(rng.gauss(0.05 + 0.03 * min(heat, 10), 0.1), 3),
+            'total_funding': total_funding or None,
+            'last_funding_date': rounds[-1]['date'] if rounds else None,
+            'funding_stage': rounds[-1]['round_type'] if rounds else 'Bootstrapped',
+            'is_hiring': is_hiring, 'last_updated': datetime.combine(self.as_of, datetime.min.time()),
+        })
+
+        for position in range(rng.randint(1, 4)):
+            founder_id = self._id('founder')
+            tables['founder'].append({
+                'id': founder_id, 'startup_id': startup_id, 'name': self._person(),
+                'title': FOUNDER_TITLES[min(position, len(FOUNDER_TITLES) - 1)],
+                'linkedin_url': f"https://www.linkedin.com/in/founder-{founder_id}",
+            })
+        for title in rng.sample(EXECUTIVE_TITLES, min(len(EXECUTIVE_TITLES), int(math.log2(employees)))):
+            executive_id = self._id('executive')
+            tables['executive'].append({
+                'id': executive_id, 'startup_id': startup_id, 'name': self._person(), 'title': title,
+                'linkedin_url': f"https://www.linkedin.com/in/executive-{executive_id}",
+            })
+        if is_hiring:
+            self._add_job_postings(tables, startup_id, employees)
+        self._add_news(tables, startup_id, name, founded, heat, rounds)
+
+    def _add_funding_rounds(self, tables, startup_id, founded, heat):
+        rng = self.rng
+        rounds = []
+        day = founded + timedelta(days=rng.randint(30, 400))
+        # Progress through the round ladder while the startup stays hot enough and time remains
+        for stage, (round_type, median, months) in enumerate(ROUND_TYPES):
+            if day > self.as_of or (stage and rng.random() > min(0.35 + 0.12 * heat, 0.92)):
+                break
+            amount = round(rng.lognormvariate(math.log(median * heat ** 0.5), 0.5), -3)
+            round_id = self._id('funding_round')
+            rounds.append({'id': round_id, 'startup_id': startup_id, 'amount': amount, 'date': day,
+                           'round_type': round_type})
+            # Later rounds are syndicated among more investors
+            participants = set(rng.choices(*self.investors, k=rng.randint(1, 2 + stage)))
+            tables['funding_round_investors'].extend(
+                {'funding_round_id': round_id, 'investor_id': investor_id} for investor_id in sorted(participants)
             )
-            funding_round.save()
-            funding_round.investors.set(random.sample(investors, k=random.randint(1, 5)))
-
-def create_job_postings(startups):
-    # Create fake job posting data
-    from jobs.models import JobPosting
-    for startup in startups:
-        for _ in range(random.randint(0, 5)):
-            job_posting = JobPosting(
-                startup=startup,
-                title=faker.job(),
-                description=faker.text(),
-                location=faker.city(),
-                salary_range=f"${random.randint(30, 200)}k - ${random.randint(50, 250)}k",
-                posted_date=faker.date_between(start_date='-30d', end_date='today'),
-                application_url=faker.url()
+            day += timedelta(days=int(months * 30 * rng.uniform(0.6, 1.4) / min(heat, 3) ** 0.3))
+        tables['funding_round'].extend(rounds)
+        return rounds
+
+    def _add_job_postings(self, tables, startup_id, employees):
+        rng = self.rng
+        departments = list(DEPARTMENTS)
+        for _ in range(min(max(1, int(employees * rng.uniform(0.03, 0.12))), 300)):
+            department = rng.choice(departments)
+            title = rng.choice(DEPARTMENTS[department])
+            posted = self._day_between(self.as_of - timedelta(days=120), self.as_of)
+            tables['job_posting'].append({
+                'id': self._id('job_posting'), 'startup_id': startup_id, 'title': title, 'department': department,
+                'description': f"Join our {department.lower()} team in Boston as a {title}.",
+                'posted_date': datetime.combine(posted, datetime.min.time()),
+                'is_active': rng.random() < 0.85,
+                'last_updated': datetime.combine(self.as_of, datetime.min.time()),
+            })
+
+    def _add_news(self, tables, startup_id, name, founded, heat, rounds):
+        rng = self.rng
+        # Press coverage is heavier-tailed than funding: hot startups collect hundreds of articles
+        count = min(int(rng.paretovariate(1.5) * heat ** 1.3) - 1, 5000)
+        for _ in range(max(count, 0)):
+            article_id = self._id('news_article')
+            source, domain = rng.choice(NEWS_SOURCES)
+            published = self._day_between(founded, self.as_of)
+            title = rng.choice(NEWS_TEMPLATES).format(
+                name=name, round=rng.choice(rounds)['round_type'] if rounds else 'seed funding',
+                title=rng.choice(EXECUTIVE_TITLES),
             )
-            job_posting.save()
-
-def create_news_articles(startups):
-    # Create fake news article data
-    from news.models import NewsArticle
-    for startup in startups:
-        for _ in range(random.randint(0, 3)):
-            news_article = NewsArticle(
-                startup=startup,
-                title=faker.sentence(),
-                content=faker.paragraphs(nb=3),
-                author=faker.name(),
-                publication_date=faker.date_between(start_date='-1y', end_date='today'),
-                source_url=faker.url()
+            tables['news_article'].append({
+                'id': article_id, 'startup_id': startup_id, 'title': title,
+                'url': f"https://{domain}/{published.year}/{article_id}", 'source': source,
+                'published_date': datetime.combine(published, datetime.min.time()) + timedelta(minutes=article_id % 1440),
+                'summary': title + '.', 'created_at': datetime.combine(self.as_of, datetime.min.time()),
+                'last_updated': datetime.combine(self.as_of, datetime.min.time()),
+            })
+
+# Insert order of the tables, parents first
+TABLES = {
+    'investor': Investor.__table__,
+    'startup': Startup.__table__,
+    'funding_round': FundingRound.__table__,
+    'funding_round_investors': funding_round_investors,
+    'founder': Founder.__table__,
+    'executive': Executive.__table__,
+    'job_posting': JobPosting.__table__,
+    'news_article': NewsArticle.__table__,
+}
+
+def first_ids(connection):
+    # Continue after existing rows, so seeding can add to a database
+    return {
+        name: (connection.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+        for name, table in TABLES.items() if 'id' in table.c
+    }
+
+def insert_rows(connection, tables, totals):
+    # Multi-row INSERTs per table; Core executemany skips the ORM unit of work and its listeners
+    for name, table in TABLES.items():
+        rows = tables.get(name)
+        if rows:
+            connection.execute(table.insert(), rows)
+            totals[name] = totals.get(name, 0) + len(rows)
+
+def reset_sequences(connection):
+    # IDs were assigned explicitly; move the Postgres sequences past them
+    if connection.dialect.name != 'postgresql':
+        return
+    for name, table in TABLES.items():
+        if 'id' in table.c:
+            connection.exec_driver_sql(
+                f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), (SELECT coalesce(max(id), 1) FROM {name}))"
             )
-            news_article.save()
+
+def seed(engine, scale, seed_value, as_of, chunk_size, reset=False):
+    """
+    Load a synthetic data set of the given scale
+
+    :param engine: SQLAlchemy Engine
+    :param scale: Scale factor; 1 loads about 500,000 rows
+    :param seed_value: Random seed; equal seeds give equal data
+    :param as_of: Reference date of the data set, the latest date generated
+    :param chunk_size: Startups generated and committed per transaction
+    :param reset: Drop and recreate all tables first
+    :return: Dictionary of table name to rows inserted
+    """
+    if reset:
+        db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+
+    totals = {}
+    with engine.connect() as connection:
+        if connection.dialect.name == 'sqlite':
+            connection.exec_driver_sql('PRAGMA synchronous = OFF')
+        generator = DataGenerator(seed_value, as_of, int(INVESTORS_PER_SCALE * scale), first_ids(connection))
+
+        insert_rows(connection, {'investor': generator.investor_rows(int(INVESTORS_PER_SCALE * scale))}, totals)
+        connection.commit()
+
+        # Generate and commit startups chunk by chunk, so memory stays flat at any scale
+        remaining = int(STARTUPS_PER_SCALE * scale)
+        started = time.perf_counter()
+        while remaining > 0:
+            count = min(chunk_size, remaining)
+            insert_rows(connection, generator.startup_rows(count), totals)
+            connection.commit()
+            remaining -= count
+            rows = sum(totals.values())
+            print(f"  {rows:,} rows, {rows / (time.perf_counter() - started):,.0f} rows/sec", flush=True)
+
+        # Derived tables are maintained by session listeners, which bulk inserts bypass
+        rebuild_funding_rollups(connection)
+        reset_sequences(connection)
+        connection.commit()
+    return totals
 
 def main():
-    try:
-        setup_django()
-        
-        print("Seeding database...")
-        startups = create_startups(50)
-        print(f"Created {len(startups)} startups")
-        
-        investors = create_investors(20)
-        print(f"Created {len(investors)} investors")
-        
-        create_funding_rounds(startups, investors)
-        print("Created funding rounds")
-        
-        create_job_postings(startups)
-        print("Created job postings")
-        
-        create_news_articles(startups)
-        print("Created news articles")
-        
-        print("Database seeding completed successfully!")
-    except Exception as e:
-        print(f"An error occurred while seeding the database: {str(e)}")
+    parser = argparse.ArgumentParser(description='Load a deterministic synthetic data set for development and performance tests')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'), help='Target database (default: $DATABASE_URL)')
+    parser.add_argument('--scale', type=float, default=1.0, help='Scale factor; 1 loads about 500,000 rows')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed; equal seeds give equal data')
+    parser.add_argument('--as-of', type=date.fromisoformat, default=date(2025, 1, 1), help='Latest date generated (YYYY-MM-DD)')
+    parser.add_argument('--chunk-size', type=int, default=2000, help='Startups generated per transaction')
+    parser.add_argument('--reset', action='store_true', help='Drop and recreate all tables first')
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error('--database-url or DATABASE_URL is required')
+
+    started = time.perf_counter()
+    print(f"Seeding {args.database_url.rsplit('@', 1)[-1]} at scale {args.scale} with seed {args.seed}...")
+    totals = seed(create_engine(args.database_url), args.scale, args.seed, args.as_of, args.chunk_size, args.reset)
+    for name, count in totals.items():
+        print(f"  {name:24} {count:12,}")
+    print(f"Loaded {sum(totals.values()):,} rows in {time.perf_counter() - started:.1f}s")
 
 if __name__ == '__main__':
     main()
-
-# Human tasks:
-# TODO: Review and adjust the number of entities created for each model
-# TODO: Ensure the fake data generation is realistic and relevant to the Boston startup ecosystem
-# TODO: Add more specific data generation for Boston-related information (e.g., local addresses, area-specific industry focus)
-# TODO: Implement command-line arguments to control the amount of data generated
-# TODO: Add option to reset the database before seeding
-# TODO: Create relationships between entities that reflect realistic scenarios
-# TODO: Ensure generated data complies with any business rules or constraints in the models
\ No newline at end of file
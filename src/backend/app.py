@@ -1,13 +1,23 @@
+import os
 from flask import Flask
 from flask_cors import CORS
-from config import Config
-from utils.db import db
+from config import config
+from utils.db import db, init_query_budget, init_query_timing, init_replicas
+from utils.cache import init_cache
+from utils.pool import init_pool_metrics
+from utils.metrics import init_metrics
+from services.autocomplete_service import init_autocomplete
 from routes.startup import startup_routes
 from routes.investor import investor_routes
 from routes.job import job_routes
 from routes.news import news_routes
 from routes.user import user_routes
 from routes.auth import auth_routes
+from routes.search import search_routes
+from routes.analytics import analytics_routes
+from routes.export import export_routes
+from routes.admin import admin_routes
+from routes.metrics import metrics_routes
 
 app = Flask(__name__)
 
@@ -15,14 +25,31 @@ def create_app():
     # Create Flask application instance
     app = Flask(__name__)
 
-    # Load configuration from Config object
-    app.config.from_object(Config)
+    # Load the configuration of the environment named by APP_ENV
+    app.config.from_object(config[os.environ.get('APP_ENV', 'production')])
 
     # Initialize CORS with the app
     CORS(app)
 
-    # Initialize database with the app
+    # Record request metrics; registered first so the latency covers the other request hooks
+    init_metrics(app)
+
+    # Instrument the connection pools, then initialize database and its read replicas with the app
+    init_pool_metrics(app)
     db.init_app(app)
+    init_replicas(app)
+
+    # Enforce the per-request query budget when configured (testing)
+    init_query_budget(app)
+
+    # Time each request's SQL for the Server-Timing header and the slow query log
+    init_query_timing(app)
+
+    # Initialize the Redis cache client
+    init_cache(app)
+
+    # Build the autocomplete index before the first request needs it
+    init_autocomplete(app)
 
     # Register blueprint for startup routes
     app.register_blueprint(startup_routes)
@@ -42,6 +69,21 @@ def create_app():
     # Register blueprint for auth routes
     app.register_blueprint(auth_routes)
 
+    # Register blueprint for search routes
+    app.register_blueprint(search_routes)
+
+    # Register blueprint for analytics routes
+    app.register_blueprint(analytics_routes)
+
+    # Register blueprint for export routes
+    app.register_blueprint(export_routes)
+
+    # Register blueprint for admin routes
+    app.register_blueprint(admin_routes)
+
+    # Register blueprint for the Prometheus metrics endpoint
+    app.register_blueprint(metrics_routes)
+
     # Return the configured app
     return app
 
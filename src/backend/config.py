@@ -1,6 +1,16 @@
 import os
 from datetime import timedelta
 
+def engine_options(pool_size, max_overflow, pool_timeout, pool_recycle):
+    # Connection pool settings of an environment; DB_POOL_* environment variables override its defaults
+    return {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', pool_size)),
+        'max_overflow': int(os.environ.get('DB_POOL_MAX_OVERFLOW', max_overflow)),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', pool_timeout)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', pool_recycle)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() != 'false',
+    }
+
 # Base configuration class with common settings
 class Config:
     DEBUG = False
@@ -8,22 +18,83 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Per worker: persistent connections, extra ones for bursts, seconds to wait for a free one and
+    # seconds before one is replaced; pre-ping drops connections a database failover left dead
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(pool_size=5, max_overflow=10, pool_timeout=30, pool_recycle=1800)
+    # Comma-separated read replica URLs serving GET requests; none sends every read to the primary
+    SQLALCHEMY_REPLICA_URIS = [uri for uri in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if uri]
+    # Seconds a client keeps reading from the primary after a write, covering replica lag
+    REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 5))
+    # Report each request's query count and database time in a Server-Timing header
+    SQLALCHEMY_SERVER_TIMING = os.environ.get('SQLALCHEMY_SERVER_TIMING', 'true').lower() != 'false'
+    # Log statements taking at least this many milliseconds, with their normalized SQL and route
+    SQLALCHEMY_SLOW_QUERY_MS = float(os.environ.get('SQLALCHEMY_SLOW_QUERY_MS', 200))
+    # Directory shared by the gunicorn workers, each publishing its request metrics there every
+    # METRICS_FLUSH_SECONDS so /metrics on any worker reports all of them; unset for a single process
+    METRICS_MULTIPROCESS_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    METRICS_FLUSH_SECONDS = float(os.environ.get('METRICS_FLUSH_SECONDS', 5))
+    # Bearer token Prometheus sends to scrape /metrics; without one, only admin users' access tokens can read it
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    REDIS_URL = os.environ.get('REDIS_URL')
+    # Seconds an exact list total stays cached; totals above the cap are reported as approximate
+    COUNT_CACHE_TTL = int(os.environ.get('COUNT_CACHE_TTL', 300))
+    COUNT_CAP = int(os.environ.get('COUNT_CAP', 10000))
+    # Seconds a serialized entity stays in the read-through detail cache
+    DETAIL_CACHE_TTL = int(os.environ.get('DETAIL_CACHE_TTL', 600))
+    # Per-worker in-process cache tier in front of Redis; its TTL bounds staleness if Redis is down
+    CACHE_LOCAL_MAXSIZE = int(os.environ.get('CACHE_LOCAL_MAXSIZE', 1024))
+    CACHE_LOCAL_TTL = int(os.environ.get('CACHE_LOCAL_TTL', 30))
+    # Namespace of all Redis keys; bump the version when the cached value format changes
+    CACHE_KEY_PREFIX = os.environ.get('CACHE_KEY_PREFIX', 'bst:v1')
+    # Upper bound on the lifetime of any cache entry, so keys orphaned by cache_clear expire
+    CACHE_DEFAULT_TTL = int(os.environ.get('CACHE_DEFAULT_TTL', 86400))
+    # Seconds a serialized list page stays cached; writes to matching rows invalidate it earlier
+    LIST_CACHE_TTL = int(os.environ.get('LIST_CACHE_TTL', 60))
+    # Seconds the facet counts of a filter set stay cached; writes to matching rows invalidate them earlier
+    FACET_CACHE_TTL = int(os.environ.get('FACET_CACHE_TTL', 300))
+    # Seconds before a worker rebuilds its autocomplete index to pick up other workers' writes
+    AUTOCOMPLETE_REFRESH_SECONDS = int(os.environ.get('AUTOCOMPLETE_REFRESH_SECONDS', 300))
+    # Seconds before a worker rebuilds its in-process fuzzy name indexes (non-Postgres databases only)
+    NAME_INDEX_REFRESH_SECONDS = int(os.environ.get('NAME_INDEX_REFRESH_SECONDS', 300))
+    # Maximum names a fuzzy ?name= filter matches on non-Postgres databases, sent as one IN list
+    NAME_FILTER_MAX_CANDIDATES = int(os.environ.get('NAME_FILTER_MAX_CANDIDATES', 500))
+    # Refresh the funding rollups a commit touched on a background thread, off the request path
+    FUNDING_ROLLUP_BACKGROUND = os.environ.get('FUNDING_ROLLUP_BACKGROUND', 'true').lower() != 'false'
+    # Maximum records per bulk write request, and rows written per transaction
+    BULK_MAX_RECORDS = int(os.environ.get('BULK_MAX_RECORDS', 10000))
+    BULK_CHUNK_SIZE = int(os.environ.get('BULK_CHUNK_SIZE', 1000))
+    # Maximum IDs per batch fetch (?ids=1,2,3), resolved with one IN query
+    BATCH_FETCH_MAX_IDS = int(os.environ.get('BATCH_FETCH_MAX_IDS', 500))
+    # Rows per server-side cursor fetch and per streamed chunk of /export
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 2000))
+    # Seconds browsers and the proxy tier may reuse a GET response before revalidating its ETag
+    HTTP_CACHE_MAX_AGE = int(os.environ.get('HTTP_CACHE_MAX_AGE', 0))
+    # Seconds the current user's row stays cached between requests; user writes invalidate it earlier
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
 
 # Configuration for development environment
 class DevelopmentConfig(Config):
     DEBUG = True
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(pool_size=2, max_overflow=3, pool_timeout=10, pool_recycle=3600)
 
 # Configuration for testing environment
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL')
+    # Fail any request that runs more queries than this, to catch N+1 regressions
+    SQLALCHEMY_QUERY_BUDGET = 10
+    # Let the test database's driver pick its pool; in-memory SQLite needs a static one
+    SQLALCHEMY_ENGINE_OPTIONS = {}
 
 # Configuration for production environment
 class ProductionConfig(Config):
-    pass
+    # Server-Timing names the tables each request read, so production only reports it when asked to
+    SQLALCHEMY_SERVER_TIMING = os.environ.get('SQLALCHEMY_SERVER_TIMING', 'false').lower() == 'true'
+    # Fail checkouts fast under overload rather than queueing requests behind the pool
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(pool_size=10, max_overflow=20, pool_timeout=10, pool_recycle=1800)
 
 # Export configuration dictionary
 config = {
@@ -7,6 +7,7 @@ from .funding_round import FundingRound
 from .job_posting import JobPosting
 from .news_article import NewsArticle
 from .user import User
+from .funding_rollup import FundingRollup
 
 # Export all model classes for easy access when importing from this package
 __all__ = [
@@ -17,5 +18,6 @@ __all__ = [
     'FundingRound',
     'JobPosting',
     'NewsArticle',
-    'User'
+    'User',
+    'FundingRollup'
 ]
\ No newline at end of file
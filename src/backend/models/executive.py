@@ -1,4 +1,5 @@
 from ..utils.db import db
+from ..utils.serializers import serialize
 from sqlalchemy.orm import relationship
 
 class Executive(db.Model):
@@ -21,14 +22,5 @@ class Executive(db.Model):
         Returns:
             dict: Dictionary representation of the Executive
         """
-        # Create a dictionary with all column values
-        exec_dict = {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
-
-        # Exclude the 'startup' relationship from the dictionary
-        exec_dict.pop('startup', None)
-
-        # Return the dictionary
-        return exec_dict
\ No newline at end of file
+        # Encode the column values with the compiled serializer (relationships are not columns)
+        return serialize(self)
\ No newline at end of file
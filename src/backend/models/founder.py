@@ -1,4 +1,5 @@
 from ..utils.db import db
+from ..utils.serializers import serialize
 from sqlalchemy.orm import relationship
 
 class Founder(db.Model):
@@ -21,14 +22,5 @@ class Founder(db.Model):
         Returns:
             dict: Dictionary representation of the Founder
         """
-        # Create a dictionary with all column values
-        founder_dict = {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
-
-        # Exclude the 'startup' relationship from the dictionary
-        founder_dict.pop('startup', None)
-
-        # Return the dictionary
-        return founder_dict
\ No newline at end of file
+        # Encode the column values with the compiled serializer (relationships are not columns)
+        return serialize(self)
\ No newline at end of file
@@ -0,0 +1,361 @@
+import logging
+import os
+import queue
+import statistics
+import threading
+from collections import defaultdict
+from datetime import date, datetime
+from flask import current_app, has_app_context
+from sqlalchemy import and_, delete, func, insert, or_, select, text
+from sqlalchemy.exc import IntegrityError
+from ..utils.db import UNKNOWN_VALUE, db, on_entities_changed
+from ..utils.serializers import serialize
+from .funding_round import FundingRound
+from .startup import Startup
+
+logger = logging.getLogger(__name__)
+
+# Period granularities of the rollups
+PERIOD_TYPES = ('month', 'quarter', 'year')
+
+# Funding round columns that decide which buckets a round counts in
+BUCKET_FIELDS = ('date', 'round_type', 'startup_id')
+
+# Stands in for a NULL industry or round type in the bucket unique index, where NULLs would be distinct
+NULL_DIMENSION = '<null>'
+
+# Batches of committed changes waiting for the refresher thread, each with the app to refresh them in
+_pending = queue.Queue()
+
+# Process whose refresher thread is running; threads do not survive a fork
+_refresher_pid = None
+_refresher_lock = threading.Lock()
+
+class FundingRollup(db.Model):
+    """FundingRollup model holding funding round aggregates per period, industry and round type"""
+
+    # Define table columns
+    id = db.Column(db.Integer, primary_key=True)
+    period_type = db.Column(db.String(10), nullable=False)
+    period_start = db.Column(db.Date, nullable=False)
+    industry = db.Column(db.String(100))
+    round_type = db.Column(db.String(50))
+    round_count = db.Column(db.Integer, nullable=False)
+    total_amount = db.Column(db.Float, nullable=False)
+    median_amount = db.Column(db.Float)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        """
+        Convert the FundingRollup object to a dictionary
+
+        Returns:
+            dict: Dictionary representation of the FundingRollup
+        """
+        # Encode the column values with the compiled serializer, which converts dates to ISO strings
+        return serialize(self)
+
+# One row per bucket; NULL dimensions are coalesced so concurrent refreshes of a NULL bucket conflict too
+BUCKET_INDEX = db.Index(
+    'uq_funding_rollup_bucket', FundingRollup.period_type, FundingRollup.period_start,
+    func.coalesce(FundingRollup.industry, NULL_DIMENSION), func.coalesce(FundingRollup.round_type, NULL_DIMENSION),
+    unique=True
+)
+
+def period_start(day, period_type):
+    """
+    First day of the period containing a date
+
+    :param day: Date
+    :param period_type: 'month', 'quarter' or 'year'
+    :return: Date
+    """
+    if period_type == 'month':
+        return date(day.year, day.month, 1)
+    if period_type == 'quarter':
+        return date(day.year, 3 * ((day.month - 1) // 3) + 1, 1)
+    return date(day.year, 1, 1)
+
+def period_end(start, period_type):
+    """
+    First day after the period starting at a date
+
+    :param start: First day of the period
+    :param period_type: 'month', 'quarter' or 'year'
+    :return: Date
+    """
+    months = {'month': 1, 'quarter': 3, 'year': 12}[period_type]
+    month_index = start.month - 1 + months
+    return date(start.year + month_index // 12, month_index % 12 + 1, 1)
+
+def _buckets(day, industry, round_type):
+    # Rollup buckets a funding round on a date counts towards, one per period type
+    if day is None:
+        return set()
+    return {(period_type, period_start(day, period_type), industry, round_type) for period_type in PERIOD_TYPES}
+
+def _rollup_row(bucket, amounts):
+    # Aggregates of one bucket; rounds without an amount count but do not add to the sum or median
+    period_type, start, industry, round_type = bucket
+    known = [amount for amount in amounts if amount is not None]
+    return {
+        'period_type': period_type, 'period_start': start, 'industry': industry, 'round_type': round_type,
+        'round_count': len(amounts), 'total_amount': float(sum(known)),
+        'median_amount': statistics.median(known) if known else None, 'updated_at': datetime.utcnow()
+    }
+
+def refresh_funding_rollups(connection, buckets):
+    """
+    Recompute the given rollup buckets from their funding rounds
+
+    Only the rounds of each bucket are read, through the date range and the join to the startup.
+
+    :param connection: SQLAlchemy connection in a transaction
+    :param buckets: Iterable of (period_type, period_start, industry, round_type) tuples
+    :return: None
+    """
+    rollups = FundingRollup.__table__
+    for bucket in buckets:
+        period_type, start, industry, round_type = bucket
+        amounts = connection.execute(
+            select(FundingRound.amount)
+            .join(Startup, Startup.id == FundingRound.startup_id)
+            .where(FundingRound.date >= start, FundingRound.date < period_end(start, period_type),
+                   Startup.industry.is_not_distinct_from(industry),
+                   FundingRound.round_type.is_not_distinct_from(round_type))
+        ).scalars().all()
+
+        connection.execute(delete(rollups).where(
+            rollups.c.period_type == period_type, rollups.c.period_start == start,
+            rollups.c.industry.is_not_distinct_from(industry), rollups.c.round_type.is_not_distinct_from(round_type)
+        ))
+        if amounts:
+            connection.execute(insert(rollups), [_rollup_row(bucket, amounts)])
+
+def rebuild_funding_rollups(connection):
+    """
+    Recompute all rollups from the full funding history in one scan
+
+    :param connection: SQLAlchemy connection in a transaction
+    :return: Number of rollup rows written
+    """
+    amounts = defaultdict(list)
+    rounds = connection.execute(
+        select(FundingRound.date, Startup.industry, FundingRound.round_type, FundingRound.amount)
+        .join(Startup, Startup.id == FundingRound.startup_id)
+    )
+    for day, industry, round_type, amount in rounds:
+        for bucket in _buckets(day, industry, round_type):
+            amounts[bucket].append(amount)
+
+    connection.execute(delete(FundingRollup.__table__))
+    rows = [_rollup_row(bucket, bucket_amounts) for bucket, bucket_amounts in amounts.items()]
+    if rows:
+        connection.execute(insert(FundingRollup.__table__), rows)
+    return len(rows)
+
+def ensure_bucket_index(connection):
+    """
+    Replace the unique constraint of an existing rollup table with the coalesced bucket index
+
+    Safe to run repeatedly. The rollups are rebuilt first, dropping the duplicate NULL buckets
+    the constraint let through on Postgres. Only Postgres and SQLite are handled.
+
+    :param connection: SQLAlchemy connection, committed by the caller
+    :return: True if the index was created
+    """
+    # Reflection skips expression indexes, so look the index up in the catalog; on Postgres the
+    # constraint's own index has the same name
+    if connection.dialect.name == 'postgresql':
+        lookup = ("SELECT 1 FROM pg_indexes WHERE indexname = :name "
+                  "AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = :name)")
+    elif connection.dialect.name == 'sqlite':
+        lookup = "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = :name"
+    else:
+        return False
+    if connection.execute(text(lookup), {'name': BUCKET_INDEX.name}).first():
+        return False
+
+    if connection.dialect.name == 'postgresql':
+        connection.exec_driver_sql(
+            f'ALTER TABLE {FundingRollup.__tablename__} DROP CONSTRAINT IF EXISTS {BUCKET_INDEX.name}'
+        )
+    rebuild_funding_rollups(connection)
+    BUCKET_INDEX.create(connection)
+    return True
+
+def _matching_buckets(connection, day, industry, round_type):
+    # Buckets of a round with some unknown old values (UNKNOWN_VALUE): the existing rollups agreeing
+    # with the known ones, as a round only counts in buckets that have a rollup row
+    if day is None:
+        return set()
+    rollups = FundingRollup.__table__
+    query = select(rollups.c.period_type, rollups.c.period_start, rollups.c.industry, rollups.c.round_type)
+    if day is not UNKNOWN_VALUE:
+        query = query.where(or_(*(
+            and_(rollups.c.period_type == period_type, rollups.c.period_start == period_start(day, period_type))
+            for period_type in PERIOD_TYPES
+        )))
+    if industry is not UNKNOWN_VALUE:
+        query = query.where(rollups.c.industry.is_not_distinct_from(industry))
+    if round_type is not UNKNOWN_VALUE:
+        query = query.where(rollups.c.round_type.is_not_distinct_from(round_type))
+    return {tuple(row) for row in connection.execute(query)}
+
+def _round_buckets(connection, day, industry, round_type):
+    # Buckets a round counts towards, looked up among the rollups where an old value is unknown
+    if any(value is UNKNOWN_VALUE for value in (day, industry, round_type)):
+        return _matching_buckets(connection, day, industry, round_type)
+    return _buckets(day, industry, round_type)
+
+def _affected_buckets(connection, changes):
+    # Buckets whose rounds a batch of committed changes added, removed or moved
+    round_changes = [change for change in changes if change.model is FundingRound]
+    moved_startups = {
+        change.id: change.previous['industry'] for change in changes
+        if change.model is Startup and 'industry' in (change.previous or {})
+    }
+
+    # Updated rounds as they are now, as the flush may not have loaded every column
+    updated_ids = [change.id for change in round_changes if change.operation == 'update']
+    current = {}
+    if updated_ids:
+        for round_id, day, round_type, startup_id in connection.execute(
+            select(FundingRound.id, FundingRound.date, FundingRound.round_type, FundingRound.startup_id)
+            .where(FundingRound.id.in_(updated_ids))
+        ):
+            current[round_id] = {'date': day, 'round_type': round_type, 'startup_id': startup_id}
+
+    round_states = []
+    for change in round_changes:
+        values, previous = change.values or {}, change.previous or {}
+        if change.operation == 'insert':
+            # A column the insert left unset was written as NULL, so every value of a new round is known
+            round_states.append({field: values.get(field) for field in BUCKET_FIELDS})
+        elif change.operation == 'delete':
+            round_states.append({field: values.get(field, UNKNOWN_VALUE) for field in BUCKET_FIELDS})
+        else:
+            # The new state, then the old one: changed columns from previous, unchanged ones as they are now
+            now = current.get(change.id)
+            if now is not None:
+                round_states.append(now)
+            unchanged = now or values
+            round_states.append({field: previous.get(field, unchanged.get(field, UNKNOWN_VALUE))
+                                 for field in BUCKET_FIELDS})
+
+    # Industries of the startups of the changed rounds, including any they just moved from;
+    # rounds of a startup that is gone may have counted under any industry
+    startup_ids = {state['startup_id'] for state in round_states if state['startup_id'] is not UNKNOWN_VALUE}
+    startup_ids.update(moved_startups)
+    industries = defaultdict(set)
+    if startup_ids:
+        for startup_id, industry in connection.execute(
+            select(Startup.id, Startup.industry).where(Startup.id.in_(startup_ids))
+        ):
+            industries[startup_id].add(industry)
+    for startup_id, previous_industry in moved_startups.items():
+        industries[startup_id].add(previous_industry)
+
+    def startup_industries(startup_id):
+        if startup_id is UNKNOWN_VALUE or not industries.get(startup_id):
+            return {UNKNOWN_VALUE}
+        return industries[startup_id]
+
+    buckets = set()
+    for state in round_states:
+        for industry in startup_industries(state['startup_id']):
+            buckets.update(_round_buckets(connection, state['date'], industry, state['round_type']))
+
+    # Every round of a startup that changed industry moves between buckets
+    if moved_startups:
+        for startup_id, day, round_type in connection.execute(
+            select(FundingRound.startup_id, FundingRound.date, FundingRound.round_type)
+            .where(FundingRound.startup_id.in_(moved_startups))
+        ):
+            for industry in startup_industries(startup_id):
+                buckets.update(_round_buckets(connection, day, industry, round_type))
+    return buckets
+
+def refresh_changed_rollups(changes):
+    """
+    Recompute the rollup buckets a batch of committed changes touched
+
+    Changes whose old values were not loaded refresh the existing buckets those values could
+    have counted in, never the whole table.
+
+    :param changes: List of EntityChange tuples
+    :return: None
+    """
+    # Retry once if a concurrent refresh of the same bucket wins the unique index
+    for attempt in range(2):
+        try:
+            with db.engine.begin() as connection:
+                refresh_funding_rollups(connection, _affected_buckets(connection, changes))
+            return
+        except IntegrityError:
+            if attempt:
+                raise
+
+def _refresh_pending():
+    # Drain the queue, refreshing everything queued meanwhile in one pass per app
+    while True:
+        batches = [_pending.get()]
+        while True:
+            try:
+                batches.append(_pending.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            changes_by_app = defaultdict(list)
+            for app, changes in batches:
+                changes_by_app[app].extend(changes)
+            for app, changes in changes_by_app.items():
+                with app.app_context():
+                    refresh_changed_rollups(changes)
+        except Exception:
+            logger.exception("Refreshing funding rollups failed")
+        finally:
+            for _ in batches:
+                _pending.task_done()
+
+def _start_refresher():
+    # Start this process's refresher thread once
+    global _refresher_pid
+    if _refresher_pid == os.getpid():
+        return
+    with _refresher_lock:
+        if _refresher_pid == os.getpid():
+            return
+        _refresher_pid = os.getpid()
+        threading.Thread(target=_refresh_pending, name='funding-rollup-refresher', daemon=True).start()
+
+def wait_for_rollups():
+    """
+    Block until every queued rollup refresh of this process has run
+
+    :return: None
+    """
+    _pending.join()
+
+def _reset_after_fork():
+    # A forked worker starts with an empty queue and its own refresher thread
+    global _pending, _refresher_pid, _refresher_lock
+    _pending, _refresher_pid, _refresher_lock = queue.Queue(), None, threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+@on_entities_changed
+def _queue_changed_rollups(changes):
+    # Keep the rollups current with committed funding round writes and startup industry changes
+    relevant = [change for change in changes
+                if change.model is FundingRound or (change.model is Startup and 'industry' in (change.previous or {}))]
+    if not relevant or not has_app_context():
+        return
+
+    # The committed session cannot run SQL here, and a refresh reads whole buckets, so it runs on a
+    # thread of its own unless FUNDING_ROLLUP_BACKGROUND is off
+    if not current_app.config.get('FUNDING_ROLLUP_BACKGROUND', True):
+        refresh_changed_rollups(relevant)
+        return
+    _start_refresher()
+    _pending.put((current_app._get_current_object(), relevant))
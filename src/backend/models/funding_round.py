@@ -1,4 +1,5 @@
 from ..utils.db import db
+from ..utils.serializers import serialize
 from sqlalchemy.orm import relationship
 from sqlalchemy import Table
 
@@ -29,18 +30,10 @@ class FundingRound(db.Model):
         Returns:
             dict: Dictionary representation of the FundingRound
         """
-        # Create a dictionary with all column values
-        result = {column.name: getattr(self, column.name) for column in self.__table__.columns}
-        
-        # Convert date object to ISO format string
-        if self.date:
-            result['date'] = self.date.isoformat()
+        # Encode the column values with the compiled serializer, which converts dates to ISO strings
+        result = serialize(self)
         
         # Add a list of investor names to the dictionary
         result['investor_names'] = [investor.name for investor in self.investors]
         
-        # Exclude the 'startup' and 'investors' relationships from the dictionary
-        result.pop('startup', None)
-        result.pop('investors', None)
-        
         return result
\ No newline at end of file
@@ -1,6 +1,9 @@
 # Import necessary modules
 from ..utils.db import db
+from ..utils.serializers import serialize
+from ..utils.fuzzy import register_name_index
 from sqlalchemy.orm import relationship
+from datetime import datetime
 
 class Investor(db.Model):
     """Investor model representing an investor in the database"""
@@ -10,9 +13,15 @@ class Investor(db.Model):
     name = db.Column(db.String(255), nullable=False)
     type = db.Column(db.String(50))
     website = db.Column(db.String(255))
+    last_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Define relationship with FundingRound model
-    funding_rounds = relationship('FundingRound', back_populates='investors')
+    funding_rounds = relationship('FundingRound', secondary='funding_round_investors', back_populates='investors')
+
+    # Range scans for offset and cursor pages in INVESTOR_SORT_KEY order, in either direction
+    __table_args__ = (
+        db.Index('ix_investor_name_id', 'name', 'id'),
+    )
 
     def to_dict(self):
         """
@@ -21,14 +30,8 @@ class Investor(db.Model):
         Returns:
             dict: Dictionary representation of the Investor
         """
-        # Create a dictionary with all column values
-        investor_dict = {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
-
-        # Exclude the 'funding_rounds' relationship from the dictionary
-        investor_dict.pop('funding_rounds', None)
+        # Encode the column values with the compiled serializer (relationships are not columns)
+        return serialize(self)
 
-        # Return the dictionary
-        return investor_dict
\ No newline at end of file
+# Trigram index behind the fuzzy name filter and /search/names
+register_name_index(Investor)
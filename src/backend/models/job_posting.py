@@ -1,4 +1,6 @@
 from ..utils.db import db
+from ..utils.serializers import serialize
+from ..utils.search import register_search_index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -13,10 +15,16 @@ class JobPosting(db.Model):
     description = db.Column(db.Text)
     posted_date = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
+    last_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Define relationship
     startup = relationship('Startup', back_populates='job_postings')
 
+    # Range scans for offset and cursor pages in JOB_POSTING_SORT_KEY order, in either direction
+    __table_args__ = (
+        db.Index('ix_job_posting_posted_date_id', 'posted_date', 'id'),
+    )
+
     def to_dict(self):
         """
         Convert the JobPosting object to a dictionary
@@ -24,17 +32,8 @@ class JobPosting(db.Model):
         Returns:
             dict: Dictionary representation of the JobPosting
         """
-        # Create a dictionary with all column values
-        job_dict = {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
-
-        # Convert datetime object to ISO format string
-        job_dict['posted_date'] = job_dict['posted_date'].isoformat() if job_dict['posted_date'] else None
-
-        # Exclude the 'startup' relationship from the dictionary
-        job_dict.pop('startup', None)
+        # Encode the column values with the compiled serializer, which converts dates to ISO strings
+        return serialize(self)
 
-        # Return the dictionary
-        return job_dict
\ No newline at end of file
+# Full-text index searched by search_service.search
+register_search_index(JobPosting, ('title', 'department', 'description'))
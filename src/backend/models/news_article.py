@@ -1,4 +1,6 @@
-from ..utils import db
+from ..utils.db import db
+from ..utils.serializers import serialize
+from ..utils.search import register_search_index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -14,10 +16,16 @@ class NewsArticle(db.Model):
     source = db.Column(db.String(100))
     summary = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Define relationship
     startup = relationship('Startup', back_populates='news_articles')
 
+    # Range scans for offset and cursor pages in NEWS_ARTICLE_SORT_KEY order, in either direction
+    __table_args__ = (
+        db.Index('ix_news_article_published_date_id', 'published_date', 'id'),
+    )
+
     def to_dict(self):
         """
         Convert the NewsArticle object to a dictionary
@@ -25,19 +33,8 @@ class NewsArticle(db.Model):
         Returns:
             dict: Dictionary representation of the NewsArticle
         """
-        # Create a dictionary with all column values
-        article_dict = {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
-
-        # Convert datetime objects to ISO format strings
-        for key, value in article_dict.items():
-            if isinstance(value, datetime):
-                article_dict[key] = value.isoformat()
-
-        # Exclude the 'startup' relationship from the dictionary
-        article_dict.pop('startup', None)
+        # Encode the column values with the compiled serializer, which converts dates to ISO strings
+        return serialize(self)
 
-        # Return the dictionary
-        return article_dict
\ No newline at end of file
+# Full-text index searched by search_service.search
+register_search_index(NewsArticle, ('title', 'summary', 'source'))
@@ -1,4 +1,6 @@
-from ..utils import db
+from ..utils.db import db
+from ..utils.serializers import serialize
+from ..utils.fuzzy import register_name_index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -18,7 +20,7 @@ class Startup(db.Model):
     last_funding_date = db.Column(db.Date)
     funding_stage = db.Column(db.String(50))
     is_hiring = db.Column(db.Boolean, default=False)
-    last_updated = db.Column(db.DateTime, default=datetime.utcnow)
+    last_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Define relationships
     founders = relationship('Founder', back_populates='startup')
@@ -27,6 +29,11 @@ class Startup(db.Model):
     job_postings = relationship('JobPosting', back_populates='startup')
     news_articles = relationship('NewsArticle', back_populates='startup')
 
+    # Range scans for offset and cursor pages in STARTUP_SORT_KEY order, in either direction
+    __table_args__ = (
+        db.Index('ix_startup_name_id', 'name', 'id'),
+    )
+
     def to_dict(self):
         """
         Convert the Startup object to a dictionary
@@ -34,13 +41,8 @@ class Startup(db.Model):
         Returns:
             dict: Dictionary representation of the Startup
         """
-        # Create a dictionary with all column values
-        startup_dict = {column.name: getattr(self, column.name) for column in self.__table__.columns}
-        
-        # Convert date and datetime objects to ISO format strings
-        for key, value in startup_dict.items():
-            if isinstance(value, (datetime, db.Date)):
-                startup_dict[key] = value.isoformat()
-        
-        # Return the dictionary
-        return startup_dict
\ No newline at end of file
+        # Encode the column values with the compiled serializer, which converts dates to ISO strings
+        return serialize(self)
+
+# Trigram index behind the fuzzy name filter and /search/names
+register_name_index(Startup)
@@ -1,4 +1,4 @@
-from ..utils import db
+from ..utils.db import db
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 
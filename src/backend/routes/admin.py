@@ -0,0 +1,14 @@
+from flask import Blueprint, jsonify
+from ..utils.auth import role_required
+from ..utils.db import db, replica_engines
+from ..utils.pool import pool_stats
+
+admin_routes = Blueprint('admin', __name__)
+
+@admin_routes.route('/admin/pool', methods=['GET'])
+@role_required('admin')
+def get_pool_stats():
+    # Report the connection pools of this worker process, one per database bind and read replica
+    pools = {bind_key or 'default': pool_stats(engine) for bind_key, engine in db.engines.items()}
+    pools.update({f"replica_{index}": pool_stats(engine) for index, engine in enumerate(replica_engines())})
+    return jsonify({'pools': pools})
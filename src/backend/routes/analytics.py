@@ -0,0 +1,44 @@
+from datetime import date
+from flask import Blueprint, request, jsonify
+from ..utils.auth import auth_required
+from ..models.funding_rollup import PERIOD_TYPES
+from ..services.analytics_service import SUMMARY_GROUPS, get_funding_summary, get_funding_trends
+
+analytics_routes = Blueprint('analytics', __name__)
+
+def _date_arg(name):
+    # Parse an optional ISO date query parameter; raises ValueError when malformed
+    value = request.args.get(name)
+    return date.fromisoformat(value) if value else None
+
+@analytics_routes.route('/analytics/funding', methods=['GET'])
+@auth_required
+def get_funding_trends_route():
+    # Parse the period granularity, the bucket filters and the date range
+    period = request.args.get('period', 'quarter')
+    if period not in PERIOD_TYPES:
+        return jsonify({'error': f"period must be one of {', '.join(PERIOD_TYPES)}"}), 400
+    try:
+        start, end = _date_arg('start'), _date_arg('end')
+    except ValueError:
+        return jsonify({'error': 'start and end must be ISO dates'}), 400
+
+    # Read the trends from the maintained rollups
+    trends = get_funding_trends(period, request.args.get('industry'), request.args.get('round_type'), start, end)
+    return jsonify({'period': period, 'trends': trends})
+
+@analytics_routes.route('/analytics/funding/summary', methods=['GET'])
+@auth_required
+def get_funding_summary_route():
+    # Parse the grouping column and the date range
+    group_by = request.args.get('group_by', 'industry')
+    if group_by not in SUMMARY_GROUPS:
+        return jsonify({'error': f"group_by must be one of {', '.join(SUMMARY_GROUPS)}"}), 400
+    try:
+        start, end = _date_arg('start'), _date_arg('end')
+    except ValueError:
+        return jsonify({'error': 'start and end must be ISO dates'}), 400
+
+    # Sum the yearly rollups, or the monthly ones when a range boundary falls mid-year
+    period = 'year' if all(day is None or (day.month, day.day) == (1, 1) for day in (start, end)) else 'month'
+    return jsonify({'group_by': group_by, 'summary': get_funding_summary(group_by, period, start, end)})
@@ -1,8 +1,9 @@
+from datetime import datetime
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from ..utils.db import db
 from ..models.user import User
-from ..utils.auth import auth_required
+from ..utils.auth import auth_required, generate_token, get_current_user, get_current_user_data, token_claims
 
 # Create a Blueprint for authentication routes
 auth_routes = Blueprint('auth', __name__)
@@ -23,12 +24,12 @@ def login():
     if not user or not user.check_password(data['password']):
         return jsonify({"error": "Invalid email or password"}), 401
 
-    # Create access and refresh tokens
-    access_token = create_access_token(identity=user.id)
-    refresh_token = create_refresh_token(identity=user.id)
+    # Create access and refresh tokens; the access token carries the role and email as claims
+    access_token = generate_token(user)
+    refresh_token = create_refresh_token(identity=str(user.id))
 
     # Update user's last_login timestamp
-    user.update_last_login()
+    user.last_login = datetime.utcnow()
 
     # Commit changes to database
     db.session.commit()
@@ -43,11 +44,13 @@ def login():
 @auth_routes.route('/refresh', methods=['POST'])
 @jwt_required(refresh=True)
 def refresh():
-    # Get the user identity from the refresh token
-    current_user = get_jwt_identity()
+    # Get the current user from the short-lived user cache, so role changes reach the new token
+    current_user = get_current_user_data()
+    if not current_user:
+        return jsonify({"error": "User not found"}), 401
 
-    # Create a new access token
-    new_access_token = create_access_token(identity=current_user)
+    # Create a new access token with fresh claims
+    new_access_token = create_access_token(identity=get_jwt_identity(), additional_claims=token_claims(current_user))
 
     # Return JSON response with the new access token
     return jsonify({"access_token": new_access_token}), 200
@@ -65,9 +68,6 @@ def logout():
 @auth_routes.route('/change-password', methods=['POST'])
 @jwt_required()
 def change_password():
-    # Get the user identity from the access token
-    current_user_id = get_jwt_identity()
-
     # Parse JSON data from request
     data = request.get_json()
 
@@ -75,8 +75,8 @@ def change_password():
     if not data or 'current_password' not in data or 'new_password' not in data:
         return jsonify({"error": "Current password and new password are required"}), 400
 
-    # Query the database for the user
-    user = User.query.get(current_user_id)
+    # Load the user of the access token; committing the change drops its cached row
+    user = get_current_user()
 
     # Verify the current password
     if not user.check_password(data['current_password']):
@@ -0,0 +1,81 @@
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from ..models.funding_round import FundingRound
+from ..models.investor import Investor
+from ..models.job_posting import JobPosting
+from ..models.news_article import NewsArticle
+from ..models.startup import Startup
+from ..utils.auth import auth_required
+from ..utils.export import DEFAULT_BATCH_SIZE, ENCODERS, EXPORT_FORMATS, export_columns, gzip_chunks, stream_rows
+from ..utils.serializers import parse_fields
+from .startup import filtered_startups
+from .investor import filtered_investors
+from .job import filtered_job_postings
+from .news import filtered_news_articles
+
+export_routes = Blueprint('export', __name__)
+
+def filtered_funding_rounds():
+    # Build the funding round query and its filter set from the request's filter parameters
+    query = FundingRound.query
+    filters = {}
+    startup_id = request.args.get('startup_id', type=int)
+    if startup_id:
+        query = query.filter(FundingRound.startup_id == startup_id)
+        filters['startup_id'] = startup_id
+    round_type = request.args.get('round_type')
+    if round_type:
+        query = query.filter(FundingRound.round_type == round_type)
+        filters['round_type'] = round_type
+    return query, filters
+
+# Exportable entities: model and the list filter logic of its blueprint
+EXPORTS = {
+    'startups': (Startup, filtered_startups),
+    'investors': (Investor, filtered_investors),
+    'funding_rounds': (FundingRound, filtered_funding_rounds),
+    'jobs': (JobPosting, filtered_job_postings),
+    'news': (NewsArticle, filtered_news_articles),
+}
+
+def _accepts_gzip():
+    # Compress unless the client opts out or cannot decode gzip
+    if request.args.get('gzip', '').lower() in ('0', 'false', 'no'):
+        return False
+    return 'gzip' in request.headers.get('Accept-Encoding', '').lower()
+
+@export_routes.route('/export/<entity>', methods=['GET'])
+@auth_required
+def export_entity(entity):
+    # Resolve the entity and the output format
+    if entity not in EXPORTS:
+        return jsonify({'error': f"Unknown entity, expected one of {', '.join(EXPORTS)}"}), 404
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+
+    # Build the filtered query with the same filters as the list endpoint, and the exported columns
+    model, filtered = EXPORTS[entity]
+    try:
+        fields = parse_fields(model, request.args.get('fields'))
+        query, _ = filtered()
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+    columns = export_columns(model, fields)
+    order = model.__table__.primary_key.columns.values()[0]
+
+    # Stream batches from a server-side cursor straight into the response body
+    batch_size = current_app.config.get('EXPORT_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    batches = stream_rows(query.order_by(order), columns, batch_size)
+    try:
+        chunks = ENCODERS[export_format](columns, batches)
+    except RuntimeError as error:
+        return jsonify({'error': str(error)}), 501
+
+    # Compress text formats on the fly; Parquet pages are compressed already
+    headers = {'Content-Disposition': f'attachment; filename="{entity}.{export_format}"', 'Vary': 'Accept-Encoding'}
+    if export_format != 'parquet' and _accepts_gzip():
+        chunks = gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+
+    # Keep the request context, and with it the database session, open while the body streams
+    return Response(stream_with_context(chunks), content_type=EXPORT_FORMATS[export_format], headers=headers)
@@ -1,42 +1,131 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from ..utils.db import db
 from ..models.investor import Investor
+from ..models.startup import Startup
 from ..utils.auth import auth_required
+from ..utils.pagination import order_by_sort_key, page_count, paginate_keyset
+from ..utils.serializers import load_only_fields, parse_fields, project, serialize_many
+from ..utils.fuzzy import fuzzy_name_filter, parse_threshold
+from ..utils.counts import count_total, parse_count_mode
+from ..utils.conditional import conditional_json, entity_etag, entity_last_modified, list_etag, revalidate_page
+from ..utils.bulk import bulk_records, bulk_summary, parse_id_list
+from ..services.investor_service import (
+    INVESTOR_SORT_KEY, create_investors, get_investors_by_ids, get_investor_data,
+    get_investor_investment_history, get_investor_portfolio, update_investors
+)
 
 investor_routes = Blueprint('investor', __name__)
 
+def filtered_investors():
+    # Build the investor query and its filter set from the request's filter parameters; shared with the export.
+    # Raises ValueError for a threshold outside 0 to 1
+    name = request.args.get('name', '')
+    threshold = parse_threshold(request.args.get('threshold'))
+    query = Investor.query
+    if name:
+        # Match names containing the text or similar to it, so typos still find the investor
+        query = query.filter(fuzzy_name_filter(Investor, name, threshold))
+    return query, {'name__fuzzy': name, 'threshold': threshold if name else None}
+
 @investor_routes.route('/', methods=['GET'])
 @auth_required
 def get_investors():
+    # Parse the sparse fieldset, validated against the Investor columns
+    try:
+        fields = parse_fields(Investor, request.args.get('fields'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # With ?ids=1,2,3, return those investors in that order; cached ones skip SQL, the rest take one IN query
+    ids = request.args.get('ids')
+    if ids is not None:
+        try:
+            investor_ids = parse_id_list(ids, current_app.config.get('BATCH_FETCH_MAX_IDS'))
+        except ValueError as error:
+            return jsonify({'error': str(error)}), 400
+        investors = [project(item, fields) for item in get_investors_by_ids(investor_ids)]
+        found = {item['id'] for item in investors}
+        response = {'investors': investors, 'missing': [item_id for item_id in investor_ids if item_id not in found]}
+        return conditional_json(response, list_etag('investor', response, 'investors'))
+
     # Parse query parameters for filtering and pagination
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
-    name_filter = request.args.get('name', '')
+    cursor = request.args.get('cursor')
 
     # Build the database query based on filters
-    query = Investor.query
-    if name_filter:
-        query = query.filter(Investor.name.ilike(f'%{name_filter}%'))
+    try:
+        query, filters = filtered_investors()
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
 
-    # Execute the query with pagination
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-    investors = pagination.items
+    # Read only the requested columns, plus the sort key for the cursor
+    page_query = query.options(load_only_fields(Investor, fields, INVESTOR_SORT_KEY)) if fields else query
 
-    # Convert investor objects to dictionaries
-    investor_list = [investor.to_dict() for investor in investors]
+    # In cursor mode, fetch the page after the cursor without counting
+    if cursor is not None:
+        metadata = {'per_page': per_page}
+        try:
+            # Answer a revalidation from the versions of the page, before loading and serializing it
+            unchanged = revalidate_page('investor', Investor, query, INVESTOR_SORT_KEY, metadata,
+                                        per_page=per_page, cursor=cursor)
+            if unchanged:
+                return unchanged
+            investors, next_cursor = paginate_keyset(page_query, INVESTOR_SORT_KEY, cursor, per_page)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        response = {'investors': serialize_many(Investor, investors, fields), 'next_cursor': next_cursor, **metadata}
+        return conditional_json(response, list_etag('investor', response, 'investors'))
 
-    # Return JSON response with investors and metadata
-    return jsonify({
-        'investors': investor_list,
-        'total': pagination.total,
-        'pages': pagination.pages,
+    # Count matching investors, cached or approximated per the ?count= mode
+    total, total_exact = count_total(query, 'investor', filters, parse_count_mode(request.args.get('count')))
+    metadata = {
+        'total': total,
+        'total_exact': total_exact,
+        'pages': page_count(total, per_page),
         'page': page,
         'per_page': per_page
-    })
+    }
+
+    # Answer a revalidation from the versions of the page, before loading and serializing it
+    unchanged = revalidate_page('investor', Investor, query, INVESTOR_SORT_KEY, metadata, page=page, per_page=per_page)
+    if unchanged:
+        return unchanged
+
+    # Execute the query with pagination
+    investors = order_by_sort_key(page_query, INVESTOR_SORT_KEY).offset((page - 1) * per_page).limit(per_page).all()
+
+    # Convert investor objects to dictionaries in one pass
+    investor_list = serialize_many(Investor, investors, fields)
+
+    # Return JSON response with investors and metadata
+    response = {'investors': investor_list, **metadata}
+    return conditional_json(response, list_etag('investor', response, 'investors'))
 
 @investor_routes.route('/<int:investor_id>', methods=['GET'])
 @auth_required
 def get_investor(investor_id):
+    # Parse the sparse fieldset, validated against the Investor columns
+    try:
+        fields = parse_fields(Investor, request.args.get('fields'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # Get the serialized investor from the read-through cache
+    investor_data = get_investor_data(investor_id)
+
+    # If investor not found, return 404 error
+    if not investor_data:
+        return jsonify({'error': 'Investor not found'}), 404
+
+    # Return JSON response with investor details, or 304 when the client's copy is current
+    return conditional_json(
+        project(investor_data, fields), entity_etag('investor', investor_data), entity_last_modified(investor_data)
+    )
+
+@investor_routes.route('/<int:investor_id>/portfolio', methods=['GET'])
+@auth_required
+def get_investor_portfolio_route(investor_id):
     # Query the database for the investor with the given ID
     investor = Investor.query.get(investor_id)
 
@@ -44,11 +133,17 @@ def get_investor(investor_id):
     if not investor:
         return jsonify({'error': 'Investor not found'}), 404
 
-    # Convert investor object to dictionary
-    investor_data = investor.to_dict()
+    # Query the portfolio and the funding rounds with investors and startups eagerly loaded
+    startups = get_investor_portfolio(investor_id)
+    funding_rounds = get_investor_investment_history(investor_id)
 
-    # Return JSON response with investor details
-    return jsonify(investor_data)
+    # Return JSON response with the investor, portfolio startups and investment history
+    return jsonify({
+        'investor': investor.to_dict(),
+        'startups': serialize_many(Startup, startups),
+        'funding_rounds': [dict(funding_round.to_dict(), startup_name=funding_round.startup.name)
+                           for funding_round in funding_rounds]
+    })
 
 @investor_routes.route('/', methods=['POST'])
 @auth_required
@@ -78,6 +173,32 @@ def create_investor():
     # Return JSON response with created investor details
     return jsonify(new_investor.to_dict()), 201
 
+@investor_routes.route('/bulk', methods=['POST'])
+@auth_required
+def create_investors_bulk():
+    # Parse the JSON array of investors to create
+    try:
+        records = bulk_records(request.get_json(silent=True), current_app.config.get('BULK_MAX_RECORDS'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # Validate and insert all records, reporting the new ID or the error of each
+    body, succeeded = bulk_summary(create_investors(records))
+    return jsonify(body), 201 if succeeded else 207
+
+@investor_routes.route('/bulk', methods=['PUT'])
+@auth_required
+def update_investors_bulk():
+    # Parse the JSON array of partial updates, each identified by its id
+    try:
+        records = bulk_records(request.get_json(silent=True), current_app.config.get('BULK_MAX_RECORDS'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # Validate and apply all updates, reporting the status of each
+    body, succeeded = bulk_summary(update_investors(records))
+    return jsonify(body), 200 if succeeded else 207
+
 @investor_routes.route('/<int:investor_id>', methods=['PUT'])
 @auth_required
 def update_investor(investor_id):
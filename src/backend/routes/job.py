@@ -1,53 +1,147 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from ..utils.db import db
 from ..models.job_posting import JobPosting
 from ..utils.auth import auth_required
+from ..utils.pagination import order_by_sort_key, page_count, paginate_keyset
+from ..utils.serializers import load_only_fields, parse_fields, project, serialize_many
+from ..utils.counts import count_total, parse_count_mode
+from ..utils.conditional import conditional_json, entity_etag, entity_last_modified, list_etag, revalidate_page
+from ..utils.bulk import bulk_records, bulk_summary, parse_id_list
+from ..services.job_service import (
+    JOB_POSTING_SORT_KEY, create_job_postings, get_job_postings_by_ids, get_job_posting_data,
+    search_job_postings, update_job_postings
+)
 
 job_routes = Blueprint('job', __name__)
 
+def filtered_job_postings():
+    # Build the job posting query and its filter set from the request's filter parameters; shared with the export
+    startup_id = request.args.get('startup_id', type=int)
+    query = JobPosting.query
+    if startup_id:
+        query = query.filter_by(startup_id=startup_id)
+    return query, {'startup_id': startup_id}
+
 @job_routes.route('/', methods=['GET'])
 @auth_required
 def get_job_postings():
+    # Parse the sparse fieldset, validated against the JobPosting columns
+    try:
+        fields = parse_fields(JobPosting, request.args.get('fields'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # With ?ids=1,2,3, return those job postings in that order; cached ones skip SQL, the rest take one IN query
+    ids = request.args.get('ids')
+    if ids is not None:
+        try:
+            job_ids = parse_id_list(ids, current_app.config.get('BATCH_FETCH_MAX_IDS'))
+        except ValueError as error:
+            return jsonify({'error': str(error)}), 400
+        jobs = [project(item, fields) for item in get_job_postings_by_ids(job_ids)]
+        found = {item['id'] for item in jobs}
+        response = {'jobs': jobs, 'missing': [item_id for item_id in job_ids if item_id not in found]}
+        return conditional_json(response, list_etag('job_posting', response, 'jobs'))
+
     # Parse query parameters for filtering and pagination
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
-    startup_id = request.args.get('startup_id', type=int)
+    cursor = request.args.get('cursor')
     
     # Build the database query based on filters
-    query = JobPosting.query
-    if startup_id:
-        query = query.filter_by(startup_id=startup_id)
+    query, filters = filtered_job_postings()
+
+    # Read only the requested columns, plus the sort key for the cursor
+    page_query = query.options(load_only_fields(JobPosting, fields, JOB_POSTING_SORT_KEY)) if fields else query
+    
+    # In cursor mode, fetch the page after the cursor without counting
+    if cursor is not None:
+        metadata = {'per_page': per_page}
+        try:
+            # Answer a revalidation from the versions of the page, before loading and serializing it
+            unchanged = revalidate_page('job_posting', JobPosting, query, JOB_POSTING_SORT_KEY, metadata,
+                                        per_page=per_page, cursor=cursor)
+            if unchanged:
+                return unchanged
+            jobs, next_cursor = paginate_keyset(page_query, JOB_POSTING_SORT_KEY, cursor, per_page)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        response = {'jobs': serialize_many(JobPosting, jobs, fields), 'next_cursor': next_cursor, **metadata}
+        return conditional_json(response, list_etag('job_posting', response, 'jobs'))
+    
+    # Count matching job postings, cached or approximated per the ?count= mode
+    total, total_exact = count_total(query, 'job_posting', filters,
+                                     parse_count_mode(request.args.get('count')))
+    metadata = {
+        'total': total,
+        'total_exact': total_exact,
+        'pages': page_count(total, per_page),
+        'page': page,
+        'per_page': per_page
+    }
+
+    # Answer a revalidation from the versions of the page, before loading and serializing it
+    unchanged = revalidate_page('job_posting', JobPosting, query, JOB_POSTING_SORT_KEY, metadata,
+                                page=page, per_page=per_page)
+    if unchanged:
+        return unchanged
     
     # Execute the query with pagination
-    paginated_jobs = query.paginate(page=page, per_page=per_page, error_out=False)
+    items = order_by_sort_key(page_query, JOB_POSTING_SORT_KEY).offset((page - 1) * per_page).limit(per_page).all()
     
-    # Convert job posting objects to dictionaries
-    jobs = [job.to_dict() for job in paginated_jobs.items]
+    # Convert job posting objects to dictionaries in one pass
+    jobs = serialize_many(JobPosting, items, fields)
     
     # Return JSON response with job postings and metadata
-    return jsonify({
-        'jobs': jobs,
-        'total': paginated_jobs.total,
-        'pages': paginated_jobs.pages,
+    response = {'jobs': jobs, **metadata}
+    return conditional_json(response, list_etag('job_posting', response, 'jobs'))
+
+@job_routes.route('/search', methods=['GET'])
+@auth_required
+def search_job_postings_route():
+    # Parse the search query and pagination parameters
+    query = request.args.get('q', '')
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
+    try:
+        fields = parse_fields(JobPosting, request.args.get('fields'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # Run the ranked full-text search
+    items, total, total_exact = search_job_postings(query, page, per_page, parse_count_mode(request.args.get('count')), fields)
+
+    # Return JSON response with the best matches first
+    response = {
+        'jobs': serialize_many(JobPosting, items, fields),
+        'total': total,
+        'total_exact': total_exact,
+        'pages': page_count(total, per_page),
         'page': page,
         'per_page': per_page
-    })
+    }
+    return conditional_json(response, list_etag('job_posting', response, 'jobs'))
 
 @job_routes.route('/<int:job_id>', methods=['GET'])
 @auth_required
 def get_job_posting(job_id):
-    # Query the database for the job posting with the given ID
-    job = JobPosting.query.get(job_id)
+    # Parse the sparse fieldset, validated against the JobPosting columns
+    try:
+        fields = parse_fields(JobPosting, request.args.get('fields'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # Get the serialized job posting from the read-through cache
+    job_dict = get_job_posting_data(job_id)
     
     # If job posting not found, return 404 error
-    if not job:
+    if not job_dict:
         return jsonify({'error': 'Job posting not found'}), 404
     
-    # Convert job posting object to dictionary
-    job_dict = job.to_dict()
-    
-    # Return JSON response with job posting details
-    return jsonify(job_dict)
+    # Return JSON response with job posting details, or 304 when the client's copy is current
+    return conditional_json(
+        project(job_dict, fields), entity_etag('job_posting', job_dict), entity_last_modified(job_dict)
+    )
 
 @job_routes.route('/', methods=['POST'])
 @auth_required
@@ -76,6 +170,32 @@ def create_job_posting():
     # Return JSON response with created job posting details
     return jsonify(new_job.to_dict()), 201
 
+@job_routes.route('/bulk', methods=['POST'])
+@auth_required
+def create_job_postings_bulk():
+    # Parse the JSON array of job postings to create
+    try:
+        records = bulk_records(request.get_json(silent=True), current_app.config.get('BULK_MAX_RECORDS'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # Validate and insert all records, reporting the new ID or the error of each
+    body, succeeded = bulk_summary(create_job_postings(records))
+    return jsonify(body), 201 if succeeded else 207
+
+@job_routes.route('/bulk', methods=['PUT'])
+@auth_required
+def update_job_postings_bulk():
+    # Parse the JSON array of partial updates, each identified by its id
+    try:
+        records = bulk_records(request.get_json(silent=True), current_app.config.get('BULK_MAX_RECORDS'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # Validate and apply all updates, reporting the status of each
+    body, succeeded = bulk_summary(update_job_postings(records))
+    return jsonify(body), 200 if succeeded else 207
+
 @job_routes.route('/<int:job_id>', methods=['PUT'])
 @auth_required
 def update_job_posting(job_id):
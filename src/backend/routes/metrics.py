@@ -0,0 +1,32 @@
+import hmac
+from flask import Blueprint, Response, current_app, jsonify, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+from ..utils.metrics import flush_metrics, render_metrics
+
+metrics_routes = Blueprint('metrics', __name__)
+
+def _scrape_error():
+    # None when the request carries the METRICS_TOKEN or an admin's access token, else the error response
+    token = current_app.config.get('METRICS_TOKEN')
+    if token and hmac.compare_digest(request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode()):
+        return None
+    try:
+        verify_jwt_in_request()
+    except (JWTExtendedException, PyJWTError):
+        return jsonify({"error": "Authentication required"}), 401
+    if get_jwt().get('role') != 'admin':
+        return jsonify({"error": "Insufficient permissions"}), 403
+    return None
+
+@metrics_routes.route('/metrics', methods=['GET'])
+def get_metrics():
+    # Scraped by Prometheus with the METRICS_TOKEN; keep /metrics off the public proxy all the same
+    error = _scrape_error()
+    if error:
+        return error
+
+    # Publish this worker's latest samples first, so scrapes of the other workers include them
+    flush_metrics()
+    return Response(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
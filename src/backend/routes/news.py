@@ -1,53 +1,147 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from ..utils.db import db
 from ..models.news_article import NewsArticle
 from ..utils.auth import auth_required
+from ..utils.pagination import order_by_sort_key, page_count, paginate_keyset
+from ..utils.serializers import load_only_fields, parse_fields, project, serialize_many
+from ..utils.counts import count_total, parse_count_mode
+from ..utils.conditional import conditional_json, entity_etag, entity_last_modified, list_etag, revalidate_page
+from ..utils.bulk import bulk_records, bulk_summary, parse_id_list
+from ..services.news_service import (
+    NEWS_ARTICLE_SORT_KEY, create_news_articles, get_news_articles_by_ids, get_news_article_data,
+    search_news_articles, update_news_articles
+)
 
 news_routes = Blueprint('news', __name__)
 
+def filtered_news_articles():
+    # Build the news article query and its filter set from the request's filter parameters; shared with the export
+    startup_id = request.args.get('startup_id', type=int)
+    query = NewsArticle.query
+    if startup_id:
+        query = query.filter_by(startup_id=startup_id)
+    return query, {'startup_id': startup_id}
+
 @news_routes.route('/', methods=['GET'])
 @auth_required
 def get_news_articles():
+    # Parse the sparse fieldset, validated against the NewsArticle columns
+    try:
+        fields = parse_fields(NewsArticle, request.args.get('fields'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # With ?ids=1,2,3, return those news articles in that order; cached ones skip SQL, the rest take one IN query
+    ids = request.args.get('ids')
+    if ids is not None:
+        try:
+            article_ids = parse_id_list(ids, current_app.config.get('BATCH_FETCH_MAX_IDS'))
+        except ValueError as error:
+            return jsonify({'error': str(error)}), 400
+        articles = [project(item, fields) for item in get_news_articles_by_ids(article_ids)]
+        found = {item['id'] for item in articles}
+        response = {'articles': articles, 'missing': [item_id for item_id in article_ids if item_id not in found]}
+        return conditional_json(response, list_etag('news_article', response, 'articles'))
+
     # Parse query parameters for filtering and pagination
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
-    startup_id = request.args.get('startup_id', type=int)
+    cursor = request.args.get('cursor')
 
     # Build the database query based on filters
-    query = NewsArticle.query
-    if startup_id:
-        query = query.filter_by(startup_id=startup_id)
+    query, filters = filtered_news_articles()
+
+    # Read only the requested columns, plus the sort key for the cursor
+    page_query = query.options(load_only_fields(NewsArticle, fields, NEWS_ARTICLE_SORT_KEY)) if fields else query
+
+    # In cursor mode, fetch the page after the cursor without counting
+    if cursor is not None:
+        metadata = {'per_page': per_page}
+        try:
+            # Answer a revalidation from the versions of the page, before loading and serializing it
+            unchanged = revalidate_page('news_article', NewsArticle, query, NEWS_ARTICLE_SORT_KEY, metadata,
+                                        per_page=per_page, cursor=cursor)
+            if unchanged:
+                return unchanged
+            articles, next_cursor = paginate_keyset(page_query, NEWS_ARTICLE_SORT_KEY, cursor, per_page)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        response = {'articles': serialize_many(NewsArticle, articles, fields), 'next_cursor': next_cursor, **metadata}
+        return conditional_json(response, list_etag('news_article', response, 'articles'))
+
+    # Count matching news articles, cached or approximated per the ?count= mode
+    total, total_exact = count_total(query, 'news_article', filters,
+                                     parse_count_mode(request.args.get('count')))
+    metadata = {
+        'total': total,
+        'total_exact': total_exact,
+        'pages': page_count(total, per_page),
+        'page': page,
+        'per_page': per_page
+    }
+
+    # Answer a revalidation from the versions of the page, before loading and serializing it
+    unchanged = revalidate_page('news_article', NewsArticle, query, NEWS_ARTICLE_SORT_KEY, metadata,
+                                page=page, per_page=per_page)
+    if unchanged:
+        return unchanged
 
-    # Execute the query with pagination
-    pagination = query.order_by(NewsArticle.date_published.desc()).paginate(page=page, per_page=per_page)
+    # Execute the query with pagination, newest articles first
+    items = order_by_sort_key(page_query, NEWS_ARTICLE_SORT_KEY).offset((page - 1) * per_page).limit(per_page).all()
 
-    # Convert news article objects to dictionaries
-    articles = [article.to_dict() for article in pagination.items]
+    # Convert news article objects to dictionaries in one pass
+    articles = serialize_many(NewsArticle, items, fields)
 
     # Return JSON response with news articles and metadata
-    return jsonify({
-        'articles': articles,
-        'total': pagination.total,
-        'pages': pagination.pages,
+    response = {'articles': articles, **metadata}
+    return conditional_json(response, list_etag('news_article', response, 'articles'))
+
+@news_routes.route('/search', methods=['GET'])
+@auth_required
+def search_news_articles_route():
+    # Parse the search query and pagination parameters
+    query = request.args.get('q', '')
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
+    try:
+        fields = parse_fields(NewsArticle, request.args.get('fields'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # Run the ranked full-text search
+    items, total, total_exact = search_news_articles(query, page, per_page, parse_count_mode(request.args.get('count')), fields)
+
+    # Return JSON response with the best matches first
+    response = {
+        'articles': serialize_many(NewsArticle, items, fields),
+        'total': total,
+        'total_exact': total_exact,
+        'pages': page_count(total, per_page),
         'page': page,
         'per_page': per_page
-    })
+    }
+    return conditional_json(response, list_etag('news_article', response, 'articles'))
 
 @news_routes.route('/<int:article_id>', methods=['GET'])
 @auth_required
 def get_news_article(article_id):
-    # Query the database for the news article with the given ID
-    article = NewsArticle.query.get(article_id)
+    # Parse the sparse fieldset, validated against the NewsArticle columns
+    try:
+        fields = parse_fields(NewsArticle, request.args.get('fields'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # Get the serialized news article from the read-through cache
+    article_data = get_news_article_data(article_id)
 
     # If news article not found, return 404 error
-    if not article:
+    if not article_data:
         return jsonify({'error': 'News article not found'}), 404
 
-    # Convert news article object to dictionary
-    article_data = article.to_dict()
-
-    # Return JSON response with news article details
-    return jsonify(article_data)
+    # Return JSON response with news article details, or 304 when the client's copy is current
+    return conditional_json(
+        project(article_data, fields), entity_etag('news_article', article_data), entity_last_modified(article_data)
+    )
 
 @news_routes.route('/', methods=['POST'])
 @auth_required
@@ -78,6 +172,32 @@ def create_news_article():
     # Return JSON response with created news article details
     return jsonify(new_article.to_dict()), 201
 
+@news_routes.route('/bulk', methods=['POST'])
+@auth_required
+def create_news_articles_bulk():
+    # Parse the JSON array of news articles to create
+    try:
+        records = bulk_records(request.get_json(silent=True), current_app.config.get('BULK_MAX_RECORDS'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # Validate and insert all records, reporting the new ID or the error of each
+    body, succeeded = bulk_summary(create_news_articles(records))
+    return jsonify(body), 201 if succeeded else 207
+
+@news_routes.route('/bulk', methods=['PUT'])
+@auth_required
+def update_news_articles_bulk():
+    # Parse the JSON array of partial updates, each identified by its id
+    try:
+        records = bulk_records(request.get_json(silent=True), current_app.config.get('BULK_MAX_RECORDS'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # Validate and apply all updates, reporting the status of each
+    body, succeeded = bulk_summary(update_news_articles(records))
+    return jsonify(body), 200 if succeeded else 207
+
 @news_routes.route('/<int:article_id>', methods=['PUT'])
 @auth_required
 def update_news_article(article_id):
@@ -0,0 +1,35 @@
+from flask import Blueprint, request, jsonify
+from ..utils.auth import auth_required
+from ..utils.fuzzy import parse_threshold
+from ..services.search_service import search_names
+from ..services.autocomplete_service import autocomplete
+from ..utils.autocomplete import MAX_SUGGESTIONS
+
+search_routes = Blueprint('search', __name__)
+
+@search_routes.route('/search/names', methods=['GET'])
+@auth_required
+def search_names_route():
+    # Parse the name query, similarity threshold and result limit
+    query = request.args.get('q', '').strip()
+    limit = request.args.get('limit', 10, type=int)
+
+    if not query:
+        return jsonify({'error': 'Missing query parameter q'}), 400
+    try:
+        threshold = parse_threshold(request.args.get('threshold'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # Return the most similar startup and investor names
+    return jsonify(search_names(query, threshold, min(limit, 100)))
+
+@search_routes.route('/autocomplete', methods=['GET'])
+@auth_required
+def autocomplete_route():
+    # Parse the text typed so far and the number of suggestions
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', 10, type=int)
+
+    # Suggest startups, investors, industries and sub-sectors from the in-process index
+    return jsonify({'suggestions': autocomplete(query, max(1, min(limit, MAX_SUGGESTIONS)))})
@@ -1,56 +1,195 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from ..utils.db import db
 from ..models.startup import Startup
+from ..models.founder import Founder
+from ..models.executive import Executive
 from ..utils.auth import auth_required
+from ..utils.pagination import order_by_sort_key, page_count, paginate_keyset
+from ..utils.serializers import load_only_fields, parse_fields, project, serialize_many
+from ..utils.counts import count_total, parse_count_mode
+from ..utils.fuzzy import fuzzy_name_filter, parse_threshold
+from ..utils.cache import (
+    cache_get_or_compute, cache_get_or_set, entity_cache_key, list_cache_key, list_tags, normalize_filters
+)
+from ..utils.facets import facet_counts
+from ..utils.conditional import conditional_json, entity_etag, entity_last_modified, list_etag, revalidate_page
+from ..utils.bulk import bulk_records, bulk_summary, parse_id_list
+from ..services.startup_service import (
+    STARTUP_SORT_KEY, create_startups, get_startups_by_ids, get_startup_data, get_startup_profile,
+    update_startups
+)
 
 startup_routes = Blueprint('startup', __name__)
 
+# Columns the startup list can be filtered and faceted on
+FACET_COLUMNS = (Startup.industry, Startup.sub_sector, Startup.funding_stage, Startup.is_hiring)
+
+def filtered_startups():
+    # Build the startup query and its filter set from the request's filter parameters; shared with the export.
+    # Raises ValueError for a threshold outside 0 to 1
+    name = request.args.get('name')
+    threshold = parse_threshold(request.args.get('threshold'))
+    query = Startup.query
+    filters = {'name__fuzzy': name, 'threshold': threshold if name else None}
+    if name:
+        # Match names containing the text or similar to it, so typos still find the startup
+        query = query.filter(fuzzy_name_filter(Startup, name, threshold))
+    for column in FACET_COLUMNS:
+        value = request.args.get(column.key)
+        if value in (None, ''):
+            continue
+        if column.key == 'is_hiring':
+            value = value.lower() in ('1', 'true', 'yes')
+        query = query.filter(column == value)
+        filters[column.key] = value
+    return query, filters
+
+def _startup_facets(query, filters):
+    # Facet counts of the filter set, cached until a write touches rows the filters can match
+    return cache_get_or_set(
+        f'facets:startup:{normalize_filters(filters)}',
+        lambda: facet_counts(query, FACET_COLUMNS),
+        current_app.config.get('FACET_CACHE_TTL'),
+        tags=list_tags('startup', filters)
+    )
+
 @startup_routes.route('/', methods=['GET'])
 @auth_required
 def get_startups():
-    # Parse query parameters for filtering and pagination
+    # Parse the sparse fieldset, validated against the Startup columns
+    try:
+        fields = parse_fields(Startup, request.args.get('fields'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # With ?ids=1,2,3, return those startups in that order; cached ones skip SQL, the rest take one IN query
+    ids = request.args.get('ids')
+    if ids is not None:
+        try:
+            startup_ids = parse_id_list(ids, current_app.config.get('BATCH_FETCH_MAX_IDS'))
+        except ValueError as error:
+            return jsonify({'error': str(error)}), 400
+        startups = [project(item, fields) for item in get_startups_by_ids(startup_ids)]
+        found = {item['id'] for item in startups}
+        response = {'startups': startups, 'missing': [item_id for item_id in startup_ids if item_id not in found]}
+        return conditional_json(response, list_etag('startup', response, 'startups'))
+
+    # Parse query parameters for pagination
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
-    name = request.args.get('name')
-    industry = request.args.get('industry')
+    cursor = request.args.get('cursor')
+    with_facets = request.args.get('facets', '').lower() in ('1', 'true', 'yes')
 
     # Build the database query based on filters
-    query = Startup.query
-    if name:
-        query = query.filter(Startup.name.ilike(f'%{name}%'))
-    if industry:
-        query = query.filter(Startup.industry == industry)
+    try:
+        query, filters = filtered_startups()
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
 
-    # Execute the query with pagination
-    paginated_startups = query.paginate(page=page, per_page=per_page, error_out=False)
+    # Read only the requested columns, plus the sort key for the cursor
+    page_query = query.options(load_only_fields(Startup, fields, STARTUP_SORT_KEY)) if fields else query
 
-    # Convert startup objects to dictionaries
-    startups = [startup.to_dict() for startup in paginated_startups.items]
+    # In cursor mode, fetch the page after the cursor without counting
+    if cursor is not None:
+        metadata = {'per_page': per_page}
+        if with_facets:
+            metadata['facets'] = _startup_facets(query, filters)
+        try:
+            # Answer a revalidation from the versions of the page, before loading and serializing it
+            unchanged = revalidate_page('startup', Startup, query, STARTUP_SORT_KEY, metadata,
+                                        per_page=per_page, cursor=cursor)
+            if unchanged:
+                return unchanged
+            items, next_cursor = paginate_keyset(page_query, STARTUP_SORT_KEY, cursor, per_page)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        response = {'startups': serialize_many(Startup, items, fields), 'next_cursor': next_cursor, **metadata}
+        return conditional_json(response, list_etag('startup', response, 'startups'))
 
-    # Return JSON response with startups and metadata
-    return jsonify({
-        'startups': startups,
-        'total': paginated_startups.total,
-        'pages': paginated_startups.pages,
+    # Count matching startups, cached or approximated per the ?count= mode
+    total, total_exact = count_total(query, 'startup', filters, parse_count_mode(request.args.get('count')))
+    metadata = {
+        'total': total,
+        'total_exact': total_exact,
+        'pages': page_count(total, per_page),
         'page': page,
         'per_page': per_page
-    })
+    }
+    if with_facets:
+        metadata['facets'] = _startup_facets(query, filters)
+
+    # Answer a revalidation from the versions of the page, before loading and serializing it
+    unchanged = revalidate_page('startup', Startup, query, STARTUP_SORT_KEY, metadata, page=page, per_page=per_page)
+    if unchanged:
+        return unchanged
+
+    # Execute the query with pagination and convert startup objects to dictionaries in one pass
+    def load_page():
+        items = order_by_sort_key(page_query, STARTUP_SORT_KEY).offset((page - 1) * per_page).limit(per_page).all()
+        return serialize_many(Startup, items, fields)
+
+    # Serve the page from the list cache; it is dropped when a listed startup or a matching row changes,
+    # and only one worker at a time reloads an expired page
+    startups = cache_get_or_compute(
+        list_cache_key('startup', filters, page=page, per_page=per_page, fields=','.join(fields or ())),
+        load_page,
+        current_app.config.get('LIST_CACHE_TTL'),
+        tags=lambda rows: list_tags('startup', filters) + [entity_cache_key('startup', row['id']) for row in rows]
+    )
+
+    # Return JSON response with startups and metadata
+    response = {'startups': startups, **metadata}
+    return conditional_json(response, list_etag('startup', response, 'startups'))
+
+@startup_routes.route('/facets', methods=['GET'])
+@auth_required
+def get_startup_facets():
+    # Count startups per industry, sub-sector, funding stage and hiring status under the current filters
+    try:
+        query, filters = filtered_startups()
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+    return jsonify({'facets': _startup_facets(query, filters)})
 
 @startup_routes.route('/<int:startup_id>', methods=['GET'])
 @auth_required
 def get_startup(startup_id):
-    # Query the database for the startup with the given ID
-    startup = Startup.query.get(startup_id)
+    # Parse the sparse fieldset, validated against the Startup columns
+    try:
+        fields = parse_fields(Startup, request.args.get('fields'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # Get the serialized startup from the read-through cache
+    startup_data = get_startup_data(startup_id)
+
+    # If startup not found, return 404 error
+    if not startup_data:
+        return jsonify({'error': 'Startup not found'}), 404
+
+    # Return JSON response with startup details, or 304 when the client's copy is current
+    return conditional_json(
+        project(startup_data, fields), entity_etag('startup', startup_data), entity_last_modified(startup_data)
+    )
+
+@startup_routes.route('/<int:startup_id>/profile', methods=['GET'])
+@auth_required
+def get_startup_profile_route(startup_id):
+    # Query the startup with its founders, executives and funding rounds eagerly loaded
+    startup = get_startup_profile(startup_id)
 
     # If startup not found, return 404 error
     if not startup:
         return jsonify({'error': 'Startup not found'}), 404
 
-    # Convert startup object to dictionary
-    startup_data = startup.to_dict()
+    # Convert startup and related objects to dictionaries without further queries
+    profile = startup.to_dict()
+    profile['founders'] = serialize_many(Founder, startup.founders)
+    profile['executives'] = serialize_many(Executive, startup.executives)
+    profile['funding_rounds'] = [funding_round.to_dict() for funding_round in startup.funding_rounds]
 
-    # Return JSON response with startup details
-    return jsonify(startup_data)
+    # Return JSON response with the startup profile
+    return jsonify(profile)
 
 @startup_routes.route('/', methods=['POST'])
 @auth_required
@@ -79,6 +218,32 @@ def create_startup():
     # Return JSON response with created startup details
     return jsonify(new_startup.to_dict()), 201
 
+@startup_routes.route('/bulk', methods=['POST'])
+@auth_required
+def create_startups_bulk():
+    # Parse the JSON array of startups to create
+    try:
+        records = bulk_records(request.get_json(silent=True), current_app.config.get('BULK_MAX_RECORDS'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # Validate and insert all records, reporting the new ID or the error of each
+    body, succeeded = bulk_summary(create_startups(records))
+    return jsonify(body), 201 if succeeded else 207
+
+@startup_routes.route('/bulk', methods=['PUT'])
+@auth_required
+def update_startups_bulk():
+    # Parse the JSON array of partial updates, each identified by its id
+    try:
+        records = bulk_records(request.get_json(silent=True), current_app.config.get('BULK_MAX_RECORDS'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # Validate and apply all updates, reporting the status of each
+    body, succeeded = bulk_summary(update_startups(records))
+    return jsonify(body), 200 if succeeded else 207
+
 @startup_routes.route('/<int:startup_id>', methods=['PUT'])
 @auth_required
 def update_startup(startup_id):
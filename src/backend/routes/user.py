@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify
 from ..utils.db import db
 from ..models.user import User
 from ..utils.auth import auth_required
+from ..utils.pagination import page_count
+from ..utils.counts import count_total, parse_count_mode
 
 user_routes = Blueprint('user', __name__)
 
@@ -15,17 +17,21 @@ def get_users():
     # Build the database query based on filters
     query = User.query
     
+    # Count users, cached or approximated per the ?count= mode
+    total, total_exact = count_total(query, 'user', None, parse_count_mode(request.args.get('count')))
+    
     # Execute the query with pagination
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    items = query.order_by(User.id).offset((page - 1) * per_page).limit(per_page).all()
     
     # Convert user objects to dictionaries
-    users = [user.to_dict() for user in pagination.items]
+    users = [user.to_dict() for user in items]
     
     # Return JSON response with users and metadata
     return jsonify({
         'users': users,
-        'total': pagination.total,
-        'pages': pagination.pages,
+        'total': total,
+        'total_exact': total_exact,
+        'pages': page_count(total, per_page),
         'page': page,
         'per_page': per_page
     })
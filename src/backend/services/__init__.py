@@ -1,9 +1,9 @@
 # Import services from their respective modules
-from .startup_service import startup_service
-from .investor_service import investor_service
-from .job_service import job_service
-from .news_service import news_service
-from .user_service import user_service
+from . import startup_service
+from . import investor_service
+from . import job_service
+from . import news_service
+from . import user_service
 
 # Export the services to make them available when importing from this package
 __all__ = ['startup_service', 'investor_service', 'job_service', 'news_service', 'user_service']
\ No newline at end of file
@@ -0,0 +1,73 @@
+from sqlalchemy import func
+from ..utils.db import db, use_replica
+from ..models.funding_rollup import FundingRollup, period_start
+
+# Rollup columns a funding summary can be grouped by
+SUMMARY_GROUPS = ('industry', 'round_type')
+
+def _rollup_query(period, industry=None, round_type=None, start=None, end=None):
+    # Rollups of one granularity, narrowed to the requested industry, round type and date range
+    query = FundingRollup.query.filter(FundingRollup.period_type == period)
+    if industry is not None:
+        query = query.filter(FundingRollup.industry == industry)
+    if round_type is not None:
+        query = query.filter(FundingRollup.round_type == round_type)
+    if start is not None:
+        query = query.filter(FundingRollup.period_start >= period_start(start, period))
+    if end is not None:
+        query = query.filter(FundingRollup.period_start <= end)
+    return query
+
+@use_replica()
+def get_funding_trends(period='quarter', industry=None, round_type=None, start=None, end=None):
+    """
+    Funding round count, total and median amount per period, industry and round type
+
+    Reads only the maintained rollups, never the funding rounds themselves.
+
+    :param period: 'month', 'quarter' or 'year'
+    :param industry: Only this industry, or None for all
+    :param round_type: Only this round type, or None for all
+    :param start: Only periods containing or after this date
+    :param end: Only periods starting on or before this date
+    :return: List of rollup dictionaries, oldest period first
+    """
+    query = _rollup_query(period, industry, round_type, start, end).order_by(
+        FundingRollup.period_start, FundingRollup.industry, FundingRollup.round_type
+    )
+    return [
+        {
+            'period_start': rollup.period_start.isoformat(), 'industry': rollup.industry,
+            'round_type': rollup.round_type, 'round_count': rollup.round_count,
+            'total_amount': rollup.total_amount, 'median_amount': rollup.median_amount
+        }
+        for rollup in query.all()
+    ]
+
+@use_replica()
+def get_funding_summary(group_by='industry', period='year', start=None, end=None):
+    """
+    Funding round count and total amount per industry or round type over a date range
+
+    Sums the rollups of the coarsest period that covers the range; medians do not add up
+    across buckets, so they are left out.
+
+    :param group_by: 'industry' or 'round_type'
+    :param period: Granularity of the rollups to sum
+    :param start: Only periods containing or after this date
+    :param end: Only periods starting on or before this date
+    :return: List of {group_by, 'round_count', 'total_amount'} dictionaries, largest total first
+    """
+    column = getattr(FundingRollup, group_by)
+    round_count, total_amount = func.sum(FundingRollup.round_count), func.sum(FundingRollup.total_amount)
+    rows = db.session.execute(
+        _rollup_query(period, start=start, end=end)
+        .with_entities(column, round_count, total_amount)
+        .group_by(column)
+        .order_by(total_amount.desc(), column)
+        .statement
+    )
+    return [
+        {group_by: value, 'round_count': int(count), 'total_amount': float(total or 0)}
+        for value, count, total in rows
+    ]
@@ -0,0 +1,180 @@
+import logging
+import os
+import threading
+import time
+from flask import current_app
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from ..utils.autocomplete import PrefixIndex
+from ..utils.db import UNKNOWN_VALUE, db, on_entities_changed
+from ..models.startup import Startup
+from ..models.investor import Investor
+from ..models.funding_round import funding_round_investors
+
+logger = logging.getLogger(__name__)
+
+# Startup columns whose values are suggested as terms, with the suggestion type
+TERM_FIELDS = (('industry', 'industry'), ('sub_sector', 'sub_sector'))
+
+# Index of the current worker process, with the time and process it was built in
+_index = None
+_built_at = 0.0
+_built_pid = None
+_build_lock = threading.Lock()
+
+def build_index():
+    """
+    Load all suggestions and their popularity from the database
+
+    Startups are ranked by total funding, investors by number of funding rounds, industries
+    and sub-sectors by number of startups.
+
+    :return: PrefixIndex
+    """
+    suggestions = []
+    for startup_id, name, total_funding in db.session.execute(select(Startup.id, Startup.name, Startup.total_funding)):
+        suggestions.append(('startup', startup_id, name, total_funding))
+
+    rounds = func.count(funding_round_investors.c.funding_round_id)
+    investors = select(Investor.id, Investor.name, rounds).outerjoin(
+        funding_round_investors, funding_round_investors.c.investor_id == Investor.id
+    ).group_by(Investor.id, Investor.name)
+    for investor_id, name, round_count in db.session.execute(investors):
+        suggestions.append(('investor', investor_id, name, round_count))
+
+    for field, kind in TERM_FIELDS:
+        column = getattr(Startup, field)
+        terms = select(column, func.count()).where(column.isnot(None)).group_by(column)
+        for value, startup_count in db.session.execute(terms):
+            suggestions.append((kind, value, value, startup_count))
+    return PrefixIndex(suggestions)
+
+def get_index():
+    """
+    Get the autocomplete index of this worker, building it on first use after start or fork
+
+    The index follows writes committed by this worker; it is rebuilt every
+    AUTOCOMPLETE_REFRESH_SECONDS to pick up writes of other workers.
+
+    :return: PrefixIndex
+    """
+    return _build_if_stale(current_app.config.get('AUTOCOMPLETE_REFRESH_SECONDS', 300))
+
+def _is_stale(max_age):
+    return _index is None or _built_pid != os.getpid() or time.monotonic() - _built_at > max_age
+
+def _build_if_stale(max_age):
+    # Build the index once per process and age, however many threads ask at the same time
+    global _index, _built_at, _built_pid
+    if _is_stale(max_age):
+        with _build_lock:
+            if _is_stale(max_age):
+                _index, _built_at, _built_pid = build_index(), time.monotonic(), os.getpid()
+    return _index
+
+def _warm_index():
+    # Build the index ahead of the first lookup; a failed build is retried by the next lookup
+    try:
+        _build_if_stale(current_app.config.get('AUTOCOMPLETE_REFRESH_SECONDS', 300))
+    except SQLAlchemyError as e:
+        logger.warning("Building the autocomplete index failed: %s", e)
+
+def init_autocomplete(app):
+    """
+    Build the autocomplete index as the app starts, so no autocomplete request pays for it
+
+    A worker forked after the build, or whose index a write dropped, builds it again at the
+    start of its next request.
+
+    :param app: Flask application instance
+    :return: None
+    """
+    with app.app_context():
+        _warm_index()
+
+    @app.before_request
+    def warm_autocomplete_index():
+        if _index is None or _built_pid != os.getpid():
+            _warm_index()
+
+def autocomplete(query, limit=10):
+    """
+    Suggest startups, investors, industries and sub-sectors for the text typed so far
+
+    :param query: Text typed so far
+    :param limit: Maximum number of suggestions
+    :return: List of suggestion dictionaries, most popular first
+    """
+    return [
+        {'type': kind, 'id': ref, 'label': label} if kind in ('startup', 'investor') else {'type': kind, 'label': label}
+        for kind, ref, label in get_index().complete(query, limit)
+    ]
+
+def _adjust_term(kind, value, delta):
+    # Move a startup between industry or sub-sector counts
+    entry = _index.get(kind, value)
+    count = (entry[1] if entry else 0) + delta
+    if count > 0:
+        _index.set(kind, value, value, count)
+    else:
+        _index.remove(kind, value)
+
+def _set_startups(startups):
+    # Index changed startups under their name, ranked by total funding; columns the write left
+    # unloaded are read from the database, as the committed session cannot run SQL here
+    unloaded = [startup_id for startup_id, values in startups.items()
+                if 'name' not in values or 'total_funding' not in values]
+    rows = {}
+    if unloaded:
+        with db.engine.connect() as connection:
+            rows = {row.id: row for row in connection.execute(
+                select(Startup.id, Startup.name, Startup.total_funding).where(Startup.id.in_(unloaded))
+            )}
+    for startup_id, values in startups.items():
+        row = rows.get(startup_id)
+        if startup_id in unloaded and row is None:
+            continue
+        name = values['name'] if 'name' in values else row.name
+        total_funding = values['total_funding'] if 'total_funding' in values else row.total_funding
+        _index.set('startup', startup_id, name, total_funding)
+
+@on_entities_changed
+def _update_index(changes):
+    # Apply committed startup and investor writes to this worker's index
+    global _index
+    if _index is None or _built_pid != os.getpid():
+        return
+    changed_startups = {}
+    for change in changes:
+        if change.model is Investor:
+            if change.operation == 'delete':
+                _index.remove('investor', change.id)
+            elif change.values and 'name' in change.values:
+                entry = _index.get('investor', change.id)
+                _index.set('investor', change.id, change.values['name'], entry[1] if entry else 0)
+        elif change.model is Startup:
+            values, previous = change.values or {}, change.previous or {}
+            if change.operation == 'delete':
+                _index.remove('startup', change.id)
+            elif change.operation == 'insert':
+                # A column the insert left unset was written as NULL
+                changed_startups[change.id] = {'total_funding': None, **values}
+            elif 'name' in values or 'total_funding' in values:
+                changed_startups[change.id] = values
+
+            for field, kind in TERM_FIELDS:
+                if change.operation == 'insert' and values.get(field):
+                    _adjust_term(kind, values[field], 1)
+                elif change.operation == 'delete' and values.get(field):
+                    _adjust_term(kind, values[field], -1)
+                elif field in previous:
+                    if previous[field] is UNKNOWN_VALUE:
+                        # The old value was never loaded; rebuild at the next request
+                        _index = None
+                        return
+                    if previous[field]:
+                        _adjust_term(kind, previous[field], -1)
+                    if values.get(field):
+                        _adjust_term(kind, values[field], 1)
+    if changed_startups:
+        _set_startups(changed_startups)
@@ -1,9 +1,20 @@
-from src.backend.utils import db
+from src.backend.utils.db import db
 from src.backend.models.investor import Investor
 from src.backend.models.funding_round import FundingRound
+from src.backend.models.startup import Startup
+from src.backend.services.load_options import load_profile
+from src.backend.utils.counts import count_total
+from src.backend.utils.cache import cache_get_or_load_ids, cache_get_or_set, entity_cache_key
+from src.backend.utils.serializers import serialize_many
+from src.backend.utils.bulk import bulk_insert, bulk_update
+from flask import current_app
+from src.backend.utils.pagination import order_by_sort_key, paginate_keyset
 import sqlalchemy
 
-def get_investors(filters: dict, page: int, per_page: int) -> tuple:
+# Stable sort key used for both offset and cursor pagination
+INVESTOR_SORT_KEY = ((Investor.name, False), (Investor.id, False))
+
+def get_investors(filters: dict, page: int, per_page: int, cursor: str = None, count: str = 'auto') -> tuple:
     # Create a base query for Investor model
     query = db.session.query(Investor)
 
@@ -12,14 +23,18 @@ def get_investors(filters: dict, page: int, per_page: int) -> tuple:
         for key, value in filters.items():
             query = query.filter(getattr(Investor, key) == value)
 
-    # Calculate total count of matching investors
-    total_count = query.count()
+    # In cursor mode, return the page along with the cursor for the next page
+    if cursor is not None:
+        return paginate_keyset(query, INVESTOR_SORT_KEY, cursor, per_page)
+
+    # Calculate total count of matching investors, cached or approximated per the count mode
+    total_count, total_exact = count_total(query, 'investor', filters, count)
 
     # Apply pagination to the query
-    query = query.offset((page - 1) * per_page).limit(per_page)
+    query = order_by_sort_key(query, INVESTOR_SORT_KEY).offset((page - 1) * per_page).limit(per_page)
 
-    # Execute the query and return results along with total count
-    return query.all(), total_count
+    # Execute the query and return results along with total count and whether it is exact
+    return query.all(), total_count, total_exact
 
 # Human tasks:
 # - Implement more advanced filtering options (e.g., by investment stage, industry focus)
@@ -33,8 +48,24 @@ def get_investor_by_id(investor_id: int) -> Investor:
     # Return the Investor object if found, otherwise return None
     return investor
 
-# Human tasks:
-# - Add caching mechanism for frequently accessed investors
+def get_investor_data(investor_id: int) -> dict:
+    # Load the serialized Investor on a cache miss
+    def load():
+        investor = get_investor_by_id(investor_id)
+        return investor.to_dict() if investor else None
+
+    # Serve the serialized Investor through the read-through cache, None if not found
+    return cache_get_or_set(entity_cache_key('investor', investor_id), load, current_app.config.get('DETAIL_CACHE_TTL'))
+
+def get_investors_by_ids(investor_ids: list) -> list:
+    # Load the serialized Investors missing from the cache with one IN query
+    def load(missing_ids):
+        rows = Investor.query.filter(Investor.id.in_(missing_ids)).all()
+        return {row['id']: row for row in serialize_many(Investor, rows)}
+
+    # Serve cached Investors without SQL and return all in the requested order, skipping unknown IDs
+    found = cache_get_or_load_ids('investor', investor_ids, load, current_app.config.get('DETAIL_CACHE_TTL'))
+    return [found[entity_id] for entity_id in investor_ids if found.get(entity_id) is not None]
 
 def create_investor(investor_data: dict) -> Investor:
     # Create a new Investor object with the provided data
@@ -75,6 +106,14 @@ def update_investor(investor_id: int, investor_data: dict) -> Investor:
 # - Implement partial update functionality
 # - Add validation to prevent updates to read-only fields
 
+def create_investors(records: list) -> list:
+    # Validate all records at once and insert them in chunked multi-row statements
+    return bulk_insert(Investor, records, current_app.config.get('BULK_CHUNK_SIZE'))
+
+def update_investors(records: list) -> list:
+    # Validate all partial updates at once and apply them in chunked executemany statements
+    return bulk_update(Investor, records, current_app.config.get('BULK_CHUNK_SIZE'))
+
 def delete_investor(investor_id: int) -> bool:
     # Query the database for the Investor with the given ID
     investor = db.session.query(Investor).get(investor_id)
@@ -93,11 +132,11 @@ def delete_investor(investor_id: int) -> bool:
 # - Add cascading delete for related entities (e.g., investment history)
 
 def get_investor_portfolio(investor_id: int) -> list:
-    # Query the database for FundingRound objects associated with the given investor_id
-    funding_rounds = db.session.query(FundingRound).filter(FundingRound.investor_id == investor_id).all()
-
-    # Extract unique startups from the funding rounds
-    startups = list(set(fr.startup for fr in funding_rounds))
+    # Query the distinct startups with a funding round the investor took part in, in a single query
+    startups = (db.session.query(Startup)
+                .filter(Startup.funding_rounds.any(FundingRound.investors.any(Investor.id == investor_id)))
+                .order_by(Startup.name, Startup.id)
+                .all())
 
     # Return the list of Startup objects
     return startups
@@ -108,8 +147,12 @@ def get_investor_portfolio(investor_id: int) -> list:
 # - Add filtering options (e.g., by startup stage, industry)
 
 def get_investor_investment_history(investor_id: int) -> list:
-    # Query the database for FundingRound objects associated with the given investor_id
-    funding_rounds = db.session.query(FundingRound).filter(FundingRound.investor_id == investor_id).all()
+    # Query the database for FundingRound objects associated with the given investor_id, with investors and startup loaded
+    funding_rounds = (db.session.query(FundingRound)
+                      .options(*load_profile('investment_history'))
+                      .filter(FundingRound.investors.any(Investor.id == investor_id))
+                      .order_by(FundingRound.date.desc(), FundingRound.id.desc())
+                      .all())
 
     # Return the list of FundingRound objects
     return funding_rounds
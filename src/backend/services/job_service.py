@@ -1,9 +1,18 @@
-from ..utils import db
+from ..utils.db import db
 from ..models.job_posting import JobPosting
 from ..models.startup import Startup
-from sqlalchemy import or_
-
-def get_job_postings(filters=None, page=1, per_page=20):
+from ..utils.counts import count_total
+from ..utils.cache import cache_get_or_load_ids, cache_get_or_set, entity_cache_key
+from ..utils.serializers import serialize_many
+from ..utils.bulk import bulk_insert, bulk_update
+from flask import current_app
+from ..utils.pagination import order_by_sort_key, paginate_keyset
+from .search_service import search
+
+# Stable sort key used for both offset and cursor pagination, newest postings first
+JOB_POSTING_SORT_KEY = ((JobPosting.posted_date, True), (JobPosting.id, True))
+
+def get_job_postings(filters=None, page=1, per_page=20, cursor=None, count='auto'):
     # Create a base query for JobPosting model
     query = JobPosting.query
 
@@ -15,19 +24,42 @@ def get_job_postings(filters=None, page=1, per_page=20):
             query = query.filter(JobPosting.job_type == filters['job_type'])
         # Add more filters as needed
 
-    # Calculate total count of matching job postings
-    total_count = query.count()
+    # In cursor mode, return the page along with the cursor for the next page
+    if cursor is not None:
+        return paginate_keyset(query, JOB_POSTING_SORT_KEY, cursor, per_page)
+
+    # Calculate total count of matching job postings, cached or approximated per the count mode
+    total_count, total_exact = count_total(query, 'job_posting', filters, count)
 
     # Apply pagination to the query
-    query = query.offset((page - 1) * per_page).limit(per_page)
+    query = order_by_sort_key(query, JOB_POSTING_SORT_KEY).offset((page - 1) * per_page).limit(per_page)
 
-    # Execute the query and return results along with total count
-    return query.all(), total_count
+    # Execute the query and return results along with total count and whether it is exact
+    return query.all(), total_count, total_exact
 
 def get_job_posting_by_id(job_posting_id):
     # Query the database for a JobPosting with the given ID
     return JobPosting.query.get(job_posting_id)
 
+def get_job_posting_data(job_posting_id):
+    # Load the serialized JobPosting on a cache miss
+    def load():
+        job_posting = get_job_posting_by_id(job_posting_id)
+        return job_posting.to_dict() if job_posting else None
+
+    # Serve the serialized JobPosting through the read-through cache, None if not found
+    return cache_get_or_set(entity_cache_key('job_posting', job_posting_id), load, current_app.config.get('DETAIL_CACHE_TTL'))
+
+def get_job_postings_by_ids(job_posting_ids):
+    # Load the serialized JobPostings missing from the cache with one IN query
+    def load(missing_ids):
+        rows = JobPosting.query.filter(JobPosting.id.in_(missing_ids)).all()
+        return {row['id']: row for row in serialize_many(JobPosting, rows)}
+
+    # Serve cached JobPostings without SQL and return all in the requested order, skipping unknown IDs
+    found = cache_get_or_load_ids('job_posting', job_posting_ids, load, current_app.config.get('DETAIL_CACHE_TTL'))
+    return [found[entity_id] for entity_id in job_posting_ids if found.get(entity_id) is not None]
+
 def create_job_posting(job_posting_data):
     # Create a new JobPosting object with the provided data
     new_job_posting = JobPosting(**job_posting_data)
@@ -59,6 +91,14 @@ def update_job_posting(job_posting_id, job_posting_data):
     # Return the updated JobPosting object
     return job_posting
 
+def create_job_postings(records):
+    # Validate all records at once and insert them in chunked multi-row statements
+    return bulk_insert(JobPosting, records, current_app.config.get('BULK_CHUNK_SIZE'))
+
+def update_job_postings(records):
+    # Validate all partial updates at once and apply them in chunked executemany statements
+    return bulk_update(JobPosting, records, current_app.config.get('BULK_CHUNK_SIZE'))
+
 def delete_job_posting(job_posting_id):
     # Query the database for the JobPosting with the given ID
     job_posting = JobPosting.query.get(job_posting_id)
@@ -76,26 +116,9 @@ def get_job_postings_by_startup(startup_id):
     # Query the database for JobPosting objects associated with the given startup_id
     return JobPosting.query.filter_by(startup_id=startup_id).all()
 
-def search_job_postings(query, page=1, per_page=20):
-    # Create a base query for JobPosting model
-    base_query = JobPosting.query
-
-    # Apply full-text search filter based on the query
-    search_filter = or_(
-        JobPosting.title.ilike(f"%{query}%"),
-        JobPosting.description.ilike(f"%{query}%"),
-        JobPosting.requirements.ilike(f"%{query}%")
-    )
-    filtered_query = base_query.filter(search_filter)
-
-    # Calculate total count of matching job postings
-    total_count = filtered_query.count()
-
-    # Apply pagination to the query
-    paginated_query = filtered_query.offset((page - 1) * per_page).limit(per_page)
-
-    # Execute the query and return results along with total count
-    return paginated_query.all(), total_count
+def search_job_postings(query, page=1, per_page=20, count='auto', fields=None):
+    # Run a ranked full-text search over title, department and description
+    return search(JobPosting, query, page, per_page, count, fields)
 
 # Human tasks:
 # - Implement more advanced filtering options (e.g., by skills, experience level, salary range)
@@ -110,6 +133,4 @@ def search_job_postings(query, page=1, per_page=20):
 # - Add authorization check to ensure only the posting startup or admin can delete
 # - Add pagination support for startups with many job postings
 # - Implement sorting options (e.g., by date posted, job title)
-# - Implement full-text search functionality
 # - Add support for advanced search operators (e.g., AND, OR, NOT)
-# - Implement relevance scoring for search results
\ No newline at end of file
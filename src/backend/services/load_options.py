@@ -0,0 +1,33 @@
+from sqlalchemy.orm import joinedload, selectinload
+from ..models.startup import Startup
+from ..models.funding_round import FundingRound
+
+# Eager-loading options per endpoint, chosen so each response is built with a fixed number of
+# queries no matter how many rows it serializes. Collections use selectinload (one extra
+# IN query per relationship); many-to-one references use joinedload (no extra query).
+LOAD_PROFILES = {
+    # Startup with founders, executives and funding rounds including investor names
+    'startup_profile': (
+        selectinload(Startup.founders),
+        selectinload(Startup.executives),
+        selectinload(Startup.funding_rounds).selectinload(FundingRound.investors),
+    ),
+    # Funding rounds serialized with their investor names
+    'funding_rounds': (
+        selectinload(FundingRound.investors),
+    ),
+    # Funding rounds serialized with their investor names and startup
+    'investment_history': (
+        selectinload(FundingRound.investors),
+        joinedload(FundingRound.startup),
+    ),
+}
+
+def load_profile(name):
+    """
+    Get the eager-loading options for an endpoint
+
+    :param name: Profile name from LOAD_PROFILES
+    :return: Tuple of loader options to pass to Query.options
+    """
+    return LOAD_PROFILES[name]
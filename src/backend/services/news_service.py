@@ -1,9 +1,19 @@
 from sqlalchemy import func
-from ..utils import db
+from ..utils.db import db
 from ..models.news_article import NewsArticle
 from ..models.startup import Startup
-
-def get_news_articles(filters=None, page=1, per_page=20):
+from ..utils.counts import count_total
+from ..utils.cache import cache_get_or_load_ids, cache_get_or_set, entity_cache_key
+from ..utils.serializers import serialize_many
+from ..utils.bulk import bulk_insert, bulk_update
+from flask import current_app
+from ..utils.pagination import order_by_sort_key, paginate_keyset
+from .search_service import search
+
+# Stable sort key used for both offset and cursor pagination, newest articles first
+NEWS_ARTICLE_SORT_KEY = ((NewsArticle.published_date, True), (NewsArticle.id, True))
+
+def get_news_articles(filters=None, page=1, per_page=20, cursor=None, count='auto'):
     # Create a base query for NewsArticle model
     query = db.session.query(NewsArticle)
 
@@ -12,19 +22,42 @@ def get_news_articles(filters=None, page=1, per_page=20):
         for key, value in filters.items():
             query = query.filter(getattr(NewsArticle, key) == value)
 
-    # Calculate total count of matching news articles
-    total_count = query.count()
+    # In cursor mode, return the page along with the cursor for the next page
+    if cursor is not None:
+        return paginate_keyset(query, NEWS_ARTICLE_SORT_KEY, cursor, per_page)
+
+    # Calculate total count of matching news articles, cached or approximated per the count mode
+    total_count, total_exact = count_total(query, 'news_article', filters, count)
 
     # Apply pagination to the query
-    query = query.offset((page - 1) * per_page).limit(per_page)
+    query = order_by_sort_key(query, NEWS_ARTICLE_SORT_KEY).offset((page - 1) * per_page).limit(per_page)
 
-    # Execute the query and return results along with total count
-    return query.all(), total_count
+    # Execute the query and return results along with total count and whether it is exact
+    return query.all(), total_count, total_exact
 
 def get_news_article_by_id(article_id):
     # Query the database for a NewsArticle with the given ID
     return db.session.query(NewsArticle).get(article_id)
 
+def get_news_article_data(article_id):
+    # Load the serialized NewsArticle on a cache miss
+    def load():
+        article = get_news_article_by_id(article_id)
+        return article.to_dict() if article else None
+
+    # Serve the serialized NewsArticle through the read-through cache, None if not found
+    return cache_get_or_set(entity_cache_key('news_article', article_id), load, current_app.config.get('DETAIL_CACHE_TTL'))
+
+def get_news_articles_by_ids(article_ids):
+    # Load the serialized NewsArticles missing from the cache with one IN query
+    def load(missing_ids):
+        rows = NewsArticle.query.filter(NewsArticle.id.in_(missing_ids)).all()
+        return {row['id']: row for row in serialize_many(NewsArticle, rows)}
+
+    # Serve cached NewsArticles without SQL and return all in the requested order, skipping unknown IDs
+    found = cache_get_or_load_ids('news_article', article_ids, load, current_app.config.get('DETAIL_CACHE_TTL'))
+    return [found[entity_id] for entity_id in article_ids if found.get(entity_id) is not None]
+
 def create_news_article(article_data):
     # Create a new NewsArticle object with the provided data
     new_article = NewsArticle(**article_data)
@@ -56,6 +89,14 @@ def update_news_article(article_id, article_data):
     # Return the updated NewsArticle object
     return article
 
+def create_news_articles(records):
+    # Validate all records at once and insert them in chunked multi-row statements
+    return bulk_insert(NewsArticle, records, current_app.config.get('BULK_CHUNK_SIZE'))
+
+def update_news_articles(records):
+    # Validate all partial updates at once and apply them in chunked executemany statements
+    return bulk_update(NewsArticle, records, current_app.config.get('BULK_CHUNK_SIZE'))
+
 def delete_news_article(article_id):
     # Query the database for the NewsArticle with the given ID
     article = db.session.query(NewsArticle).get(article_id)
@@ -69,37 +110,22 @@ def delete_news_article(article_id):
     # Return False if not found
     return False
 
-def get_news_articles_by_startup(startup_id, page=1, per_page=20):
+def get_news_articles_by_startup(startup_id, page=1, per_page=20, count='auto'):
     # Create a query for NewsArticle objects associated with the given startup_id
     query = db.session.query(NewsArticle).filter(NewsArticle.startup_id == startup_id)
 
-    # Calculate total count of matching news articles
-    total_count = query.count()
+    # Calculate total count of matching news articles, cached or approximated per the count mode
+    total_count, total_exact = count_total(query, 'news_article', {'startup_id': startup_id}, count)
 
     # Apply pagination to the query
     query = query.offset((page - 1) * per_page).limit(per_page)
 
-    # Execute the query and return results along with total count
-    return query.all(), total_count
-
-def search_news_articles(query, page=1, per_page=20):
-    # Create a base query for NewsArticle model
-    base_query = db.session.query(NewsArticle)
-
-    # Apply full-text search filter based on the query
-    search_query = base_query.filter(
-        NewsArticle.title.ilike(f"%{query}%") |
-        NewsArticle.content.ilike(f"%{query}%")
-    )
-
-    # Calculate total count of matching news articles
-    total_count = search_query.count()
-
-    # Apply pagination to the query
-    search_query = search_query.offset((page - 1) * per_page).limit(per_page)
+    # Execute the query and return results along with total count and whether it is exact
+    return query.all(), total_count, total_exact
 
-    # Execute the query and return results along with total count
-    return search_query.all(), total_count
+def search_news_articles(query, page=1, per_page=20, count='auto', fields=None):
+    # Run a ranked full-text search over title, summary and source
+    return search(NewsArticle, query, page, per_page, count, fields)
 
 # Human tasks:
 # TODO: Implement more advanced filtering options (e.g., by date range, source, startup)
@@ -115,6 +141,4 @@ def search_news_articles(query, page=1, per_page=20):
 # TODO: Add authorization check to ensure only admin users can delete news articles
 # TODO: Add sorting options (e.g., by date published, relevance)
 # TODO: Implement filtering options (e.g., by source, keywords)
-# TODO: Implement full-text search functionality
 # TODO: Add support for advanced search operators (e.g., AND, OR, NOT)
-# TODO: Implement relevance scoring for search results
\ No newline at end of file
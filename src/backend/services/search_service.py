@@ -0,0 +1,60 @@
+from ..utils.db import db, use_replica
+from ..models.investor import Investor
+from ..models.startup import Startup
+from ..utils.counts import count_total
+from ..utils.fuzzy import DEFAULT_SIMILARITY_THRESHOLD, fuzzy_name_matches
+from ..utils.search import get_search_index, search_terms
+from ..utils.serializers import load_only_fields
+
+@use_replica()
+def search(model, query, page=1, per_page=20, count='auto', fields=None):
+    """
+    Ranked full-text search over the search index of a model
+
+    Uses the tsvector GIN index on Postgres and the FTS5 table on SQLite; rows must match every
+    word of the query, best matches first.
+
+    :param model: SQLAlchemy model class with a registered search index
+    :param query: Raw user query
+    :param page: Page number, starting at 1
+    :param per_page: Number of results per page
+    :param count: Count mode, see count_total
+    :param fields: Projection from parse_fields to load, or None for all columns
+    :return: Tuple of (list of model instances, total count or None, whether the total is exact)
+    """
+    terms = search_terms(query)
+    if not terms:
+        return [], 0, True
+
+    # Join the model to the (id, rank) rows of the index matching the terms
+    matches = get_search_index(model).matches(db.session.get_bind().dialect.name, terms)
+    matched_query = model.query.join(matches, model.id == matches.c.id)
+
+    # Calculate total count of matches, cached or approximated per the count mode
+    total_count, total_exact = count_total(matched_query, model.__tablename__, {'q': ' '.join(terms)}, count)
+
+    # Read only the projected columns
+    if fields:
+        matched_query = matched_query.options(load_only_fields(model, fields))
+
+    # Order by relevance, with the ID as tie-breaker for stable pages
+    results = matched_query.order_by(matches.c.rank, model.id).offset((page - 1) * per_page).limit(per_page).all()
+    return results, total_count, total_exact
+
+@use_replica()
+def search_names(query, threshold=DEFAULT_SIMILARITY_THRESHOLD, limit=10):
+    """
+    Fuzzy lookup of startups and investors by name, tolerant of typos
+
+    :param query: Name to look up, possibly misspelt
+    :param threshold: Minimum trigram similarity between 0 and 1
+    :param limit: Maximum number of matches per entity type
+    :return: Dictionary of startup and investor matches, most similar first
+    """
+    return {
+        key: [
+            {'id': entity_id, 'name': name, 'similarity': round(score, 4)}
+            for entity_id, name, score in fuzzy_name_matches(model, query, threshold, limit)
+        ]
+        for key, model in (('startups', Startup), ('investors', Investor))
+    }
@@ -1,11 +1,21 @@
-from ..utils import db
+from ..utils.db import db
 from ..models.startup import Startup
 from ..models.funding_round import FundingRound
 from ..models.job_posting import JobPosting
 from ..models.news_article import NewsArticle
+from ..utils.counts import count_total
+from ..utils.cache import cache_get_or_load_ids, cache_get_or_set, entity_cache_key
+from ..utils.serializers import serialize_many
+from ..utils.bulk import bulk_insert, bulk_update
+from flask import current_app
+from .load_options import load_profile
+from ..utils.pagination import order_by_sort_key, paginate_keyset
 import sqlalchemy
 
-def get_startups(filters=None, page=1, per_page=20):
+# Stable sort key used for both offset and cursor pagination
+STARTUP_SORT_KEY = ((Startup.name, False), (Startup.id, False))
+
+def get_startups(filters=None, page=1, per_page=20, cursor=None, count='auto'):
     # Create a base query for Startup model
     query = db.session.query(Startup)
 
@@ -14,19 +24,49 @@ def get_startups(filters=None, page=1, per_page=20):
         for key, value in filters.items():
             query = query.filter(getattr(Startup, key) == value)
 
-    # Calculate total count of matching startups
-    total_count = query.count()
+    # In cursor mode, return the page along with the cursor for the next page
+    if cursor is not None:
+        return paginate_keyset(query, STARTUP_SORT_KEY, cursor, per_page)
+
+    # Calculate total count of matching startups, cached or approximated per the count mode
+    total_count, total_exact = count_total(query, 'startup', filters, count)
 
     # Apply pagination to the query
-    query = query.offset((page - 1) * per_page).limit(per_page)
+    query = order_by_sort_key(query, STARTUP_SORT_KEY).offset((page - 1) * per_page).limit(per_page)
 
-    # Execute the query and return results along with total count
-    return query.all(), total_count
+    # Execute the query and return results along with total count and whether it is exact
+    return query.all(), total_count, total_exact
 
 def get_startup_by_id(startup_id):
     # Query the database for a Startup with the given ID
     return db.session.query(Startup).get(startup_id)
 
+def get_startup_data(startup_id):
+    # Load the serialized Startup on a cache miss
+    def load():
+        startup = get_startup_by_id(startup_id)
+        return startup.to_dict() if startup else None
+
+    # Serve the serialized Startup through the read-through cache, None if not found
+    return cache_get_or_set(entity_cache_key('startup', startup_id), load, current_app.config.get('DETAIL_CACHE_TTL'))
+
+def get_startups_by_ids(startup_ids):
+    # Load the serialized Startups missing from the cache with one IN query
+    def load(missing_ids):
+        rows = Startup.query.filter(Startup.id.in_(missing_ids)).all()
+        return {row['id']: row for row in serialize_many(Startup, rows)}
+
+    # Serve cached Startups without SQL and return all in the requested order, skipping unknown IDs
+    found = cache_get_or_load_ids('startup', startup_ids, load, current_app.config.get('DETAIL_CACHE_TTL'))
+    return [found[entity_id] for entity_id in startup_ids if found.get(entity_id) is not None]
+
+def get_startup_profile(startup_id):
+    # Query the Startup with founders, executives and funding rounds eagerly loaded
+    return (db.session.query(Startup)
+            .options(*load_profile('startup_profile'))
+            .filter(Startup.id == startup_id)
+            .one_or_none())
+
 def create_startup(startup_data):
     # Create a new Startup object with the provided data
     new_startup = Startup(**startup_data)
@@ -58,6 +98,14 @@ def update_startup(startup_id, startup_data):
     # Return the updated Startup object
     return startup
 
+def create_startups(records):
+    # Validate all records at once and insert them in chunked multi-row statements
+    return bulk_insert(Startup, records, current_app.config.get('BULK_CHUNK_SIZE'))
+
+def update_startups(records):
+    # Validate all partial updates at once and apply them in chunked executemany statements
+    return bulk_update(Startup, records, current_app.config.get('BULK_CHUNK_SIZE'))
+
 def delete_startup(startup_id):
     # Query the database for the Startup with the given ID
     startup = db.session.query(Startup).get(startup_id)
@@ -71,8 +119,11 @@ def delete_startup(startup_id):
     return False
 
 def get_startup_funding_rounds(startup_id):
-    # Query the database for FundingRound objects associated with the given startup_id
-    return db.session.query(FundingRound).filter(FundingRound.startup_id == startup_id).all()
+    # Query the database for FundingRound objects associated with the given startup_id, with investors loaded
+    return (db.session.query(FundingRound)
+            .options(*load_profile('funding_rounds'))
+            .filter(FundingRound.startup_id == startup_id)
+            .all())
 
 def get_startup_job_postings(startup_id):
     # Query the database for JobPosting objects associated with the given startup_id
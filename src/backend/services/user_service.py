@@ -1,9 +1,10 @@
-from src.backend.utils import db
+from src.backend.utils.db import db
 from src.backend.models.user import User
+from src.backend.utils.counts import count_total
 import sqlalchemy
 from werkzeug.security import generate_password_hash, check_password_hash
 
-def get_users(filters=None, page=1, per_page=20):
+def get_users(filters=None, page=1, per_page=20, count='auto'):
     # Create a base query for User model
     query = User.query
 
@@ -13,14 +14,14 @@ def get_users(filters=None, page=1, per_page=20):
             if hasattr(User, key):
                 query = query.filter(getattr(User, key) == value)
 
-    # Calculate total count of matching users
-    total_count = query.count()
+    # Calculate total count of matching users, cached or approximated per the count mode
+    total_count, total_exact = count_total(query, 'user', filters, count)
 
     # Apply pagination to the query
     query = query.offset((page - 1) * per_page).limit(per_page)
 
-    # Execute the query and return results along with total count
-    return query.all(), total_count
+    # Execute the query and return results along with total count and whether it is exact
+    return query.all(), total_count, total_exact
 
 def get_user_by_id(user_id):
     # Query the database for a User with the given ID
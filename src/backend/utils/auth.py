@@ -1,7 +1,11 @@
-from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity, create_access_token
 from functools import wraps
-from flask import jsonify
+from flask import current_app, g, jsonify
 from ..models.user import User
+from .cache import cache_get_or_set, entity_cache_key
+
+# User columns signed into access tokens as claims
+TOKEN_CLAIMS = ('role', 'email')
 
 def auth_required(func):
     @wraps(func)
@@ -15,28 +19,85 @@ def auth_required(func):
             return jsonify({"error": "Authentication required"}), 401
     return wrapper
 
+def role_required(*roles):
+    """
+    Require a valid token whose role claim is one of the given roles
+
+    The role is read from the signed token, so authorization takes no database query.
+
+    :param roles: Allowed roles
+    :return: Decorator for route functions
+    """
+    def decorator(func):
+        @wraps(func)
+        @jwt_required()
+        def wrapper(*args, **kwargs):
+            if get_jwt().get('role') not in roles:
+                return jsonify({"error": "Insufficient permissions"}), 403
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def token_claims(user):
+    """
+    Identity claims signed into a user's access tokens
+
+    :param user: User object, or its serialized dictionary
+    :return: Dictionary of additional JWT claims
+    """
+    if isinstance(user, dict):
+        return {field: user[field] for field in TOKEN_CLAIMS}
+    return {field: getattr(user, field) for field in TOKEN_CLAIMS}
+
+def current_user_id():
+    # JWT subjects are strings; user IDs are integers
+    return int(get_jwt_identity())
+
+def get_current_identity():
+    """
+    Identity of the current request from its token claims, without a database query
+
+    :return: Dictionary with the user's id, email and role
+    """
+    claims = get_jwt()
+    return dict({field: claims.get(field) for field in TOKEN_CLAIMS}, id=current_user_id())
+
+def get_current_user_data():
+    """
+    Serialized row of the current user
+
+    Memoized for the request and cached for USER_CACHE_TTL seconds; the cache entry is dropped
+    whenever a commit changes the user, e.g. its role or password.
+
+    :return: Dictionary from User.to_dict, or None if the user no longer exists
+    """
+    if 'current_user_data' not in g:
+        user_id = current_user_id()
+
+        def load():
+            user = User.query.get(user_id)
+            return user.to_dict() if user else None
+
+        g.current_user_data = cache_get_or_set(
+            entity_cache_key('user', user_id), load, current_app.config.get('USER_CACHE_TTL')
+        )
+    return g.current_user_data
+
 def get_current_user():
-    # Get the user ID from the JWT token
-    user_id = get_jwt_identity()
-    
-    # Query the database for the User with the given ID
-    user = User.query.get(user_id)
-    
-    # Return the User object if found, otherwise return None
-    return user
+    # Load the User object of the token's identity once per request, for handlers that modify it
+    if 'current_user' not in g:
+        g.current_user = User.query.get(current_user_id())
+    return g.current_user
 
 def generate_token(user):
-    # Create a JWT token with the user's ID as the identity
-    token = create_access_token(identity=user.id)
-    
+    # Create a JWT token with the user's ID as the identity and the role and email as claims
+    token = create_access_token(identity=str(user.id), additional_claims=token_claims(user))
+
     # Return the generated token
     return token
 
 # Human tasks:
-# TODO: Implement role-based access control
 # TODO: Add logging for authentication failures
 # TODO: Implement token refresh mechanism
-# TODO: Implement caching for frequent user lookups
 # TODO: Add error handling for database query failures
 # TODO: Implement token expiration and refresh mechanism
-# TODO: Add additional claims to the token (e.g., user role)
\ No newline at end of file
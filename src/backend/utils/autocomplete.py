@@ -0,0 +1,153 @@
+import heapq
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+# Maximum number of suggestions per lookup
+MAX_SUGGESTIONS = 20
+
+# Prefixes up to this length match large ranges, so their top suggestions are precomputed
+_PRECOMPUTED_PREFIX_LENGTH = 3
+
+# Number of longer prefixes whose suggestions are memoized
+_MEMO_SIZE = 4096
+
+_SPACES = re.compile(r'\s+')
+
+def normalize(text):
+    """
+    Normalize text for prefix matching: lower-cased, with single spaces
+
+    :param text: Raw text
+    :return: Normalized text
+    """
+    return _SPACES.sub(' ', (text or '').strip().lower())
+
+def _word_starts(text):
+    # The normalized text from each word start on, so prefixes match any word
+    return [text] + [text[match.end():] for match in _SPACES.finditer(text)]
+
+class PrefixIndex:
+    """
+    Sorted array of suggestion keys with popularity scores, answering prefix queries by bisection
+
+    Each suggestion is indexed under its full text and under every word start within it, so
+    'bio' suggests 'Ginkgo Bioworks'. Scores are compared relative to the most popular
+    suggestion of the same type. The top suggestions of short prefixes, which match the
+    most keys, are precomputed and kept current on writes.
+    """
+
+    def __init__(self, suggestions=()):
+        self._keys = []
+        self._entries = {}
+        self._max_scores = {}
+        self._top = {}
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Bulk load: append all keys and sort once, instead of one insort per key
+        for kind, ref, label, score in suggestions:
+            text = normalize(label)
+            if text and (kind, ref) not in self._entries:
+                self._entries[(kind, ref)] = (label, score or 0)
+                self._max_scores[kind] = max(self._max_scores.get(kind, 0), score or 0)
+                self._keys.extend((key, kind, ref) for key in _word_starts(text))
+        self._keys.sort()
+
+        short_prefixes = {key[:length] for key, _, _ in self._keys
+                          for length in range(1, _PRECOMPUTED_PREFIX_LENGTH + 1)}
+        for prefix in short_prefixes:
+            self._refresh_top(prefix)
+
+    def _popularity(self, entry_key):
+        label, score = self._entries[entry_key]
+        max_score = self._max_scores[entry_key[0]]
+        return (score / max_score if max_score else 0, -len(label))
+
+    def _scan(self, prefix):
+        # Top suggestions among all keys starting with the prefix, contiguous in the sorted array
+        low = bisect_left(self._keys, (prefix,))
+        high = bisect_left(self._keys, (prefix + '\uffff',))
+        refs = {(kind, ref) for _, kind, ref in self._keys[low:high]}
+        return heapq.nlargest(MAX_SUGGESTIONS, refs, key=self._popularity)
+
+    def _refresh_top(self, prefix):
+        top = self._scan(prefix)
+        if top:
+            self._top[prefix] = top
+        else:
+            self._top.pop(prefix, None)
+
+    def _short_prefixes(self, text):
+        return {key[:length] for key in _word_starts(text)
+                for length in range(1, min(len(key), _PRECOMPUTED_PREFIX_LENGTH) + 1)}
+
+    def set(self, kind, ref, label, score):
+        with self._lock:
+            self._remove(kind, ref)
+            text = normalize(label)
+            if not text:
+                return
+            self._entries[(kind, ref)] = (label, score or 0)
+            self._max_scores[kind] = max(self._max_scores.get(kind, 0), score or 0)
+            for key in _word_starts(text):
+                insort(self._keys, (key, kind, ref))
+
+            # Merge the suggestion into the precomputed top lists instead of rescanning them
+            for prefix in self._short_prefixes(text):
+                top = self._top.get(prefix, []) + [(kind, ref)]
+                self._top[prefix] = heapq.nlargest(MAX_SUGGESTIONS, top, key=self._popularity)
+            self._memo.clear()
+
+    def remove(self, kind, ref):
+        with self._lock:
+            self._remove(kind, ref)
+
+    def _remove(self, kind, ref):
+        # Drop a suggestion and its keys; the caller holds the lock
+        entry = self._entries.pop((kind, ref), None)
+        if entry is None:
+            return
+        text = normalize(entry[0])
+        for key in _word_starts(text):
+            position = bisect_left(self._keys, (key, kind, ref))
+            if position < len(self._keys) and self._keys[position] == (key, kind, ref):
+                del self._keys[position]
+
+        # Only top lists that contained the suggestion need a rescan
+        for prefix in self._short_prefixes(text):
+            if (kind, ref) in self._top.get(prefix, ()):
+                self._refresh_top(prefix)
+        self._memo.clear()
+
+    def get(self, kind, ref):
+        return self._entries.get((kind, ref))
+
+    def complete(self, prefix, limit=10):
+        """
+        Most popular suggestions starting with a prefix, or with a word starting with it
+
+        :param prefix: Text typed so far
+        :param limit: Maximum number of suggestions, at most MAX_SUGGESTIONS
+        :return: List of (kind, ref, label) tuples, most popular first
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        with self._lock:
+            if len(prefix) <= _PRECOMPUTED_PREFIX_LENGTH:
+                top = self._top.get(prefix, [])
+            else:
+                top = self._memo.get(prefix)
+                if top is None:
+                    top = self._memo[prefix] = self._scan(prefix)
+                    if len(self._memo) > _MEMO_SIZE:
+                        self._memo.popitem(last=False)
+                else:
+                    self._memo.move_to_end(prefix)
+            return [(kind, ref, self._entries[(kind, ref)][0]) for kind, ref in top[:limit]]
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,330 @@
+import logging
+from datetime import date, datetime
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Numeric, String, bindparam, insert, select, update
+from sqlalchemy.exc import DBAPIError
+from .db import EntityChange, db, notify_entities_changed
+
+logger = logging.getLogger(__name__)
+
+# Default number of rows written per transaction
+DEFAULT_CHUNK_SIZE = 1000
+
+# Compiled validators keyed by model class
+_validators = {}
+
+def _coerce_integer(value):
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError('must be an integer')
+    return value
+
+def _coerce_float(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError('must be a number')
+    return float(value)
+
+def _coerce_boolean(value):
+    if not isinstance(value, bool):
+        raise ValueError('must be a boolean')
+    return value
+
+def _coerce_date(value):
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if not isinstance(value, str):
+        raise ValueError('must be an ISO date')
+    return date.fromisoformat(value)
+
+def _coerce_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    if not isinstance(value, str):
+        raise ValueError('must be an ISO datetime')
+    return datetime.fromisoformat(value)
+
+def _string_coercer(length):
+    def coerce(value):
+        if not isinstance(value, str):
+            raise ValueError('must be a string')
+        if length and len(value) > length:
+            raise ValueError(f'must be at most {length} characters')
+        return value
+    return coerce
+
+def _coercer(column):
+    # Converter from JSON values to the Python type of a column, raising ValueError on bad input
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return _coerce_boolean
+    if isinstance(column_type, Integer):
+        return _coerce_integer
+    if isinstance(column_type, (Float, Numeric)):
+        return _coerce_float
+    if isinstance(column_type, DateTime):
+        return _coerce_datetime
+    if isinstance(column_type, Date):
+        return _coerce_date
+    if isinstance(column_type, String):
+        return _string_coercer(column_type.length)
+    return lambda value: value
+
+class RecordValidator:
+    """Column-wise validator of raw records for one model, compiled once"""
+
+    def __init__(self, model):
+        self.model = model
+        self.table = model.__table__
+        self.primary_key = self.table.primary_key.columns.values()[0].name
+
+        # Writable columns with their converters, and the ones an insert cannot leave out
+        self.coercers = {
+            column.name: _coercer(column) for column in self.table.columns if column.name != self.primary_key
+        }
+        self.required = tuple(
+            column.name for column in self.table.columns
+            if column.name != self.primary_key and not column.nullable
+            and column.default is None and column.server_default is None
+        )
+        self.nullable = frozenset(column.name for column in self.table.columns if column.nullable)
+
+        # Foreign key columns and the primary key column they reference
+        self.foreign_keys = {
+            column.name: next(iter(column.foreign_keys)).column for column in self.table.columns if column.foreign_keys
+        }
+
+    def validate(self, records, for_update=False):
+        """
+        Validate and convert a batch of records, one pass per column
+
+        :param records: List of raw record dictionaries
+        :param for_update: Whether records are partial updates identified by their primary key
+        :return: Tuple of (list of converted rows or None, dictionary of record index to error message)
+        """
+        errors = {}
+        rows = [None] * len(records)
+        for index, record in enumerate(records):
+            if not isinstance(record, dict):
+                errors[index] = 'Record must be an object'
+                continue
+            unknown = set(record).difference(self.coercers, (self.primary_key,) if for_update else ())
+            if unknown:
+                errors[index] = f"Unknown fields: {', '.join(sorted(unknown))}"
+            elif for_update and not isinstance(record.get(self.primary_key), int):
+                errors[index] = f'Missing required field: {self.primary_key}'
+            elif not for_update and any(field not in record for field in self.required):
+                missing = next(field for field in self.required if field not in record)
+                errors[index] = f'Missing required field: {missing}'
+            else:
+                rows[index] = dict(record)
+
+        # Convert each column across all records with the same converter
+        for field, coerce in self.coercers.items():
+            for index, row in enumerate(rows):
+                if row is None or field not in row:
+                    continue
+                value = row[field]
+                if value is None:
+                    if field not in self.nullable:
+                        errors[index], rows[index] = f'{field} must not be null', None
+                    continue
+                try:
+                    row[field] = coerce(value)
+                except ValueError as error:
+                    errors[index], rows[index] = f'{field} {error}', None
+
+        self._check_foreign_keys(rows, errors)
+        return rows, errors
+
+    def _check_foreign_keys(self, rows, errors):
+        # Look up all referenced IDs of each foreign key column in one query
+        for field, referenced in self.foreign_keys.items():
+            values = {row[field] for row in rows if row is not None and row.get(field) is not None}
+            if not values:
+                continue
+            existing = set()
+            values = list(values)
+            for start in range(0, len(values), DEFAULT_CHUNK_SIZE):
+                existing.update(db.session.execute(
+                    select(referenced).where(referenced.in_(values[start:start + DEFAULT_CHUNK_SIZE]))
+                ).scalars())
+            for index, row in enumerate(rows):
+                if row is not None and row.get(field) is not None and row[field] not in existing:
+                    errors[index], rows[index] = f'{field} {row[field]} does not exist', None
+
+def get_validator(model):
+    """
+    Get the compiled record validator of a model, building it on first use
+
+    :param model: SQLAlchemy model class
+    :return: RecordValidator
+    """
+    validator = _validators.get(model)
+    if validator is None:
+        validator = _validators[model] = RecordValidator(model)
+    return validator
+
+def _chunks(indexes, chunk_size):
+    for start in range(0, len(indexes), chunk_size):
+        yield indexes[start:start + chunk_size]
+
+def _key_groups(rows, indexes):
+    # Rows of one executemany must share their keys, so group a chunk by key set, keeping order
+    groups = {}
+    for index in indexes:
+        groups.setdefault(tuple(sorted(rows[index])), []).append(index)
+    return groups.values()
+
+def _row_error(error):
+    # Short database error message for the per-row status
+    return str(getattr(error, 'orig', None) or error).splitlines()[0]
+
+def _insert_chunk(validator, rows, indexes, results):
+    # Insert one chunk in a transaction of its own; returns the changes to notify
+    table = validator.table
+    primary_key = table.c[validator.primary_key]
+    changes = []
+    for group in _key_groups(rows, indexes):
+        statement = insert(table).returning(primary_key, sort_by_parameter_order=True)
+        ids = db.session.execute(statement, [rows[index] for index in group]).scalars().all()
+        for index, entity_id in zip(group, ids):
+            results[index] = {'index': index, 'status': 'created', 'id': entity_id}
+            changes.append(EntityChange(validator.model, entity_id, 'insert', None,
+                                        {**rows[index], validator.primary_key: entity_id}))
+    db.session.commit()
+    return changes
+
+def _update_chunk(validator, rows, indexes, results):
+    # Update one chunk in a transaction of its own; returns the changes to notify
+    table = validator.table
+    primary_key = table.c[validator.primary_key]
+    ids = [rows[index][validator.primary_key] for index in indexes]
+
+    # Current rows of the chunk in one query, for existence and the old values of changed columns
+    current = {row[validator.primary_key]: row for row in db.session.execute(
+        select(table).where(primary_key.in_(ids))
+    ).mappings()}
+
+    changes, found = [], []
+    for index in indexes:
+        entity_id = rows[index][validator.primary_key]
+        if entity_id not in current:
+            results[index] = {'index': index, 'status': 'error', 'id': entity_id, 'error': 'Not found'}
+            continue
+        found.append(index)
+        old = current[entity_id]
+        previous = {field: old[field] for field, value in rows[index].items()
+                    if field != validator.primary_key and old[field] != value}
+        if previous:
+            changes.append(EntityChange(validator.model, entity_id, 'update', None,
+                                        {**old, **rows[index]}, previous))
+
+    for group in _key_groups(rows, found):
+        fields = [field for field in rows[group[0]] if field != validator.primary_key]
+        if not fields:
+            continue
+        statement = update(table).where(primary_key == bindparam('_id')).values(
+            {field: bindparam(field) for field in fields}
+        )
+        db.session.execute(statement, [
+            {'_id': rows[index][validator.primary_key], **{field: rows[index][field] for field in fields}}
+            for index in group
+        ])
+    db.session.commit()
+
+    for index in found:
+        results[index] = {'index': index, 'status': 'updated', 'id': rows[index][validator.primary_key]}
+    return changes
+
+def _write(model, records, for_update, chunk_size):
+    validator = get_validator(model)
+    rows, errors = validator.validate(records, for_update)
+    results = [None] * len(records)
+    for index, error in errors.items():
+        results[index] = {'index': index, 'status': 'error', 'error': error}
+
+    write_chunk = _update_chunk if for_update else _insert_chunk
+    chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+    valid = [index for index, row in enumerate(rows) if row is not None]
+    for chunk in _chunks(valid, chunk_size):
+        try:
+            changes = write_chunk(validator, rows, chunk, results)
+        except DBAPIError:
+            db.session.rollback()
+            logger.warning("Bulk %s chunk of %s failed, retrying row by row",
+                           'update' if for_update else 'insert', model.__tablename__)
+
+            # Isolate the failing rows so the rest of the chunk is still written
+            changes = []
+            for index in chunk:
+                try:
+                    changes.extend(write_chunk(validator, rows, [index], results))
+                except DBAPIError as error:
+                    db.session.rollback()
+                    results[index] = {'index': index, 'status': 'error', 'error': _row_error(error)}
+
+        # Core statements bypass the ORM unit of work, so notify the cache and index listeners here
+        notify_entities_changed(changes)
+    return results
+
+def bulk_insert(model, records, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Validate and insert many records with multi-row INSERT statements, one transaction per chunk
+
+    :param model: SQLAlchemy model class
+    :param records: List of raw record dictionaries
+    :param chunk_size: Number of rows per transaction
+    :return: List of per-record status dictionaries in input order, with the new ID or an error
+    """
+    return _write(model, records, False, chunk_size)
+
+def bulk_update(model, records, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Validate and apply many partial updates identified by primary key, one transaction per chunk
+
+    :param model: SQLAlchemy model class
+    :param records: List of raw record dictionaries, each with the primary key and the fields to set
+    :param chunk_size: Number of rows per transaction
+    :return: List of per-record status dictionaries in input order, with the ID or an error
+    """
+    return _write(model, records, True, chunk_size)
+
+def bulk_records(payload, max_records):
+    """
+    Check the body of a bulk write request
+
+    :param payload: Parsed JSON body
+    :param max_records: Maximum number of records per request
+    :return: List of raw records
+    :raises ValueError: If the body is not an array or holds too many records
+    """
+    if not isinstance(payload, list):
+        raise ValueError('Request body must be a JSON array of records')
+    if max_records and len(payload) > max_records:
+        raise ValueError(f'At most {max_records} records per request')
+    return payload
+
+def parse_id_list(value, max_ids):
+    """
+    Parse a comma-separated list of IDs from a query parameter, dropping duplicates
+
+    :param value: Raw parameter value, e.g. '3,1,2'
+    :param max_ids: Maximum number of IDs
+    :return: List of distinct integer IDs in the given order
+    :raises ValueError: If an ID is not an integer or there are too many
+    """
+    try:
+        ids = list(dict.fromkeys(int(part) for part in value.split(',') if part.strip()))
+    except ValueError:
+        raise ValueError('ids must be a comma-separated list of integers')
+    if max_ids and len(ids) > max_ids:
+        raise ValueError(f'At most {max_ids} ids per request')
+    return ids
+
+def bulk_summary(results):
+    """
+    Build the response body of a bulk write
+
+    :param results: Per-record status dictionaries from bulk_insert or bulk_update
+    :return: Tuple of (response dictionary, whether every record succeeded)
+    """
+    failed = sum(1 for result in results if result['status'] == 'error')
+    return {'succeeded': len(results) - failed, 'failed': failed, 'results': results}, not failed
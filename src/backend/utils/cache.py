@@ -1,117 +1,730 @@
-from redis import Redis
+from redis import Redis, RedisError
+from redis.exceptions import LockError
 import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from urllib.parse import urlencode
 from flask import current_app
+from .db import UNKNOWN_VALUE, on_entities_changed, use_primary
+from .metrics import define_counter, inc
+
+logger = logging.getLogger(__name__)
 
 # Global variable to store the Redis client
 redis_client = None
 
+# Pub/sub channel carrying local-tier invalidations between workers
+INVALIDATION_CHANNEL = 'cache:invalidate'
+
+# Columns whose values tag cached list pages and counts, per table. A write only invalidates
+# the lists filtered on its old or new value of these columns, plus the lists filtered on none.
+LIST_TAG_FIELDS = {
+    'startup': ('industry', 'sub_sector', 'funding_stage', 'is_hiring'),
+    'investor': ('type',),
+    'job_posting': ('startup_id',),
+    'news_article': ('startup_id',),
+}
+
+# Marker for keys absent from the local tier, so cached falsy values still count as hits
+_MISSING = object()
+
+# Lookups by the tier that answered them; a miss went through both tiers
+CACHE_LOOKUPS = define_counter('cache_lookups_total', 'Cache lookups, by result and the tier answering them')
+_LOCAL_HIT = (('result', 'hit'), ('tier', 'local'))
+_REDIS_HIT = (('result', 'hit'), ('tier', 'redis'))
+_MISS = (('result', 'miss'), ('tier', 'none'))
+
+# Versioned namespace of every Redis key; the generation is bumped by cache_clear
+_key_prefix = 'bst:v1'
+_key_generation = 0
+
+# TTL applied when none is given, so keys orphaned by a generation bump always expire
+_default_ttl = 86400
+
+class LocalCache:
+    """
+    Bounded per-worker LRU cache with per-entry expiry and tags
+
+    Sits in front of Redis so hot keys are served without a network round trip or
+    json.loads. Values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize=1024, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def _remove(self, key):
+        # Drop an entry and its tag index references; the caller holds the lock
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return True
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return _MISSING
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, expire=None, tags=()):
+        # Never keep a value locally longer than in Redis or than the local TTL
+        ttl = min(expire, self.ttl) if expire else self.ttl
+        tags = tuple(tags)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key):
+        with self._lock:
+            return self._remove(key)
+
+    def invalidate_tags(self, tags):
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tags.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+# Local tier of the current worker process
+local_cache = LocalCache()
+
+# Recompute locks held in this process, used when Redis is unavailable (and in tests)
+_local_locks = {}
+_local_locks_guard = threading.Lock()
+
+# Identifies this process in invalidation messages, so it ignores its own
+_process_token = None
+_subscriber_pid = None
+
+def _redis_key(key):
+    # Physical Redis key of a logical cache key
+    return f"{_key_prefix}:{_key_generation}:{key}"
+
+def _tag_key(tag):
+    # Physical Redis key of the set of logical keys carrying a tag
+    return _redis_key(f"tag:{tag}")
+
+def _load_generation():
+    # Read the key generation shared by all workers
+    global _key_generation
+    try:
+        _key_generation = int(redis_client.get(f"{_key_prefix}:generation") or 0)
+    except RedisError as e:
+        logger.warning("Failed to read the cache key generation: %s", e)
+
 def init_cache(app):
     """
-    Initialize the Redis cache client
+    Initialize the Redis cache client and the local cache tier
     """
-    global redis_client
-    
+    global redis_client, local_cache, _key_prefix, _default_ttl
+
+    # Size the per-worker local tier
+    local_cache = LocalCache(
+        maxsize=app.config.get('CACHE_LOCAL_MAXSIZE', 1024),
+        ttl=app.config.get('CACHE_LOCAL_TTL', 30)
+    )
+
+    # Namespace of all keys written by this deployment
+    _key_prefix = app.config.get('CACHE_KEY_PREFIX', 'bst:v1')
+    _default_ttl = app.config.get('CACHE_DEFAULT_TTL', 86400)
+
     # Get Redis configuration from the Flask app config
+    redis_url = app.config.get('REDIS_URL')
     redis_config = app.config.get('REDIS_CONFIG', {})
-    
-    # Create a new Redis client with the provided configuration
-    redis_client = Redis(**redis_config)
-    
+
+    # Create a new Redis client from the URL if set, otherwise from the provided configuration
+    if redis_url:
+        redis_client = Redis.from_url(redis_url)
+    else:
+        redis_client = Redis(**redis_config)
+
     # Test the connection to ensure Redis is available
     try:
         redis_client.ping()
     except Exception as e:
-        # TODO: Implement error handling for Redis connection failures
-        # TODO: Add logging for cache initialization events
-        # TODO: Implement a fallback mechanism if Redis is unavailable
-        print(f"Failed to connect to Redis: {str(e)}")
+        # Keep serving from the local tier alone while Redis is unavailable
+        logger.warning("Failed to connect to Redis, using the local cache tier only: %s", e)
         redis_client = None
+        return
+
+    _load_generation()
+
+def _ensure_subscriber():
+    # Start the invalidation listener once per process; gunicorn forks after create_app
+    global _process_token, _subscriber_pid
+    pid = os.getpid()
+    if _subscriber_pid == pid or not redis_client:
+        return
+    _subscriber_pid = pid
+    _process_token = f"{pid}-{uuid.uuid4().hex}"
+    threading.Thread(target=_listen_for_invalidations, name='cache-invalidation', daemon=True).start()
+
+def _listen_for_invalidations():
+    # Apply invalidations published by other workers; reconnect after Redis errors
+    while True:
+        try:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            for message in pubsub.listen():
+                sender, kind, *items = message['data'].decode('utf-8').split('\n')
+                if sender == _process_token:
+                    continue
+                if kind == 'key':
+                    for key in items:
+                        local_cache.delete(key)
+                elif kind == 'tag':
+                    local_cache.invalidate_tags(items)
+                else:
+                    local_cache.clear()
+                    _load_generation()
+        except Exception as e:
+            logger.warning("Cache invalidation listener disconnected: %s", e)
+
+        # Messages may have been missed while disconnected
+        local_cache.clear()
+        _load_generation()
+        time.sleep(1)
+
+def _publish_invalidation(kind, items=()):
+    # Tell the other workers to drop their local copies; kind is 'key', 'tag' or 'all'.
+    # Lines separate the fields, since tags embed filter values that may contain spaces.
+    try:
+        redis_client.publish(INVALIDATION_CHANNEL, '\n'.join([f"{_process_token}", kind, *items]))
+    except RedisError as e:
+        logger.warning("Failed to publish cache invalidation: %s", e)
+
+def normalize_filters(filters):
+    """
+    Build a canonical string for a filter set so equivalent filters share a cache entry
+    """
+    if not filters:
+        return ''
+    return urlencode(sorted((key, str(value)) for key, value in filters.items() if value not in (None, '')))
+
+def _tag_value(value):
+    # Canonical tag form of a filter or column value
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+def list_tags(entity, filters=None):
+    """
+    Tags of a cached list page or count of an entity under a filter set
+    """
+    tags = []
+    for field in LIST_TAG_FIELDS.get(entity, ()):
+        value = (filters or {}).get(field)
+        if value not in (None, ''):
+            tags.append(f"list:{entity}:{field}={_tag_value(value)}")
+            tags.append(f"list:{entity}:{field}")
+
+    # Lists not filtered on any tag field can change with any write to the entity
+    return tags or [f"list:{entity}"]
+
+def list_cache_key(entity, filters=None, **page):
+    """
+    Build the cache key of a list page of an entity
+    """
+    return f"list:{entity}:{normalize_filters(dict(filters or {}, **page))}"
 
 def cache_get(key):
     """
     Retrieve a value from the cache
     """
+    # Serve from the local tier first
+    value = local_cache.get(key)
+    if value is not _MISSING:
+        inc(CACHE_LOOKUPS, _LOCAL_HIT)
+        return value
+
     if not redis_client:
+        inc(CACHE_LOOKUPS, _MISS)
         return None
-    
+    _ensure_subscriber()
+
     # Attempt to get the value from Redis using the provided key
-    value = redis_client.get(key)
-    
-    if value:
+    try:
+        raw_value = redis_client.get(_redis_key(key))
+    except RedisError as e:
+        logger.warning("Cache get failed for %s: %s", key, e)
+        inc(CACHE_LOOKUPS, _MISS)
+        return None
+
+    if raw_value:
         try:
-            # If value exists, deserialize it from JSON
-            return json.loads(value)
+            # If value exists, deserialize it from JSON and keep it in the local tier
+            value = json.loads(raw_value)
         except json.JSONDecodeError:
-            # TODO: Implement error handling for deserialization failures
-            # TODO: Add logging for cache misses
+            logger.warning("Discarding undecodable cache value for %s", key)
+            inc(CACHE_LOOKUPS, _MISS)
             return None
-    
-    # TODO: Consider implementing a cache prefix for better organization
+        local_cache.set(key, value)
+        inc(CACHE_LOOKUPS, _REDIS_HIT)
+        return value
+
+    inc(CACHE_LOOKUPS, _MISS)
     return None
 
-def cache_set(key, value, expire=None):
+def cache_set(key, value, expire=None, tags=()):
     """
-    Store a value in the cache
+    Store a value in the cache, optionally tagged for group invalidation
     """
-    if not redis_client:
-        return False
-    
     try:
         # Serialize the value to JSON
         serialized_value = json.dumps(value)
     except TypeError:
-        # TODO: Implement error handling for serialization failures
-        # TODO: Add logging for cache set operations
+        logger.warning("Cache value for %s is not JSON serializable", key)
         return False
-    
-    # Attempt to set the value in Redis with the provided key
-    if expire:
-        success = redis_client.setex(key, expire, serialized_value)
-    else:
-        success = redis_client.set(key, serialized_value)
-    
-    # TODO: Consider implementing a mechanism to update cache on data changes
+
+    # Every key expires, so entries orphaned by cache_clear or a lost tag set do not linger
+    expire = expire or _default_ttl
+    tags = tuple(tags)
+
+    # Keep the value in the local tier, even when Redis is unavailable
+    local_cache.set(key, value, expire, tags)
+
+    if not redis_client:
+        return False
+    _ensure_subscriber()
+
+    # Store the value and register it in its tag sets in one round trip
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.setex(_redis_key(key), expire, serialized_value)
+        for tag in tags:
+            pipe.sadd(_tag_key(tag), key)
+            pipe.expire(_tag_key(tag), max(expire, _default_ttl))
+        success = pipe.execute()[0]
+    except RedisError as e:
+        logger.warning("Cache set failed for %s: %s", key, e)
+        return False
+
+    # Other workers may hold an older local copy
+    _publish_invalidation('key', [key])
     return success
 
 def cache_delete(key):
     """
     Delete a value from the cache
     """
+    deleted_locally = local_cache.delete(key)
+
     if not redis_client:
-        return False
-    
+        return deleted_locally
+    _ensure_subscriber()
+
     # Attempt to delete the key from Redis
-    deleted = redis_client.delete(key)
-    
-    # TODO: Add logging for cache delete operations
-    # TODO: Consider implementing a mechanism to clear related cache entries
-    return deleted > 0
+    try:
+        deleted = redis_client.delete(_redis_key(key))
+    except RedisError as e:
+        logger.warning("Cache delete failed for %s: %s", key, e)
+        return deleted_locally
+
+    _publish_invalidation('key', [key])
+    return deleted > 0 or deleted_locally
+
+def cache_get_many(keys):
+    """
+    Retrieve several values from the cache with at most one Redis round trip
+
+    Returns a dictionary of the keys found; missing keys are left out.
+    """
+    found = {}
+    remote_keys = []
+    for key in keys:
+        # Serve from the local tier first
+        value = local_cache.get(key)
+        if value is not _MISSING:
+            found[key] = value
+        else:
+            remote_keys.append(key)
+    local_hits = len(found)
+    if local_hits:
+        inc(CACHE_LOOKUPS, _LOCAL_HIT, local_hits)
+
+    if not remote_keys or not redis_client:
+        if remote_keys:
+            inc(CACHE_LOOKUPS, _MISS, len(remote_keys))
+        return found
+    _ensure_subscriber()
+
+    # Fetch the remaining keys with a single MGET
+    try:
+        raw_values = redis_client.mget([_redis_key(key) for key in remote_keys])
+    except RedisError as e:
+        logger.warning("Cache get_many failed for %d keys: %s", len(remote_keys), e)
+        inc(CACHE_LOOKUPS, _MISS, len(remote_keys))
+        return found
+
+    for key, raw_value in zip(remote_keys, raw_values):
+        if not raw_value:
+            continue
+        try:
+            value = json.loads(raw_value)
+        except json.JSONDecodeError:
+            logger.warning("Discarding undecodable cache value for %s", key)
+            continue
+        local_cache.set(key, value)
+        found[key] = value
+
+    redis_hits = len(found) - local_hits
+    if redis_hits:
+        inc(CACHE_LOOKUPS, _REDIS_HIT, redis_hits)
+    if len(remote_keys) > redis_hits:
+        inc(CACHE_LOOKUPS, _MISS, len(remote_keys) - redis_hits)
+    return found
+
+def cache_set_many(mapping, expire=None, tags=None):
+    """
+    Store several values in the cache with one pipelined Redis round trip
+
+    tags may map each key to the tags of its value.
+    """
+    expire = expire or _default_ttl
+    tags = tags or {}
+
+    serialized = {}
+    for key, value in mapping.items():
+        try:
+            serialized[key] = json.dumps(value)
+        except TypeError:
+            logger.warning("Cache value for %s is not JSON serializable", key)
+            continue
+        local_cache.set(key, value, expire, tags.get(key, ()))
+
+    if not serialized or not redis_client:
+        return False
+    _ensure_subscriber()
+
+    # Store all values and their tag registrations in one pipeline
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key, serialized_value in serialized.items():
+            pipe.setex(_redis_key(key), expire, serialized_value)
+            for tag in tags.get(key, ()):
+                pipe.sadd(_tag_key(tag), key)
+                pipe.expire(_tag_key(tag), max(expire, _default_ttl))
+        pipe.execute()
+    except RedisError as e:
+        logger.warning("Cache set_many failed for %d keys: %s", len(serialized), e)
+        return False
+
+    # Other workers may hold older local copies
+    _publish_invalidation('key', list(serialized))
+    return True
+
+def cache_delete_many(keys):
+    """
+    Delete several values from the cache with a single DEL
+    """
+    return cache_invalidate(keys=keys)
+
+def cache_get_ids(entity, ids):
+    """
+    Look up cached serialized entities by ID
+
+    Returns a dictionary of the cached entities by ID and the list of IDs to load from the
+    database, typically with one IN (...) query.
+    """
+    keys = {entity_id: entity_cache_key(entity, entity_id) for entity_id in ids}
+    found = cache_get_many(keys.values())
+
+    hits, misses = {}, []
+    for entity_id, key in keys.items():
+        if key in found:
+            hits[entity_id] = found[key]
+        else:
+            misses.append(entity_id)
+    return hits, misses
+
+def cache_get_or_load_ids(entity, ids, loader, expire=None):
+    """
+    Batched read-through lookup of serialized entities by ID
+
+    loader receives the list of missed IDs and returns a dictionary of serialized entities by
+    ID; IDs it leaves out (e.g. missing rows) are not cached. Returns the dictionary of all
+    entities found. Like every cache fill, the loader reads from the primary.
+    """
+    hits, misses = cache_get_ids(entity, ids)
+    if misses:
+        with use_primary():
+            loaded = loader(misses)
+        cache_set_many(
+            {entity_cache_key(entity, entity_id): value for entity_id, value in loaded.items()}, expire
+        )
+        hits.update(loaded)
+    return hits
+
+def cache_invalidate(keys=(), tags=()):
+    """
+    Delete the given keys and every key carrying one of the given tags
+
+    Takes two pipelined round trips, reading the tag sets then deleting, and never scans the keyspace.
+    """
+    keys, tags = list(keys), list(tags)
+    for key in keys:
+        local_cache.delete(key)
+    local_cache.invalidate_tags(tags)
+
+    if not redis_client or not (keys or tags):
+        return 0
+    _ensure_subscriber()
+
+    try:
+        # Read the members of all tag sets at once
+        members = []
+        if tags:
+            pipe = redis_client.pipeline(transaction=False)
+            for tag in tags:
+                pipe.smembers(_tag_key(tag))
+            members = pipe.execute()
+
+        # Delete the tagged keys, removing only the members read so keys tagged meanwhile stay tracked
+        doomed = {member.decode('utf-8') for tag_members in members for member in tag_members}.union(keys)
+        pipe = redis_client.pipeline(transaction=False)
+        if doomed:
+            pipe.delete(*(_redis_key(key) for key in doomed))
+        for tag, tag_members in zip(tags, members):
+            if tag_members:
+                pipe.srem(_tag_key(tag), *tag_members)
+        results = pipe.execute()
+    except RedisError as e:
+        logger.warning("Cache invalidation failed: %s", e)
+        return 0
+
+    if keys:
+        _publish_invalidation('key', keys)
+    if tags:
+        _publish_invalidation('tag', tags)
+    return results[0] if doomed else 0
+
+def cache_invalidate_tags(*tags):
+    """
+    Delete every cached value carrying one of the given tags
+    """
+    return cache_invalidate(tags=tags)
+
+def cache_incr(key):
+    """
+    Atomically increment an integer counter in the cache
+    """
+    # Counters live in Redis only; a stale local copy would hide the increment
+    local_cache.delete(key)
+
+    if not redis_client:
+        return None
+    _ensure_subscriber()
+
+    # Missing keys start from zero
+    try:
+        value = redis_client.incr(_redis_key(key))
+    except RedisError as e:
+        logger.warning("Cache incr failed for %s: %s", key, e)
+        return None
+
+    _publish_invalidation('key', [key])
+    return value
+
+def entity_cache_key(entity, entity_id):
+    """
+    Build the cache key of a serialized entity, also the tag of cached lists containing it
+    """
+    return f"{entity}:{entity_id}"
+
+def cache_get_or_set(key, loader, expire=None, tags=()):
+    """
+    Read-through lookup: return the cached value, or load, cache and return it
+
+    tags may be a callable computing the tags from the loaded value.
+    """
+    value = cache_get(key)
+    if value is not None:
+        return value
+
+    # Load the value on a miss; None results (e.g. missing rows) are not cached. A lagging replica
+    # could hand back a row older than the last invalidation and keep it cached for the whole TTL,
+    # so misses read from the primary.
+    with use_primary():
+        value = loader()
+    if value is not None:
+        cache_set(key, value, expire, tags(value) if callable(tags) else tags)
+    return value
+
+def _acquire_lock(key, timeout):
+    # Take the short-lived recompute lock of a key; returns a release callable, or None if held
+    if redis_client:
+        lock = redis_client.lock(_redis_key(f"lock:{key}"), timeout=timeout, blocking=False)
+        try:
+            if not lock.acquire():
+                return None
+        except RedisError as e:
+            logger.warning("Cache lock failed for %s: %s", key, e)
+            return None
+
+        def release():
+            try:
+                lock.release()
+            except (LockError, RedisError):
+                # The lock expired while recomputing; another worker may hold it now
+                pass
+        return release
+
+    # Without Redis, single-flight is per process
+    token = object()
+    with _local_locks_guard:
+        holder = _local_locks.get(key)
+        if holder is not None and holder[1] > time.monotonic():
+            return None
+        _local_locks[key] = (token, time.monotonic() + timeout)
+
+    def release():
+        with _local_locks_guard:
+            if _local_locks.get(key, (None,))[0] is token:
+                del _local_locks[key]
+    return release
+
+def _is_fresh(envelope, beta):
+    # Probabilistic early expiration (XFetch): the closer to expiry and the slower the
+    # recompute, the likelier a caller refreshes early, so refreshes rarely coincide
+    delta = envelope['delta'] * beta * -math.log(1.0 - random.random())
+    return time.time() + delta < envelope['expires_at']
+
+def cache_get_or_compute(key, compute, expire, tags=(), stale_ttl=None, lock_timeout=10, wait=2.0, beta=1.0):
+    """
+    Read-through lookup for expensive values with stampede protection
+
+    Only the caller holding the key's recompute lock runs compute; the others keep serving the
+    stale value for up to stale_ttl seconds (defaults to expire) after expiry, or wait up to
+    wait seconds for the first value. Entries are refreshed early with a probability that
+    grows towards expiry. tags may be a callable computing the tags from the value. compute
+    reads from the primary, as in cache_get_or_set.
+    """
+    stale_ttl = expire if stale_ttl is None else stale_ttl
+    envelope = cache_get(key)
+    if envelope is not None and _is_fresh(envelope, beta):
+        return envelope['value']
+
+    release = _acquire_lock(key, lock_timeout)
+    if release is None:
+        if envelope is not None:
+            # Another worker is refreshing; serve the stale value meanwhile
+            return envelope['value']
+
+        # Another worker is computing the first value; wait for it rather than piling on
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            envelope = cache_get(key)
+            if envelope is not None:
+                return envelope['value']
+        logger.warning("Timed out waiting for %s to be computed, computing it here", key)
+
+    try:
+        started = time.time()
+        with use_primary():
+            value = compute()
+        finished = time.time()
+        if value is not None:
+            cache_set(
+                key,
+                {'value': value, 'delta': finished - started, 'expires_at': finished + expire},
+                expire + stale_ttl,
+                tags(value) if callable(tags) else tags
+            )
+        return value
+    finally:
+        if release is not None:
+            release()
+
+def invalidate_entity(entity, entity_id):
+    """
+    Drop the cached serialized entity and every cached list containing it
+    """
+    key = entity_cache_key(entity, entity_id)
+    return cache_invalidate(keys=[key], tags=[key])
+
+def _change_tags(change):
+    # Tags of every cached value a committed write can make stale
+    entity = change.model.__tablename__
+    tags = {entity_cache_key(entity, change.id), f"list:{entity}"}
+    values, previous = change.values or {}, change.previous or {}
+    for field in LIST_TAG_FIELDS.get(entity, ()):
+        for source in (values, previous):
+            if field in source and source[field] is not UNKNOWN_VALUE:
+                tags.add(f"list:{entity}:{field}={_tag_value(source[field])}")
+        if field not in values or previous.get(field) is UNKNOWN_VALUE:
+            # Without the value, every list filtered on the field may be stale
+            tags.add(f"list:{entity}:{field}")
+    return tags
+
+@on_entities_changed
+def _invalidate_changed_entities(changes):
+    # Every committed write goes through here: service update_*/delete_*, route handlers and scraper save_*
+    keys, tags = set(), set()
+    for change in changes:
+        keys.add(entity_cache_key(change.model.__tablename__, change.id))
+        tags.update(_change_tags(change))
+    cache_invalidate(keys=keys, tags=tags)
 
 def cache_clear():
     """
     Clear all cached values
+
+    Bumps the key generation instead of flushing the Redis database, so data of other
+    applications is untouched; keys of the old generation expire on their own.
     """
+    global _key_generation
+    local_cache.clear()
+
     if not redis_client:
         return False
-    
-    # Attempt to flush all keys from Redis
-    success = redis_client.flushdb()
-    
-    # TODO: Add logging for cache clear operations
-    # TODO: Implement a mechanism to selectively clear cache based on patterns
-    return success
+    _ensure_subscriber()
+
+    try:
+        _key_generation = int(redis_client.incr(f"{_key_prefix}:generation"))
+    except RedisError as e:
+        logger.warning("Cache clear failed: %s", e)
+        return False
+
+    _publish_invalidation('all')
+    return True
 
 # Human tasks:
-# TODO: Implement error handling for Redis connection failures
-# TODO: Add logging for cache initialization events
-# TODO: Implement a fallback mechanism if Redis is unavailable
-# TODO: Implement error handling for deserialization failures
 # TODO: Add logging for cache misses
-# TODO: Consider implementing a cache prefix for better organization
-# TODO: Implement error handling for serialization failures
 # TODO: Add logging for cache set operations
-# TODO: Consider implementing a mechanism to update cache on data changes
 # TODO: Add logging for cache delete operations
-# TODO: Consider implementing a mechanism to clear related cache entries
 # TODO: Add logging for cache clear operations
-# TODO: Implement a mechanism to selectively clear cache based on patterns
\ No newline at end of file
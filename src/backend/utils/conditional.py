@@ -0,0 +1,186 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from flask import Response, current_app, jsonify, request
+from sqlalchemy import inspect
+from .pagination import order_by_sort_key, paginate_keyset
+
+# Column holding the version of an entity, where the model has one
+VERSION_FIELD = 'last_updated'
+
+def ensure_version_columns(connection, metadata):
+    """
+    Add the version column to existing tables whose model has one, and set it where it is NULL
+
+    Safe to run repeatedly. Rows without a version get the current time, so their validators
+    change once.
+
+    :param connection: SQLAlchemy connection, committed by the caller
+    :param metadata: MetaData of the models
+    :return: Dictionary of table name to rows given a version
+    """
+    inspector = inspect(connection)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    backfilled = {}
+    for table in metadata.sorted_tables:
+        column = table.c.get(VERSION_FIELD)
+        if column is None or not inspector.has_table(table.name):
+            continue
+        if VERSION_FIELD not in {existing['name'] for existing in inspector.get_columns(table.name)}:
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {VERSION_FIELD} {column_type}')
+        result = connection.execute(table.update().where(column.is_(None)).values({VERSION_FIELD: now}))
+        backfilled[table.name] = result.rowcount
+    return backfilled
+
+def make_etag(*parts):
+    """
+    Build a strong entity tag from the parts identifying a response's content
+
+    :param parts: JSON-encodable values, e.g. entity versions and page metadata
+    :return: Unquoted hex digest
+    """
+    raw = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def entity_etag(entity, data):
+    """
+    Entity tag of a serialized entity
+
+    Versioned entities are tagged by ID and version alone; others by a hash of their content.
+
+    :param entity: Entity name, e.g. 'startup'
+    :param data: Serialized entity
+    :return: Unquoted hex digest
+    """
+    if data.get(VERSION_FIELD) is not None:
+        return make_etag(entity, data['id'], data[VERSION_FIELD])
+    return make_etag(entity, data)
+
+def entity_last_modified(data):
+    """
+    Time of the last change of a serialized entity, if it is versioned
+
+    :param data: Serialized entity
+    :return: Naive UTC datetime, or None
+    """
+    version = data.get(VERSION_FIELD)
+    return datetime.fromisoformat(version) if version else None
+
+def list_etag(entity, response, items_key):
+    """
+    Entity tag of a list response, from the versions of its members and the rest of the body
+
+    Validators are scoped to the request URL, so filters and projections need not be part of it.
+    For versioned members the tag equals list_validator's, so a revalidation can be answered
+    before the page is loaded.
+
+    :param entity: Entity name, e.g. 'startup'
+    :param response: Response body
+    :param items_key: Key of the serialized entities in the body
+    :return: Unquoted hex digest
+    """
+    items = response[items_key]
+    if items and all(item.get(VERSION_FIELD) is not None for item in items):
+        members = [(item['id'], item[VERSION_FIELD]) for item in items]
+    else:
+        members = items
+    return make_etag(entity, members, {key: value for key, value in response.items() if key != items_key})
+
+def version_columns(model, sort_key=()):
+    """
+    Columns a list validator reads instead of the entities: the ID, the version and the sort key
+
+    :param model: Versioned SQLAlchemy model class
+    :param sort_key: Sort key whose columns are also read, for keyset cursors
+    :return: List of columns to pass to Query.with_entities
+    """
+    columns = {'id': model.id, VERSION_FIELD: getattr(model, VERSION_FIELD)}
+    for column, _ in sort_key:
+        columns.setdefault(column.key, column)
+    return list(columns.values())
+
+def list_validator(entity, rows, metadata):
+    """
+    Entity tag of a list page from the IDs and versions of its rows, read without loading or serializing them
+
+    :param entity: Entity name, e.g. 'startup'
+    :param rows: Rows of the page read with version_columns
+    :param metadata: Rest of the response body, e.g. total and page
+    :return: Unquoted hex digest equal to list_etag of the full response, or None if a row has no version
+    """
+    if any(getattr(row, VERSION_FIELD) is None for row in rows):
+        return None
+    members = [(row.id, getattr(row, VERSION_FIELD).isoformat()) for row in rows]
+    return make_etag(entity, members, metadata)
+
+def not_modified(etag):
+    """
+    Answer a GET with 304 Not Modified when its If-None-Match matches, before the body is built
+
+    :param etag: Entity tag from list_validator, or None
+    :return: 304 response with the validators set, or None when the full response is needed
+    """
+    if etag is None or not request.if_none_match.contains(etag):
+        return None
+    return conditional_json(None, etag)
+
+def revalidate_page(entity, model, query, sort_key, metadata, page=1, per_page=20, cursor=None):
+    """
+    Answer a revalidation of a list page from the IDs and versions of its rows, before the page is loaded
+
+    Only conditional requests run the narrow version query; a match skips loading, serializing
+    and encoding the page.
+
+    :param entity: Entity name, e.g. 'startup'
+    :param model: Versioned SQLAlchemy model class
+    :param query: Filtered query without ordering, limits or loader options
+    :param sort_key: Sort key of the list
+    :param metadata: Rest of the response body; in cursor mode next_cursor is added here
+    :param page: Page number in offset mode
+    :param per_page: Number of rows per page
+    :param cursor: Cursor of the request in cursor mode, else None
+    :return: 304 response, or None when the full response is needed
+    :raises ValueError: If the cursor is malformed
+    """
+    if not request.if_none_match:
+        return None
+    versions = query.with_entities(*version_columns(model, sort_key))
+    if cursor is None:
+        rows = order_by_sort_key(versions, sort_key).offset((page - 1) * per_page).limit(per_page).all()
+    else:
+        rows, next_cursor = paginate_keyset(versions, sort_key, cursor, per_page)
+        metadata = dict(metadata, next_cursor=next_cursor)
+    return not_modified(list_validator(entity, rows, metadata))
+
+def _not_modified(etag, last_modified):
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110, 13.2.2)
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+def conditional_json(payload, etag, last_modified=None):
+    """
+    Answer a GET with 304 Not Modified when the client's validators match, else with the JSON payload
+
+    :param payload: JSON-encodable response body
+    :param etag: Entity tag from make_etag, entity_etag or list_etag
+    :param last_modified: Naive UTC datetime of the last change, if known
+    :return: Flask response with ETag, Last-Modified and Cache-Control set
+    """
+    if last_modified is not None and last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+    # A match skips encoding the body altogether
+    response = Response(status=304) if _not_modified(etag, last_modified) else jsonify(payload)
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+
+    # Let browsers and the proxy tier reuse the response per credential, revalidating once stale
+    response.cache_control.max_age = current_app.config.get('HTTP_CACHE_MAX_AGE', 0)
+    response.cache_control.must_revalidate = True
+    response.vary.add('Authorization')
+    return response
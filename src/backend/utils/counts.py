@@ -0,0 +1,109 @@
+import json
+from flask import current_app
+from sqlalchemy import func
+from .cache import cache_get, cache_set, list_tags, normalize_filters
+from .db import use_primary
+
+# Count modes accepted by count_total
+COUNT_MODES = ('auto', 'exact', 'none')
+
+def parse_count_mode(value):
+    """
+    Translate the ?count= query parameter into a count mode
+
+    :param value: Raw parameter value or None
+    :return: One of COUNT_MODES
+    """
+    if value is None:
+        return 'auto'
+    value = value.lower()
+    if value in ('false', '0', 'no', 'none'):
+        return 'none'
+    if value == 'exact':
+        return 'exact'
+    return 'auto'
+
+def count_cache_key(entity, filters):
+    """
+    Build the cache key for the exact count of an entity under a filter set
+
+    :param entity: Table name of the counted entity
+    :param filters: Dictionary of filter names to values
+    :return: Cache key string
+    """
+    return f'count:{entity}:{normalize_filters(filters)}'
+
+def estimate_count(query):
+    """
+    Ask the Postgres planner for its row estimate of a query
+
+    :param query: SQLAlchemy query
+    :return: Estimated row count, or None if the database has no usable planner estimate
+    """
+    bind = query.session.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return None
+
+    compiled = query.statement.compile(dialect=bind.dialect)
+    plan = query.session.connection().exec_driver_sql(
+        f'EXPLAIN (FORMAT JSON) {compiled}', compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+def capped_count(query, cap):
+    """
+    Count the rows of a query, stopping after cap + 1 rows
+
+    :param query: SQLAlchemy query
+    :param cap: Maximum count of interest
+    :return: Row count, at most cap + 1
+    """
+    limited = query.order_by(None).limit(cap + 1).subquery()
+    return query.session.query(func.count()).select_from(limited).scalar()
+
+def count_total(query, entity, filters=None, mode='auto'):
+    """
+    Count the rows matching a list query using the cheapest adequate strategy
+
+    Exact counts are cached per normalized filter set until the TTL expires or a write touches
+    rows the filters can match. In 'auto' mode, filters the planner expects to match more than
+    COUNT_CAP rows are answered with the estimate, and others with a count that stops at COUNT_CAP.
+    Counts that get cached are taken on the primary, so a lagging replica cannot cache a stale total.
+
+    :param query: SQLAlchemy query without ordering or limits
+    :param entity: Table name of the counted entity
+    :param filters: Dictionary describing the filters applied to the query
+    :param mode: 'auto', 'exact' or 'none'
+    :return: Tuple of (total or None, boolean indicating whether the total is exact)
+    """
+    if mode == 'none':
+        return None, False
+
+    key = count_cache_key(entity, filters)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached, True
+
+    ttl = current_app.config.get('COUNT_CACHE_TTL', 300)
+    cap = current_app.config.get('COUNT_CAP', 10000)
+
+    if mode == 'exact':
+        with use_primary():
+            total = query.order_by(None).count()
+        cache_set(key, total, expire=ttl, tags=list_tags(entity, filters))
+        return total, True
+
+    # Skip scanning entirely when the planner already knows the result is large
+    estimate = estimate_count(query)
+    if estimate is not None and estimate > cap:
+        return estimate, False
+
+    with use_primary():
+        total = capped_count(query, cap)
+    if total > cap:
+        return cap, False
+
+    cache_set(key, total, expire=ttl, tags=list_tags(entity, filters))
+    return total, True
@@ -1,7 +1,131 @@
+import heapq
+import json
+import logging
+import random
+import re
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import current_app, g, has_app_context, has_request_context, request
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import UpdateBase
+
+logger = logging.getLogger(__name__)
+
+# One JSON record per statement slower than SQLALCHEMY_SLOW_QUERY_MS
+slow_query_logger = logging.getLogger(f"{__name__}.slow_queries")
+
+# Cookie keeping a client's reads on the primary for a few seconds after its writes
+PRIMARY_PIN_COOKIE = 'read_primary'
+
+# Read target forced by use_primary or use_replica, if any
+_read_target = ContextVar('read_target', default=None)
+
+class RoutingSession(FlaskSession):
+    """
+    Session sending the reads of GET requests to a read replica and everything else to the primary
+
+    Each session sticks to one randomly chosen replica. Once a session flushes or executes a
+    write statement, its later reads go to the primary as well, so it reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or isinstance(clause, UpdateBase):
+                _pin_primary(self)
+            elif self._reads_from_replica():
+                replica = self._replica()
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self):
+        if self.info.get('primary_pinned'):
+            return False
+        target = _read_target.get()
+        if target is not None:
+            return target == 'replica'
+        return (has_request_context() and request.method in ('GET', 'HEAD')
+                and PRIMARY_PIN_COOKIE not in request.cookies)
+
+    def _replica(self):
+        if 'replica' not in self.info:
+            replicas = replica_engines()
+            self.info['replica'] = random.choice(replicas) if replicas else None
+        return self.info['replica']
+
+def _pin_primary(session):
+    # Keep the session, and the client through the pin cookie, on the primary
+    session.info['primary_pinned'] = True
+    if has_request_context():
+        g.wrote_primary = True
 
 # Initialize SQLAlchemy instance
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# A single entity written by a committed transaction; operation is 'insert', 'update' or 'delete'.
+# values holds the loaded column values at flush time and previous the old values of updated columns.
+EntityChange = namedtuple('EntityChange', ['model', 'id', 'operation', 'instance', 'values', 'previous'],
+                          defaults=(None, None))
+
+# Previous value of a column that was changed without its old value being loaded
+UNKNOWN_VALUE = object()
+
+# Callbacks notified with the entity changes of every committed transaction
+_change_listeners = []
+
+# Query counters active in the current context, innermost last
+_active_query_counters = ContextVar('active_query_counters', default=())
+
+# Query profiles active in the current context, innermost last
+_active_query_profiles = ContextVar('active_query_profiles', default=())
+
+# Literals and bind parameter lists replaced when normalizing SQL, so statements group by shape
+_SQL_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SQL_PARAMETER_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SQL_PARAMETERS = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+")
+_SQL_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE)\s+\"?(\w+)", re.IGNORECASE)
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a block of code or a request runs more SQL statements than its budget allows"""
+
+class QueryCounter:
+    """Records the SQL statements executed while it is active"""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+class QueryProfile:
+    """Records the number, total duration and slowest of the SQL statements executed while it is active"""
+
+    def __init__(self, keep=3):
+        self.count = 0
+        self.total_time = 0.0
+        self.keep = keep
+        self._slowest = []
+
+    def record(self, statement, duration):
+        self.count += 1
+        self.total_time += duration
+        # Min-heap of the slowest statements, so the fastest of them is replaced first
+        if len(self._slowest) < self.keep:
+            heapq.heappush(self._slowest, (duration, statement))
+        elif duration > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (duration, statement))
+
+    @property
+    def slowest(self):
+        # (duration, statement) pairs, slowest first
+        return sorted(self._slowest, reverse=True)
 
 def init_db(app):
     """
@@ -17,6 +141,66 @@ def init_db(app):
     with app.app_context():
         db.create_all()
 
+def init_replicas(app):
+    """
+    Create engines for the read replicas of SQLALCHEMY_REPLICA_URIS
+
+    Replicas are not binds of db, so create_all and drop_all never touch them. Their pools use
+    the primary's SQLALCHEMY_ENGINE_OPTIONS, instrumented when init_pool_metrics ran first.
+
+    :param app: Flask application instance
+    :return: None
+    """
+    uris = app.config.get('SQLALCHEMY_REPLICA_URIS') or []
+    engine_options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+    app.extensions['replica_engines'] = [create_engine(uri, **engine_options) for uri in uris]
+    if not uris:
+        return
+    pin_seconds = app.config.get('REPLICA_PIN_SECONDS', 5)
+
+    @app.after_request
+    def pin_primary_after_write(response):
+        # Replicas lag behind; let the client read its own writes from the primary for a while
+        if g.pop('wrote_primary', False):
+            response.set_cookie(PRIMARY_PIN_COOKIE, '1', max_age=pin_seconds, httponly=True, samesite='Lax')
+        return response
+
+def replica_engines():
+    """
+    Engines of the current app's read replicas
+
+    :return: List of SQLAlchemy Engines, empty without replicas
+    """
+    return current_app.extensions.get('replica_engines', [])
+
+@contextmanager
+def use_primary():
+    """
+    Send the reads inside the block, or of the decorated function, to the primary
+
+    :return: Context manager, also usable as a decorator
+    """
+    token = _read_target.set('primary')
+    try:
+        yield
+    finally:
+        _read_target.reset(token)
+
+@contextmanager
+def use_replica():
+    """
+    Send the reads inside the block, or of the decorated function, to a read replica
+
+    Sessions that already wrote keep reading from the primary.
+
+    :return: Context manager, also usable as a decorator
+    """
+    token = _read_target.set('replica')
+    try:
+        yield
+    finally:
+        _read_target.reset(token)
+
 def get_or_create(model, **kwargs):
     """
     Get an existing database record or create a new one if it doesn't exist
@@ -42,6 +226,249 @@ def get_or_create(model, **kwargs):
         # Return the new record and True
         return instance, True
 
+def on_entities_changed(listener):
+    """
+    Register a callback notified after each commit with the entities it wrote
+
+    :param listener: Callable taking a list of EntityChange tuples
+    :return: The listener, so this can be used as a decorator
+    """
+    _change_listeners.append(listener)
+    return listener
+
+def notify_entities_changed(changes):
+    """
+    Notify registered listeners of entity changes
+
+    Writes that bypass the ORM unit of work (bulk statements) call this directly.
+
+    :param changes: List of EntityChange tuples
+    :return: None
+    """
+    if not changes:
+        return
+
+    for listener in _change_listeners:
+        try:
+            listener(changes)
+        except Exception:
+            # A failing listener must never fail the write that already committed
+            logger.exception("Entity change listener %r failed", listener)
+
+@event.listens_for(Session, 'after_flush')
+def _record_entity_changes(session, flush_context):
+    # The new, dirty and deleted collections still hold the pre-flush state here
+    changes = session.info.setdefault('entity_changes', [])
+    for operation, instances in (('insert', session.new), ('update', session.dirty), ('delete', session.deleted)):
+        for instance in instances:
+            if operation == 'update' and not session.is_modified(instance):
+                continue
+            state = inspect(instance)
+            primary_key = state.mapper.primary_key_from_instance(instance)
+
+            # Snapshot column values now; after commit they are expired and reading them would query
+            values, previous = {}, {}
+            for attr in state.mapper.column_attrs:
+                if attr.key in state.dict:
+                    values[attr.key] = state.dict[attr.key]
+                if operation == 'update':
+                    history = state.attrs[attr.key].history
+                    if history.has_changes():
+                        previous[attr.key] = history.deleted[0] if history.deleted else UNKNOWN_VALUE
+
+            changes.append(EntityChange(type(instance), primary_key[0], operation, instance, values, previous))
+
+@event.listens_for(Session, 'after_commit')
+def _dispatch_entity_changes(session):
+    notify_entities_changed(session.info.pop('entity_changes', None))
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_entity_changes(session, previous_transaction):
+    session.info.pop('entity_changes', None)
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    for counter in _active_query_counters.get():
+        counter.statements.append(statement)
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _record_query_time(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_query_started', None)
+    if started is None:
+        return
+    duration = time.perf_counter() - started
+    for profile in _active_query_profiles.get():
+        profile.record(statement, duration)
+    _log_slow_query(statement, duration)
+
+def normalize_sql(statement):
+    """
+    Normalize a SQL statement so executions differing only in values group together
+
+    Collapses whitespace, replaces literals and bind parameters with ? and lists of them with (...).
+
+    :param statement: SQL statement
+    :return: Normalized SQL
+    """
+    sql = _SQL_PARAMETERS.sub('?', _SQL_LITERALS.sub('?', statement))
+    return _SQL_PARAMETER_LISTS.sub('(...)', ' '.join(sql.split()))
+
+def _statement_summary(statement):
+    # Verb and first table of a statement, e.g. 'SELECT startup'; never includes values
+    words = statement.split(None, 1)
+    if not words:
+        return 'SQL'
+    table = _SQL_TABLE.search(statement)
+    return f"{words[0].upper()} {table.group(1)}" if table else words[0].upper()
+
+def _log_slow_query(statement, duration):
+    if not has_app_context():
+        return
+    threshold = current_app.config.get('SQLALCHEMY_SLOW_QUERY_MS')
+    if threshold is None or duration * 1000 < threshold:
+        return
+
+    record = {'duration_ms': round(duration * 1000, 2), 'sql': normalize_sql(statement)}
+    if has_request_context():
+        record.update({
+            'method': request.method,
+            'route': request.url_rule.rule if request.url_rule else request.path,
+            'endpoint': request.endpoint,
+        })
+    slow_query_logger.warning("Slow query: %s", json.dumps(record), extra={'slow_query': record})
+
+@contextmanager
+def count_queries():
+    """
+    Count the SQL statements executed inside the block
+
+    :return: Context manager yielding a QueryCounter
+    """
+    counter = QueryCounter()
+    token = _active_query_counters.set(_active_query_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _active_query_counters.reset(token)
+
+@contextmanager
+def profile_queries(keep=3):
+    """
+    Time the SQL statements executed inside the block
+
+    :param keep: Number of slowest statements to keep
+    :return: Context manager yielding a QueryProfile
+    """
+    profile = QueryProfile(keep)
+    token = _active_query_profiles.set(_active_query_profiles.get() + (profile,))
+    try:
+        yield profile
+    finally:
+        _active_query_profiles.reset(token)
+
+def server_timing(profile):
+    """
+    Server-Timing header value of a query profile
+
+    Reports the total database time and query count, then each of the slowest statements
+    by verb and table only, so no values reach the client.
+
+    :param profile: QueryProfile
+    :return: Header value, e.g. 'db;dur=12.5;desc="4 queries", db-1;dur=9.1;desc="SELECT startup"'
+    """
+    metrics = [f'db;dur={profile.total_time * 1000:.2f};desc="{profile.count} queries"']
+    for rank, (duration, statement) in enumerate(profile.slowest, 1):
+        metrics.append(f'db-{rank};dur={duration * 1000:.2f};desc="{_statement_summary(statement)}"')
+    return ', '.join(metrics)
+
+def init_query_timing(app):
+    """
+    Time the SQL statements of every request and report them in a Server-Timing header
+
+    Statements slower than SQLALCHEMY_SLOW_QUERY_MS are logged whether or not the header is enabled.
+
+    :param app: Flask application instance
+    :return: None
+    """
+    if not app.config.get('SQLALCHEMY_SERVER_TIMING'):
+        return
+
+    @app.before_request
+    def start_query_timing():
+        g.query_profile = QueryProfile()
+        g.query_profile_token = _active_query_profiles.set(_active_query_profiles.get() + (g.query_profile,))
+
+    @app.after_request
+    def add_server_timing(response):
+        profile = g.pop('query_profile', None)
+        if profile is not None:
+            response.headers.add('Server-Timing', server_timing(profile))
+        return response
+
+    @app.teardown_request
+    def stop_query_timing(exception=None):
+        token = g.pop('query_profile_token', None)
+        if token is not None:
+            _active_query_profiles.reset(token)
+
+@contextmanager
+def query_budget(max_queries):
+    """
+    Fail if the block executes more than max_queries SQL statements
+
+    :param max_queries: Number of statements allowed
+    :return: Context manager yielding a QueryCounter
+    :raises QueryBudgetExceeded: If the block exceeds the budget
+    """
+    with count_queries() as counter:
+        yield counter
+    if counter.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{counter.count} queries executed, budget is {max_queries}:\n" + "\n".join(counter.statements)
+        )
+
+def init_query_budget(app):
+    """
+    Fail every request that executes more SQL statements than SQLALCHEMY_QUERY_BUDGET
+
+    Meant for the test configuration, so N+1 query regressions fail the route tests.
+    Individual endpoints can get their own budget through SQLALCHEMY_QUERY_BUDGETS.
+
+    :param app: Flask application instance
+    :return: None
+    """
+    default_budget = app.config.get('SQLALCHEMY_QUERY_BUDGET')
+    endpoint_budgets = app.config.get('SQLALCHEMY_QUERY_BUDGETS', {})
+    if not default_budget and not endpoint_budgets:
+        return
+
+    @app.before_request
+    def start_query_budget():
+        g.query_counter = QueryCounter()
+        g.query_counter_token = _active_query_counters.set(_active_query_counters.get() + (g.query_counter,))
+
+    @app.after_request
+    def check_query_budget(response):
+        budget = endpoint_budgets.get(request.endpoint, default_budget)
+        counter = g.pop('query_counter', None)
+        if budget and counter and counter.count > budget:
+            raise QueryBudgetExceeded(
+                f"{request.method} {request.path} executed {counter.count} queries, budget is {budget}:\n"
+                + "\n".join(counter.statements)
+            )
+        return response
+
+    @app.teardown_request
+    def stop_query_budget(exception=None):
+        token = g.pop('query_counter_token', None)
+        if token is not None:
+            _active_query_counters.reset(token)
+
 # Human tasks:
 # TODO: Implement database migration strategy using Flask-Migrate
 # TODO: Add error handling for database initialization failures
@@ -0,0 +1,179 @@
+import csv
+import io
+import json
+import zlib
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Numeric
+
+# Rows fetched per round trip from the server-side cursor, and written per output chunk
+DEFAULT_BATCH_SIZE = 2000
+
+# Content type of each export format
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+def export_columns(model, fields=None):
+    """
+    Columns of a model to export, in table order
+
+    :param model: SQLAlchemy model class
+    :param fields: Projection from parse_fields, or None for all columns
+    :return: List of columns
+    """
+    return [column for column in model.__table__.columns if fields is None or column.name in fields]
+
+def stream_rows(query, columns, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Stream the rows of a filtered query in batches through a server-side cursor
+
+    Only the exported columns are selected, as plain tuples, so no ORM instances accumulate in
+    the identity map and memory stays flat regardless of the number of rows.
+
+    :param query: SQLAlchemy query with the filters applied
+    :param columns: Columns to select
+    :param batch_size: Rows fetched per round trip
+    :return: Generator of lists of row tuples
+    """
+    result = query.with_entities(*columns).execution_options(yield_per=batch_size)
+    batch = []
+    for row in result:
+        batch.append(tuple(row))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _text_value(value):
+    # Dates as ISO strings, like the JSON serializers
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+def csv_chunks(columns, batches):
+    """
+    Encode row batches as CSV, one chunk per batch after the header
+
+    :param columns: Exported columns, giving the header
+    :param batches: Iterable of lists of row tuples
+    :return: Generator of bytes
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.name for column in columns])
+    for batch in batches:
+        writer.writerows([[_text_value(value) for value in row] for row in batch])
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+def ndjson_chunks(columns, batches):
+    """
+    Encode row batches as newline-delimited JSON objects
+
+    :param columns: Exported columns, giving the keys
+    :param batches: Iterable of lists of row tuples
+    :return: Generator of bytes
+    """
+    names = [column.name for column in columns]
+    for batch in batches:
+        yield ''.join(
+            json.dumps(dict(zip(names, [_text_value(value) for value in row])), separators=(',', ':')) + '\n'
+            for row in batch
+        ).encode('utf-8')
+
+class _ParquetSink:
+    """Write-only file object handing the bytes written so far to the response"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data, self._chunks = b''.join(self._chunks), []
+        return data
+
+def _arrow_type(pa, column):
+    # Arrow type of a column; anything not numeric, boolean or temporal is exported as text
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, (Float, Numeric)):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp('us')
+    if isinstance(column_type, Date):
+        return pa.date32()
+    return pa.string()
+
+def parquet_chunks(columns, batches):
+    """
+    Encode row batches as a Parquet file, one row group per batch
+
+    :param columns: Exported columns, giving the schema
+    :param batches: Iterable of lists of row tuples
+    :return: Generator of bytes
+    :raises RuntimeError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError('Parquet export requires pyarrow')
+
+    schema = pa.schema([(column.name, _arrow_type(pa, column)) for column in columns])
+    sink = _ParquetSink()
+
+    def generate():
+        with pq.ParquetWriter(sink, schema) as writer:
+            for batch in batches:
+                arrays = [pa.array([row[i] for row in batch], type=field.type) for i, field in enumerate(schema)]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                yield sink.drain()
+        yield sink.drain()
+
+    return generate()
+
+def gzip_chunks(chunks, level=6):
+    """
+    Compress a stream of chunks on the fly into one gzip stream
+
+    :param chunks: Iterable of bytes
+    :param level: zlib compression level
+    :return: Generator of bytes
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+# Chunk encoder of each export format
+ENCODERS = {'csv': csv_chunks, 'ndjson': ndjson_chunks, 'parquet': parquet_chunks}
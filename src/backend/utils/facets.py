@@ -0,0 +1,48 @@
+from sqlalchemy import Boolean, String, cast, func, literal, select, union_all
+
+def _facet_value(column, value):
+    # Values come back as text from the UNION ALL path; restore booleans
+    if isinstance(column.type, Boolean) and isinstance(value, str):
+        return value.lower() in ('1', 'true', 't')
+    return value
+
+def facet_counts(query, columns):
+    """
+    Count the rows of a filtered query per value of several columns in one SQL statement
+
+    Postgres groups by GROUPING SETS and tells the facets apart with GROUPING(); other
+    databases run one GROUP BY per column combined with UNION ALL.
+
+    :param query: SQLAlchemy query with the current filters applied
+    :param columns: Model columns to count values of
+    :return: Dictionary of column name to a list of {'value', 'count'} dictionaries, largest first
+    """
+    filtered = query.order_by(None).with_entities(*columns).subquery()
+    facet_columns = [filtered.c[column.key] for column in columns]
+    session = query.session
+
+    if session.get_bind().dialect.name == 'postgresql':
+        # One bit per column in GROUPING(...), set for the columns not grouped in the row
+        statement = select(*facet_columns, func.grouping(*facet_columns), func.count()).group_by(
+            func.grouping_sets(*facet_columns)
+        )
+        rows = []
+        for row in session.execute(statement):
+            bits = row[len(columns)]
+            position = next(i for i in range(len(columns)) if not bits & (1 << (len(columns) - 1 - i)))
+            rows.append((columns[position].key, row[position], row[-1]))
+    else:
+        statement = union_all(*[
+            select(literal(column.key).label('facet'), cast(facet_column, String).label('value'), func.count())
+            .group_by(facet_column)
+            for column, facet_column in zip(columns, facet_columns)
+        ])
+        rows = [(facet, value, count) for facet, value, count in session.execute(statement)]
+
+    by_key = {column.key: column for column in columns}
+    counts = {column.key: [] for column in columns}
+    for facet, value, count in rows:
+        counts[facet].append({'value': _facet_value(by_key[facet], value), 'count': count})
+    for values in counts.values():
+        values.sort(key=lambda item: (-item['count'], str(item['value'])))
+    return counts
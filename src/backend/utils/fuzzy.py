@@ -0,0 +1,301 @@
+import math
+import os
+import re
+import threading
+import time
+from flask import current_app
+from sqlalchemy import DDL, event, func, or_, select
+from .db import db, on_entities_changed
+
+# Default minimum similarity of a fuzzy name match, same as the pg_trgm default
+DEFAULT_SIMILARITY_THRESHOLD = 0.3
+
+# Default maximum IDs a fuzzy name filter matches outside Postgres, passed to the database in one IN list
+DEFAULT_MAX_CANDIDATES = 500
+
+# Words of a name, as split by pg_trgm
+_WORD_PATTERN = re.compile(r'[^\W_]+', re.UNICODE)
+
+# Postgres extension providing the trigram operators and index support
+_PG_TRGM_DDL = 'CREATE EXTENSION IF NOT EXISTS pg_trgm'
+
+# Models declared with register_name_index
+_name_indexed_models = []
+
+# Name indexes keyed by table name; built on first use in each worker process and rebuilt when stale
+_name_indexes = {}
+_name_indexes_lock = threading.Lock()
+
+def trigrams(text):
+    """
+    Trigrams of a string, computed like pg_trgm
+
+    Each lower-cased word is padded with two spaces in front and one behind.
+
+    :param text: String to split
+    :return: Set of trigrams
+    """
+    result = set()
+    for word in _WORD_PATTERN.findall((text or '').lower()):
+        padded = f'  {word} '
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+def similarity(a, b):
+    """
+    Trigram similarity of two strings, as pg_trgm's similarity()
+
+    :param a: First string
+    :param b: Second string
+    :return: Shared trigrams over all distinct trigrams, between 0 and 1
+    """
+    trigrams_a, trigrams_b = trigrams(a), trigrams(b)
+    if not trigrams_a or not trigrams_b:
+        return 0.0
+    shared = len(trigrams_a & trigrams_b)
+    return shared / (len(trigrams_a) + len(trigrams_b) - shared)
+
+class NgramIndex:
+    """In-process trigram index of entity names, standing in for pg_trgm outside Postgres"""
+
+    def __init__(self):
+        # When and in which process the index was built, to tell when it is stale
+        self.built_at = time.monotonic()
+        self.built_pid = os.getpid()
+        self._names = {}
+        self._grams = {}
+        self._postings = {}
+        self._lock = threading.Lock()
+
+    def add(self, entity_id, name):
+        with self._lock:
+            self._remove(entity_id)
+            grams = frozenset(trigrams(name))
+            self._names[entity_id] = name
+            self._grams[entity_id] = grams
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(entity_id)
+
+    def remove(self, entity_id):
+        with self._lock:
+            self._remove(entity_id)
+
+    def _remove(self, entity_id):
+        # Drop an entity from the postings; the caller holds the lock
+        if self._names.pop(entity_id, None) is None:
+            return
+        for gram in self._grams.pop(entity_id):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(entity_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def search(self, query, threshold=DEFAULT_SIMILARITY_THRESHOLD, limit=None):
+        """
+        Find names similar to a query
+
+        :param query: Name to look up, possibly misspelt
+        :param threshold: Minimum similarity between 0 and 1
+        :param limit: Maximum number of matches, or None for all
+        :return: List of (id, name, similarity) tuples, most similar first
+        """
+        grams = trigrams(query)
+        if not grams:
+            return []
+
+        with self._lock:
+            # A match shares at least min_shared trigrams with the query, so it contains one of the
+            # len(grams) - min_shared + 1 rarest ones; only their postings produce candidates
+            min_shared = max(1, math.ceil(threshold * len(grams)))
+            rarest = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+            candidates = set()
+            for gram in rarest[:len(grams) - min_shared + 1]:
+                candidates.update(self._postings.get(gram, ()))
+
+            matches = []
+            for entity_id in candidates:
+                entity_grams = self._grams[entity_id]
+                shared = len(grams & entity_grams)
+                score = shared / (len(grams) + len(entity_grams) - shared)
+                if score >= threshold:
+                    matches.append((entity_id, self._names[entity_id], score))
+
+        matches.sort(key=lambda match: (-match[2], match[1], match[0]))
+        return matches[:limit] if limit else matches
+
+    def contains(self, text):
+        """
+        Find names containing a substring, case-insensitively, like ILIKE '%text%'
+
+        :param text: Substring to look for
+        :return: Set of matching IDs
+        """
+        needle = text.lower()
+        with self._lock:
+            # Every trigram inside a word of the substring must be a trigram of the name
+            candidates = None
+            for word in _WORD_PATTERN.findall(needle):
+                for i in range(len(word) - 2):
+                    ids = self._postings.get(word[i:i + 3], set())
+                    candidates = set(ids) if candidates is None else candidates & ids
+            if candidates is None:
+                candidates = self._names.keys()
+            return {entity_id for entity_id in candidates if needle in self._names[entity_id].lower()}
+
+    def __len__(self):
+        return len(self._names)
+
+def _name_index_ddl(model):
+    table = model.__tablename__
+    return f'CREATE INDEX IF NOT EXISTS ix_{table}_name_trgm ON {table} USING gin (name gin_trgm_ops)'
+
+def register_name_index(model):
+    """
+    Declare a trigram index over the name column of a model
+
+    On Postgres, a pg_trgm GIN index is created along with the table, or by ensure_name_indexes
+    for an existing one; elsewhere an NgramIndex is built in each worker on first use, kept
+    current from the worker's own committed writes and rebuilt every NAME_INDEX_REFRESH_SECONDS
+    to pick up writes of other workers.
+
+    :param model: SQLAlchemy model class with a name column
+    :return: None
+    """
+    _name_indexed_models.append(model)
+    event.listen(model.__table__, 'before_create', DDL(_PG_TRGM_DDL).execute_if(dialect='postgresql'))
+    event.listen(model.__table__, 'after_create', DDL(_name_index_ddl(model)).execute_if(dialect='postgresql'))
+
+def ensure_name_indexes(connection):
+    """
+    Create the pg_trgm indexes of tables that existed before them
+
+    Safe to run repeatedly; other databases keep their name indexes in process.
+
+    :param connection: SQLAlchemy connection, committed by the caller
+    :return: Names of the indexed tables
+    """
+    if connection.dialect.name != 'postgresql':
+        return []
+    connection.exec_driver_sql(_PG_TRGM_DDL)
+    for model in _name_indexed_models:
+        connection.exec_driver_sql(_name_index_ddl(model))
+    return [model.__tablename__ for model in _name_indexed_models]
+
+def _uses_pg_trgm():
+    return db.session.get_bind().dialect.name == 'postgresql'
+
+def _is_stale(index, max_age):
+    return index is None or index.built_pid != os.getpid() or time.monotonic() - index.built_at > max_age
+
+def get_name_index(model):
+    """
+    Get the in-process name index of a model, loading it from the database on first use after
+    start or fork, and again once it is older than NAME_INDEX_REFRESH_SECONDS
+
+    :param model: SQLAlchemy model class registered with register_name_index
+    :return: NgramIndex
+    """
+    table = model.__tablename__
+    max_age = current_app.config.get('NAME_INDEX_REFRESH_SECONDS', 300)
+    index = _name_indexes.get(table)
+    if _is_stale(index, max_age):
+        with _name_indexes_lock:
+            index = _name_indexes.get(table)
+            if _is_stale(index, max_age):
+                index = NgramIndex()
+                for entity_id, name in db.session.execute(select(model.id, model.name)):
+                    index.add(entity_id, name)
+                _name_indexes[table] = index
+    return index
+
+def parse_threshold(value):
+    """
+    Parse a similarity threshold request parameter
+
+    :param value: Raw parameter value, or None for the default
+    :return: Threshold between 0 and 1
+    :raises ValueError: If the value is not a number between 0 and 1
+    """
+    if value is None:
+        return DEFAULT_SIMILARITY_THRESHOLD
+    try:
+        threshold = float(value)
+    except ValueError:
+        raise ValueError('threshold must be between 0 and 1') from None
+    if not 0 <= threshold <= 1:
+        raise ValueError('threshold must be between 0 and 1')
+    return threshold
+
+def contains_pattern(text):
+    """
+    LIKE pattern matching strings that contain a text, with its wildcards escaped
+
+    :param text: Literal text from the request
+    :return: Pattern for like()/ilike() with escape='\\'
+    """
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+def _set_similarity_threshold(threshold):
+    # Threshold of the pg_trgm % operator, for the current transaction only
+    db.session.execute(select(func.set_config('pg_trgm.similarity_threshold', str(threshold), True)))
+
+def fuzzy_name_filter(model, name, threshold=DEFAULT_SIMILARITY_THRESHOLD):
+    """
+    Build a filter matching names that contain the text or are similar to it
+
+    Both branches use the trigram index: pg_trgm on Postgres, the in-process index elsewhere.
+    Outside Postgres, the filter matches at most NAME_FILTER_MAX_CANDIDATES names, substring
+    matches first, then the most similar ones.
+
+    :param model: SQLAlchemy model class registered with register_name_index
+    :param name: Name filter from the request
+    :param threshold: Minimum similarity between 0 and 1
+    :return: SQLAlchemy filter expression
+    """
+    if _uses_pg_trgm():
+        _set_similarity_threshold(threshold)
+        return or_(model.name.ilike(contains_pattern(name), escape='\\'), model.name.op('%')(name))
+
+    index = get_name_index(model)
+    max_candidates = current_app.config.get('NAME_FILTER_MAX_CANDIDATES', DEFAULT_MAX_CANDIDATES)
+    ids = sorted(index.contains(name))[:max_candidates]
+    if len(ids) < max_candidates:
+        found = set(ids)
+        similar = [entity_id for entity_id, _, _ in index.search(name, threshold) if entity_id not in found]
+        ids.extend(similar[:max_candidates - len(ids)])
+    return model.id.in_(ids)
+
+def fuzzy_name_matches(model, name, threshold=DEFAULT_SIMILARITY_THRESHOLD, limit=10):
+    """
+    Find the entities whose names are most similar to a query
+
+    :param model: SQLAlchemy model class registered with register_name_index
+    :param name: Name to look up, possibly misspelt
+    :param threshold: Minimum similarity between 0 and 1
+    :param limit: Maximum number of matches
+    :return: List of (id, name, similarity) tuples, most similar first
+    """
+    if _uses_pg_trgm():
+        _set_similarity_threshold(threshold)
+        score = func.similarity(model.name, name)
+        rows = db.session.execute(
+            select(model.id, model.name, score).where(model.name.op('%')(name))
+            .order_by(score.desc(), model.name, model.id).limit(limit)
+        )
+        return [tuple(row) for row in rows]
+
+    return get_name_index(model).search(name, threshold, limit)
+
+@on_entities_changed
+def _update_name_indexes(changes):
+    # Keep the in-process indexes of this worker current with committed writes
+    for change in changes:
+        index = _name_indexes.get(change.model.__tablename__)
+        if index is None:
+            continue
+        if change.operation == 'delete':
+            index.remove(change.id)
+        elif change.values and 'name' in change.values:
+            index.add(change.id, change.values['name'])
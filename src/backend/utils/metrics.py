@@ -0,0 +1,387 @@
+import bisect
+import glob
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from flask import g, request
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the default latency buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Upper bounds in bytes of the payload size buckets
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+# Metric definitions: name -> (type, help text, bucket bounds of histograms)
+_definitions = {}
+
+# Samples of this worker, sharded per thread so recording takes no lock: each shard is only
+# written by its own thread, and collecting copies them. Each shard is a pair of dictionaries,
+# (name, labels) -> counter value and (name, labels) -> [count per bucket..., count above, sum].
+# When a thread exits its shard is folded into the base shard, so short-lived threads do not pile up.
+_base = ({}, {})
+_shards = []
+_shards_lock = threading.RLock()
+_local = threading.local()
+
+# Directory where each worker process publishes its samples for the others to merge; None for one process
+_multiprocess_dir = None
+_flush_seconds = 5
+
+# Name of this worker's file: its pid plus its start time, as a restarted worker may reuse a pid
+_worker_token = f"{os.getpid()}_{time.time_ns()}"
+
+# Process whose flusher thread is running; threads do not survive a fork
+_flusher_pid = None
+_flusher_lock = threading.Lock()
+
+class Histogram:
+    """Distribution of observed values over fixed buckets, with their count and sum"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        # The last slot counts values above the largest bucket
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self):
+        """
+        Current state of the histogram
+
+        :return: Dictionary with the cumulative count per bucket upper bound, the count and the sum
+        """
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets, counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative['+Inf'] = running + counts[-1]
+        return {'buckets': cumulative, 'count': cumulative['+Inf'], 'sum': total}
+
+def define_counter(name, help_text):
+    """
+    Declare a counter, so it is exported even before its first increment
+
+    :param name: Metric name, e.g. 'http_requests_total'
+    :param help_text: Description for the HELP line
+    :return: The name
+    """
+    _definitions[name] = ('counter', help_text, None)
+    return name
+
+def define_histogram(name, help_text, buckets=LATENCY_BUCKETS):
+    """
+    Declare a histogram with fixed bucket upper bounds
+
+    :param name: Metric name, e.g. 'http_request_duration_seconds'
+    :param help_text: Description for the HELP line
+    :param buckets: Ascending bucket upper bounds
+    :return: The name
+    """
+    _definitions[name] = ('histogram', help_text, tuple(buckets))
+    return name
+
+class _ShardOwner:
+    # Held only by a thread's local storage, so it is collected when the thread exits
+    __slots__ = ('shard', '__weakref__')
+
+    def __init__(self, shard):
+        self.shard = shard
+
+def _fold_shard(shard):
+    # Move the samples of an exited thread into the base shard; a shard of the parent of a fork is dropped
+    with _shards_lock:
+        if not any(registered is shard for registered in _shards):
+            return
+        _merge(_base[0], _base[1], *shard)
+        _shards[:] = [registered for registered in _shards if registered is not shard]
+
+def _shard():
+    # Samples of the current thread, registered on first use
+    owner = getattr(_local, 'owner', None)
+    if owner is None:
+        shard = ({}, {})
+        with _shards_lock:
+            _shards.append(shard)
+        owner = _local.owner = _ShardOwner(shard)
+        weakref.finalize(owner, _fold_shard, shard)
+    return owner.shard
+
+def inc(name, labels=(), amount=1):
+    """
+    Increment a counter
+
+    :param name: Name of a defined counter
+    :param labels: Tuple of (label, value) pairs, in a fixed order per metric
+    :param amount: Increment
+    :return: None
+    """
+    counters = _shard()[0]
+    key = (name, labels)
+    counters[key] = counters.get(key, 0) + amount
+
+def observe(name, value, labels=()):
+    """
+    Record a value in a histogram
+
+    :param name: Name of a defined histogram
+    :param value: Observed value, e.g. seconds or bytes
+    :param labels: Tuple of (label, value) pairs, in a fixed order per metric
+    :return: None
+    """
+    histograms = _shard()[1]
+    key = (name, labels)
+    buckets = _definitions[name][2]
+    values = histograms.get(key)
+    if values is None:
+        values = histograms[key] = [0] * (len(buckets) + 2)
+    values[bisect.bisect_left(buckets, value)] += 1
+    values[-1] += value
+
+def _merge(counters, histograms, other_counters, other_histograms):
+    # Add the samples of another shard or worker into the given dictionaries
+    for key, value in other_counters.items():
+        counters[key] = counters.get(key, 0) + value
+    for key, values in other_histograms.items():
+        merged = histograms.get(key)
+        if merged is None:
+            histograms[key] = list(values)
+        else:
+            histograms[key] = [a + b for a, b in zip(merged, values)]
+
+def _worker_samples():
+    # Sum the shards of this worker; dict.copy is atomic, so writers never block or break the iteration,
+    # and the lock keeps a shard being folded from counting twice or not at all
+    counters, histograms = {}, {}
+    with _shards_lock:
+        shards = [_base] + _shards
+        for shard_counters, shard_histograms in shards:
+            _merge(counters, histograms, shard_counters.copy(), shard_histograms.copy())
+    return counters, histograms
+
+def _sample_path():
+    return os.path.join(_multiprocess_dir, f"metrics_{_worker_token}.json")
+
+def flush_metrics():
+    """
+    Publish this worker's samples to the multiprocess directory, if one is configured
+
+    Files of exited workers are kept until a worker's flusher starts and prunes them, so a
+    restarted worker does not drop its predecessor's samples between two scrapes.
+
+    :return: None
+    """
+    if not _multiprocess_dir:
+        return
+
+    counters, histograms = _worker_samples()
+    payload = {
+        'counters': [[name, labels, value] for (name, labels), value in counters.items()],
+        'histograms': [[name, labels, values] for (name, labels), values in histograms.items()],
+    }
+    # Write a private file and rename it into place, so readers never see a partial file
+    path = _sample_path()
+    temporary = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporary, 'w') as file:
+            json.dump(payload, file)
+        os.replace(temporary, path)
+    except OSError as e:
+        logger.warning("Publishing metrics to %s failed: %s", path, e)
+
+def collect_metrics():
+    """
+    Samples of this worker merged with those published by the other workers
+
+    :return: Tuple of (counters, histograms) dictionaries keyed by (name, labels)
+    """
+    counters, histograms = _worker_samples()
+    if not _multiprocess_dir:
+        return counters, histograms
+
+    own_path = _sample_path()
+    for path in glob.glob(os.path.join(_multiprocess_dir, 'metrics_*.json')):
+        if path == own_path:
+            continue
+        try:
+            with open(path) as file:
+                payload = json.load(file)
+        except (OSError, ValueError) as e:
+            logger.warning("Skipping unreadable metrics file %s: %s", path, e)
+            continue
+        _merge(
+            counters, histograms,
+            {(name, tuple(map(tuple, labels))): value for name, labels, value in payload['counters']},
+            {(name, tuple(map(tuple, labels))): values for name, labels, values in payload['histograms']},
+        )
+    return counters, histograms
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{label}="{_escape(value)}"' for label, value in labels) + '}'
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render_metrics():
+    """
+    Render all defined metrics in the Prometheus text exposition format
+
+    :return: Text body for a scrape
+    """
+    counters, histograms = collect_metrics()
+    samples = {}
+    for (name, labels), value in list(counters.items()) + list(histograms.items()):
+        samples.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name, (kind, help_text, buckets) in sorted(_definitions.items()):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in sorted(samples.get(name, ())):
+            if kind == 'counter':
+                lines.append(f"{name}{_format_labels(labels)} {_format_number(value)}")
+                continue
+            running = 0
+            for bound, count in zip(buckets, value):
+                running += count
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', _format_number(bound)),))} {running}")
+            running += value[-2]
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {running}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(value[-1])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {running}")
+    return '\n'.join(lines) + '\n'
+
+def _process_exists(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def prune_metrics_files():
+    """
+    Delete the metrics files of workers whose process has exited
+
+    A file whose pid was reused by a live process is kept, as its owner cannot be told apart.
+
+    :return: Number of files deleted
+    """
+    if not _multiprocess_dir:
+        return 0
+
+    pruned = 0
+    for path in glob.glob(os.path.join(_multiprocess_dir, 'metrics_*.json')):
+        # File names are metrics_<pid>_<start time>.json
+        pid = os.path.basename(path)[len('metrics_'):-len('.json')].split('_')[0]
+        if not pid.isdigit() or int(pid) == os.getpid() or _process_exists(int(pid)):
+            continue
+        try:
+            os.remove(path)
+            pruned += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Pruning metrics file %s failed: %s", path, e)
+    return pruned
+
+def _flush_periodically(pid):
+    # Publish every _flush_seconds, whether or not requests arrive; stops once the registry is reset
+    while _flusher_pid == pid:
+        time.sleep(_flush_seconds)
+        flush_metrics()
+
+def _start_flusher():
+    # Start this process's flusher thread once, so an idle worker still publishes its last samples
+    global _flusher_pid
+    if not _multiprocess_dir or _flusher_pid == os.getpid():
+        return
+    with _flusher_lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+        prune_metrics_files()
+        threading.Thread(target=_flush_periodically, args=(_flusher_pid,), name='metrics-flusher', daemon=True).start()
+
+def _reset_after_fork():
+    # A forked worker starts from zero under a file of its own instead of repeating the samples of its parent
+    global _base, _shards, _shards_lock, _local, _worker_token, _flusher_pid, _flusher_lock
+    _base, _shards, _shards_lock, _local = ({}, {}), [], threading.RLock(), threading.local()
+    _worker_token = f"{os.getpid()}_{time.time_ns()}"
+    _flusher_pid, _flusher_lock = None, threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+REQUESTS = define_counter('http_requests_total', 'Requests handled, by blueprint, route, method and status code')
+REQUEST_DURATION = define_histogram(
+    'http_request_duration_seconds', 'Time to produce a response, by blueprint, route and method'
+)
+REQUEST_SIZE = define_histogram(
+    'http_request_size_bytes', 'Size of request bodies, by blueprint, route and method', SIZE_BUCKETS
+)
+RESPONSE_SIZE = define_histogram(
+    'http_response_size_bytes', 'Size of response bodies, by blueprint, route and method; streamed ones are left out',
+    SIZE_BUCKETS
+)
+
+def init_metrics(app):
+    """
+    Record the count, latency, payload sizes and status codes of every request
+
+    Register before other request hooks, so the latency covers them. With METRICS_MULTIPROCESS_DIR
+    set, each worker publishes its samples there every METRICS_FLUSH_SECONDS from a background
+    thread started on its first request, and a scrape of any worker reports the sum of all of them.
+    Starting that thread prunes the files of exited workers.
+
+    :param app: Flask application instance
+    :return: None
+    """
+    global _multiprocess_dir, _flush_seconds
+    _multiprocess_dir = app.config.get('METRICS_MULTIPROCESS_DIR')
+    _flush_seconds = app.config.get('METRICS_FLUSH_SECONDS', 5)
+    if _multiprocess_dir:
+        os.makedirs(_multiprocess_dir, exist_ok=True)
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.pop('request_started', None)
+        if started is None:
+            return response
+
+        # Label by route template, not path, to keep the number of series bounded
+        labels = (
+            ('blueprint', request.blueprint or ''),
+            ('route', request.url_rule.rule if request.url_rule else 'unmatched'),
+            ('method', request.method),
+        )
+        observe(REQUEST_DURATION, time.perf_counter() - started, labels)
+        inc(REQUESTS, labels + (('status', str(response.status_code)),))
+        if request.content_length is not None:
+            observe(REQUEST_SIZE, request.content_length, labels)
+        if not response.is_streamed:
+            observe(RESPONSE_SIZE, response.calculate_content_length() or 0, labels)
+
+        _start_flusher()
+        return response
@@ -0,0 +1,127 @@
+import base64
+import json
+from datetime import date, datetime
+from sqlalchemy import and_, false, or_
+
+def _sort_clause(column, descending):
+    # NULLs sort as the largest value, as in PostgreSQL, so a plain ascending index serves both directions;
+    # spelled out for nullable columns because SQLite sorts them as the smallest
+    if descending:
+        return column.desc().nulls_first() if column.nullable else column.desc()
+    return column.asc().nulls_last() if column.nullable else column.asc()
+
+def order_by_sort_key(query, sort_key):
+    """
+    Order a query by a stable sort key
+
+    :param query: SQLAlchemy query
+    :param sort_key: Sequence of (column, descending) tuples ending with a unique column
+    :return: Ordered query
+    """
+    return query.order_by(*[_sort_clause(column, descending) for column, descending in sort_key])
+
+def encode_cursor(values):
+    """
+    Encode the sort key values of the last row on a page into an opaque cursor
+
+    :param values: Sort key values in sort key order
+    :return: URL-safe cursor string
+    """
+    # Dates and datetimes are carried as ISO strings and restored on decode
+    payload = [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, sort_key):
+    """
+    Decode a cursor produced by encode_cursor back into sort key values
+
+    :param cursor: Cursor string
+    :param sort_key: Sort key the cursor was produced for
+    :return: List of sort key values
+    :raises ValueError: If the cursor is malformed or does not match the sort key
+    """
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != len(sort_key):
+        raise ValueError("Invalid cursor")
+
+    # Restore date and datetime values using the column types
+    decoded = []
+    for (column, _), value in zip(sort_key, values):
+        python_type = column.type.python_type
+        try:
+            if value is not None and python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif value is not None and python_type is date:
+                value = date.fromisoformat(value)
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+        decoded.append(value)
+
+    return decoded
+
+def keyset_filter(sort_key, values):
+    """
+    Build a predicate selecting rows strictly after the given sort key values
+
+    :param sort_key: Sequence of (column, descending) tuples
+    :param values: Sort key values of the last row already returned
+    :return: SQLAlchemy boolean clause
+    """
+    # Expanded form of (a, b, c) > (x, y, z) that also handles mixed directions; == None renders IS NULL
+    clauses = []
+    for index, (column, descending) in enumerate(sort_key):
+        equal = [prefix_column == prefix_value
+                 for (prefix_column, _), prefix_value in zip(sort_key[:index], values[:index])]
+        clauses.append(and_(*equal, _after(column, descending, values[index])))
+    return or_(*clauses)
+
+def _after(column, descending, value):
+    # Rows sorting strictly after the value in one column, with NULLs as the largest value
+    if value is None:
+        return column.isnot(None) if descending else false()
+    if descending:
+        return column < value
+    return or_(column > value, column.is_(None)) if column.nullable else column > value
+
+def paginate_keyset(query, sort_key, cursor=None, per_page=20):
+    """
+    Fetch one page of a query using keyset (cursor) pagination
+
+    Each page is a range scan on the sort key index, so page N costs the same as page 1.
+
+    :param query: SQLAlchemy query without ordering or limits
+    :param sort_key: Sequence of (column, descending) tuples ending with a unique column
+    :param cursor: Cursor returned with the previous page, or None for the first page
+    :param per_page: Number of rows per page
+    :return: Tuple of (list of rows, next cursor or None when there are no more rows)
+    :raises ValueError: If the cursor is malformed
+    """
+    if cursor:
+        query = query.filter(keyset_filter(sort_key, decode_cursor(cursor, sort_key)))
+
+    # Fetch one extra row to find out whether another page exists
+    rows = order_by_sort_key(query, sort_key).limit(per_page + 1).all()
+    if len(rows) <= per_page:
+        return rows, None
+
+    rows = rows[:per_page]
+    last_row = rows[-1]
+    return rows, encode_cursor([getattr(last_row, column.key) for column, _ in sort_key])
+
+def page_count(total, per_page):
+    """
+    Number of pages needed to show total rows
+
+    :param total: Total row count, or None if it was not counted
+    :param per_page: Number of rows per page
+    :return: Page count, or None if the total is unknown
+    """
+    if total is None:
+        return None
+    return (total + per_page - 1) // per_page
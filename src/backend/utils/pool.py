@@ -0,0 +1,124 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from .metrics import Histogram
+
+class PoolMetrics:
+    """Counters and latency distributions of one connection pool, kept per worker process"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.peak_checked_out = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.checkout_wait = Histogram()
+        self.connect_latency = Histogram()
+        self._lock = threading.Lock()
+
+    def listen(self, pool):
+        # Connection records stamp the start of each connect attempt; the connect event fires once it succeeded
+        @event.listens_for(pool, 'connect')
+        def record_connect(dbapi_connection, connection_record):
+            self.connect_latency.observe(time.time() - connection_record.starttime)
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(pool, 'invalidate')
+        def record_invalidation(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+    def record_checkout(self, wait, checked_out):
+        self.checkout_wait.observe(wait)
+        with self._lock:
+            self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def record_timeout(self, wait):
+        self.checkout_wait.observe(wait)
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def snapshot(self):
+        """
+        Current state of the metrics
+
+        :return: Dictionary of counters and histogram snapshots
+        """
+        return {
+            'checkouts': self.checkouts,
+            'checkout_timeouts': self.checkout_timeouts,
+            'peak_checked_out': self.peak_checked_out,
+            'connects': self.connects,
+            'invalidations': self.invalidations,
+            'checkout_wait_seconds': self.checkout_wait.snapshot(),
+            'connect_latency_seconds': self.connect_latency.snapshot(),
+        }
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool recording how long each checkout waits for a connection
+
+    The wait includes opening a new connection when the pool grows into its overflow.
+    """
+
+    def __init__(self, creator, **kw):
+        super().__init__(creator, **kw)
+        self.metrics = PoolMetrics()
+        # Pools recreated after a dispose or failover inherit the listeners of the pool they replace
+        if kw.get('_dispatch') is None:
+            self.metrics.listen(self)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_timeout(time.perf_counter() - started)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started, self.checkedout())
+        return connection
+
+def init_pool_metrics(app):
+    """
+    Instrument the connection pools of the app's engines
+
+    Must run before db.init_app, which creates the engines. Engines whose driver needs
+    another pool class, such as in-memory SQLite, keep it and report only their status.
+
+    :param app: Flask application instance
+    :return: None
+    """
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    options.setdefault('poolclass', InstrumentedQueuePool)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+def pool_stats(engine):
+    """
+    Live state and recorded metrics of an engine's connection pool
+
+    :param engine: SQLAlchemy Engine
+    :return: Dictionary of pool statistics
+    """
+    pool = engine.pool
+    stats = {'pool': type(pool).__name__, 'status': pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+            'timeout': pool.timeout(),
+        })
+    metrics = getattr(pool, 'metrics', None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
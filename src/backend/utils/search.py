@@ -0,0 +1,150 @@
+import re
+from sqlalchemy import DDL, Float, Integer, event, text
+
+# Text search configuration of the Postgres tsvector indexes
+TEXT_SEARCH_CONFIG = 'english'
+
+# Relative weights of the indexed fields, most important first
+_PG_WEIGHTS = ('A', 'B', 'C', 'D')
+_FTS5_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+
+# Search indexes keyed by model class
+_search_indexes = {}
+
+# Words of a user query; operators and punctuation are dropped, so any input is a valid match
+_WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+class SearchIndex:
+    """Inverted full-text index over text columns of one model"""
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = tuple(fields)
+        self.table = model.__tablename__
+        self.fts_table = f'{self.table}_fts'
+
+    def pg_document(self):
+        # Weighted tsvector expression; queries must use the exact same text so the GIN index applies
+        return '(' + ' || '.join(
+            f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}'::regconfig, coalesce({field}, '')), "
+            f"'{_PG_WEIGHTS[min(position, len(_PG_WEIGHTS) - 1)]}')"
+            for position, field in enumerate(self.fields)
+        ) + ')'
+
+    def pg_ddl(self):
+        # Expression index, maintained by Postgres on every insert, update and delete
+        return [f'CREATE INDEX IF NOT EXISTS ix_{self.table}_search ON {self.table} USING gin ({self.pg_document()})']
+
+    def sqlite_ddl(self):
+        # External-content FTS5 table kept in sync with the base table by triggers
+        columns = ', '.join(self.fields)
+        new_values = ', '.join(f'new.{field}' for field in self.fields)
+        old_values = ', '.join(f'old.{field}' for field in self.fields)
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.fts_table} USING fts5("
+            f"{columns}, content='{self.table}', content_rowid='id')",
+            f"CREATE TRIGGER IF NOT EXISTS {self.fts_table}_insert AFTER INSERT ON {self.table} BEGIN "
+            f"INSERT INTO {self.fts_table}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.fts_table}_delete AFTER DELETE ON {self.table} BEGIN "
+            f"INSERT INTO {self.fts_table}({self.fts_table}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.fts_table}_update AFTER UPDATE ON {self.table} BEGIN "
+            f"INSERT INTO {self.fts_table}({self.fts_table}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {self.fts_table}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        ]
+
+    def matches(self, dialect_name, terms):
+        """
+        Build a subquery of (id, rank) rows matching all terms; lower ranks are better matches
+
+        :param dialect_name: Name of the database dialect
+        :param terms: Non-empty list of query words
+        :return: SQLAlchemy subquery with id and rank columns
+        """
+        if dialect_name == 'postgresql':
+            document = self.pg_document()
+            sql = text(
+                f"SELECT id, -ts_rank_cd({document}, query) AS rank "
+                f"FROM {self.table}, plainto_tsquery('{TEXT_SEARCH_CONFIG}'::regconfig, :terms) AS query "
+                f"WHERE {document} @@ query"
+            ).bindparams(terms=' '.join(terms))
+        elif dialect_name == 'sqlite':
+            weights = ', '.join(
+                str(_FTS5_WEIGHTS[min(position, len(_FTS5_WEIGHTS) - 1)]) for position in range(len(self.fields))
+            )
+            sql = text(
+                f"SELECT rowid AS id, bm25({self.fts_table}, {weights}) AS rank "
+                f"FROM {self.fts_table} WHERE {self.fts_table} MATCH :terms"
+            ).bindparams(terms=' '.join(f'"{term}"' for term in terms))
+        else:
+            raise NotImplementedError(f"Full-text search is not supported on {dialect_name}")
+        return sql.columns(id=Integer, rank=Float).subquery(f'{self.table}_matches')
+
+    def rebuild(self, connection):
+        """
+        Re-index all rows, e.g. after bulk loading with triggers disabled
+
+        :param connection: SQLAlchemy connection
+        :return: None
+        """
+        if connection.dialect.name == 'sqlite':
+            connection.exec_driver_sql(f"INSERT INTO {self.fts_table}({self.fts_table}) VALUES ('rebuild')")
+        elif connection.dialect.name == 'postgresql':
+            connection.exec_driver_sql(f'REINDEX INDEX ix_{self.table}_search')
+
+def register_search_index(model, fields):
+    """
+    Declare a full-text index over text columns of a model
+
+    The index is created along with the model's table: a tsvector GIN expression index on
+    Postgres, an FTS5 table maintained by triggers on SQLite. Tables that already exist get it
+    from ensure_search_indexes (scripts/ensure_schema.py).
+
+    :param model: SQLAlchemy model class
+    :param fields: Text column names, most important first
+    :return: SearchIndex
+    """
+    index = _search_indexes[model] = SearchIndex(model, fields)
+    for statement in index.pg_ddl():
+        event.listen(model.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+    for statement in index.sqlite_ddl():
+        event.listen(model.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    return index
+
+def ensure_search_indexes(connection):
+    """
+    Create the full-text indexes of tables that existed before them, and index their rows
+
+    Safe to run repeatedly; create_all only sets the indexes up for tables it creates.
+
+    :param connection: SQLAlchemy connection, committed by the caller
+    :return: Names of the indexed tables
+    """
+    dialect_name = connection.dialect.name
+    if dialect_name not in ('postgresql', 'sqlite'):
+        return []
+    for index in _search_indexes.values():
+        for statement in index.pg_ddl() if dialect_name == 'postgresql' else index.sqlite_ddl():
+            connection.exec_driver_sql(statement)
+        # Building the GIN index reads every row already; the FTS5 table starts empty
+        if dialect_name == 'sqlite':
+            index.rebuild(connection)
+    return [index.table for index in _search_indexes.values()]
+
+def get_search_index(model):
+    """
+    Get the full-text index of a model
+
+    :param model: SQLAlchemy model class
+    :return: SearchIndex
+    :raises KeyError: If the model has no search index
+    """
+    return _search_indexes[model]
+
+def search_terms(query):
+    """
+    Split a user query into search words
+
+    :param query: Raw query string
+    :return: List of lower-cased words
+    """
+    return [word.lower() for word in _WORD_PATTERN.findall(query or '')]
@@ -0,0 +1,176 @@
+from operator import attrgetter
+from sqlalchemy import Date, DateTime
+from sqlalchemy.orm import load_only
+from .conditional import VERSION_FIELD
+
+# Compiled serializers keyed by model class
+_serializers = {}
+
+class ModelSerializer:
+    """Encoder for one model, compiled once with a fixed column list and date converters"""
+
+    def __init__(self, model):
+        self.model = model
+
+        # Fixed column list in table order, read once instead of on every call
+        self.fields = tuple(column.name for column in model.__table__.columns)
+
+        # Columns whose values are converted to ISO format strings
+        self.date_fields = frozenset(
+            column.name for column in model.__table__.columns if isinstance(column.type, (Date, DateTime))
+        )
+
+        # Encoders per projection, keyed by the tuple of projected fields
+        self._encoders = {}
+        self._default_encoder = self._compile(self.fields)
+
+    def _compile(self, fields):
+        # Fetch all values with one attrgetter call and convert only the date positions
+        getters = attrgetter(*fields)
+        if len(fields) == 1:
+            single_getter = getters
+            getters = lambda instance: (single_getter(instance),)
+        date_positions = tuple(index for index, field in enumerate(fields) if field in self.date_fields)
+
+        def encode(instance):
+            values = getters(instance)
+            if date_positions:
+                values = list(values)
+                for index in date_positions:
+                    value = values[index]
+                    if value is not None:
+                        values[index] = value.isoformat()
+            return dict(zip(fields, values))
+
+        return encode
+
+    def validate_fields(self, fields):
+        """
+        Check a field projection against the model columns
+
+        :param fields: Iterable of field names
+        :return: Tuple of the requested fields in column order
+        :raises ValueError: If a field is not a column of the model
+        """
+        requested = set(fields)
+        unknown = requested.difference(self.fields)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return tuple(field for field in self.fields if field in requested)
+
+    def encoder(self, fields=None):
+        """
+        Get the compiled encoder for a field projection
+
+        :param fields: Iterable of field names, or None for all columns
+        :return: Callable converting an instance to a dictionary
+        :raises ValueError: If a field is not a column of the model
+        """
+        if fields is None:
+            return self._default_encoder
+
+        projection = self.validate_fields(fields)
+        encode = self._encoders.get(projection)
+        if encode is None:
+            encode = self._encoders[projection] = self._compile(projection)
+        return encode
+
+    def serialize(self, instance, fields=None):
+        """
+        Convert an instance to a dictionary
+
+        :param instance: Model instance
+        :param fields: Iterable of field names, or None for all columns
+        :return: Dictionary of column values with dates as ISO strings
+        """
+        return self.encoder(fields)(instance)
+
+    def serialize_many(self, instances, fields=None):
+        """
+        Convert a result set to a list of dictionaries in one pass
+
+        :param instances: Iterable of model instances
+        :param fields: Iterable of field names, or None for all columns
+        :return: List of dictionaries
+        """
+        encode = self.encoder(fields)
+        return [encode(instance) for instance in instances]
+
+def get_serializer(model):
+    """
+    Get the compiled serializer of a model, compiling it on first use
+
+    :param model: SQLAlchemy model class
+    :return: ModelSerializer
+    """
+    serializer = _serializers.get(model)
+    if serializer is None:
+        serializer = _serializers[model] = ModelSerializer(model)
+    return serializer
+
+def serialize(instance, fields=None):
+    """
+    Convert a model instance to a dictionary using its compiled serializer
+
+    :param instance: Model instance
+    :param fields: Iterable of field names, or None for all columns
+    :return: Dictionary of column values
+    """
+    return get_serializer(type(instance)).serialize(instance, fields)
+
+def serialize_many(model, instances, fields=None):
+    """
+    Convert a list of model instances to dictionaries using the model's compiled serializer
+
+    :param model: SQLAlchemy model class of the instances
+    :param instances: Iterable of model instances
+    :param fields: Iterable of field names, or None for all columns
+    :return: List of dictionaries
+    """
+    return get_serializer(model).serialize_many(instances, fields)
+
+def parse_fields(model, value):
+    """
+    Parse a sparse fieldset parameter (?fields=id,name) against the columns of a model
+
+    The primary key is always part of the projection, since cache tags and cursors rely on it, and so
+    is the version column of versioned models, since list validators rely on it.
+
+    :param model: SQLAlchemy model class
+    :param value: Comma-separated field names, or None/empty for all columns
+    :return: Tuple of field names in column order, or None for all columns
+    :raises ValueError: If a field is not a column of the model
+    """
+    if not value:
+        return None
+    requested = [field.strip() for field in value.split(',') if field.strip()]
+    always = [column.name for column in model.__table__.primary_key.columns]
+    if VERSION_FIELD in model.__table__.columns:
+        always.append(VERSION_FIELD)
+    return get_serializer(model).validate_fields(requested + always)
+
+def load_only_fields(model, fields, sort_key=()):
+    """
+    Loader option reading only the projected columns from the database
+
+    :param model: SQLAlchemy model class
+    :param fields: Projection from parse_fields
+    :param sort_key: Sort key whose columns are also loaded, for keyset cursors
+    :return: Loader option to pass to Query.options
+    """
+    columns = {field: getattr(model, field) for field in fields}
+    for column, _ in sort_key:
+        columns.setdefault(column.key, column)
+    return load_only(*columns.values())
+
+def project(data, fields):
+    """
+    Reduce a serialized entity to a projection, e.g. one served from the detail cache
+
+    :param data: Dictionary from serialize
+    :param fields: Projection from parse_fields, or None for all columns
+    :return: Dictionary with only the projected fields
+    """
+    if fields is None:
+        return data
+    return {field: data[field] for field in fields if field in data}
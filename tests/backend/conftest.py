@@ -0,0 +1,49 @@
+import pytest
+from unittest.mock import patch
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from src.backend.utils import cache
+from src.backend.utils.db import db
+
+@pytest.fixture
+def app_config():
+    # Extra configuration of the test application; override in a test module
+    return {}
+
+@pytest.fixture
+def seed():
+    # Model instances committed before each test; override in a test module
+    return []
+
+@pytest.fixture
+def app(app_config, seed):
+    # Create an in-memory database holding the seed rows of the test module
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-of-sufficient-length'
+    # Refresh funding rollups inline, so no thread shares the in-memory database with the test
+    app.config['FUNDING_ROLLUP_BACKGROUND'] = False
+    app.config.update(app_config)
+    JWTManager(app)
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all(seed)
+        db.session.commit()
+        # Tests start from an empty session, not one holding the seed rows
+        db.session.remove()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def auth_headers(app):
+    # Bearer header of an access token for user 1
+    with app.test_request_context('/'):
+        return {'Authorization': f"Bearer {create_access_token(identity='1')}"}
+
+@pytest.fixture
+def local_cache():
+    # Run the cache on a fresh local tier, without Redis
+    with patch.object(cache, 'redis_client', None), patch.object(cache, 'local_cache', cache.LocalCache()):
+        yield cache.local_cache
@@ -0,0 +1,51 @@
+import pytest
+from src.backend.models import Startup
+from src.backend.routes.startup import startup_routes
+from src.backend.utils.cache import cache_get, entity_cache_key, list_cache_key
+from src.backend.utils.db import db, init_replicas, replica_engines
+
+@pytest.fixture
+def app_config(tmp_path):
+    # Stand in for the primary and a replica that has not caught up with two SQLite files
+    return {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'primary.db'}",
+        'SQLALCHEMY_REPLICA_URIS': [f"sqlite:///{tmp_path / 'replica.db'}"],
+        'DETAIL_CACHE_TTL': 600,
+        'LIST_CACHE_TTL': 60,
+    }
+
+@pytest.fixture
+def seed():
+    return [Startup(id=1, name='Before')]
+
+@pytest.fixture
+def client(app, local_cache):
+    init_replicas(app)
+    replica = replica_engines()[0]
+    db.metadata.create_all(replica)
+    with replica.begin() as connection:
+        connection.execute(Startup.__table__.insert(), {'id': 1, 'name': 'Before'})
+    app.register_blueprint(startup_routes, url_prefix='/startups')
+    yield app.test_client()
+    replica.dispose()
+
+class TestCacheFillAfterWrite:
+    def test_other_client_caches_the_write(self, app, client, auth_headers):
+        # A second client, without the writer's pin cookie, warms the caches before the write
+        reader = app.test_client()
+        reader.get('/startups/1', headers=auth_headers)
+        reader.get('/startups/?per_page=5', headers=auth_headers)
+
+        # The write commits on the primary and drops the cached entries; the replica still lags
+        assert client.put('/startups/1', json={'name': 'After'}, headers=auth_headers).status_code == 200
+        # Requests share the test's app context, so drop the writer's session as the end of its request would
+        db.session.remove()
+
+        # The reader's misses are filled from the primary, not the lagging replica
+        detail = reader.get('/startups/1', headers=auth_headers)
+        listing = reader.get('/startups/?per_page=5', headers=auth_headers)
+
+        assert detail.json['name'] == 'After'
+        assert [startup['name'] for startup in listing.json['startups']] == ['After']
+        assert cache_get(entity_cache_key('startup', 1))['name'] == 'After'
+        assert cache_get(list_cache_key('startup', {}, page=1, per_page=5, fields=''))['value'][0]['name'] == 'After'
@@ -0,0 +1,67 @@
+import pytest
+from datetime import datetime
+from src.backend.models import JobPosting, Startup
+from src.backend.routes.job import job_routes
+from src.backend.services.job_service import get_job_postings
+from src.backend.utils.db import db
+
+# Posting dates with ties and missing dates, which sort first when newest come first
+POSTED_DATES = [datetime(2024, 5, 1), None, datetime(2024, 5, 3), datetime(2024, 5, 1), None,
+                datetime(2024, 5, 2), datetime(2024, 5, 3), None]
+
+@pytest.fixture
+def seed():
+    return [Startup(id=1, name='Startup 1')] + [
+        JobPosting(id=job_id, startup_id=1, title=f'Job {job_id}', posted_date=posted_date)
+        for job_id, posted_date in enumerate(POSTED_DATES, 1)
+    ]
+
+@pytest.fixture(autouse=True)
+def undated(app):
+    # The column default fills in a missing date on insert, so clear those dates afterwards
+    undated_ids = [job_id for job_id, posted_date in enumerate(POSTED_DATES, 1) if posted_date is None]
+    db.session.execute(JobPosting.__table__.update().where(JobPosting.id.in_(undated_ids)).values(posted_date=None))
+    db.session.commit()
+    db.session.remove()
+
+@pytest.fixture
+def client(app, local_cache):
+    app.register_blueprint(job_routes, url_prefix='/jobs')
+    return app.test_client()
+
+def expected_order():
+    # Newest first, undated ones before all dated ones, ties broken by descending ID
+    dated = sorted(((posted_date, job_id) for job_id, posted_date in enumerate(POSTED_DATES, 1) if posted_date),
+                   reverse=True)
+    undated = sorted((job_id for job_id, posted_date in enumerate(POSTED_DATES, 1) if posted_date is None),
+                     reverse=True)
+    return undated + [job_id for _, job_id in dated]
+
+class TestCursorPagination:
+    @pytest.mark.parametrize('per_page', [1, 2, 3, 8, 20])
+    def test_route_walks_every_row_once(self, client, auth_headers, per_page):
+        # Follow next_cursor from the first page until the last one
+        seen, cursor, pages = [], '', 0
+        while cursor is not None:
+            response = client.get(f'/jobs/?per_page={per_page}&cursor={cursor}', headers=auth_headers)
+            assert response.status_code == 200
+            assert len(response.json['jobs']) <= per_page
+            seen.extend(job['id'] for job in response.json['jobs'])
+            cursor = response.json['next_cursor']
+            pages += 1
+            assert pages <= len(POSTED_DATES) + 1
+
+        # No duplicates or gaps, in sort key order across the NULL dates
+        assert seen == expected_order()
+        assert JobPosting.query.filter(JobPosting.posted_date.is_(None)).count() == 3
+
+    def test_service_walks_every_row_once(self, app):
+        seen, cursor = [], ''
+        while cursor is not None:
+            jobs, cursor = get_job_postings(per_page=3, cursor=cursor)
+            seen.extend(job.id for job in jobs)
+
+        assert seen == expected_order()
+
+    def test_invalid_cursor_is_rejected(self, client, auth_headers):
+        assert client.get('/jobs/?cursor=not-a-cursor', headers=auth_headers).status_code == 400
@@ -0,0 +1,50 @@
+import pytest
+from datetime import datetime
+from src.backend.models import Investor, JobPosting, NewsArticle, Startup
+from src.backend.routes.investor import investor_routes
+from src.backend.routes.job import job_routes
+from src.backend.routes.news import news_routes
+from src.backend.routes.startup import startup_routes
+from src.backend.utils.db import count_queries
+
+@pytest.fixture
+def seed():
+    # One entity of each type with a detail route
+    return [
+        Startup(id=1, name='Startup 1', industry='Biotech'),
+        Investor(id=1, name='Investor 1'),
+        JobPosting(id=1, startup_id=1, title='Engineer', posted_date=datetime(2024, 5, 1)),
+        NewsArticle(id=1, startup_id=1, title='Startup 1 raises', url='https://example.com/1',
+                    published_date=datetime(2024, 5, 2)),
+    ]
+
+@pytest.fixture
+def client(app, local_cache):
+    app.register_blueprint(startup_routes, url_prefix='/startups')
+    app.register_blueprint(investor_routes, url_prefix='/investors')
+    app.register_blueprint(job_routes, url_prefix='/jobs')
+    app.register_blueprint(news_routes, url_prefix='/news')
+    return app.test_client()
+
+class TestReadThroughDetails:
+    @pytest.mark.parametrize('path, name_field, name', [
+        ('/startups/1', 'name', 'Startup 1'),
+        ('/investors/1', 'name', 'Investor 1'),
+        ('/jobs/1', 'title', 'Engineer'),
+        ('/news/1', 'title', 'Startup 1 raises'),
+    ])
+    def test_miss_queries_then_hit_serves_from_cache(self, client, auth_headers, path, name_field, name):
+        # The first request loads the row, the second is served from the cache without SQL
+        with count_queries() as miss:
+            first = client.get(path, headers=auth_headers)
+        with count_queries() as hit:
+            second = client.get(path, headers=auth_headers)
+
+        assert first.status_code == second.status_code == 200
+        assert first.json[name_field] == name
+        assert second.json == first.json
+        assert miss.count == 1
+        assert hit.count == 0
+
+    def test_missing_entity_is_not_found(self, client, auth_headers):
+        assert client.get('/startups/2', headers=auth_headers).status_code == 404
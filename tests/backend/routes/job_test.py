@@ -1,134 +1,79 @@
 import pytest
-from flask import Flask
-from unittest.mock import patch, MagicMock
-from app import create_app
-from db import db
-from models.job_posting import JobPosting
+from datetime import datetime
+from src.backend.models import JobPosting, Startup
+from src.backend.routes.job import job_routes
+from src.backend.utils.db import db
 
 @pytest.fixture
-def client():
-    # Create a Flask test client
-    app = create_app('testing')
-    
-    # Set up application context
-    with app.app_context():
-        # Yield the test client
-        yield app.test_client()
-    
-    # Tear down application context after tests
-
-class TestJobPostingRoutes:
-    def test_get_job_postings(self, client):
-        # Mock db.session.query to return a list of mock job postings
-        mock_job_postings = [
-            JobPosting(id=1, title="Software Engineer", company="TechCo", description="Job description"),
-            JobPosting(id=2, title="Data Scientist", company="DataCorp", description="Another job description")
-        ]
-        with patch('db.session.query') as mock_query:
-            mock_query.return_value.all.return_value = mock_job_postings
-
-            # Send GET request to /jobs
-            response = client.get('/jobs')
-
-            # Assert response status code is 200
-            assert response.status_code == 200
-
-            # Assert response JSON contains expected job posting data
-            data = response.get_json()
-            assert len(data) == 2
-            assert data[0]['id'] == 1
-            assert data[0]['title'] == "Software Engineer"
-            assert data[1]['id'] == 2
-            assert data[1]['title'] == "Data Scientist"
-
-    def test_get_job_posting(self, client):
-        # Mock db.session.query.get to return a mock job posting
-        mock_job_posting = JobPosting(id=1, title="Software Engineer", company="TechCo", description="Job description")
-        with patch('db.session.query') as mock_query:
-            mock_query.return_value.get.return_value = mock_job_posting
-
-            # Send GET request to /jobs/1
-            response = client.get('/jobs/1')
-
-            # Assert response status code is 200
-            assert response.status_code == 200
-
-            # Assert response JSON contains expected job posting data
-            data = response.get_json()
-            assert data['id'] == 1
-            assert data['title'] == "Software Engineer"
-            assert data['company'] == "TechCo"
-            assert data['description'] == "Job description"
-
-    def test_create_job_posting(self, client):
-        # Mock db.session.add and db.session.commit
-        with patch('db.session.add') as mock_add, patch('db.session.commit') as mock_commit:
-            # Send POST request to /jobs with job posting data
-            response = client.post('/jobs', json={
-                'title': "New Job",
-                'company': "NewCo",
-                'description': "New job description"
-            })
-
-            # Assert response status code is 201
-            assert response.status_code == 201
-
-            # Assert response JSON contains created job posting data
-            data = response.get_json()
-            assert data['title'] == "New Job"
-            assert data['company'] == "NewCo"
-            assert data['description'] == "New job description"
-
-            # Assert db.session.add and db.session.commit were called
-            mock_add.assert_called_once()
-            mock_commit.assert_called_once()
-
-    def test_update_job_posting(self, client):
-        # Mock db.session.query.get to return a mock job posting
-        mock_job_posting = MagicMock(spec=JobPosting)
-        mock_job_posting.id = 1
-        with patch('db.session.query') as mock_query, patch('db.session.commit') as mock_commit:
-            mock_query.return_value.get.return_value = mock_job_posting
-
-            # Send PUT request to /jobs/1 with updated data
-            response = client.put('/jobs/1', json={
-                'title': "Updated Job",
-                'company': "UpdatedCo",
-                'description': "Updated job description"
-            })
-
-            # Assert response status code is 200
-            assert response.status_code == 200
-
-            # Assert response JSON contains updated job posting data
-            data = response.get_json()
-            assert data['title'] == "Updated Job"
-            assert data['company'] == "UpdatedCo"
-            assert data['description'] == "Updated job description"
-
-            # Assert mock job posting object was updated with new data
-            assert mock_job_posting.title == "Updated Job"
-            assert mock_job_posting.company == "UpdatedCo"
-            assert mock_job_posting.description == "Updated job description"
-
-            # Assert db.session.commit was called
-            mock_commit.assert_called_once()
-
-    def test_delete_job_posting(self, client):
-        # Mock db.session.query.get to return a mock job posting
-        mock_job_posting = MagicMock(spec=JobPosting)
-        mock_job_posting.id = 1
-        with patch('db.session.query') as mock_query, patch('db.session.delete') as mock_delete, patch('db.session.commit') as mock_commit:
-            mock_query.return_value.get.return_value = mock_job_posting
-
-            # Send DELETE request to /jobs/1
-            response = client.delete('/jobs/1')
-
-            # Assert response status code is 204
-            assert response.status_code == 204
-
-            # Assert db.session.delete was called with the mock job posting
-            mock_delete.assert_called_once_with(mock_job_posting)
-
-            # Assert db.session.commit was called
-            mock_commit.assert_called_once()
\ No newline at end of file
+def seed():
+    return [
+        Startup(id=1, name='Startup 1'),
+        Startup(id=2, name='Startup 2'),
+        JobPosting(id=1, startup_id=1, title='Engineer', posted_date=datetime(2024, 5, 1)),
+        JobPosting(id=2, startup_id=2, title='Designer', posted_date=datetime(2024, 5, 2)),
+    ]
+
+@pytest.fixture
+def client(app, local_cache):
+    app.register_blueprint(job_routes, url_prefix='/jobs')
+    return app.test_client()
+
+class TestJobRoutes:
+    def test_get_job_postings(self, client, auth_headers):
+        response = client.get('/jobs/', headers=auth_headers)
+
+        # Newest postings first
+        assert response.status_code == 200
+        assert [job['title'] for job in response.json['jobs']] == ['Designer', 'Engineer']
+        assert (response.json['total'], response.json['total_exact']) == (2, True)
+
+    def test_get_job_postings_of_startup(self, client, auth_headers):
+        response = client.get('/jobs/?startup_id=1', headers=auth_headers)
+
+        assert [job['id'] for job in response.json['jobs']] == [1]
+        assert response.json['total'] == 1
+
+    def test_search_job_postings(self, client, auth_headers):
+        response = client.get('/jobs/search?q=engineer', headers=auth_headers)
+
+        assert [job['id'] for job in response.json['jobs']] == [1]
+        assert (response.json['total'], response.json['total_exact']) == (1, True)
+
+        # Without a count, clients learn the total is not exact
+        response = client.get('/jobs/search?q=engineer&count=none', headers=auth_headers)
+        assert (response.json['total'], response.json['total_exact']) == (None, False)
+
+    def test_get_job_posting(self, client, auth_headers):
+        response = client.get('/jobs/1', headers=auth_headers)
+
+        assert response.status_code == 200
+        assert (response.json['title'], response.json['startup_id']) == ('Engineer', 1)
+
+    def test_get_missing_job_posting(self, client, auth_headers):
+        assert client.get('/jobs/3', headers=auth_headers).status_code == 404
+
+    def test_update_job_posting(self, client, auth_headers):
+        response = client.put('/jobs/1', json={'title': 'Senior Engineer'}, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json['title'] == 'Senior Engineer'
+        assert db.session.get(JobPosting, 1).title == 'Senior Engineer'
+
+    def test_update_missing_job_posting(self, client, auth_headers):
+        assert client.put('/jobs/3', json={'title': 'Nobody'}, headers=auth_headers).status_code == 404
+
+    def test_delete_job_posting(self, client, auth_headers):
+        response = client.delete('/jobs/2', headers=auth_headers)
+
+        assert response.status_code == 200
+        assert db.session.get(JobPosting, 2) is None
+
+    def test_delete_missing_job_posting(self, client, auth_headers):
+        assert client.delete('/jobs/3', headers=auth_headers).status_code == 404
+
+    def test_bulk_create_job_postings(self, client, auth_headers):
+        response = client.post('/jobs/bulk', json=[{'startup_id': 1, 'title': 'Analyst'}], headers=auth_headers)
+
+        assert response.status_code == 201
+        assert response.json['succeeded'] == 1
+        assert JobPosting.query.filter_by(startup_id=1).count() == 2
@@ -0,0 +1,52 @@
+import pytest
+from unittest.mock import patch
+from src.backend.models import Investor, Startup
+from src.backend.routes.investor import investor_routes
+from src.backend.routes.startup import startup_routes
+from src.backend.utils.db import db
+
+@pytest.fixture
+def seed():
+    # A few startups and investors to list
+    return [Startup(id=i, name=f'Startup {i}') for i in range(1, 6)] + \
+        [Investor(id=i, name=f'Investor {i}') for i in range(1, 6)]
+
+@pytest.fixture
+def app_config():
+    # Cache list pages as the default config does
+    return {'LIST_CACHE_TTL': 60}
+
+@pytest.fixture
+def client(app, local_cache):
+    app.register_blueprint(startup_routes, url_prefix='/startups')
+    app.register_blueprint(investor_routes, url_prefix='/investors')
+    return app.test_client()
+
+class TestListRevalidation:
+    @pytest.mark.parametrize('path, module', [
+        ('/startups/?per_page=2', 'startup'),
+        ('/startups/?per_page=2&cursor=&fields=name', 'startup'),
+        ('/investors/?per_page=2&page=2', 'investor'),
+        ('/investors/?per_page=2&cursor=', 'investor'),
+    ])
+    def test_matching_tag_skips_serialization(self, client, auth_headers, path, module):
+        etag = client.get(path, headers=auth_headers).headers['ETag']
+
+        # The tag computed from the page's versions matches the one of the full response
+        with patch(f'src.backend.routes.{module}.serialize_many') as serialize_many:
+            response = client.get(path, headers={**auth_headers, 'If-None-Match': etag})
+
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+        serialize_many.assert_not_called()
+
+    def test_write_to_listed_row_changes_tag(self, client, auth_headers):
+        etag = client.get('/investors/?per_page=2', headers=auth_headers).headers['ETag']
+
+        db.session.get(Investor, 1).name = 'Investor 1 Renamed'
+        db.session.commit()
+        response = client.get('/investors/?per_page=2', headers={**auth_headers, 'If-None-Match': etag})
+
+        assert response.status_code == 200
+        assert response.json['investors'][0]['name'] == 'Investor 1 Renamed'
+        assert response.headers['ETag'] != etag
@@ -0,0 +1,74 @@
+import pytest
+from flask_jwt_extended import create_refresh_token, decode_token
+from src.backend.models import User
+from src.backend.routes.auth import auth_routes
+from src.backend.utils.db import db
+
+@pytest.fixture
+def seed():
+    user = User(id=1, email='test@example.com', role='admin')
+    user.set_password('password123')
+    return [user]
+
+@pytest.fixture
+def client(app, local_cache):
+    app.register_blueprint(auth_routes, url_prefix='/auth')
+    return app.test_client()
+
+class TestAuthRoutes:
+    def test_login_success(self, client):
+        response = client.post('/auth/login', json={'email': 'test@example.com', 'password': 'password123'})
+
+        # The access token carries the role and email claims; the login time is recorded
+        assert response.status_code == 200
+        claims = decode_token(response.json['access_token'])
+        assert (claims['sub'], claims['role'], claims['email']) == ('1', 'admin', 'test@example.com')
+        assert decode_token(response.json['refresh_token'])['type'] == 'refresh'
+        assert response.json['user']['email'] == 'test@example.com'
+        assert db.session.get(User, 1).last_login is not None
+
+    @pytest.mark.parametrize('credentials', [
+        {'email': 'test@example.com', 'password': 'wrong_password'},
+        {'email': 'nobody@example.com', 'password': 'password123'},
+    ])
+    def test_login_invalid_credentials(self, client, credentials):
+        response = client.post('/auth/login', json=credentials)
+
+        assert response.status_code == 401
+        assert response.json['error'] == 'Invalid email or password'
+
+    def test_login_requires_fields(self, client):
+        assert client.post('/auth/login', json={'email': 'test@example.com'}).status_code == 400
+
+    def test_refresh_token(self, client):
+        refresh_token = create_refresh_token(identity='1')
+
+        response = client.post('/auth/refresh', headers={'Authorization': f'Bearer {refresh_token}'})
+
+        assert response.status_code == 200
+        assert decode_token(response.json['access_token'])['role'] == 'admin'
+
+    def test_refresh_rejects_access_token(self, client, auth_headers):
+        assert client.post('/auth/refresh', headers=auth_headers).status_code == 422
+
+    def test_logout(self, client, auth_headers):
+        response = client.post('/auth/logout', headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json['message'] == 'Successfully logged out'
+
+    def test_change_password(self, client, auth_headers):
+        response = client.post('/auth/change-password', json={
+            'current_password': 'password123', 'new_password': 'new-password'
+        }, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert db.session.get(User, 1).check_password('new-password')
+
+    def test_change_password_rejects_wrong_current_password(self, client, auth_headers):
+        response = client.post('/auth/change-password', json={
+            'current_password': 'wrong_password', 'new_password': 'new-password'
+        }, headers=auth_headers)
+
+        assert response.status_code == 400
+        assert db.session.get(User, 1).check_password('password123')
@@ -1,129 +1,72 @@
 import pytest
-from flask import Flask
-from unittest.mock import patch, MagicMock
-from app import create_app
-from db import db
-from models.news_article import NewsArticle
+from datetime import datetime
+from src.backend.models import NewsArticle, Startup
+from src.backend.routes.news import news_routes
+from src.backend.utils.db import db
 
 @pytest.fixture
-def client():
-    # Create a Flask test client
-    app = create_app('testing')
-    
-    # Set up application context
-    with app.app_context():
-        # Yield the test client
-        yield app.test_client()
-    
-    # Tear down application context after tests
-
-class TestNewsArticleRoutes:
-    def test_get_news_articles(self, client):
-        # Mock db.session.query to return a list of mock news articles
-        mock_articles = [
-            NewsArticle(id=1, title="Article 1", content="Content 1"),
-            NewsArticle(id=2, title="Article 2", content="Content 2")
-        ]
-        with patch('db.session.query') as mock_query:
-            mock_query.return_value.all.return_value = mock_articles
-
-            # Send GET request to /news
-            response = client.get('/news')
-
-            # Assert response status code is 200
-            assert response.status_code == 200
-
-            # Assert response JSON contains expected news article data
-            data = response.get_json()
-            assert len(data) == 2
-            assert data[0]['id'] == 1
-            assert data[0]['title'] == "Article 1"
-            assert data[1]['id'] == 2
-            assert data[1]['title'] == "Article 2"
-
-    def test_get_news_article(self, client):
-        # Mock db.session.query.get to return a mock news article
-        mock_article = NewsArticle(id=1, title="Test Article", content="Test Content")
-        with patch('db.session.query') as mock_query:
-            mock_query.return_value.get.return_value = mock_article
-
-            # Send GET request to /news/1
-            response = client.get('/news/1')
-
-            # Assert response status code is 200
-            assert response.status_code == 200
-
-            # Assert response JSON contains expected news article data
-            data = response.get_json()
-            assert data['id'] == 1
-            assert data['title'] == "Test Article"
-            assert data['content'] == "Test Content"
-
-    def test_create_news_article(self, client):
-        # Mock db.session.add and db.session.commit
-        with patch('db.session.add') as mock_add, patch('db.session.commit') as mock_commit:
-            # Send POST request to /news with news article data
-            response = client.post('/news', json={
-                'title': 'New Article',
-                'content': 'New Content'
-            })
-
-            # Assert response status code is 201
-            assert response.status_code == 201
-
-            # Assert response JSON contains created news article data
-            data = response.get_json()
-            assert data['title'] == 'New Article'
-            assert data['content'] == 'New Content'
-
-            # Assert db.session.add and db.session.commit were called
-            mock_add.assert_called_once()
-            mock_commit.assert_called_once()
-
-    def test_update_news_article(self, client):
-        # Mock db.session.query.get to return a mock news article
-        mock_article = NewsArticle(id=1, title="Old Title", content="Old Content")
-        with patch('db.session.query') as mock_query, patch('db.session.commit') as mock_commit:
-            mock_query.return_value.get.return_value = mock_article
-
-            # Send PUT request to /news/1 with updated data
-            response = client.put('/news/1', json={
-                'title': 'Updated Title',
-                'content': 'Updated Content'
-            })
-
-            # Assert response status code is 200
-            assert response.status_code == 200
-
-            # Assert response JSON contains updated news article data
-            data = response.get_json()
-            assert data['id'] == 1
-            assert data['title'] == 'Updated Title'
-            assert data['content'] == 'Updated Content'
-
-            # Assert mock news article object was updated with new data
-            assert mock_article.title == 'Updated Title'
-            assert mock_article.content == 'Updated Content'
-
-            # Assert db.session.commit was called
-            mock_commit.assert_called_once()
-
-    def test_delete_news_article(self, client):
-        # Mock db.session.query.get to return a mock news article
-        mock_article = NewsArticle(id=1, title="Test Article", content="Test Content")
-        with patch('db.session.query') as mock_query, \
-             patch('db.session.delete') as mock_delete, \
-             patch('db.session.commit') as mock_commit:
-            mock_query.return_value.get.return_value = mock_article
-
-            # Send DELETE request to /news/1
-            response = client.delete('/news/1')
-
-            # Assert response status code is 204
-            assert response.status_code == 204
-
-            # Assert db.session.delete was called with the mock news article
-            mock_delete.assert_called_once_with(mock_article)
-
-            # Assert db.session.commit was called
-            mock_commit.assert_called_once()
\ No newline at end of file
+def seed():
+    return [
+        Startup(id=1, name='Startup 1'),
+        Startup(id=2, name='Startup 2'),
+        NewsArticle(id=1, startup_id=1, title='Startup 1 raises', url='https://example.com/1',
+                    published_date=datetime(2024, 5, 1)),
+        NewsArticle(id=2, startup_id=2, title='Startup 2 hires', url='https://example.com/2',
+                    published_date=datetime(2024, 5, 2)),
+    ]
+
+@pytest.fixture
+def client(app, local_cache):
+    app.register_blueprint(news_routes, url_prefix='/news')
+    return app.test_client()
+
+class TestNewsRoutes:
+    def test_get_news_articles(self, client, auth_headers):
+        response = client.get('/news/', headers=auth_headers)
+
+        # Newest articles first
+        assert response.status_code == 200
+        assert [article['id'] for article in response.json['articles']] == [2, 1]
+        assert (response.json['total'], response.json['total_exact']) == (2, True)
+
+    def test_get_news_articles_of_startup(self, client, auth_headers):
+        response = client.get('/news/?startup_id=1', headers=auth_headers)
+
+        assert [article['id'] for article in response.json['articles']] == [1]
+
+    def test_get_news_article(self, client, auth_headers):
+        response = client.get('/news/1', headers=auth_headers)
+
+        assert response.status_code == 200
+        assert (response.json['title'], response.json['url']) == ('Startup 1 raises', 'https://example.com/1')
+
+    def test_get_missing_news_article(self, client, auth_headers):
+        assert client.get('/news/3', headers=auth_headers).status_code == 404
+
+    def test_update_news_article(self, client, auth_headers):
+        response = client.put('/news/1', json={'source': 'Wire'}, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json['source'] == 'Wire'
+        assert db.session.get(NewsArticle, 1).source == 'Wire'
+
+    def test_update_missing_news_article(self, client, auth_headers):
+        assert client.put('/news/3', json={'source': 'Wire'}, headers=auth_headers).status_code == 404
+
+    def test_delete_news_article(self, client, auth_headers):
+        response = client.delete('/news/2', headers=auth_headers)
+
+        assert response.status_code == 200
+        assert db.session.get(NewsArticle, 2) is None
+
+    def test_delete_missing_news_article(self, client, auth_headers):
+        assert client.delete('/news/3', headers=auth_headers).status_code == 404
+
+    def test_bulk_create_news_articles(self, client, auth_headers):
+        response = client.post('/news/bulk', json=[{
+            'startup_id': 1, 'title': 'Startup 1 expands', 'url': 'https://example.com/3',
+            'published_date': '2024-05-03T00:00:00'
+        }], headers=auth_headers)
+
+        assert response.status_code == 201
+        assert NewsArticle.query.filter_by(startup_id=1).count() == 2
@@ -0,0 +1,50 @@
+import pytest
+from datetime import date
+from src.backend.models import Executive, Founder, FundingRound, Investor, Startup
+from src.backend.routes.investor import investor_routes
+from src.backend.routes.startup import startup_routes
+from src.backend.utils.db import query_budget
+
+@pytest.fixture
+def seed():
+    # Two startups, each with people and three funding rounds shared between two investors
+    investors = [Investor(id=1, name='Investor 1'), Investor(id=2, name='Investor 2')]
+    rows = list(investors)
+    for startup_id in (1, 2):
+        rows.append(Startup(id=startup_id, name=f'Startup {startup_id}'))
+        rows.extend(Founder(startup_id=startup_id, name=f'Founder {i}') for i in range(3))
+        rows.extend(Executive(startup_id=startup_id, name=f'Executive {i}') for i in range(3))
+        rows.extend(FundingRound(startup_id=startup_id, amount=1e6 * i, date=date(2024, i, 1), round_type='Seed',
+                                 investors=investors)
+                    for i in range(1, 4))
+    return rows
+
+@pytest.fixture
+def client(app):
+    app.register_blueprint(startup_routes, url_prefix='/startups')
+    app.register_blueprint(investor_routes, url_prefix='/investors')
+    return app.test_client()
+
+class TestEagerLoading:
+    def test_startup_profile_query_count(self, client, auth_headers):
+        # The startup, then one IN query each for founders, executives, funding rounds and their investors
+        with query_budget(5) as counter:
+            response = client.get('/startups/1/profile', headers=auth_headers)
+
+        assert response.status_code == 200
+        assert counter.count == 5
+        assert len(response.json['founders']) == len(response.json['executives']) == 3
+        assert [funding_round['investor_names'] for funding_round in response.json['funding_rounds']] == \
+            [['Investor 1', 'Investor 2']] * 3
+
+    def test_investor_portfolio_query_count(self, client, auth_headers):
+        # The investor, its startups, then its funding rounds joined to their startups plus their investors
+        with query_budget(4) as counter:
+            response = client.get('/investors/1/portfolio', headers=auth_headers)
+
+        assert response.status_code == 200
+        assert counter.count == 4
+        assert [startup['name'] for startup in response.json['startups']] == ['Startup 1', 'Startup 2']
+        assert len(response.json['funding_rounds']) == 6
+        assert {funding_round['startup_name'] for funding_round in response.json['funding_rounds']} == \
+            {'Startup 1', 'Startup 2'}
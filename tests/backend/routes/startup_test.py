@@ -1,125 +1,82 @@
 import pytest
-from flask import Flask
-from unittest.mock import patch, MagicMock
-from app import app
-from db import db
-from Startup import Startup
+from src.backend.models import Startup
+from src.backend.routes.startup import startup_routes
+from src.backend.utils.db import db
 
 @pytest.fixture
-def client():
-    # Create a Flask test client
-    with app.test_client() as client:
-        # Set up application context
-        with app.app_context():
-            yield client
-        # Tear down application context after tests
-
-def test_get_startups(client):
-    # Mock db.session.query to return a list of mock startups
-    mock_startups = [
-        Startup(id=1, name="Startup 1", description="Description 1"),
-        Startup(id=2, name="Startup 2", description="Description 2")
+def app_config():
+    return {'LIST_CACHE_TTL': 60}
+
+@pytest.fixture
+def seed():
+    return [
+        Startup(id=1, name='Startup 1', industry='Biotech'),
+        Startup(id=2, name='Startup 2', industry='Fintech'),
     ]
-    with patch('db.session.query') as mock_query:
-        mock_query.return_value.all.return_value = mock_startups
 
-        # Send GET request to /startups
-        response = client.get('/startups')
+@pytest.fixture
+def client(app, local_cache):
+    app.register_blueprint(startup_routes, url_prefix='/startups')
+    return app.test_client()
+
+class TestStartupRoutes:
+    def test_get_startups(self, client, auth_headers):
+        response = client.get('/startups/', headers=auth_headers)
 
-        # Assert response status code is 200
         assert response.status_code == 200
+        assert [startup['name'] for startup in response.json['startups']] == ['Startup 1', 'Startup 2']
+        assert (response.json['total'], response.json['total_exact'], response.json['pages']) == (2, True, 1)
 
-        # Assert response JSON contains expected startup data
-        data = response.get_json()
-        assert len(data) == 2
-        assert data[0]['id'] == 1
-        assert data[0]['name'] == "Startup 1"
-        assert data[1]['id'] == 2
-        assert data[1]['name'] == "Startup 2"
+    def test_get_startups_filtered(self, client, auth_headers):
+        response = client.get('/startups/?industry=Fintech', headers=auth_headers)
 
-def test_get_startup(client):
-    # Mock db.session.query.get to return a mock startup
-    mock_startup = Startup(id=1, name="Test Startup", description="Test Description")
-    with patch('db.session.query') as mock_query:
-        mock_query.return_value.get.return_value = mock_startup
+        assert [startup['id'] for startup in response.json['startups']] == [2]
+        assert response.json['total'] == 1
 
-        # Send GET request to /startups/1
-        response = client.get('/startups/1')
+    def test_get_startups_rejects_threshold_out_of_range(self, client, auth_headers):
+        response = client.get('/startups/?name=Startup&threshold=1.5', headers=auth_headers)
 
-        # Assert response status code is 200
-        assert response.status_code == 200
+        assert response.status_code == 400
+        assert response.json['error'] == 'threshold must be between 0 and 1'
+        assert client.get('/startups/facets?name=Startup&threshold=-1', headers=auth_headers).status_code == 400
 
-        # Assert response JSON contains expected startup data
-        data = response.get_json()
-        assert data['id'] == 1
-        assert data['name'] == "Test Startup"
-        assert data['description'] == "Test Description"
-
-def test_create_startup(client):
-    # Mock db.session.add and db.session.commit
-    with patch('db.session.add') as mock_add, patch('db.session.commit') as mock_commit:
-        # Send POST request to /startups with startup data
-        response = client.post('/startups', json={
-            'name': 'New Startup',
-            'description': 'New Description'
-        })
-
-        # Assert response status code is 201
-        assert response.status_code == 201
+    def test_get_startups_requires_token(self, client):
+        assert client.get('/startups/').status_code == 401
 
-        # Assert response JSON contains created startup data
-        data = response.get_json()
-        assert data['name'] == 'New Startup'
-        assert data['description'] == 'New Description'
+    def test_get_startup(self, client, auth_headers):
+        response = client.get('/startups/1', headers=auth_headers)
 
-        # Assert db.session.add and db.session.commit were called
-        mock_add.assert_called_once()
-        mock_commit.assert_called_once()
+        assert response.status_code == 200
+        assert response.json['name'] == 'Startup 1'
+        assert response.json['industry'] == 'Biotech'
 
-def test_update_startup(client):
-    # Mock db.session.query.get to return a mock startup
-    mock_startup = Startup(id=1, name="Old Name", description="Old Description")
-    with patch('db.session.query') as mock_query, patch('db.session.commit') as mock_commit:
-        mock_query.return_value.get.return_value = mock_startup
+    def test_get_missing_startup(self, client, auth_headers):
+        assert client.get('/startups/3', headers=auth_headers).status_code == 404
 
-        # Send PUT request to /startups/1 with updated data
-        response = client.put('/startups/1', json={
-            'name': 'Updated Name',
-            'description': 'Updated Description'
-        })
+    def test_update_startup(self, client, auth_headers):
+        response = client.put('/startups/1', json={'name': 'Updated Name', 'unknown': 'ignored'}, headers=auth_headers)
 
-        # Assert response status code is 200
         assert response.status_code == 200
+        assert response.json['name'] == 'Updated Name'
+        assert db.session.get(Startup, 1).name == 'Updated Name'
 
-        # Assert response JSON contains updated startup data
-        data = response.get_json()
-        assert data['id'] == 1
-        assert data['name'] == 'Updated Name'
-        assert data['description'] == 'Updated Description'
-
-        # Assert mock startup object was updated with new data
-        assert mock_startup.name == 'Updated Name'
-        assert mock_startup.description == 'Updated Description'
-
-        # Assert db.session.commit was called
-        mock_commit.assert_called_once()
+    def test_update_missing_startup(self, client, auth_headers):
+        assert client.put('/startups/3', json={'name': 'Nobody'}, headers=auth_headers).status_code == 404
 
-def test_delete_startup(client):
-    # Mock db.session.query.get to return a mock startup
-    mock_startup = Startup(id=1, name="To Delete", description="Will be deleted")
-    with patch('db.session.query') as mock_query, \
-         patch('db.session.delete') as mock_delete, \
-         patch('db.session.commit') as mock_commit:
-        mock_query.return_value.get.return_value = mock_startup
+    def test_delete_startup(self, client, auth_headers):
+        response = client.delete('/startups/2', headers=auth_headers)
 
-        # Send DELETE request to /startups/1
-        response = client.delete('/startups/1')
+        assert response.status_code == 200
+        assert db.session.get(Startup, 2) is None
+        assert client.get('/startups/2', headers=auth_headers).status_code == 404
 
-        # Assert response status code is 204
-        assert response.status_code == 204
+    def test_delete_missing_startup(self, client, auth_headers):
+        assert client.delete('/startups/3', headers=auth_headers).status_code == 404
 
-        # Assert db.session.delete was called with the mock startup
-        mock_delete.assert_called_once_with(mock_startup)
+    def test_bulk_create_startups(self, client, auth_headers):
+        response = client.post('/startups/bulk', json=[{'name': 'Startup 3'}, {'name': 'Startup 4'}],
+                               headers=auth_headers)
 
-        # Assert db.session.commit was called
-        mock_commit.assert_called_once()
\ No newline at end of file
+        assert response.status_code == 201
+        assert (response.json['succeeded'], response.json['failed']) == (2, 0)
+        assert Startup.query.count() == 4
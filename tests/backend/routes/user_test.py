@@ -1,137 +1,68 @@
 import pytest
-from flask import Flask
-from unittest.mock import patch, MagicMock
-from app import app
-from db import db
-from models.user import User
-from utils.auth import bcrypt
+from src.backend.models import User
+from src.backend.routes.user import user_routes
+from src.backend.utils.db import db
 
 @pytest.fixture
-def client():
-    # Create a Flask test client
-    with app.test_client() as client:
-        # Set up application context
-        with app.app_context():
-            yield client
-        # Tear down application context after tests
-
-def test_get_users(client):
-    # Mock db.session.query to return a list of mock users
-    mock_users = [
-        User(id=1, username='user1', email='user1@example.com'),
-        User(id=2, username='user2', email='user2@example.com')
-    ]
-    with patch('db.session.query') as mock_query:
-        mock_query.return_value.all.return_value = mock_users
-
-        # Send GET request to /users
-        response = client.get('/users')
-
-        # Assert response status code is 200
-        assert response.status_code == 200
+def seed():
+    users = [User(id=1, email='user1@example.com', first_name='User'), User(id=2, email='user2@example.com')]
+    for user in users:
+        user.set_password('password123')
+    return users
+
+@pytest.fixture
+def client(app, local_cache):
+    app.register_blueprint(user_routes, url_prefix='/users')
+    return app.test_client()
+
+class TestUserRoutes:
+    def test_get_users(self, client, auth_headers):
+        response = client.get('/users/', headers=auth_headers)
 
-        # Assert response JSON contains expected user data
-        data = response.get_json()
-        assert len(data) == 2
-        assert data[0]['id'] == 1
-        assert data[0]['username'] == 'user1'
-        assert data[0]['email'] == 'user1@example.com'
-        assert data[1]['id'] == 2
-        assert data[1]['username'] == 'user2'
-        assert data[1]['email'] == 'user2@example.com'
-
-def test_get_user(client):
-    # Mock db.session.query.get to return a mock user
-    mock_user = User(id=1, username='user1', email='user1@example.com')
-    with patch('db.session.query') as mock_query:
-        mock_query.return_value.get.return_value = mock_user
-
-        # Send GET request to /users/1
-        response = client.get('/users/1')
-
-        # Assert response status code is 200
         assert response.status_code == 200
+        assert [user['email'] for user in response.json['users']] == ['user1@example.com', 'user2@example.com']
+        assert (response.json['total'], response.json['total_exact']) == (2, True)
+        # Password hashes never leave the server
+        assert all('password_hash' not in user for user in response.json['users'])
+
+    def test_get_user(self, client, auth_headers):
+        response = client.get('/users/1', headers=auth_headers)
 
-        # Assert response JSON contains expected user data
-        data = response.get_json()
-        assert data['id'] == 1
-        assert data['username'] == 'user1'
-        assert data['email'] == 'user1@example.com'
-
-def test_create_user(client):
-    # Mock db.session.add and db.session.commit
-    with patch('db.session.add') as mock_add, \
-         patch('db.session.commit') as mock_commit, \
-         patch('bcrypt.generate_password_hash') as mock_hash:
-
-        mock_hash.return_value = b'hashed_password'
-
-        # Send POST request to /users with user data
-        response = client.post('/users', json={
-            'username': 'newuser',
-            'email': 'newuser@example.com',
-            'password': 'password123'
-        })
-
-        # Assert response status code is 201
-        assert response.status_code == 201
-
-        # Assert response JSON contains created user data
-        data = response.get_json()
-        assert data['username'] == 'newuser'
-        assert data['email'] == 'newuser@example.com'
-
-        # Assert db.session.add and db.session.commit were called
-        mock_add.assert_called_once()
-        mock_commit.assert_called_once()
-
-        # Assert bcrypt.generate_password_hash was called
-        mock_hash.assert_called_once_with('password123')
-
-def test_update_user(client):
-    # Mock db.session.query.get to return a mock user
-    mock_user = User(id=1, username='user1', email='user1@example.com')
-    with patch('db.session.query') as mock_query, \
-         patch('db.session.commit') as mock_commit:
-        mock_query.return_value.get.return_value = mock_user
-
-        # Send PUT request to /users/1 with updated data
-        response = client.put('/users/1', json={
-            'username': 'updateduser',
-            'email': 'updated@example.com'
-        })
-
-        # Assert response status code is 200
         assert response.status_code == 200
+        assert (response.json['email'], response.json['first_name'], response.json['role']) == \
+            ('user1@example.com', 'User', 'user')
 
-        # Assert response JSON contains updated user data
-        data = response.get_json()
-        assert data['username'] == 'updateduser'
-        assert data['email'] == 'updated@example.com'
+    def test_get_missing_user(self, client, auth_headers):
+        assert client.get('/users/3', headers=auth_headers).status_code == 404
 
-        # Assert mock user object was updated with new data
-        assert mock_user.username == 'updateduser'
-        assert mock_user.email == 'updated@example.com'
+    def test_create_user_requires_fields(self, client):
+        response = client.post('/users/', json={'email': 'new@example.com'})
 
-        # Assert db.session.commit was called
-        mock_commit.assert_called_once()
+        assert response.status_code == 400
+        assert response.json['error'] == 'Missing required field: password'
 
-def test_delete_user(client):
-    # Mock db.session.query.get to return a mock user
-    mock_user = User(id=1, username='user1', email='user1@example.com')
-    with patch('db.session.query') as mock_query, \
-         patch('db.session.delete') as mock_delete, \
-         patch('db.session.commit') as mock_commit:
-        mock_query.return_value.get.return_value = mock_user
+    def test_create_user_rejects_taken_email(self, client):
+        response = client.post('/users/', json={'email': 'user1@example.com', 'password': 'secret', 'name': 'New'})
 
-        # Send DELETE request to /users/1
-        response = client.delete('/users/1')
+        assert response.status_code == 400
+        assert response.json['error'] == 'Email already exists'
 
-        # Assert response status code is 204
-        assert response.status_code == 204
+    def test_update_user(self, client, auth_headers):
+        response = client.put('/users/2', json={'email': 'renamed@example.com', 'password': 'new-password'},
+                              headers=auth_headers)
 
-        # Assert db.session.delete was called with the mock user
-        mock_delete.assert_called_once_with(mock_user)
+        assert response.status_code == 200
+        assert response.json['email'] == 'renamed@example.com'
+        assert db.session.get(User, 2).check_password('new-password')
+
+    def test_update_missing_user(self, client, auth_headers):
+        assert client.put('/users/3', json={'email': 'nobody@example.com'}, headers=auth_headers).status_code == 404
+
+    def test_delete_user(self, client, auth_headers):
+        response = client.delete('/users/2', headers=auth_headers)
+
+        assert response.status_code == 200
+        assert db.session.get(User, 2) is None
 
-        # Assert db.session.commit was called
-        mock_commit.assert_called_once()
\ No newline at end of file
+    def test_delete_missing_user(self, client, auth_headers):
+        assert client.delete('/users/3', headers=auth_headers).status_code == 404
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy.orm import load_only
+from src.backend.models import Startup
+from src.backend.services import autocomplete_service
+from src.backend.utils.db import count_queries, db
+
+@pytest.fixture
+def seed():
+    # Startups ranked by total funding
+    return [
+        Startup(id=1, name='Bio Alpha', industry='Biotech', total_funding=100e6),
+        Startup(id=2, name='Bio Beta', industry='Biotech', total_funding=50e6),
+    ]
+
+@pytest.fixture(autouse=True)
+def index(app):
+    # Start every test without an index, as a fresh worker does
+    autocomplete_service._index, autocomplete_service._built_pid = None, None
+    yield
+    autocomplete_service._index, autocomplete_service._built_pid = None, None
+
+def startup_labels(query):
+    return [suggestion['label'] for suggestion in autocomplete_service.autocomplete(query)
+            if suggestion['type'] == 'startup']
+
+class TestIndexWarmup:
+    def test_index_built_at_start(self, app):
+        autocomplete_service.init_autocomplete(app)
+
+        # The first lookup finds the index built and runs no query
+        with count_queries() as counter:
+            assert startup_labels('bio') == ['Bio Alpha', 'Bio Beta']
+        assert counter.count == 0
+
+    def test_forked_worker_builds_before_its_first_request(self, app):
+        @app.route('/ping')
+        def ping():
+            return {'built': autocomplete_service._index is not None}
+
+        autocomplete_service.init_autocomplete(app)
+        # A worker forked from the process that built the index
+        autocomplete_service._built_pid = -1
+
+        assert app.test_client().get('/ping').json == {'built': True}
+        assert autocomplete_service._built_pid is not None and autocomplete_service._built_pid != -1
+
+class TestIndexUpdates:
+    def test_rename_keeps_unloaded_funding(self, app):
+        db.session.get(Startup, 2).total_funding = 500e6
+        db.session.commit()
+        db.session.remove()
+        autocomplete_service.get_index()
+
+        # The rename loads the name only; the ranking reads the funding from the database
+        startup = Startup.query.options(load_only(Startup.name)).filter_by(id=2).one()
+        startup.name = 'Bio Gamma'
+        db.session.commit()
+
+        assert startup_labels('bio') == ['Bio Gamma', 'Bio Alpha']
+
+    def test_funding_change_reranks(self, app):
+        autocomplete_service.get_index()
+
+        db.session.get(Startup, 2).total_funding = 500e6
+        db.session.commit()
+
+        assert startup_labels('bio') == ['Bio Beta', 'Bio Alpha']
+
+    def test_insert_ranked_by_its_funding(self, app):
+        autocomplete_service.get_index()
+
+        db.session.add(Startup(id=3, name='Bio Delta', total_funding=1e9))
+        db.session.commit()
+
+        assert startup_labels('bio') == ['Bio Delta', 'Bio Alpha', 'Bio Beta']
@@ -1,96 +1,63 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from datetime import date
+from src.backend.models import FundingRound, Investor, Startup
 from src.backend.services import investor_service
-from src.backend.models.investor import Investor
-from src.backend.utils import db
+from src.backend.utils.db import db
 
-class TestInvestorService:
-    @patch('src.backend.utils.db.session.query')
-    def test_get_investors(self, mock_query):
-        # Mock db.session.query to return a list of mock investors
-        mock_investors = [Investor(id=1, name="Investor 1"), Investor(id=2, name="Investor 2")]
-        mock_query.return_value.all.return_value = mock_investors
-
-        # Call investor_service.get_investors()
-        result = investor_service.get_investors()
-
-        # Assert the correct number of investors is returned
-        assert len(result) == len(mock_investors)
-
-        # Assert the returned objects are of type Investor
-        for investor in result:
-            assert isinstance(investor, Investor)
-
-    @patch('src.backend.utils.db.session.query')
-    def test_get_investor_by_id(self, mock_query):
-        # Create a mock investor with a specific ID
-        mock_investor = Investor(id=1, name="Test Investor")
-        mock_query.return_value.get.return_value = mock_investor
+# Every test runs against the shared app's database, with a fresh local cache
+pytestmark = pytest.mark.usefixtures('app', 'local_cache')
 
-        # Call investor_service.get_investor_by_id() with the specific ID
-        result = investor_service.get_investor_by_id(1)
+@pytest.fixture
+def seed():
+    investors = [Investor(id=1, name='Beta Capital', type='VC'), Investor(id=2, name='Acme Ventures', type='Angel')]
+    return investors + [
+        Startup(id=1, name='Startup 1'),
+        FundingRound(id=1, startup_id=1, amount=1e6, date=date(2024, 1, 1), round_type='Seed',
+                     investors=investors[:1]),
+    ]
 
-        # Assert the returned investor matches the mock investor
-        assert result == mock_investor
-
-        # Assert the returned object is an instance of Investor
-        assert isinstance(result, Investor)
-
-    @patch('src.backend.utils.db.session.add')
-    @patch('src.backend.utils.db.session.commit')
-    def test_create_investor(self, mock_commit, mock_add):
-        # Create mock investor data
-        investor_data = {"name": "New Investor", "email": "new@investor.com"}
-
-        # Call investor_service.create_investor() with mock data
-        result = investor_service.create_investor(investor_data)
+class TestInvestorService:
+    def test_get_investors(self):
+        investors, total, total_exact = investor_service.get_investors({}, page=1, per_page=20)
 
-        # Assert db.session.add was called with an Investor object
-        mock_add.assert_called_once()
-        assert isinstance(mock_add.call_args[0][0], Investor)
+        assert [investor.name for investor in investors] == ['Acme Ventures', 'Beta Capital']
+        assert (total, total_exact) == (2, True)
 
-        # Assert db.session.commit was called
-        mock_commit.assert_called_once()
+    def test_get_investors_filtered(self):
+        investors, total, total_exact = investor_service.get_investors({'type': 'VC'}, page=1, per_page=20)
 
-        # Assert the returned object is an instance of Investor
-        assert isinstance(result, Investor)
+        assert [investor.id for investor in investors] == [1]
+        assert (total, total_exact) == (1, True)
 
-    @patch('src.backend.utils.db.session.query')
-    @patch('src.backend.utils.db.session.commit')
-    def test_update_investor(self, mock_commit, mock_query):
-        # Create a mock investor
-        mock_investor = Investor(id=1, name="Old Name", email="old@email.com")
-        mock_query.return_value.get.return_value = mock_investor
+    def test_get_investor_by_id(self):
+        assert investor_service.get_investor_by_id(1).name == 'Beta Capital'
+        assert investor_service.get_investor_by_id(3) is None
 
-        # Create mock update data
-        update_data = {"name": "New Name", "email": "new@email.com"}
+    def test_get_investors_by_ids(self):
+        assert [investor['id'] for investor in investor_service.get_investors_by_ids([2, 3, 1])] == [2, 1]
 
-        # Call investor_service.update_investor() with mock data
-        result = investor_service.update_investor(1, update_data)
+    def test_create_investor(self):
+        investor = investor_service.create_investor({'name': 'Gamma Partners', 'type': 'PE'})
 
-        # Assert the investor's attributes are updated
-        assert result.name == update_data["name"]
-        assert result.email == update_data["email"]
+        assert db.session.get(Investor, investor.id).type == 'PE'
 
-        # Assert db.session.commit was called
-        mock_commit.assert_called_once()
+    def test_update_investor(self):
+        investor = investor_service.update_investor(1, {'type': 'PE'})
 
-        # Assert the returned object is an instance of Investor
-        assert isinstance(result, Investor)
+        assert investor.type == 'PE'
+        assert investor_service.get_investor_data(1)['type'] == 'PE'
 
-    @patch('src.backend.utils.db.session.query')
-    @patch('src.backend.utils.db.session.delete')
-    @patch('src.backend.utils.db.session.commit')
-    def test_delete_investor(self, mock_commit, mock_delete, mock_query):
-        # Create a mock investor
-        mock_investor = Investor(id=1, name="To Be Deleted")
-        mock_query.return_value.get.return_value = mock_investor
+    def test_update_missing_investor(self):
+        with pytest.raises(ValueError):
+            investor_service.update_investor(3, {'type': 'PE'})
 
-        # Call investor_service.delete_investor() with the investor's ID
-        investor_service.delete_investor(1)
+    def test_delete_investor(self):
+        assert investor_service.delete_investor(2) is True
+        assert investor_service.delete_investor(2) is False
 
-        # Assert db.session.delete was called with the mock investor
-        mock_delete.assert_called_once_with(mock_investor)
+    def test_get_investor_portfolio(self):
+        assert [startup.name for startup in investor_service.get_investor_portfolio(1)] == ['Startup 1']
+        assert investor_service.get_investor_portfolio(2) == []
 
-        # Assert db.session.commit was called
-        mock_commit.assert_called_once()
\ No newline at end of file
+    def test_get_investor_investment_history(self):
+        assert [funding_round.id for funding_round in investor_service.get_investor_investment_history(1)] == [1]
@@ -1,99 +1,61 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from datetime import datetime
+from src.backend.models import JobPosting, Startup
 from src.backend.services import job_service
-from src.backend.models.job_posting import JobPosting
-from src.backend.utils import db
+from src.backend.utils.db import db
 
-class TestJobService:
-    @pytest.fixture
-    def mock_db_session(self):
-        with patch('src.backend.utils.db.session') as mock_session:
-            yield mock_session
-
-    def test_get_job_postings(self, mock_db_session):
-        # Mock db.session.query to return a list of mock job postings
-        mock_job_postings = [JobPosting(id=1), JobPosting(id=2), JobPosting(id=3)]
-        mock_db_session.query.return_value.all.return_value = mock_job_postings
-
-        # Call job_service.get_job_postings()
-        result = job_service.get_job_postings()
-
-        # Assert the correct number of job postings is returned
-        assert len(result) == len(mock_job_postings)
-
-        # Assert the returned objects are of type JobPosting
-        assert all(isinstance(job, JobPosting) for job in result)
-
-    def test_get_job_posting_by_id(self, mock_db_session):
-        # Create a mock job posting with a specific ID
-        mock_job_posting = JobPosting(id=1, title="Software Engineer")
-        mock_db_session.query.return_value.get.return_value = mock_job_posting
+# Every test runs against the shared app's database, with a fresh local cache
+pytestmark = pytest.mark.usefixtures('app', 'local_cache')
 
-        # Call job_service.get_job_posting_by_id() with the specific ID
-        result = job_service.get_job_posting_by_id(1)
+@pytest.fixture
+def seed():
+    return [
+        Startup(id=1, name='Startup 1'),
+        Startup(id=2, name='Startup 2'),
+        JobPosting(id=1, startup_id=1, title='Engineer', posted_date=datetime(2024, 5, 1)),
+        JobPosting(id=2, startup_id=1, title='Designer', posted_date=datetime(2024, 5, 3)),
+        JobPosting(id=3, startup_id=2, title='Analyst', posted_date=datetime(2024, 5, 2)),
+    ]
 
-        # Assert the returned job posting matches the mock job posting
-        assert result == mock_job_posting
-
-        # Assert the returned object is an instance of JobPosting
-        assert isinstance(result, JobPosting)
-
-    def test_create_job_posting(self, mock_db_session):
-        # Create mock job posting data
-        mock_data = {
-            "title": "Software Engineer",
-            "company": "TechCorp",
-            "description": "Exciting opportunity for a skilled developer"
-        }
-
-        # Call job_service.create_job_posting() with mock data
-        result = job_service.create_job_posting(mock_data)
-
-        # Assert db.session.add was called with a JobPosting object
-        mock_db_session.add.assert_called_once()
-        assert isinstance(mock_db_session.add.call_args[0][0], JobPosting)
+class TestJobService:
+    def test_get_job_postings(self):
+        job_postings, total, total_exact = job_service.get_job_postings(per_page=2)
 
-        # Assert db.session.commit was called
-        mock_db_session.commit.assert_called_once()
+        # Newest postings first, with the total of all pages
+        assert [job_posting.id for job_posting in job_postings] == [2, 3]
+        assert (total, total_exact) == (3, True)
 
-        # Assert the returned object is an instance of JobPosting
-        assert isinstance(result, JobPosting)
+    def test_get_job_postings_of_startup(self):
+        job_postings, total, total_exact = job_service.get_job_postings({'startup_id': 1})
 
-    def test_update_job_posting(self, mock_db_session):
-        # Create a mock job posting
-        mock_job_posting = JobPosting(id=1, title="Software Engineer", company="TechCorp")
-        mock_db_session.query.return_value.get.return_value = mock_job_posting
+        assert [job_posting.id for job_posting in job_postings] == [2, 1]
+        assert (total, total_exact) == (2, True)
 
-        # Create mock update data
-        mock_update_data = {
-            "title": "Senior Software Engineer",
-            "description": "Leadership role for an experienced developer"
-        }
+    def test_get_job_posting_by_id(self):
+        assert job_service.get_job_posting_by_id(1).title == 'Engineer'
+        assert job_service.get_job_posting_by_id(4) is None
 
-        # Call job_service.update_job_posting() with mock data
-        result = job_service.update_job_posting(1, mock_update_data)
+    def test_get_job_postings_by_ids(self):
+        assert [job['id'] for job in job_service.get_job_postings_by_ids([3, 4, 1])] == [3, 1]
 
-        # Assert the job posting's attributes are updated
-        assert result.title == mock_update_data["title"]
-        assert result.description == mock_update_data["description"]
-        assert result.company == "TechCorp"  # Unchanged attribute
+    def test_create_job_posting(self):
+        job_posting = job_service.create_job_posting({'startup_id': 2, 'title': 'Recruiter'})
 
-        # Assert db.session.commit was called
-        mock_db_session.commit.assert_called_once()
+        assert db.session.get(JobPosting, job_posting.id).startup_id == 2
 
-        # Assert the returned object is an instance of JobPosting
-        assert isinstance(result, JobPosting)
+    def test_update_job_posting(self):
+        job_posting = job_service.update_job_posting(1, {'title': 'Senior Engineer'})
 
-    def test_delete_job_posting(self, mock_db_session):
-        # Create a mock job posting
-        mock_job_posting = JobPosting(id=1, title="Software Engineer")
-        mock_db_session.query.return_value.get.return_value = mock_job_posting
+        assert job_posting.title == 'Senior Engineer'
+        assert job_service.get_job_posting_data(1)['title'] == 'Senior Engineer'
 
-        # Call job_service.delete_job_posting() with the job posting's ID
-        job_service.delete_job_posting(1)
+    def test_update_missing_job_posting(self):
+        with pytest.raises(ValueError):
+            job_service.update_job_posting(4, {'title': 'Nobody'})
 
-        # Assert db.session.delete was called with the mock job posting
-        mock_db_session.delete.assert_called_once_with(mock_job_posting)
+    def test_delete_job_posting(self):
+        assert job_service.delete_job_posting(3) is True
+        assert job_service.delete_job_posting(3) is False
 
-        # Assert db.session.commit was called
-        mock_db_session.commit.assert_called_once()
\ No newline at end of file
+    def test_get_job_postings_by_startup(self):
+        assert {job_posting.id for job_posting in job_service.get_job_postings_by_startup(1)} == {1, 2}
@@ -1,96 +1,65 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from datetime import datetime
+from src.backend.models import NewsArticle, Startup
 from src.backend.services import news_service
-from src.backend.models.news_article import NewsArticle
-from src.backend.utils import db
+from src.backend.utils.db import db
 
-class TestNewsService:
-    @patch('src.backend.utils.db.session.query')
-    def test_get_news_articles(self, mock_query):
-        # Mock db.session.query to return a list of mock news articles
-        mock_articles = [NewsArticle(id=1, title='Test Article 1'), NewsArticle(id=2, title='Test Article 2')]
-        mock_query.return_value.all.return_value = mock_articles
-
-        # Call news_service.get_news_articles()
-        result = news_service.get_news_articles()
-
-        # Assert the correct number of news articles is returned
-        assert len(result) == len(mock_articles)
-
-        # Assert the returned objects are of type NewsArticle
-        for article in result:
-            assert isinstance(article, NewsArticle)
-
-    @patch('src.backend.utils.db.session.query')
-    def test_get_news_article_by_id(self, mock_query):
-        # Create a mock news article with a specific ID
-        mock_article = NewsArticle(id=1, title='Test Article')
-        mock_query.return_value.get.return_value = mock_article
+# Every test runs against the shared app's database, with a fresh local cache
+pytestmark = pytest.mark.usefixtures('app', 'local_cache')
 
-        # Call news_service.get_news_article_by_id() with the specific ID
-        result = news_service.get_news_article_by_id(1)
+@pytest.fixture
+def seed():
+    return [Startup(id=1, name='Startup 1'), Startup(id=2, name='Startup 2')] + [
+        NewsArticle(id=article_id, startup_id=startup_id, title=f'Article {article_id}',
+                    url=f'https://example.com/{article_id}', published_date=datetime(2024, 5, day))
+        for article_id, startup_id, day in ((1, 1, 1), (2, 1, 3), (3, 2, 2))
+    ]
 
-        # Assert the returned news article matches the mock news article
-        assert result == mock_article
-
-        # Assert the returned object is an instance of NewsArticle
-        assert isinstance(result, NewsArticle)
-
-    @patch('src.backend.utils.db.session.add')
-    @patch('src.backend.utils.db.session.commit')
-    def test_create_news_article(self, mock_commit, mock_add):
-        # Create mock news article data
-        mock_data = {'title': 'New Article', 'content': 'Article content'}
-
-        # Call news_service.create_news_article() with mock data
-        result = news_service.create_news_article(mock_data)
+class TestNewsService:
+    def test_get_news_articles(self):
+        articles, total, total_exact = news_service.get_news_articles(per_page=2)
 
-        # Assert db.session.add was called with a NewsArticle object
-        mock_add.assert_called_once()
-        assert isinstance(mock_add.call_args[0][0], NewsArticle)
+        # Newest articles first, with the total of all pages
+        assert [article.id for article in articles] == [2, 3]
+        assert (total, total_exact) == (3, True)
 
-        # Assert db.session.commit was called
-        mock_commit.assert_called_once()
+    def test_get_news_articles_filtered(self):
+        articles, total, total_exact = news_service.get_news_articles({'startup_id': 2})
 
-        # Assert the returned object is an instance of NewsArticle
-        assert isinstance(result, NewsArticle)
+        assert [article.id for article in articles] == [3]
+        assert (total, total_exact) == (1, True)
 
-    @patch('src.backend.utils.db.session.query')
-    @patch('src.backend.utils.db.session.commit')
-    def test_update_news_article(self, mock_commit, mock_query):
-        # Create a mock news article
-        mock_article = NewsArticle(id=1, title='Old Title', content='Old content')
-        mock_query.return_value.get.return_value = mock_article
+    def test_get_news_article_by_id(self):
+        assert news_service.get_news_article_by_id(1).title == 'Article 1'
+        assert news_service.get_news_article_by_id(4) is None
 
-        # Create mock update data
-        mock_update_data = {'title': 'Updated Title', 'content': 'Updated content'}
+    def test_get_news_articles_by_ids(self):
+        assert [article['id'] for article in news_service.get_news_articles_by_ids([3, 4, 1])] == [3, 1]
 
-        # Call news_service.update_news_article() with mock data
-        result = news_service.update_news_article(1, mock_update_data)
+    def test_create_news_article(self):
+        article = news_service.create_news_article({
+            'startup_id': 2, 'title': 'Article 4', 'url': 'https://example.com/4',
+            'published_date': datetime(2024, 5, 4)
+        })
 
-        # Assert the news article's attributes are updated
-        assert result.title == 'Updated Title'
-        assert result.content == 'Updated content'
+        assert db.session.get(NewsArticle, article.id).title == 'Article 4'
 
-        # Assert db.session.commit was called
-        mock_commit.assert_called_once()
+    def test_update_news_article(self):
+        article = news_service.update_news_article(1, {'source': 'Wire'})
 
-        # Assert the returned object is an instance of NewsArticle
-        assert isinstance(result, NewsArticle)
+        assert article.source == 'Wire'
+        assert news_service.get_news_article_data(1)['source'] == 'Wire'
 
-    @patch('src.backend.utils.db.session.query')
-    @patch('src.backend.utils.db.session.delete')
-    @patch('src.backend.utils.db.session.commit')
-    def test_delete_news_article(self, mock_commit, mock_delete, mock_query):
-        # Create a mock news article
-        mock_article = NewsArticle(id=1, title='Test Article')
-        mock_query.return_value.get.return_value = mock_article
+    def test_update_missing_news_article(self):
+        with pytest.raises(ValueError):
+            news_service.update_news_article(4, {'source': 'Wire'})
 
-        # Call news_service.delete_news_article() with the news article's ID
-        news_service.delete_news_article(1)
+    def test_delete_news_article(self):
+        assert news_service.delete_news_article(3) is True
+        assert news_service.delete_news_article(3) is False
 
-        # Assert db.session.delete was called with the mock news article
-        mock_delete.assert_called_once_with(mock_article)
+    def test_get_news_articles_by_startup(self):
+        articles, total, total_exact = news_service.get_news_articles_by_startup(1, per_page=1)
 
-        # Assert db.session.commit was called
-        mock_commit.assert_called_once()
\ No newline at end of file
+        assert len(articles) == 1
+        assert (total, total_exact) == (2, True)
@@ -1,96 +1,74 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from datetime import date
+from src.backend.models import FundingRound, Startup
 from src.backend.services import startup_service
-from src.backend.models.startup import Startup
-from src.backend.utils import db
+from src.backend.utils.db import db
 
-class TestStartupService:
-    @patch('src.backend.utils.db.session.query')
-    def test_get_startups(self, mock_query):
-        # Mock db.session.query to return a list of mock startups
-        mock_startups = [Startup(id=1, name='Startup 1'), Startup(id=2, name='Startup 2')]
-        mock_query.return_value.all.return_value = mock_startups
-
-        # Call startup_service.get_startups()
-        result = startup_service.get_startups()
-
-        # Assert the correct number of startups is returned
-        assert len(result) == len(mock_startups)
+# Every test runs against the shared app's database, with a fresh local cache
+pytestmark = pytest.mark.usefixtures('app', 'local_cache')
 
-        # Assert the returned objects are of type Startup
-        for startup in result:
-            assert isinstance(startup, Startup)
+@pytest.fixture
+def seed():
+    return [
+        Startup(id=1, name='Beta', industry='Fintech'),
+        Startup(id=2, name='Alpha', industry='Biotech'),
+        Startup(id=3, name='Gamma', industry='Fintech'),
+        FundingRound(id=1, startup_id=1, amount=1e6, date=date(2024, 1, 1), round_type='Seed'),
+    ]
 
-    @patch('src.backend.utils.db.session.query')
-    def test_get_startup_by_id(self, mock_query):
-        # Create a mock startup with a specific ID
-        mock_startup = Startup(id=1, name='Test Startup')
-        mock_query.return_value.get.return_value = mock_startup
-
-        # Call startup_service.get_startup_by_id() with the specific ID
-        result = startup_service.get_startup_by_id(1)
-
-        # Assert the returned startup matches the mock startup
-        assert result == mock_startup
+class TestStartupService:
+    def test_get_startups(self):
+        startups, total, total_exact = startup_service.get_startups(per_page=2)
 
-        # Assert the returned object is an instance of Startup
-        assert isinstance(result, Startup)
+        # Ordered by name, with the total of all pages
+        assert [startup.name for startup in startups] == ['Alpha', 'Beta']
+        assert (total, total_exact) == (3, True)
 
-    @patch('src.backend.utils.db.session.add')
-    @patch('src.backend.utils.db.session.commit')
-    def test_create_startup(self, mock_commit, mock_add):
-        # Create mock startup data
-        startup_data = {'name': 'New Startup', 'description': 'A new startup'}
+    def test_get_startups_filtered(self):
+        startups, total, total_exact = startup_service.get_startups({'industry': 'Fintech'}, page=2, per_page=1)
 
-        # Call startup_service.create_startup() with mock data
-        result = startup_service.create_startup(startup_data)
+        assert [startup.name for startup in startups] == ['Gamma']
+        assert (total, total_exact) == (2, True)
 
-        # Assert db.session.add was called with a Startup object
-        mock_add.assert_called_once()
-        assert isinstance(mock_add.call_args[0][0], Startup)
+    def test_get_startups_uncounted(self):
+        # Without a count the total is unknown, so it is not exact either
+        startups, total, total_exact = startup_service.get_startups(per_page=2, count='none')
 
-        # Assert db.session.commit was called
-        mock_commit.assert_called_once()
+        assert len(startups) == 2
+        assert (total, total_exact) == (None, False)
 
-        # Assert the returned object is an instance of Startup
-        assert isinstance(result, Startup)
+    def test_get_startup_by_id(self):
+        assert startup_service.get_startup_by_id(1).name == 'Beta'
+        assert startup_service.get_startup_by_id(4) is None
 
-    @patch('src.backend.utils.db.session.query')
-    @patch('src.backend.utils.db.session.commit')
-    def test_update_startup(self, mock_commit, mock_query):
-        # Create a mock startup
-        mock_startup = Startup(id=1, name='Old Name', description='Old description')
-        mock_query.return_value.get.return_value = mock_startup
+    def test_get_startups_by_ids(self):
+        startups = startup_service.get_startups_by_ids([3, 4, 1])
 
-        # Create mock update data
-        update_data = {'name': 'New Name', 'description': 'New description'}
+        assert [startup['id'] for startup in startups] == [3, 1]
 
-        # Call startup_service.update_startup() with mock data
-        result = startup_service.update_startup(1, update_data)
+    def test_create_startup(self):
+        startup = startup_service.create_startup({'name': 'Delta', 'industry': 'Energy'})
 
-        # Assert the startup's attributes are updated
-        assert result.name == 'New Name'
-        assert result.description == 'New description'
+        assert startup.id is not None
+        assert db.session.get(Startup, startup.id).industry == 'Energy'
 
-        # Assert db.session.commit was called
-        mock_commit.assert_called_once()
+    def test_update_startup(self):
+        startup = startup_service.update_startup(1, {'name': 'Beta Labs'})
 
-        # Assert the returned object is an instance of Startup
-        assert isinstance(result, Startup)
+        assert startup.name == 'Beta Labs'
+        assert startup_service.get_startup_data(1)['name'] == 'Beta Labs'
 
-    @patch('src.backend.utils.db.session.query')
-    @patch('src.backend.utils.db.session.delete')
-    @patch('src.backend.utils.db.session.commit')
-    def test_delete_startup(self, mock_commit, mock_delete, mock_query):
-        # Create a mock startup
-        mock_startup = Startup(id=1, name='Startup to delete')
-        mock_query.return_value.get.return_value = mock_startup
+    def test_update_missing_startup(self):
+        with pytest.raises(ValueError):
+            startup_service.update_startup(4, {'name': 'Nobody'})
 
-        # Call startup_service.delete_startup() with the startup's ID
-        startup_service.delete_startup(1)
+    def test_delete_startup(self):
+        assert startup_service.delete_startup(2) is True
+        assert startup_service.delete_startup(2) is False
+        assert db.session.get(Startup, 2) is None
 
-        # Assert db.session.delete was called with the mock startup
-        mock_delete.assert_called_once_with(mock_startup)
+    def test_get_startup_funding_rounds(self):
+        funding_rounds = startup_service.get_startup_funding_rounds(1)
 
-        # Assert db.session.commit was called
-        mock_commit.assert_called_once()
\ No newline at end of file
+        assert [funding_round.amount for funding_round in funding_rounds] == [1e6]
+        assert startup_service.get_startup_funding_rounds(2) == []
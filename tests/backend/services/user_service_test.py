@@ -1,121 +1,60 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from src.backend.models import User
 from src.backend.services import user_service
-from src.backend.models.user import User
-from src.backend.utils import db
-from src.backend.utils import auth as bcrypt
+from src.backend.utils.db import db
 
-class TestUserService:
-    @pytest.fixture
-    def mock_db_session(self):
-        with patch('src.backend.utils.db.session') as mock_session:
-            yield mock_session
-
-    @pytest.fixture
-    def mock_bcrypt(self):
-        with patch('src.backend.utils.auth.bcrypt') as mock_bcrypt:
-            yield mock_bcrypt
-
-    def test_get_users(self, mock_db_session):
-        # Mock db.session.query to return a list of mock users
-        mock_users = [User(id=1, username='user1'), User(id=2, username='user2')]
-        mock_db_session.query.return_value.all.return_value = mock_users
-
-        # Call user_service.get_users()
-        result = user_service.get_users()
-
-        # Assert the correct number of users is returned
-        assert len(result) == len(mock_users)
-
-        # Assert the returned objects are of type User
-        assert all(isinstance(user, User) for user in result)
-
-    def test_get_user_by_id(self, mock_db_session):
-        # Create a mock user with a specific ID
-        mock_user = User(id=1, username='testuser')
-        mock_db_session.query.return_value.get.return_value = mock_user
-
-        # Call user_service.get_user_by_id() with the specific ID
-        result = user_service.get_user_by_id(1)
-
-        # Assert the returned user matches the mock user
-        assert result == mock_user
-
-        # Assert the returned object is an instance of User
-        assert isinstance(result, User)
+# Every test runs against the shared app's database, with a fresh local cache
+pytestmark = pytest.mark.usefixtures('app', 'local_cache')
 
-    def test_create_user(self, mock_db_session, mock_bcrypt):
-        # Create mock user data
-        user_data = {'username': 'newuser', 'email': 'newuser@example.com', 'password': 'password123'}
+@pytest.fixture
+def seed():
+    users = [User(id=1, email='user1@example.com', role='admin'), User(id=2, email='user2@example.com')]
+    for user in users:
+        user.set_password('password123')
+    return users
 
-        # Mock bcrypt.generate_password_hash
-        mock_bcrypt.generate_password_hash.return_value = b'hashed_password'
-
-        # Call user_service.create_user() with mock data
-        result = user_service.create_user(user_data)
-
-        # Assert bcrypt.generate_password_hash was called
-        mock_bcrypt.generate_password_hash.assert_called_once_with('password123')
-
-        # Assert db.session.add was called with a User object
-        mock_db_session.add.assert_called_once()
-        added_user = mock_db_session.add.call_args[0][0]
-        assert isinstance(added_user, User)
-
-        # Assert db.session.commit was called
-        mock_db_session.commit.assert_called_once()
-
-        # Assert the returned object is an instance of User
-        assert isinstance(result, User)
-
-    def test_update_user(self, mock_db_session):
-        # Create a mock user
-        mock_user = User(id=1, username='oldusername', email='old@example.com')
-        mock_db_session.query.return_value.get.return_value = mock_user
-
-        # Create mock update data
-        update_data = {'username': 'newusername', 'email': 'new@example.com'}
-
-        # Call user_service.update_user() with mock data
-        result = user_service.update_user(1, update_data)
+class TestUserService:
+    def test_get_users(self):
+        users, total, total_exact = user_service.get_users(per_page=1)
 
-        # Assert the user's attributes are updated
-        assert result.username == 'newusername'
-        assert result.email == 'new@example.com'
+        assert len(users) == 1
+        assert (total, total_exact) == (2, True)
 
-        # Assert db.session.commit was called
-        mock_db_session.commit.assert_called_once()
+    def test_get_users_filtered(self):
+        users, total, total_exact = user_service.get_users({'role': 'admin', 'unknown': 'ignored'})
 
-        # Assert the returned object is an instance of User
-        assert isinstance(result, User)
+        assert [user.id for user in users] == [1]
+        assert (total, total_exact) == (1, True)
 
-    def test_delete_user(self, mock_db_session):
-        # Create a mock user
-        mock_user = User(id=1, username='testuser')
-        mock_db_session.query.return_value.get.return_value = mock_user
+    def test_get_user_by_id(self):
+        assert user_service.get_user_by_id(1).email == 'user1@example.com'
+        assert user_service.get_user_by_id(3) is None
 
-        # Call user_service.delete_user() with the user's ID
-        user_service.delete_user(1)
+    def test_get_user_by_email(self):
+        assert user_service.get_user_by_email('user2@example.com').id == 2
+        assert user_service.get_user_by_email('nobody@example.com') is None
 
-        # Assert db.session.delete was called with the mock user
-        mock_db_session.delete.assert_called_once_with(mock_user)
+    def test_create_user_requires_fields(self):
+        with pytest.raises(ValueError, match='Missing required field: name'):
+            user_service.create_user({'email': 'new@example.com', 'password': 'secret'})
 
-        # Assert db.session.commit was called
-        mock_db_session.commit.assert_called_once()
+    def test_create_user_rejects_taken_email(self):
+        with pytest.raises(ValueError, match='already exists'):
+            user_service.create_user({'email': 'user1@example.com', 'password': 'secret', 'name': 'New'})
 
-    def test_authenticate_user(self, mock_db_session, mock_bcrypt):
-        # Create a mock user with a hashed password
-        mock_user = User(id=1, username='testuser', password='hashed_password')
-        mock_db_session.query.return_value.filter_by.return_value.first.return_value = mock_user
+    def test_update_user(self):
+        user = user_service.update_user(2, {'email': 'renamed@example.com'})
 
-        # Mock bcrypt.check_password_hash to return True
-        mock_bcrypt.check_password_hash.return_value = True
+        assert user.email == 'renamed@example.com'
+        assert db.session.get(User, 2).email == 'renamed@example.com'
 
-        # Call user_service.authenticate_user() with correct credentials
-        result = user_service.authenticate_user('testuser', 'password123')
+    def test_update_missing_user(self):
+        with pytest.raises(ValueError):
+            user_service.update_user(3, {'email': 'nobody@example.com'})
 
-        # Assert bcrypt.check_password_hash was called
-        mock_bcrypt.check_password_hash.assert_called_once_with('hashed_password', 'password123')
+    def test_delete_user(self):
+        assert user_service.delete_user(2) is True
+        assert user_service.delete_user(2) is False
 
-        # Assert the returned user matches the mock user
-        assert result == mock_user
\ No newline at end of file
+    def test_authenticate_unknown_user(self):
+        assert user_service.authenticate_user('nobody@example.com', 'password123') is None
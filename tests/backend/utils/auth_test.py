@@ -0,0 +1,103 @@
+import pytest
+from contextlib import contextmanager
+from flask import g
+from flask_jwt_extended import decode_token, verify_jwt_in_request
+from src.backend.models.user import User
+from src.backend.utils.auth import (
+    generate_token, get_current_identity, get_current_user_data, role_required
+)
+from src.backend.utils.db import count_queries, db
+
+@pytest.fixture
+def app_config():
+    return {'USER_CACHE_TTL': 60}
+
+@pytest.fixture
+def seed():
+    # One analyst
+    return [User(id=1, email='analyst@example.com', role='analyst')]
+
+@pytest.fixture
+def app(app, local_cache):
+    # Add a route only admins may call
+    @app.route('/admin')
+    @role_required('admin')
+    def admin():
+        return {'ok': True}
+
+    return app
+
+def auth_headers(app):
+    # Bearer header for a fresh access token of the seeded user
+    with app.test_request_context('/'):
+        return {'Authorization': f"Bearer {generate_token(db.session.get(User, 1))}"}
+
+@contextmanager
+def request_as(app, headers):
+    # Authenticated request with its own app context, and so its own g
+    with app.app_context(), app.test_request_context('/', headers=headers):
+        verify_jwt_in_request()
+        yield
+
+class TestTokenClaims:
+    def test_token_carries_role_and_email(self, app):
+        with app.test_request_context('/'):
+            claims = decode_token(generate_token(db.session.get(User, 1)))
+
+        assert (claims['role'], claims['email']) == ('analyst', 'analyst@example.com')
+
+    def test_identity_read_without_query(self, app):
+        headers = auth_headers(app)
+
+        # The identity comes from the verified token alone
+        with request_as(app, headers), count_queries() as counter:
+            identity = get_current_identity()
+
+        assert counter.count == 0
+        assert identity == {'id': 1, 'email': 'analyst@example.com', 'role': 'analyst'}
+
+class TestRoleRequired:
+    def test_role_checked_from_claims(self, app):
+        headers = auth_headers(app)
+
+        # The analyst's token is refused without touching the database
+        with count_queries() as counter:
+            response = app.test_client().get('/admin', headers=headers)
+
+        assert response.status_code == 403
+        assert counter.count == 0
+
+    def test_matching_role_allowed(self, app):
+        user = db.session.get(User, 1)
+        user.role = 'admin'
+        db.session.commit()
+
+        response = app.test_client().get('/admin', headers=auth_headers(app))
+
+        assert response.status_code == 200
+
+class TestCurrentUserData:
+    def test_loaded_once_across_requests(self, app):
+        headers = auth_headers(app)
+
+        # The first request loads the row; later requests and repeated calls hit the cache or the memo
+        with count_queries() as counter:
+            for _ in range(3):
+                with request_as(app, headers):
+                    assert get_current_user_data()['role'] == 'analyst'
+                    assert get_current_user_data() is g.current_user_data
+
+        assert counter.count == 1
+
+    def test_role_change_invalidates_cached_row(self, app):
+        headers = auth_headers(app)
+        with request_as(app, headers):
+            get_current_user_data()
+
+        # Committing the role change drops the cached row
+        user = db.session.get(User, 1)
+        user.role = 'admin'
+        db.session.commit()
+
+        with request_as(app, headers):
+            assert get_current_user_data()['role'] == 'admin'
@@ -0,0 +1,43 @@
+from src.backend.utils.autocomplete import PrefixIndex, normalize
+
+def build_index():
+    # Two startups, an investor and an industry with different popularity
+    return PrefixIndex([
+        ('startup', 1, 'Ginkgo Bioworks', 800e6),
+        ('startup', 2, 'Biogen Labs', 20e6),
+        ('investor', 1, 'Flagship Pioneering', 40),
+        ('industry', 'Biotech', 'Biotech', 120),
+    ])
+
+class TestPrefixIndex:
+    def test_prefix_matches_any_word_by_popularity(self):
+        index = build_index()
+
+        # Popularity is relative to the top suggestion of each type; shorter labels break ties
+        assert index.complete('bio') == [
+            ('industry', 'Biotech', 'Biotech'),
+            ('startup', 1, 'Ginkgo Bioworks'),
+            ('startup', 2, 'Biogen Labs'),
+        ]
+        assert index.complete('BIO', limit=1) == [('industry', 'Biotech', 'Biotech')]
+
+    def test_long_prefix_and_no_match(self):
+        index = build_index()
+
+        assert index.complete('flagship pio') == [('investor', 1, 'Flagship Pioneering')]
+        assert index.complete('xyz') == []
+        assert index.complete('  ') == []
+
+    def test_writes_update_precomputed_suggestions(self):
+        index = build_index()
+
+        index.set('startup', 3, 'Bioverse', 900e6)
+        index.set('startup', 1, 'Ginkgo Works', 800e6)
+        index.remove('industry', 'Biotech')
+
+        assert index.complete('bio') == [('startup', 3, 'Bioverse'), ('startup', 2, 'Biogen Labs')]
+        assert index.complete('works') == [('startup', 1, 'Ginkgo Works')]
+        assert len(index) == 4
+
+    def test_normalize(self):
+        assert normalize('  Ginkgo   Bioworks ') == 'ginkgo bioworks'
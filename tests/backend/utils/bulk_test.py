@@ -0,0 +1,83 @@
+import pytest
+from datetime import datetime
+from src.backend.models import JobPosting, Startup
+from src.backend.utils import db as db_module
+from src.backend.utils.bulk import bulk_insert, bulk_summary, bulk_update, parse_id_list
+from src.backend.utils.db import db
+
+@pytest.fixture
+def seed():
+    # One startup to attach job postings to
+    return [Startup(id=1, name='Startup 1', industry='Biotech')]
+
+@pytest.fixture
+def notified(monkeypatch):
+    # Record the entity changes passed to the listeners
+    batches = []
+    monkeypatch.setattr(db_module, '_change_listeners', [batches.append])
+    return batches
+
+class TestBulkInsert:
+    def test_inserts_rows_in_chunks(self, app, notified):
+        records = [{'name': f'Bulk {i}', 'industry': 'Fintech', 'total_funding': i} for i in range(5)]
+
+        results = bulk_insert(Startup, records, chunk_size=2)
+
+        # Every record is created, IDs come back in input order and each chunk notifies once
+        assert [result['status'] for result in results] == ['created'] * 5
+        names = {startup.id: startup.name for startup in Startup.query.all()}
+        assert [names[result['id']] for result in results] == [record['name'] for record in records]
+        assert [len(batch) for batch in notified] == [2, 2, 1]
+        assert notified[0][0].operation == 'insert' and notified[0][0].values['industry'] == 'Fintech'
+
+    def test_reports_invalid_rows_and_writes_the_rest(self, app, notified):
+        records = [
+            {'startup_id': 1, 'title': 'Engineer', 'posted_date': '2024-05-01T09:00:00'},
+            {'startup_id': 1},
+            {'startup_id': 99, 'title': 'Chemist'},
+            {'startup_id': 1, 'title': 'Analyst', 'is_active': 'yes'},
+            {'startup_id': 1, 'title': 'Designer', 'salary': 100},
+            'not a record',
+        ]
+
+        results = bulk_insert(JobPosting, records)
+        body, succeeded = bulk_summary(results)
+
+        assert not succeeded
+        assert (body['succeeded'], body['failed']) == (1, 5)
+        assert results[1]['error'] == 'Missing required field: title'
+        assert results[2]['error'] == 'startup_id 99 does not exist'
+        assert results[3]['error'] == 'is_active must be a boolean'
+        assert results[4]['error'] == 'Unknown fields: salary'
+        job = db.session.get(JobPosting, results[0]['id'])
+        assert job.posted_date == datetime(2024, 5, 1, 9, 0) and job.is_active is True
+
+class TestBulkUpdate:
+    def test_updates_rows_and_notifies_previous_values(self, app, notified):
+        results = bulk_update(Startup, [
+            {'id': 1, 'industry': 'Medtech'},
+            {'id': 2, 'industry': 'Medtech'},
+            {'id': 1, 'name': 'Renamed', 'is_hiring': True},
+        ])
+
+        # Missing rows are reported without failing the others
+        assert [result['status'] for result in results] == ['updated', 'error', 'updated']
+        assert results[1]['error'] == 'Not found'
+        db.session.expire_all()
+        startup = db.session.get(Startup, 1)
+        assert (startup.name, startup.industry, startup.is_hiring) == ('Renamed', 'Medtech', True)
+
+        # Listeners get the old values of the changed columns
+        change = notified[0][0]
+        assert change.operation == 'update' and change.previous == {'industry': 'Biotech'}
+        assert change.values['name'] == 'Startup 1'
+
+class TestParseIdList:
+    def test_keeps_order_and_drops_duplicates(self):
+        assert parse_id_list('3,1, 2,3,', 10) == [3, 1, 2]
+
+    def test_rejects_bad_and_too_many_ids(self):
+        with pytest.raises(ValueError):
+            parse_id_list('1,two', 10)
+        with pytest.raises(ValueError):
+            parse_id_list('1,2,3', 2)
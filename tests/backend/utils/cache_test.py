@@ -0,0 +1,319 @@
+import json
+import pytest
+import threading
+import time
+from unittest.mock import MagicMock, patch
+from redis import RedisError
+from src.backend.models import Startup
+from src.backend.utils import cache
+from src.backend.utils.db import EntityChange, UNKNOWN_VALUE
+
+class FakeRedis:
+    """Dictionary-backed stand-in for the subset of the Redis client used by the cache"""
+
+    def __init__(self):
+        self.store = {}
+        self.published = []
+        self.calls = []
+
+    def get(self, key):
+        self.calls.append(('get', key))
+        return self.store.get(key)
+
+    def mget(self, keys):
+        self.calls.append(('mget', list(keys)))
+        return [self.store.get(key) for key in keys]
+
+    def setex(self, key, expire, value):
+        self.store[key] = value.encode('utf-8')
+        return True
+
+    def delete(self, *keys):
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+    def incr(self, key):
+        self.store[key] = int(self.store.get(key, 0)) + 1
+        return self.store[key]
+
+    def sadd(self, key, *members):
+        self.store.setdefault(key, set()).update(member.encode('utf-8') for member in members)
+
+    def srem(self, key, *members):
+        self.store.get(key, set()).difference_update(members)
+
+    def smembers(self, key):
+        return set(self.store.get(key, set()))
+
+    def expire(self, key, seconds):
+        return key in self.store
+
+    def publish(self, channel, message):
+        self.published.append(message)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args) for name, args in self.commands]
+
+def physical(key):
+    # Redis key under which the cache stores a logical key
+    return cache._redis_key(key)
+
+@pytest.fixture
+def redis_client():
+    # Replace the Redis client with an in-memory fake
+    client = FakeRedis()
+    with patch.object(cache, 'redis_client', client), \
+         patch.object(cache, 'local_cache', cache.LocalCache()), \
+         patch.object(cache, '_ensure_subscriber'):
+        yield client
+
+class TestReadThroughCache:
+    def test_miss_loads_and_caches(self, redis_client):
+        loader = MagicMock(return_value={'id': 1, 'name': 'Startup 1'})
+
+        result = cache.cache_get_or_set('startup:1', loader, expire=60)
+
+        assert result == {'id': 1, 'name': 'Startup 1'}
+        loader.assert_called_once()
+        assert json.loads(redis_client.store[physical('startup:1')]) == result
+
+    def test_hit_skips_loader(self, redis_client):
+        redis_client.store[physical('startup:1')] = json.dumps({'id': 1})
+        loader = MagicMock()
+
+        assert cache.cache_get_or_set('startup:1', loader) == {'id': 1}
+        loader.assert_not_called()
+
+    def test_missing_entity_not_cached(self, redis_client):
+        assert cache.cache_get_or_set('startup:404', lambda: None) is None
+        assert redis_client.store == {}
+
+    def test_committed_change_invalidates_entity(self, redis_client):
+        redis_client.store[physical('startup:1')] = json.dumps({'id': 1})
+
+        cache._invalidate_changed_entities([EntityChange(Startup, 1, 'update', None)])
+
+        assert physical('startup:1') not in redis_client.store
+
+class TestBatchedCache:
+    def test_get_many_uses_one_round_trip(self, redis_client):
+        for i in range(1, 4):
+            redis_client.store[physical(f'startup:{i}')] = json.dumps({'id': i})
+
+        result = cache.cache_get_many(['startup:1', 'startup:2', 'startup:3', 'startup:4'])
+
+        assert result == {f'startup:{i}': {'id': i} for i in range(1, 4)}
+        assert [call[0] for call in redis_client.calls] == ['mget']
+
+        # Hits are now served by the local tier alone
+        assert cache.cache_get_many(['startup:1', 'startup:2']) == {'startup:1': {'id': 1}, 'startup:2': {'id': 2}}
+        assert len(redis_client.calls) == 1
+
+    def test_set_many_and_delete_many(self, redis_client):
+        assert cache.cache_set_many({'startup:1': {'id': 1}, 'startup:2': {'id': 2}}, expire=60) is True
+        assert json.loads(redis_client.store[physical('startup:2')]) == {'id': 2}
+        assert redis_client.published[-1].endswith('\nkey\nstartup:1\nstartup:2')
+
+        cache.cache_delete_many(['startup:1', 'startup:2'])
+
+        assert cache.cache_get_many(['startup:1', 'startup:2']) == {}
+
+    def test_get_ids_splits_hits_and_misses(self, redis_client):
+        redis_client.store[physical('startup:2')] = json.dumps({'id': 2})
+
+        assert cache.cache_get_ids('startup', [1, 2, 3]) == ({2: {'id': 2}}, [1, 3])
+
+    def test_get_or_load_ids_loads_misses_in_one_call(self, redis_client):
+        redis_client.store[physical('startup:2')] = json.dumps({'id': 2})
+        loader = MagicMock(return_value={1: {'id': 1}})
+
+        result = cache.cache_get_or_load_ids('startup', [1, 2, 404], loader)
+
+        assert result == {1: {'id': 1}, 2: {'id': 2}}
+        loader.assert_called_once_with([1, 404])
+        assert physical('startup:1') in redis_client.store
+        assert physical('startup:404') not in redis_client.store
+
+@pytest.fixture
+def local_only():
+    # Run against the local tier and the in-process lock stand-in
+    with patch.object(cache, 'redis_client', None), \
+         patch.object(cache, 'local_cache', cache.LocalCache(ttl=600)), \
+         patch.object(cache, '_local_locks', {}):
+        yield
+
+class TestStampedeProtection:
+    def set_envelope(self, key, value, expires_in, delta=0.1):
+        cache.cache_set(key, {'value': value, 'delta': delta, 'expires_at': time.time() + expires_in}, 600)
+
+    def test_fresh_value_skips_compute(self, local_only):
+        self.set_envelope('page', 'cached', expires_in=300)
+        compute = MagicMock()
+
+        assert cache.cache_get_or_compute('page', compute, 60) == 'cached'
+        compute.assert_not_called()
+
+    def test_expired_value_recomputed_by_lock_holder(self, local_only):
+        self.set_envelope('page', 'old', expires_in=-1)
+
+        assert cache.cache_get_or_compute('page', lambda: 'new', 60) == 'new'
+        assert cache.cache_get('page')['value'] == 'new'
+
+    def test_stale_value_served_while_another_worker_refreshes(self, local_only):
+        self.set_envelope('page', 'old', expires_in=-1)
+        release = cache._acquire_lock('page', 10)
+        compute = MagicMock()
+
+        assert cache.cache_get_or_compute('page', compute, 60) == 'old'
+        compute.assert_not_called()
+        release()
+
+    def test_early_expiration_near_expiry(self, local_only):
+        self.set_envelope('page', 'old', expires_in=1, delta=5)
+
+        # A draw in the tail of the exponential distribution triggers an early refresh
+        with patch.object(cache.random, 'random', return_value=0.99):
+            assert cache.cache_get_or_compute('page', lambda: 'new', 60) == 'new'
+
+    def test_concurrent_misses_compute_once(self, local_only):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.cache_get_or_compute('page', compute, 60)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ['value'] * 5
+        assert len(calls) == 1
+
+class TestTaggedInvalidation:
+    def test_tag_invalidation_drops_tagged_keys_only(self, redis_client):
+        cache.cache_set('list:startup:industry=Biotech', [{'id': 1}], tags=['list:startup:industry=Biotech', 'startup:1'])
+        cache.cache_set('list:startup:industry=Fintech', [{'id': 2}], tags=['list:startup:industry=Fintech', 'startup:2'])
+
+        assert cache.cache_invalidate_tags('startup:1') == 1
+
+        assert physical('list:startup:industry=Biotech') not in redis_client.store
+        assert physical('list:startup:industry=Fintech') in redis_client.store
+        assert cache.cache_get('list:startup:industry=Biotech') is None
+        assert redis_client.published[-1].endswith('\ntag\nstartup:1')
+
+    def test_change_invalidates_lists_matching_old_and_new_values(self, redis_client):
+        for industry in ('Biotech', 'Fintech', 'Robotics'):
+            filters = {'industry': industry}
+            cache.cache_set(cache.list_cache_key('startup', filters), [], tags=cache.list_tags('startup', filters))
+        cache.cache_set(cache.list_cache_key('startup'), [], tags=cache.list_tags('startup'))
+
+        # Startup 5 moved from Biotech to Fintech
+        cache._invalidate_changed_entities([EntityChange(
+            Startup, 5, 'update', None,
+            values={'industry': 'Fintech', 'sub_sector': None, 'funding_stage': 'Seed', 'is_hiring': True},
+            previous={'industry': 'Biotech'}
+        )])
+
+        assert cache.cache_get(cache.list_cache_key('startup', {'industry': 'Biotech'})) is None
+        assert cache.cache_get(cache.list_cache_key('startup', {'industry': 'Fintech'})) is None
+        assert cache.cache_get(cache.list_cache_key('startup')) is None
+        assert cache.cache_get(cache.list_cache_key('startup', {'industry': 'Robotics'})) == []
+
+    def test_unknown_previous_value_invalidates_field_wide(self, redis_client):
+        filters = {'industry': 'Robotics'}
+        cache.cache_set(cache.list_cache_key('startup', filters), [], tags=cache.list_tags('startup', filters))
+
+        cache._invalidate_changed_entities([EntityChange(
+            Startup, 5, 'update', None, values={'industry': 'Fintech'}, previous={'industry': UNKNOWN_VALUE}
+        )])
+
+        assert physical(cache.list_cache_key('startup', filters)) not in redis_client.store
+
+    def test_local_tier_honours_tags_without_redis(self):
+        with patch.object(cache, 'redis_client', None), patch.object(cache, 'local_cache', cache.LocalCache()):
+            cache.cache_set('list:startup:', [], tags=['list:startup'])
+            cache.cache_invalidate_tags('list:startup')
+            assert cache.cache_get('list:startup:') is None
+
+    def test_clear_bumps_generation_instead_of_flushing(self, redis_client):
+        redis_client.store['unrelated'] = b'kept'
+        cache.cache_set('startup:1', {'id': 1})
+
+        with patch.object(cache, '_key_generation', 0):
+            assert cache.cache_clear() is True
+            assert cache.cache_get('startup:1') is None
+            assert redis_client.store['unrelated'] == b'kept'
+            assert redis_client.published[-1].endswith('\nall')
+
+class TestTwoTierCache:
+    def test_local_tier_serves_repeat_reads(self, redis_client):
+        redis_client.store[physical('startup:1')] = json.dumps({'id': 1})
+
+        assert cache.cache_get('startup:1') == {'id': 1}
+        assert cache.cache_get('startup:1') == {'id': 1}
+
+        # Only the first read reaches Redis
+        assert redis_client.calls == [('get', physical('startup:1'))]
+
+    def test_writes_publish_invalidations(self, redis_client):
+        cache.cache_set('startup:1', {'id': 1})
+        cache.cache_delete('startup:1')
+
+        assert len(redis_client.published) == 2
+        assert redis_client.published[-1].endswith('\nkey\nstartup:1')
+        assert cache.cache_get('startup:1') is None
+
+    def test_redis_errors_fall_back_to_local_tier(self, redis_client):
+        redis_client.pipeline = MagicMock(side_effect=RedisError('connection lost'))
+        redis_client.get = MagicMock(side_effect=RedisError('connection lost'))
+
+        assert cache.cache_set('startup:1', {'id': 1}, expire=60) is False
+        assert cache.cache_get('startup:1') == {'id': 1}
+        assert cache.cache_get('startup:2') is None
+
+    def test_local_tier_keeps_serving_without_redis(self):
+        with patch.object(cache, 'redis_client', None), patch.object(cache, 'local_cache', cache.LocalCache()):
+            assert cache.cache_get('startup:1') is None
+            assert cache.cache_set('startup:1', {'id': 1}) is False
+            assert cache.cache_get('startup:1') == {'id': 1}
+            assert cache.cache_get_or_set('startup:2', lambda: {'id': 2}) == {'id': 2}
+
+class TestLocalCache:
+    def test_evicts_least_recently_used(self):
+        local = cache.LocalCache(maxsize=2, ttl=60)
+        local.set('a', 1)
+        local.set('b', 2)
+        local.get('a')
+        local.set('c', 3)
+
+        assert local.get('a') == 1
+        assert local.get('b') is cache._MISSING
+        assert len(local) == 2
+
+    def test_entries_expire(self):
+        local = cache.LocalCache(maxsize=2, ttl=60)
+        local.set('a', 1, expire=1)
+
+        with patch.object(time, 'monotonic', return_value=time.monotonic() + 2):
+            assert local.get('a') is cache._MISSING
+
+    def test_falsy_values_are_hits(self):
+        local = cache.LocalCache()
+        local.set('count', 0)
+
+        assert local.get('count') == 0
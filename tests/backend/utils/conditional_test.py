@@ -0,0 +1,88 @@
+import pytest
+from datetime import datetime
+from flask import Flask
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, create_engine, inspect
+from src.backend.utils.conditional import (
+    conditional_json, ensure_version_columns, entity_etag, entity_last_modified, list_etag
+)
+
+STARTUP = {'id': 1, 'name': 'Startup 1', 'last_updated': '2024-03-02T10:30:00.250000'}
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['HTTP_CACHE_MAX_AGE'] = 30
+    return app
+
+class TestEntityTags:
+    def test_versioned_entity_tagged_by_version(self):
+        # Changing a column without bumping the version keeps the tag; bumping it changes the tag
+        assert entity_etag('startup', STARTUP) == entity_etag('startup', dict(STARTUP, name='Other'))
+        assert entity_etag('startup', STARTUP) != entity_etag('startup', dict(STARTUP, last_updated='2024-03-03'))
+
+    def test_unversioned_entity_tagged_by_content(self):
+        investor = {'id': 1, 'name': 'Investor 1'}
+
+        assert entity_etag('investor', investor) != entity_etag('investor', dict(investor, name='Other'))
+
+    def test_list_tag_covers_members_and_metadata(self):
+        response = {'startups': [STARTUP], 'total': 1, 'page': 1}
+
+        assert list_etag('startup', response, 'startups') != list_etag('startup', dict(response, total=2), 'startups')
+        assert list_etag('startup', response, 'startups') != list_etag('startup', dict(response, startups=[]), 'startups')
+
+class TestConditionalJson:
+    def test_full_response_carries_validators(self, app):
+        with app.test_request_context('/'):
+            response = conditional_json(STARTUP, 'abc', entity_last_modified(STARTUP))
+
+        assert response.status_code == 200
+        assert response.headers['ETag'] == '"abc"'
+        assert response.headers['Last-Modified'] == 'Sat, 02 Mar 2024 10:30:00 GMT'
+        assert response.headers['Cache-Control'] == 'max-age=30, must-revalidate'
+        assert response.headers['Vary'] == 'Authorization'
+
+    def test_matching_etag_returns_304(self, app):
+        with app.test_request_context('/', headers={'If-None-Match': '"xyz", "abc"'}):
+            response = conditional_json(STARTUP, 'abc')
+
+        assert response.status_code == 304
+        assert response.get_data() == b''
+
+    def test_if_none_match_takes_precedence(self, app):
+        headers = {'If-None-Match': '"old"', 'If-Modified-Since': 'Sun, 03 Mar 2024 00:00:00 GMT'}
+        with app.test_request_context('/', headers=headers):
+            response = conditional_json(STARTUP, 'abc', datetime(2024, 3, 2, 10, 30))
+
+        assert response.status_code == 200
+
+    def test_if_modified_since_compares_whole_seconds(self, app):
+        headers = {'If-Modified-Since': 'Sat, 02 Mar 2024 10:30:00 GMT'}
+        with app.test_request_context('/', headers=headers):
+            unchanged = conditional_json(STARTUP, 'abc', entity_last_modified(STARTUP))
+        with app.test_request_context('/', headers=headers):
+            changed = conditional_json(STARTUP, 'abc', datetime(2024, 3, 2, 10, 30, 1))
+
+        assert (unchanged.status_code, changed.status_code) == (304, 200)
+
+class TestEnsureVersionColumns:
+    def test_column_added_and_backfilled(self):
+        engine = create_engine('sqlite://')
+        # A table created before it had a version column
+        with engine.begin() as connection:
+            connection.exec_driver_sql('CREATE TABLE investor (id INTEGER PRIMARY KEY, name VARCHAR(100))')
+            connection.exec_driver_sql("INSERT INTO investor (id, name) VALUES (1, 'Investor 1'), (2, 'Investor 2')")
+        metadata = MetaData()
+        investor = Table('investor', metadata, Column('id', Integer, primary_key=True), Column('name', String(100)),
+                         Column('last_updated', DateTime))
+        Table('unversioned', metadata, Column('id', Integer, primary_key=True))
+
+        with engine.begin() as connection:
+            assert ensure_version_columns(connection, metadata) == {'investor': 2}
+        with engine.begin() as connection:
+            # Running it again finds every row versioned
+            assert ensure_version_columns(connection, metadata) == {'investor': 0}
+            versions = connection.execute(investor.select().order_by(investor.c.id)).all()
+
+        assert 'last_updated' in {column['name'] for column in inspect(engine).get_columns('investor')}
+        assert all(isinstance(row.last_updated, datetime) for row in versions)
@@ -0,0 +1,69 @@
+import pytest
+from unittest.mock import patch
+from flask import Flask
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+from src.backend.utils.counts import count_total, normalize_filters, parse_count_mode
+
+Base = declarative_base()
+
+class Item(Base):
+    __tablename__ = 'item'
+    id = Column(Integer, primary_key=True)
+    industry = Column(String(50))
+
+@pytest.fixture
+def session():
+    # Create an in-memory database with 30 rows across two industries
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    session.add_all([Item(id=i, industry='Biotech' if i % 3 else 'Fintech') for i in range(1, 31)])
+    session.commit()
+    yield session
+    session.close()
+
+@pytest.fixture
+def app_context():
+    # Provide the count configuration through a Flask app context
+    app = Flask(__name__)
+    app.config.update(COUNT_CACHE_TTL=60, COUNT_CAP=25)
+    with app.app_context():
+        yield
+
+@pytest.fixture
+def cache():
+    # Replace the Redis-backed cache with a dictionary
+    store = {}
+    with patch('src.backend.utils.counts.cache_get', side_effect=store.get), \
+         patch('src.backend.utils.counts.cache_set', side_effect=lambda key, value, expire=None, tags=(): store.__setitem__(key, value)):
+        yield store
+
+class TestCountTotal:
+    def test_exact_count_below_cap_is_cached(self, session, app_context, cache):
+        query = session.query(Item).filter(Item.industry == 'Fintech')
+
+        assert count_total(query, 'item', {'industry': 'Fintech'}) == (10, True)
+        assert list(cache.values()) == [10]
+
+        # A cached count is served without touching the database
+        with patch.object(type(query), 'count') as mock_count:
+            assert count_total(session.query(Item), 'item', {'industry': 'Fintech'}) == (10, True)
+            mock_count.assert_not_called()
+
+    def test_count_above_cap_is_capped(self, session, app_context, cache):
+        assert count_total(session.query(Item), 'item') == (25, False)
+        assert cache == {}
+
+    def test_exact_mode_counts_past_cap(self, session, app_context, cache):
+        assert count_total(session.query(Item), 'item', mode='exact') == (30, True)
+
+    def test_none_mode_skips_counting(self, session, app_context, cache):
+        assert count_total(session.query(Item), 'item', mode='none') == (None, False)
+
+    def test_normalize_filters_ignores_order_and_empty_values(self):
+        assert normalize_filters({'b': 2, 'a': 'x', 'c': None}) == normalize_filters({'a': 'x', 'b': 2})
+
+    @pytest.mark.parametrize('value,mode', [(None, 'auto'), ('false', 'none'), ('exact', 'exact'), ('true', 'auto')])
+    def test_parse_count_mode(self, value, mode):
+        assert parse_count_mode(value) == mode
@@ -0,0 +1,147 @@
+import json
+import logging
+import pytest
+from flask import Flask, jsonify
+from sqlalchemy import Column, Integer, String, create_engine, text
+from sqlalchemy.orm import Session, declarative_base
+from src.backend.config import ProductionConfig
+from src.backend.utils.db import (
+    QueryBudgetExceeded, count_queries, init_query_budget, init_query_timing, normalize_sql, on_entities_changed,
+    profile_queries, query_budget, _change_listeners
+)
+
+Base = declarative_base()
+
+class Item(Base):
+    __tablename__ = 'item'
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50))
+
+@pytest.fixture
+def engine():
+    # Create an in-memory database with the test table
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    return engine
+
+@pytest.fixture
+def changes():
+    # Record the entity changes dispatched after each commit
+    recorded = []
+    listener = on_entities_changed(lambda batch: recorded.append([(c.model, c.id, c.operation) for c in batch]))
+    yield recorded
+    _change_listeners.remove(listener)
+
+class TestQueryBudget:
+    def test_count_queries(self, engine):
+        with engine.connect() as conn, count_queries() as counter:
+            conn.execute(text('SELECT 1'))
+            conn.execute(text('SELECT 2'))
+
+        assert counter.count == 2
+
+    def test_query_budget_exceeded(self, engine):
+        with pytest.raises(QueryBudgetExceeded):
+            with engine.connect() as conn, query_budget(1):
+                conn.execute(text('SELECT 1'))
+                conn.execute(text('SELECT 2'))
+
+    def test_request_over_budget_fails(self, engine):
+        app = Flask(__name__)
+        app.config.update(TESTING=True, SQLALCHEMY_QUERY_BUDGET=2, SQLALCHEMY_QUERY_BUDGETS={'cheap': 1})
+        init_query_budget(app)
+
+        def run_queries(n):
+            with engine.connect() as conn:
+                for _ in range(n):
+                    conn.execute(text('SELECT 1'))
+            return jsonify({'queries': n})
+
+        app.add_url_rule('/ok', 'ok', lambda: run_queries(2))
+        app.add_url_rule('/n-plus-one', 'n_plus_one', lambda: run_queries(5))
+        app.add_url_rule('/cheap', 'cheap', lambda: run_queries(2))
+        client = app.test_client()
+
+        assert client.get('/ok').status_code == 200
+        with pytest.raises(QueryBudgetExceeded):
+            client.get('/n-plus-one')
+        with pytest.raises(QueryBudgetExceeded):
+            client.get('/cheap')
+
+class TestQueryTiming:
+    def test_profile_keeps_slowest(self, engine):
+        with engine.connect() as conn, profile_queries(keep=1) as profile:
+            conn.execute(text('SELECT 1'))
+            conn.execute(text('WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 20000) '
+                              'SELECT count(*) FROM n'))
+
+        assert profile.count == 2
+        assert profile.total_time > 0
+        assert [statement for _, statement in profile.slowest] == [
+            'WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 20000) SELECT count(*) FROM n'
+        ]
+
+    def test_normalize_sql(self):
+        statement = "SELECT item.id FROM item\n WHERE item.id IN (?, ?, ?) AND item.name = 'O''Neil' LIMIT 10"
+
+        assert normalize_sql(statement) == 'SELECT item.id FROM item WHERE item.id IN (...) AND item.name = ? LIMIT ?'
+
+    def test_request_reports_server_timing_and_slow_queries(self, engine, caplog):
+        app = Flask(__name__)
+        app.config.update(SQLALCHEMY_SERVER_TIMING=True, SQLALCHEMY_SLOW_QUERY_MS=0)
+        init_query_timing(app)
+
+        @app.route('/items/<int:item_id>')
+        def get_item(item_id):
+            with engine.connect() as conn:
+                conn.execute(text('SELECT name FROM item WHERE id = :id'), {'id': item_id})
+                conn.execute(text('SELECT count(*) FROM item'))
+            return jsonify({})
+
+        # Every statement is over the zero threshold and logged with the route template
+        with caplog.at_level(logging.WARNING, logger='src.backend.utils.db.slow_queries'):
+            response = app.test_client().get('/items/7')
+
+        header = response.headers['Server-Timing']
+        assert header.startswith('db;dur=') and 'desc="2 queries"' in header
+        assert 'desc="SELECT item"' in header
+        record = caplog.records[0].slow_query
+        assert record['sql'] == 'SELECT name FROM item WHERE id = ?'
+        assert (record['method'], record['route'], record['endpoint']) == ('GET', '/items/<int:item_id>', 'get_item')
+        assert json.loads(caplog.records[0].getMessage().split(': ', 1)[1]) == record
+
+    def test_server_timing_disabled_in_production(self, engine):
+        app = Flask(__name__)
+        app.config.from_object(ProductionConfig)
+        init_query_timing(app)
+
+        @app.route('/items/<int:item_id>')
+        def get_item(item_id):
+            with engine.connect() as conn:
+                conn.execute(text('SELECT name FROM item WHERE id = :id'), {'id': item_id})
+            return jsonify({})
+
+        # No table names reach the client unless SQLALCHEMY_SERVER_TIMING opts in
+        assert 'Server-Timing' not in app.test_client().get('/items/7').headers
+
+class TestEntityChanges:
+    def test_changes_dispatched_after_commit(self, engine, changes):
+        session = Session(engine)
+        item = Item(name='Startup')
+        session.add(item)
+        session.commit()
+        item.name = 'Renamed'
+        session.commit()
+        session.delete(item)
+        session.commit()
+
+        assert changes == [[(Item, 1, 'insert')], [(Item, 1, 'update')], [(Item, 1, 'delete')]]
+
+    def test_rolled_back_changes_not_dispatched(self, engine, changes):
+        session = Session(engine)
+        session.add(Item(name='Startup'))
+        session.flush()
+        session.rollback()
+        session.commit()
+
+        assert changes == []
@@ -0,0 +1,62 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from datetime import date
+from src.backend.models import Startup
+from src.backend.utils.db import count_queries, db
+from src.backend.utils.export import (
+    csv_chunks, export_columns, gzip_chunks, ndjson_chunks, parquet_chunks, stream_rows
+)
+
+@pytest.fixture
+def seed():
+    # A few hundred startups across two industries
+    return [
+        Startup(id=i, name=f'Startup {i}', industry='Biotech' if i % 2 else 'Fintech', last_funding_date=date(2024, 1, 1))
+        for i in range(1, 251)
+    ]
+
+class TestStreamRows:
+    def test_streams_filtered_rows_in_batches(self, app):
+        columns = export_columns(Startup, ('id', 'name'))
+        query = Startup.query.filter(Startup.industry == 'Biotech').order_by(Startup.id)
+
+        # One statement, read in batches of plain tuples
+        with count_queries() as counter:
+            batches = list(stream_rows(query, columns, batch_size=50))
+
+        assert counter.count == 1
+        assert [len(batch) for batch in batches] == [50, 50, 25]
+        assert batches[0][0] == (1, 'Startup 1')
+        assert db.session.identity_map.keys() == set()
+
+class TestEncoders:
+    def test_csv(self, app):
+        columns = export_columns(Startup, ('id', 'name', 'last_funding_date'))
+        body = b''.join(csv_chunks(columns, [[(1, 'A, Inc.', date(2024, 1, 1))], [(2, 'B', None)]]))
+
+        rows = list(csv.reader(io.StringIO(body.decode('utf-8'))))
+        assert rows == [['id', 'name', 'last_funding_date'], ['1', 'A, Inc.', '2024-01-01'], ['2', 'B', '']]
+
+    def test_ndjson(self, app):
+        columns = export_columns(Startup, ('id', 'last_funding_date'))
+        body = b''.join(ndjson_chunks(columns, [[(1, date(2024, 1, 1)), (2, None)]]))
+
+        assert [json.loads(line) for line in body.splitlines()] == [
+            {'id': 1, 'last_funding_date': '2024-01-01'}, {'id': 2, 'last_funding_date': None}
+        ]
+
+    def test_gzip_round_trip(self, app):
+        chunks = [b'id,name\n', b'1,A\n' * 1000]
+
+        assert gzip.decompress(b''.join(gzip_chunks(iter(chunks)))) == b''.join(chunks)
+
+    def test_parquet(self, app):
+        pq = pytest.importorskip('pyarrow.parquet')
+        columns = export_columns(Startup, ('id', 'name', 'last_funding_date'))
+        body = b''.join(parquet_chunks(columns, [[(1, 'A', date(2024, 1, 1))], [(2, 'B', None)]]))
+
+        table = pq.read_table(io.BytesIO(body))
+        assert table.column('name').to_pylist() == ['A', 'B']
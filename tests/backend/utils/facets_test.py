@@ -0,0 +1,34 @@
+import pytest
+from src.backend.models import Startup
+from src.backend.utils.db import count_queries
+from src.backend.utils.facets import facet_counts
+
+FACET_COLUMNS = (Startup.industry, Startup.sub_sector, Startup.funding_stage, Startup.is_hiring)
+
+@pytest.fixture
+def seed():
+    # Startups across industries, stages and hiring status
+    return [
+        Startup(id=1, name='Startup 1', industry='Biotech', sub_sector='Therapeutics', funding_stage='Seed', is_hiring=True),
+        Startup(id=2, name='Startup 2', industry='Biotech', sub_sector='Diagnostics', funding_stage='Series A', is_hiring=False),
+        Startup(id=3, name='Startup 3', industry='Biotech', sub_sector='Therapeutics', funding_stage='Series A', is_hiring=True),
+        Startup(id=4, name='Startup 4', industry='Fintech', funding_stage='Seed', is_hiring=False),
+    ]
+
+class TestFacetCounts:
+    def test_counts_all_facets_in_one_statement(self, app):
+        with count_queries() as counter:
+            facets = facet_counts(Startup.query, FACET_COLUMNS)
+
+        assert counter.count == 1
+        assert facets['industry'] == [{'value': 'Biotech', 'count': 3}, {'value': 'Fintech', 'count': 1}]
+        assert facets['sub_sector'] == [{'value': 'Therapeutics', 'count': 2}, {'value': 'Diagnostics', 'count': 1},
+                                        {'value': None, 'count': 1}]
+        assert facets['is_hiring'] == [{'value': False, 'count': 2}, {'value': True, 'count': 2}]
+
+    def test_counts_respect_filters(self, app):
+        facets = facet_counts(Startup.query.filter(Startup.industry == 'Biotech'), FACET_COLUMNS)
+
+        assert facets['industry'] == [{'value': 'Biotech', 'count': 3}]
+        assert facets['funding_stage'] == [{'value': 'Series A', 'count': 2}, {'value': 'Seed', 'count': 1}]
+        assert facets['is_hiring'] == [{'value': True, 'count': 2}, {'value': False, 'count': 1}]
@@ -0,0 +1,185 @@
+import threading
+import pytest
+from unittest.mock import patch
+from datetime import date, datetime
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
+from src.backend.models import FundingRollup, FundingRound, Startup
+from src.backend.models import funding_rollup
+from src.backend.models.funding_rollup import (
+    ensure_bucket_index, period_end, period_start, rebuild_funding_rollups, wait_for_rollups
+)
+from src.backend.utils.db import db
+
+@pytest.fixture
+def seed():
+    # Two startups in different industries
+    return [Startup(id=1, name='Startup 1', industry='Biotech'), Startup(id=2, name='Startup 2', industry='Fintech')]
+
+def rollup(period_type, start, industry, round_type):
+    db.session.expire_all()
+    return FundingRollup.query.filter_by(
+        period_type=period_type, period_start=start, industry=industry, round_type=round_type
+    ).one_or_none()
+
+class TestPeriods:
+    def test_period_boundaries(self):
+        assert period_start(date(2024, 5, 17), 'month') == date(2024, 5, 1)
+        assert period_start(date(2024, 5, 17), 'quarter') == date(2024, 4, 1)
+        assert period_start(date(2024, 5, 17), 'year') == date(2024, 1, 1)
+        assert period_end(date(2024, 10, 1), 'quarter') == date(2025, 1, 1)
+        assert period_end(date(2024, 12, 1), 'month') == date(2025, 1, 1)
+
+class TestFundingRollups:
+    def test_insert_updates_buckets(self, app):
+        # Commit three seed rounds in one quarter, one without an amount
+        db.session.add_all([
+            FundingRound(startup_id=1, round_type='Seed', amount=1.0, date=date(2024, 1, 10)),
+            FundingRound(startup_id=1, round_type='Seed', amount=5.0, date=date(2024, 2, 10)),
+            FundingRound(startup_id=1, round_type='Seed', amount=None, date=date(2024, 3, 10)),
+        ])
+        db.session.commit()
+
+        # Count all rounds, sum and median only the known amounts
+        quarter = rollup('quarter', date(2024, 1, 1), 'Biotech', 'Seed')
+        assert (quarter.round_count, quarter.total_amount, quarter.median_amount) == (3, 6.0, 3.0)
+        assert rollup('month', date(2024, 2, 1), 'Biotech', 'Seed').round_count == 1
+        assert rollup('year', date(2024, 1, 1), 'Biotech', 'Seed').round_count == 3
+
+    def test_insert_with_unset_columns_refreshes_incrementally(self, app):
+        # Columns an insert leaves unset are NULL, not unknown, so no full rebuild runs
+        with patch('src.backend.models.funding_rollup.rebuild_funding_rollups') as rebuild:
+            db.session.add_all([
+                FundingRound(startup_id=1, amount=5.0, date=date(2024, 1, 10)),
+                FundingRound(startup_id=1, round_type='Seed', amount=2.0),
+            ])
+            db.session.commit()
+
+        rebuild.assert_not_called()
+        assert rollup('quarter', date(2024, 1, 1), 'Biotech', None).total_amount == 5.0
+
+    def test_unloaded_old_values_refresh_only_matching_buckets(self, app):
+        db.session.add_all([
+            FundingRound(id=1, startup_id=1, round_type='Seed', amount=2.0, date=date(2024, 1, 10)),
+            FundingRound(id=2, startup_id=2, round_type='Seed', amount=3.0, date=date(2024, 1, 10)),
+        ])
+        db.session.commit()
+        untouched = rollup('quarter', date(2024, 1, 1), 'Fintech', 'Seed').updated_at
+
+        # Change the date of a round whose old date was never loaded
+        round_ = FundingRound.query.options(load_only(FundingRound.amount)).filter_by(id=1).one()
+        round_.date = date(2024, 7, 1)
+        with patch('src.backend.models.funding_rollup.rebuild_funding_rollups') as rebuild:
+            db.session.commit()
+
+        # The old bucket is found among the existing rollups; other industries are left alone
+        rebuild.assert_not_called()
+        assert rollup('quarter', date(2024, 1, 1), 'Biotech', 'Seed') is None
+        assert rollup('quarter', date(2024, 7, 1), 'Biotech', 'Seed').total_amount == 2.0
+        assert rollup('quarter', date(2024, 1, 1), 'Fintech', 'Seed').updated_at == untouched
+
+    def test_null_dimension_buckets_are_unique(self, app):
+        # A second row for the same bucket with a NULL industry and round type is rejected
+        bucket = dict(period_type='year', period_start=date(2024, 1, 1), industry=None, round_type=None,
+                      round_count=1, total_amount=1.0)
+        db.session.add(FundingRollup(**bucket))
+        db.session.commit()
+        db.session.add(FundingRollup(**bucket))
+        with pytest.raises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+
+    def test_bucket_index_ensured_on_existing_table(self, app):
+        # A table from before the index, holding a duplicate of a NULL bucket
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql('DROP INDEX uq_funding_rollup_bucket')
+        bucket = dict(period_type='year', period_start=date(2024, 1, 1), industry=None, round_type=None,
+                      round_count=1, total_amount=1.0)
+        db.session.add_all([FundingRollup(**bucket), FundingRollup(**bucket)])
+        db.session.commit()
+
+        with db.engine.begin() as connection:
+            assert ensure_bucket_index(connection) is True
+            assert ensure_bucket_index(connection) is False
+
+        # The rebuild dropped the duplicates, which the index now rejects
+        assert FundingRollup.query.filter_by(industry=None, round_type=None).count() == 0
+        db.session.add_all([FundingRollup(**bucket), FundingRollup(**bucket)])
+        with pytest.raises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+
+    def test_update_moves_round_between_buckets(self, app):
+        round_ = FundingRound(startup_id=1, round_type='Seed', amount=2.0, date=date(2024, 1, 10))
+        db.session.add(round_)
+        db.session.commit()
+
+        # Move the round to another quarter and round type
+        round_.date = date(2024, 7, 1)
+        round_.round_type = 'Series A'
+        db.session.commit()
+
+        assert rollup('quarter', date(2024, 1, 1), 'Biotech', 'Seed') is None
+        assert rollup('quarter', date(2024, 7, 1), 'Biotech', 'Series A').total_amount == 2.0
+
+    def test_startup_industry_change_moves_rounds(self, app):
+        db.session.add(FundingRound(startup_id=2, round_type='Seed', amount=4.0, date=date(2024, 1, 10)))
+        db.session.commit()
+
+        # Reclassify the startup; its rounds follow it to the new industry
+        startup = db.session.get(Startup, 2)
+        startup.industry = 'Biotech'
+        db.session.commit()
+
+        assert rollup('year', date(2024, 1, 1), 'Fintech', 'Seed') is None
+        assert rollup('year', date(2024, 1, 1), 'Biotech', 'Seed').total_amount == 4.0
+
+    def test_delete_empties_bucket(self, app):
+        round_ = FundingRound(startup_id=1, round_type='Seed', amount=2.0, date=date(2024, 1, 10))
+        db.session.add(round_)
+        db.session.commit()
+
+        db.session.delete(round_)
+        db.session.commit()
+
+        assert FundingRollup.query.count() == 0
+
+    def test_rebuild_matches_incremental(self, app):
+        db.session.add_all([
+            FundingRound(startup_id=1, round_type='Seed', amount=1.0, date=date(2023, 11, 10)),
+            FundingRound(startup_id=2, round_type='Series A', amount=8.0, date=date(2024, 2, 10)),
+            FundingRound(startup_id=2, round_type='Series A', amount=2.0, date=date(2024, 3, 10)),
+        ])
+        db.session.commit()
+        columns = ('period_type', 'period_start', 'industry', 'round_type', 'round_count', 'total_amount', 'median_amount')
+        incremental = sorted(tuple(getattr(r, c) for c in columns) for r in FundingRollup.query.all())
+
+        # A full rebuild produces the same rollups as the incremental refreshes
+        with db.engine.begin() as connection:
+            assert rebuild_funding_rollups(connection) == len(incremental)
+        db.session.expire_all()
+        rebuilt = sorted(tuple(getattr(r, c) for c in columns) for r in FundingRollup.query.all())
+        assert rebuilt == incremental
+
+class TestBackgroundRefresh:
+    @pytest.fixture
+    def app_config(self, tmp_path):
+        # A file database, as the refresher thread gets a connection of its own
+        return {'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'rollups.db'}", 'FUNDING_ROLLUP_BACKGROUND': True}
+
+    def test_commit_queues_refresh(self, app):
+        threads = []
+
+        def refresh(changes):
+            threads.append(threading.current_thread().name)
+            return refresh_changed_rollups(changes)
+
+        refresh_changed_rollups = funding_rollup.refresh_changed_rollups
+        with patch.object(funding_rollup, 'refresh_changed_rollups', side_effect=refresh):
+            db.session.add(FundingRound(startup_id=1, round_type='Seed', amount=2.0, date=date(2024, 1, 10)))
+            db.session.commit()
+            wait_for_rollups()
+
+        # The refresh ran on the refresher thread, not in the committing one
+        assert threads == ['funding-rollup-refresher']
+        assert rollup('year', date(2024, 1, 1), 'Biotech', 'Seed').total_amount == 2.0
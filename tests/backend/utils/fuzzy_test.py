@@ -0,0 +1,156 @@
+import pytest
+import time
+from src.backend.models import Investor, Startup
+from src.backend.utils import fuzzy
+from src.backend.utils.db import db
+from src.backend.utils.fuzzy import (
+    DEFAULT_SIMILARITY_THRESHOLD, NgramIndex, contains_pattern, ensure_name_indexes, fuzzy_name_filter,
+    fuzzy_name_matches, parse_threshold, similarity, trigrams
+)
+
+@pytest.fixture
+def seed():
+    # A few startups and an investor to match names against
+    return [Startup(id=1, name='Moderna'), Startup(id=2, name='Ginkgo Bioworks'),
+            Startup(id=3, name='Biogen Labs'), Investor(id=1, name='Flagship Pioneering')]
+
+@pytest.fixture(autouse=True)
+def name_indexes():
+    # Start every test from a fresh set of name indexes
+    fuzzy._name_indexes.clear()
+    yield
+    fuzzy._name_indexes.clear()
+
+class TestTrigrams:
+    def test_trigrams_match_pg_trgm(self):
+        assert trigrams('Cat') == {'  c', ' ca', 'cat', 'at '}
+
+    def test_similarity(self):
+        assert similarity('Moderna', 'Moderna') == 1.0
+        assert similarity('Moderana', 'Moderna') > 0.5
+        assert similarity('Moderna', 'Flagship') == 0.0
+
+class TestNgramIndex:
+    def test_search_ranks_by_similarity(self):
+        index = NgramIndex()
+        index.add(1, 'Moderna')
+        index.add(2, 'Modern Meadow')
+        index.add(3, 'Akili')
+
+        matches = index.search('Moderana', threshold=0.2)
+
+        assert [entity_id for entity_id, _, _ in matches] == [1, 2]
+        assert matches[0][2] == pytest.approx(similarity('Moderana', 'Moderna'))
+
+    def test_threshold_and_limit(self):
+        index = NgramIndex()
+        index.add(1, 'Moderna')
+        index.add(2, 'Modern Meadow')
+
+        assert [match[0] for match in index.search('Moderana', threshold=0.5)] == [1]
+        assert len(index.search('Moderana', threshold=0.1, limit=1)) == 1
+
+    def test_contains_and_remove(self):
+        index = NgramIndex()
+        index.add(1, 'Ginkgo Bioworks')
+        index.add(2, 'Biogen Labs')
+
+        assert index.contains('bio') == {1, 2}
+        assert index.contains('kgo bio') == {1}
+
+        index.remove(2)
+        assert index.contains('bio') == {1}
+        assert len(index) == 1
+
+    def test_fast_at_100k_names(self):
+        index = NgramIndex()
+        for i in range(100000):
+            index.add(i, f'Startup {i} Therapeutics')
+
+        start = time.perf_counter()
+        index.search('Startup 4242 Therapeutix', threshold=0.6, limit=10)
+        assert time.perf_counter() - start < 1.0
+
+class TestFuzzyNameFilter:
+    def test_filter_finds_typos_and_substrings(self, app):
+        typo = Startup.query.filter(fuzzy_name_filter(Startup, 'Moderana')).all()
+        substring = Startup.query.filter(fuzzy_name_filter(Startup, 'bio')).order_by(Startup.id).all()
+
+        assert [startup.id for startup in typo] == [1]
+        assert [startup.id for startup in substring] == [2, 3]
+
+    def test_matches_follow_committed_writes(self, app):
+        assert fuzzy_name_matches(Investor, 'Flagship Pioner')[0][:2] == (1, 'Flagship Pioneering')
+
+        db.session.get(Startup, 1).name = 'Moderna Therapeutics'
+        db.session.add(Startup(id=4, name='Modernizing Medicine'))
+        db.session.delete(db.session.get(Startup, 2))
+        db.session.commit()
+
+        assert [match[0] for match in fuzzy_name_matches(Startup, 'Moderna Therapeutic')][:1] == [1]
+        assert 4 in [match[0] for match in fuzzy_name_matches(Startup, 'Modernizing', threshold=0.5)]
+        assert fuzzy_name_matches(Startup, 'Ginkgo Bioworks') == []
+
+    def test_index_rebuilt_for_writes_of_other_workers(self, app):
+        assert Startup.query.filter(fuzzy_name_filter(Startup, 'Moderna')).count() == 1
+
+        # Another worker's insert reaches the database but not the index of this worker
+        with db.engine.begin() as connection:
+            connection.execute(Startup.__table__.insert(), {'id': 4, 'name': 'Moderna Labs'})
+        assert Startup.query.filter(fuzzy_name_filter(Startup, 'Moderna')).count() == 1
+
+        # Once the index is older than the refresh interval it is rebuilt from the database
+        app.config['NAME_INDEX_REFRESH_SECONDS'] = 0
+        assert Startup.query.filter(fuzzy_name_filter(Startup, 'Moderna')).count() == 2
+
+    def test_candidates_capped(self, app):
+        # Substring matches come first, then the most similar names, up to the cap
+        app.config['NAME_FILTER_MAX_CANDIDATES'] = 1
+        assert [startup.id for startup in Startup.query.filter(fuzzy_name_filter(Startup, 'bio'))] == [2]
+
+        app.config['NAME_FILTER_MAX_CANDIDATES'] = 2
+        assert Startup.query.filter(fuzzy_name_filter(Startup, 'Moderana')).count() == 1
+
+class TestRequestParameters:
+    def test_parse_threshold(self):
+        assert parse_threshold(None) == DEFAULT_SIMILARITY_THRESHOLD
+        assert parse_threshold('0.5') == 0.5
+        for value in ('-0.1', '1.5', 'nan', 'high'):
+            with pytest.raises(ValueError):
+                parse_threshold(value)
+
+    def test_contains_pattern_escapes_wildcards(self, app):
+        db.session.add_all([Startup(id=4, name='100% Bio'), Startup(id=5, name='1000 Bio'),
+                            Startup(id=6, name='Bio_Labs'), Startup(id=7, name='BioXLabs')])
+        db.session.commit()
+
+        def matching(text):
+            pattern = contains_pattern(text)
+            return [startup.id for startup in Startup.query.filter(Startup.name.ilike(pattern, escape='\\'))]
+
+        assert contains_pattern('50%_a\\b') == '%50\\%\\_a\\\\b%'
+        assert matching('0%') == [4]
+        assert matching('o_L') == [6]
+
+class TestEnsureNameIndexes:
+    def test_nothing_to_create_outside_postgres(self, app):
+        with db.engine.begin() as connection:
+            assert ensure_name_indexes(connection) == []
+
+    def test_postgres_indexes_created_idempotently(self):
+        # Record the statements a Postgres connection would run
+        statements = []
+
+        class Connection:
+            class dialect:
+                name = 'postgresql'
+
+            def exec_driver_sql(self, statement):
+                statements.append(statement)
+
+        assert ensure_name_indexes(Connection()) == ['startup', 'investor']
+        assert statements == [
+            'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+            'CREATE INDEX IF NOT EXISTS ix_startup_name_trgm ON startup USING gin (name gin_trgm_ops)',
+            'CREATE INDEX IF NOT EXISTS ix_investor_name_trgm ON investor USING gin (name gin_trgm_ops)',
+        ]
@@ -0,0 +1,181 @@
+import json
+import os
+import threading
+import subprocess
+import sys
+import time
+import pytest
+from unittest.mock import patch
+from flask import Blueprint, Flask, jsonify
+from flask_jwt_extended import create_access_token
+from src.backend.routes.metrics import metrics_routes
+from src.backend.utils import cache, metrics
+
+COUNTER = metrics.define_counter('test_events_total', 'Events seen by the tests')
+HISTOGRAM = metrics.define_histogram('test_duration_seconds', 'Durations seen by the tests', buckets=(0.1, 1.0))
+
+@pytest.fixture(autouse=True)
+def registry():
+    # Start every test from an empty single-process registry
+    metrics._reset_after_fork()
+    with patch.object(metrics, '_multiprocess_dir', None):
+        yield
+    metrics._reset_after_fork()
+
+def sample_lines(name):
+    # Exposition lines of one metric, without its HELP and TYPE lines
+    return [line for line in metrics.render_metrics().splitlines() if line.startswith(name)]
+
+class TestRegistry:
+    def test_counter_and_histogram_exposition(self):
+        metrics.inc(COUNTER, (('kind', 'a"b'),), 2)
+        for value in (0.05, 0.5, 3):
+            metrics.observe(HISTOGRAM, value, (('kind', 'a'),))
+
+        body = metrics.render_metrics()
+        assert '# TYPE test_events_total counter' in body
+        assert sample_lines('test_events_total') == ['test_events_total{kind="a\\"b"} 2']
+        assert sample_lines('test_duration_seconds') == [
+            'test_duration_seconds_bucket{kind="a",le="0.1"} 1',
+            'test_duration_seconds_bucket{kind="a",le="1.0"} 2',
+            'test_duration_seconds_bucket{kind="a",le="+Inf"} 3',
+            'test_duration_seconds_sum{kind="a"} 3.55',
+            'test_duration_seconds_count{kind="a"} 3',
+        ]
+
+    def test_threads_record_into_own_shards(self):
+        def record():
+            for _ in range(1000):
+                metrics.inc(COUNTER)
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Shards of finished threads are folded into the base shard and still count
+        assert sample_lines('test_events_total') == ['test_events_total 4000']
+        assert metrics._shards == []
+        assert metrics._base[0] == {(COUNTER, ()): 4000}
+
+    def test_workers_merged_through_directory(self, tmp_path):
+        # Another worker published its samples; this worker's own file is superseded by its live samples
+        (tmp_path / 'metrics_1.json').write_text(json.dumps({
+            'counters': [[COUNTER, [['kind', 'a']], 5]],
+            'histograms': [[HISTOGRAM, [], [1, 0, 0, 0.05]]],
+        }))
+        metrics.inc(COUNTER, (('kind', 'a'),))
+        metrics.observe(HISTOGRAM, 0.5)
+        with patch.object(metrics, '_multiprocess_dir', str(tmp_path)):
+            metrics.flush_metrics()
+            lines = sample_lines('test_')
+
+        assert os.path.exists(tmp_path / f'metrics_{metrics._worker_token}.json')
+        assert 'test_events_total{kind="a"} 6' in lines
+        assert 'test_duration_seconds_count 2' in lines
+
+    def test_restarted_worker_keeps_file_of_pid_predecessor(self, tmp_path):
+        # An exited worker with the same pid published earlier; the restarted one writes a file of its own
+        (tmp_path / f'metrics_{os.getpid()}_1.json').write_text(json.dumps({
+            'counters': [[COUNTER, [], 5]], 'histograms': [],
+        }))
+        metrics.inc(COUNTER)
+        with patch.object(metrics, '_multiprocess_dir', str(tmp_path)):
+            metrics.flush_metrics()
+            lines = sample_lines('test_events_total')
+
+        assert len(list(tmp_path.glob('metrics_*.json'))) == 2
+        assert lines == ['test_events_total 6']
+
+    def test_idle_worker_flushes_in_background(self, tmp_path):
+        # Samples recorded before the worker went idle are published without a further request
+        metrics.inc(COUNTER)
+        with patch.object(metrics, '_multiprocess_dir', str(tmp_path)), patch.object(metrics, '_flush_seconds', 0.01):
+            metrics._start_flusher()
+            path = tmp_path / f'metrics_{metrics._worker_token}.json'
+            for _ in range(100):
+                if path.exists():
+                    break
+                time.sleep(0.01)
+
+        assert json.loads(path.read_text())['counters'] == [[COUNTER, [], 1]]
+
+    def test_flusher_prunes_files_of_exited_workers(self, tmp_path):
+        # A worker that has exited, and one that is still running: this process
+        exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+        exited.wait()
+        payload = json.dumps({'counters': [[COUNTER, [], 5]], 'histograms': []})
+        (tmp_path / f'metrics_{exited.pid}_1.json').write_text(payload)
+        (tmp_path / f'metrics_{os.getpid()}_1.json').write_text(payload)
+
+        with patch.object(metrics, '_multiprocess_dir', str(tmp_path)), patch.object(metrics, '_flush_seconds', 60):
+            metrics._start_flusher()
+
+        assert sorted(path.name for path in tmp_path.glob('metrics_*.json')) == [f'metrics_{os.getpid()}_1.json']
+
+class TestRequestMetrics:
+    def test_request_counted_by_route_template(self):
+        app = Flask(__name__)
+        metrics.init_metrics(app)
+        items = Blueprint('items', __name__)
+
+        @items.route('/items/<int:item_id>')
+        def get_item(item_id):
+            return jsonify({'id': item_id})
+
+        app.register_blueprint(items)
+        client = app.test_client()
+        client.get('/items/1')
+        client.get('/items/2')
+        client.get('/missing')
+
+        labels = 'blueprint="items",route="/items/<int:item_id>",method="GET"'
+        assert f'http_requests_total{{{labels},status="200"}} 2' in sample_lines('http_requests_total')
+        assert 'http_requests_total{blueprint="",route="unmatched",method="GET",status="404"} 1' in \
+            sample_lines('http_requests_total')
+        assert f'http_request_duration_seconds_count{{{labels}}} 2' in sample_lines('http_request_duration')
+        assert f'http_response_size_bytes_bucket{{{labels},le="100"}} 2' in sample_lines('http_response_size')
+
+class TestCacheMetrics:
+    def test_lookups_counted_by_tier(self):
+        with patch.object(cache, 'redis_client', None), patch.object(cache, 'local_cache', cache.LocalCache()):
+            cache.cache_set('startup:1', {'id': 1})
+            cache.cache_get('startup:1')
+            cache.cache_get('startup:2')
+            cache.cache_get_many(['startup:1', 'startup:3'])
+
+        assert sample_lines('cache_lookups_total') == [
+            'cache_lookups_total{result="hit",tier="local"} 2',
+            'cache_lookups_total{result="miss",tier="none"} 2',
+        ]
+
+class TestMetricsRoute:
+    @pytest.fixture
+    def app_config(self):
+        return {'METRICS_TOKEN': 'scrape-token'}
+
+    @pytest.fixture
+    def client(self, app):
+        app.register_blueprint(metrics_routes)
+        return app.test_client()
+
+    def bearer(self, app, **claims):
+        with app.test_request_context('/'):
+            return {'Authorization': f"Bearer {create_access_token(identity='1', additional_claims=claims)}"}
+
+    def test_scrape_token_accepted(self, client):
+        response = client.get('/metrics', headers={'Authorization': 'Bearer scrape-token'})
+
+        assert response.status_code == 200
+        assert '# TYPE http_requests_total counter' in response.text
+
+    def test_admin_token_accepted(self, app, client):
+        assert client.get('/metrics', headers=self.bearer(app, role='admin')).status_code == 200
+
+    def test_other_users_refused(self, app, client):
+        assert client.get('/metrics', headers=self.bearer(app, role='analyst')).status_code == 403
+
+    def test_anonymous_and_wrong_token_refused(self, client):
+        assert client.get('/metrics').status_code == 401
+        assert client.get('/metrics', headers={'Authorization': 'Bearer wrong-token'}).status_code == 401
@@ -0,0 +1,76 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import Column, DateTime, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+from src.backend.utils.pagination import decode_cursor, encode_cursor, paginate_keyset
+
+Base = declarative_base()
+
+class Item(Base):
+    __tablename__ = 'item'
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50))
+    published_date = Column(DateTime)
+
+NAME_SORT_KEY = ((Item.name, False), (Item.id, False))
+DATE_SORT_KEY = ((Item.published_date, True), (Item.id, True))
+
+@pytest.fixture
+def session():
+    # Create an in-memory database with duplicate sort values to exercise the tie-breaker
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    base_date = datetime(2024, 1, 1)
+    for i in range(1, 26):
+        session.add(Item(id=i, name=f'Startup {i % 5}', published_date=base_date + timedelta(days=i % 7)))
+    session.commit()
+    yield session
+    session.close()
+
+class TestKeysetPagination:
+    def walk(self, session, sort_key, per_page):
+        # Follow next_cursor until the last page and collect the IDs in order
+        ids, cursor = [], ''
+        while cursor is not None:
+            rows, cursor = paginate_keyset(session.query(Item), sort_key, cursor, per_page)
+            ids.extend(row.id for row in rows)
+        return ids
+
+    def test_pages_cover_all_rows_in_order(self, session):
+        expected = [item.id for item in session.query(Item).order_by(Item.name, Item.id)]
+
+        assert self.walk(session, NAME_SORT_KEY, 4) == expected
+
+    def test_descending_datetime_sort_key(self, session):
+        expected = [item.id for item in session.query(Item).order_by(Item.published_date.desc(), Item.id.desc())]
+
+        assert self.walk(session, DATE_SORT_KEY, 6) == expected
+
+    def test_null_sort_values_walked_once(self, session):
+        # NULL dates sort as the largest value: first when descending, last when ascending
+        session.add_all([Item(id=i, name='Undated') for i in range(26, 31)])
+        session.commit()
+
+        descending = self.walk(session, DATE_SORT_KEY, 4)
+        ascending = self.walk(session, ((Item.published_date, False), (Item.id, False)), 4)
+
+        assert descending[:5] == [30, 29, 28, 27, 26]
+        assert ascending[-5:] == [26, 27, 28, 29, 30]
+        assert sorted(descending) == sorted(ascending) == list(range(1, 31))
+
+    def test_last_page_has_no_next_cursor(self, session):
+        rows, cursor = paginate_keyset(session.query(Item), NAME_SORT_KEY, None, 25)
+
+        assert len(rows) == 25
+        assert cursor is None
+
+    def test_cursor_round_trip(self):
+        values = [datetime(2024, 5, 1, 12, 30), 42]
+
+        assert decode_cursor(encode_cursor(values), DATE_SORT_KEY) == values
+
+    @pytest.mark.parametrize('cursor', ['not-a-cursor', encode_cursor([1]), encode_cursor(['bad-date', 1])])
+    def test_invalid_cursor_raises(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, DATE_SORT_KEY)
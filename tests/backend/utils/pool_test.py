@@ -0,0 +1,63 @@
+import pytest
+from flask import Flask
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from src.backend.utils.db import db
+from src.backend.utils.metrics import Histogram
+from src.backend.utils.pool import InstrumentedQueuePool, init_pool_metrics, pool_stats
+
+@pytest.fixture
+def app(tmp_path):
+    # Create a file database behind a single-connection pool that gives up quickly
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'pool.db'}"
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'pool_size': 1, 'max_overflow': 0, 'pool_timeout': 0.05}
+    init_pool_metrics(app)
+    db.init_app(app)
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+class TestHistogram:
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        assert snapshot['buckets'] == {'0.1': 2, '1.0': 3, '+Inf': 4}
+        assert (snapshot['count'], snapshot['sum']) == (4, pytest.approx(2.65))
+
+class TestPoolMetrics:
+    def test_checkouts_and_connects_recorded(self, app):
+        with db.engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+            stats = pool_stats(db.engine)
+
+        assert isinstance(db.engine.pool, InstrumentedQueuePool)
+        assert (stats['checked_out'], stats['peak_checked_out']) == (1, 1)
+        assert stats['checkout_wait_seconds']['count'] == 1
+        assert stats['connects'] == stats['connect_latency_seconds']['count'] == 1
+
+    def test_exhausted_pool_counts_timeout(self, app):
+        # The second checkout waits for the only connection and times out
+        with db.engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                db.engine.connect()
+
+        stats = pool_stats(db.engine)
+        assert stats['checkout_timeouts'] == 1
+        assert stats['checkout_wait_seconds']['count'] == 2
+
+    def test_metrics_survive_dispose(self, app):
+        with db.engine.connect():
+            pass
+
+        # Disposing replaces the pool, as after a failover; its metrics and listeners carry over
+        db.engine.dispose()
+        with db.engine.connect():
+            pass
+
+        stats = pool_stats(db.engine)
+        assert stats['checkouts'] == 2
+        assert stats['connects'] == 2
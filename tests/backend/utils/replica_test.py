@@ -0,0 +1,78 @@
+import pytest
+from flask import Flask
+from src.backend.models import Startup
+from src.backend.utils.db import PRIMARY_PIN_COOKIE, db, init_replicas, replica_engines, use_primary, use_replica
+
+@pytest.fixture
+def app(tmp_path):
+    # Stand in for the primary and its replica with two SQLite files holding differently named rows
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'primary.db'}"
+    app.config['SQLALCHEMY_REPLICA_URIS'] = [f"sqlite:///{tmp_path / 'replica.db'}"]
+    app.config['REPLICA_PIN_SECONDS'] = 5
+    db.init_app(app)
+    init_replicas(app)
+
+    @app.route('/startups/1', methods=['GET', 'PUT'])
+    def startup_name():
+        return {'name': db.session.get(Startup, 1).name}
+
+    @app.route('/startups/1/touch', methods=['GET'])
+    def touch_then_read():
+        # A write inside a GET request pins the rest of its reads to the primary
+        db.session.add(Startup(id=2, name='Written'))
+        db.session.flush()
+        db.session.expunge_all()
+        return {'name': db.session.get(Startup, 1).name}
+
+    with app.app_context():
+        for engine, name in ((db.engine, 'Primary'), (replica_engines()[0], 'Replica')):
+            db.metadata.create_all(engine)
+            with engine.begin() as connection:
+                connection.execute(Startup.__table__.insert(), {'id': 1, 'name': name})
+        yield app
+        db.session.remove()
+        for engine in replica_engines():
+            engine.dispose()
+
+def read_name():
+    # Name of startup 1 as seen by a fresh session
+    db.session.remove()
+    return db.session.get(Startup, 1).name
+
+class TestReadRouting:
+    def test_get_reads_replica(self, app):
+        response = app.test_client().get('/startups/1')
+
+        assert response.json['name'] == 'Replica'
+
+    def test_other_methods_read_primary(self, app):
+        response = app.test_client().put('/startups/1')
+
+        assert response.json['name'] == 'Primary'
+
+    def test_write_pins_session_to_primary(self, app):
+        response = app.test_client().get('/startups/1/touch')
+
+        assert response.json['name'] == 'Primary'
+        assert PRIMARY_PIN_COOKIE in response.headers['Set-Cookie']
+
+    def test_pin_cookie_reads_primary(self, app):
+        client = app.test_client()
+        client.set_cookie(PRIMARY_PIN_COOKIE, '1')
+
+        assert client.get('/startups/1').json['name'] == 'Primary'
+
+    def test_explicit_targets(self, app):
+        # Outside requests reads go to the primary unless a replica is asked for
+        assert read_name() == 'Primary'
+        with use_replica():
+            assert read_name() == 'Replica'
+        with app.test_request_context('/', method='GET'), use_primary():
+            assert read_name() == 'Primary'
+
+    def test_without_replicas_reads_primary(self, app):
+        app.extensions['replica_engines'] = []
+
+        with app.test_request_context('/', method='GET'):
+            assert read_name() == 'Primary'
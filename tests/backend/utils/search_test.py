@@ -0,0 +1,86 @@
+import pytest
+from datetime import datetime
+from src.backend.models import JobPosting, NewsArticle, Startup
+from src.backend.utils.db import db
+from src.backend.utils.search import ensure_search_indexes, get_search_index, search_terms
+
+@pytest.fixture
+def seed():
+    # Job postings indexed by the FTS5 triggers that create_all sets up
+    return [
+        Startup(id=1, name='Startup 1'),
+        JobPosting(id=1, startup_id=1, title='Senior Python Engineer', department='Engineering',
+                   description='Build data pipelines'),
+        JobPosting(id=2, startup_id=1, title='Sales Lead', department='Sales',
+                   description='Sell our Python platform to biotech companies'),
+        JobPosting(id=3, startup_id=1, title='Office Manager', description='Keep the office running'),
+    ]
+
+def search(model, query, page=1, per_page=20):
+    # Same join and ordering as search_service.search, whose package cannot be imported in isolation
+    terms = search_terms(query)
+    if not terms:
+        return []
+    matches = get_search_index(model).matches('sqlite', terms)
+    matched_query = model.query.join(matches, model.id == matches.c.id)
+    return matched_query.order_by(matches.c.rank, model.id).offset((page - 1) * per_page).limit(per_page).all()
+
+class TestFullTextSearch:
+    def test_results_ranked_by_field_weight(self, app):
+        results = search(JobPosting, 'python')
+
+        # A title match outranks a description match
+        assert [job.id for job in results] == [1, 2]
+
+    def test_all_terms_must_match(self, app):
+        results = search(JobPosting, 'python biotech')
+
+        assert [job.id for job in results] == [2]
+
+    def test_pagination(self, app):
+        results = search(JobPosting, 'python', page=2, per_page=1)
+
+        assert [job.id for job in results] == [2]
+
+    def test_index_follows_updates_and_deletes(self, app):
+        db.session.get(JobPosting, 3).title = 'Python Office Manager'
+        db.session.delete(db.session.get(JobPosting, 1))
+        db.session.commit()
+
+        results = search(JobPosting, 'python')
+
+        assert sorted(job.id for job in results) == [2, 3]
+
+    def test_operators_in_query_are_ignored(self, app):
+        assert search(JobPosting, 'python" OR (NEAR') == []
+        assert search(JobPosting, '  ') == []
+        assert search_terms('Python-3, "AI"') == ['python', '3', 'ai']
+
+    def test_news_articles_searchable(self, app):
+        db.session.add(NewsArticle(id=1, startup_id=1, title='Startup 1 raises Series B', url='https://example.com/1',
+                                   published_date=datetime(2024, 1, 1), summary='Funding led by Boston investors'))
+        db.session.commit()
+
+        results = search(NewsArticle, 'boston funding')
+
+        assert [article.id for article in results] == [1]
+
+class TestEnsureSearchIndexes:
+    def test_indexes_created_and_filled_for_existing_tables(self, app):
+        # A database whose job table predates the search index
+        with db.engine.begin() as connection:
+            for trigger in ('insert', 'update', 'delete'):
+                connection.exec_driver_sql(f'DROP TRIGGER job_posting_fts_{trigger}')
+            connection.exec_driver_sql('DROP TABLE job_posting_fts')
+
+        with db.engine.begin() as connection:
+            assert 'job_posting' in ensure_search_indexes(connection)
+            # Running it again changes nothing
+            ensure_search_indexes(connection)
+
+        assert [job.id for job in search(JobPosting, 'python')] == [1, 2]
+
+        # The triggers keep the rebuilt index current
+        db.session.get(JobPosting, 3).title = 'Python Office Manager'
+        db.session.commit()
+        assert sorted(job.id for job in search(JobPosting, 'python')) == [1, 2, 3]
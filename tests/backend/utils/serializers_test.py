@@ -0,0 +1,70 @@
+import pytest
+from datetime import date, datetime
+from src.backend.models import FundingRound, JobPosting, Startup
+from sqlalchemy import select
+from src.backend.utils.serializers import (
+    get_serializer, load_only_fields, parse_fields, project, serialize, serialize_many
+)
+
+class TestSerializers:
+    def test_serialize_converts_dates(self):
+        startup = Startup(id=1, name='Startup 1', last_funding_date=date(2024, 3, 1),
+                          last_updated=datetime(2024, 3, 2, 10, 30))
+
+        result = serialize(startup)
+
+        assert result['last_funding_date'] == '2024-03-01'
+        assert result['last_updated'] == '2024-03-02T10:30:00'
+        assert list(result) == [column.name for column in Startup.__table__.columns]
+
+    def test_serialize_keeps_null_dates(self):
+        result = serialize(JobPosting(id=1, title='Engineer'))
+
+        assert result['posted_date'] is None
+
+    def test_serializer_compiled_once_per_model(self):
+        assert get_serializer(Startup) is get_serializer(Startup)
+
+    def test_serialize_many_with_projection(self):
+        startups = [Startup(id=i, name=f'Startup {i}', industry='Biotech') for i in range(3)]
+
+        result = serialize_many(Startup, startups, fields=['name', 'id'])
+
+        # Projected fields come back in column order
+        assert result == [{'id': i, 'name': f'Startup {i}'} for i in range(3)]
+
+    def test_unknown_field_rejected(self):
+        with pytest.raises(ValueError):
+            serialize_many(Startup, [], fields=['id', 'password'])
+
+    def test_funding_round_to_dict_includes_investor_names(self):
+        funding_round = FundingRound(id=1, date=date(2024, 1, 15), round_type='Seed')
+
+        result = funding_round.to_dict()
+
+        assert result['date'] == '2024-01-15'
+        assert result['investor_names'] == []
+
+class TestSparseFieldsets:
+    def test_parse_fields_adds_primary_key_and_version(self):
+        assert parse_fields(Startup, 'industry, name') == ('id', 'name', 'industry', 'last_updated')
+        assert parse_fields(Startup, '') is None
+
+    def test_parse_fields_rejects_unknown_fields(self):
+        with pytest.raises(ValueError):
+            parse_fields(Startup, 'name,password')
+
+    def test_load_only_selects_projected_columns(self):
+        fields = parse_fields(Startup, 'name')
+        query = select(Startup).options(load_only_fields(Startup, fields, ((Startup.industry, False),)))
+
+        # Only the projection and the sort key columns are read
+        sql = str(query.compile())
+        assert 'startup.industry' in sql and 'startup.name' in sql
+        assert 'startup.website' not in sql and 'startup.total_funding' not in sql
+
+    def test_project_cached_entity(self):
+        data = serialize(Startup(id=1, name='Startup 1', industry='Biotech'))
+
+        assert project(data, ('id', 'name')) == {'id': 1, 'name': 'Startup 1'}
+        assert project(data, None) is data